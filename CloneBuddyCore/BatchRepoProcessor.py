@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 # BatchRepoProcessor.py
-# Purpose: Batch-process multiple pyRevit GitHub extensions using CloneBuddyCore
+# Purpose: Batch-process multiple pyRevit GitHub extensions using the clonebuddy package
 
 import os
 import re
-from CloneBuddyCore import clone_repo, validate_structure, auto_fix_structure,log
+from clonebuddy.clone import clone_repo
+from clonebuddy.fix import auto_fix_structure
+from clonebuddy.registry import register_with_pyrevit
+from clonebuddy.validate import validate_structure
 
 # -------------------------------
 # Repo List to Process
@@ -67,8 +70,9 @@ def process_all_repos():
                 continue
 
             issues = validate_structure(path)
-            auto_fix_structure(path)
-            issues = validate_structure(path)  # Re-validate after fix
+            if issues:
+                path = auto_fix_structure(path, repo_url)
+                issues = validate_structure(path)  # Re-validate after fix
 
             if issues:
                 batch_log("⚠ Extension has unresolved issues. Skipping registration.")
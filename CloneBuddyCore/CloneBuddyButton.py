@@ -5,21 +5,10 @@ This is the pyRevit button entry script to:
 2. Run the CloneBuddy workflow.
 """
 
-import os
-import sys
-import pyRevit
-
 from pyrevit import forms
 
-# Dynamically import the core module (adjust path if needed)
-core_path = os.path.join(os.path.dirname(__file__), "..", "..", "CloneBuddyCore.py")
-core_path = os.path.abspath(core_path)
-
-if core_path not in sys.path:
-    sys.path.append(os.path.dirname(core_path))
-
-# Import your workflow function
-from CloneBuddyCore import run_clonebuddy_workflow
+# Import your workflow function (clonebuddy ships in HT.extension/lib)
+from clonebuddy.workflow import run_clonebuddy_workflow
 
 # Ask the user for a GitHub repo URL
 repo_url = forms.ask_for_string(
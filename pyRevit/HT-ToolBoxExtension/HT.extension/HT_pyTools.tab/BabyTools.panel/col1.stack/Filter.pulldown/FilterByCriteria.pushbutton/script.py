@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+__title__ = "Filter by Criteria"
+__author__ = "Hani M Tartour"
+__tooltip__ = "Filter the selection by category, family, type, level, workset, phase or any parameter"
+__highlight__ = "orange"
+__doc__ = """v1.0.0
+-----------------------
+Select elements, then narrow them down with several criteria at once
+(e.g. Walls or Doors, not on Level 1, in Workset1). Every criterion is
+answered from an index built once, so re-filtering stays instant on
+large selections.
+"""
+
+import clr
+clr.AddReference('RevitAPI')
+clr.AddReference("System.Windows.Forms")
+clr.AddReference("System.Drawing")
+
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.UI.Selection import ObjectType
+
+from System.Windows.Forms import (
+    Form, Label, Button, ComboBox, ListBox, CheckedListBox, TextBox, PictureBox,
+    FormStartPosition, FormBorderStyle, ComboBoxStyle, Application
+)
+from System.Drawing import Point, Size, Font, FontStyle, Image
+from System.Collections.Generic import List
+import os
+from System import Array, String
+
+from ht_revit.query import ElementIndex, PARAM_PREFIX
+
+# Revit setup
+uidoc = __revit__.ActiveUIDocument
+doc = uidoc.Document
+
+# ----------------------------
+# STEP 1 – Current selection (or pick elements)
+# ----------------------------
+selected_ids = list(uidoc.Selection.GetElementIds())
+if not selected_ids:
+    picked_refs = uidoc.Selection.PickObjects(ObjectType.Element, "Pick elements to filter")
+    selected_ids = [ref.ElementId for ref in picked_refs]
+elements = [doc.GetElement(i) for i in selected_ids]
+
+# One pass over the selection for the standard attributes
+index = ElementIndex(doc, elements)
+
+ATTRIBUTES = [
+    ("Category", "category"),
+    ("Family", "family"),
+    ("Type", "type"),
+    ("Level", "level"),
+    ("Workset", "workset"),
+    ("Phase Created", "phase"),
+    ("Parameter…", PARAM_PREFIX),
+]
+MODES = ["is any of", "is none of"]
+
+
+# ----------------------------
+# STEP 2 – UI Form for filtering
+# ----------------------------
+class CriteriaFilterForm(Form):
+    def __init__(self):
+        self.Text = "Filter Elements By Criteria"
+        self.Size = Size(420, 560)
+        self.StartPosition = FormStartPosition.CenterScreen
+        self.FormBorderStyle = FormBorderStyle.FixedDialog
+        self.MaximizeBox = False
+        self.criteria = []  # (attribute, values, exclude)
+
+        # Branding Logo (optional)
+        logo_path = os.path.join(os.path.dirname(__file__), "button.png")
+        if os.path.exists(logo_path):
+            logo = PictureBox()
+            logo.Image = Image.FromFile(logo_path)
+            logo.Size = Size(48, 48)
+            logo.Location = Point(20, 20)
+            self.Controls.Add(logo)
+
+        # Title
+        title = Label()
+        title.Text = "Filter Elements By Criteria"
+        title.Font = Font("Segoe UI", 12, FontStyle.Bold)
+        title.Location = Point(80, 25)
+        title.AutoSize = True
+        self.Controls.Add(title)
+
+        # Subtitle
+        subtitle = Label()
+        subtitle.Text = "✨ Your Revit Companion"
+        subtitle.Font = Font("Segoe UI", 10)
+        subtitle.Location = Point(80, 55)
+        subtitle.AutoSize = True
+        self.Controls.Add(subtitle)
+
+        # Attribute + mode
+        self.attr_combo = ComboBox()
+        self.attr_combo.Location = Point(30, 90)
+        self.attr_combo.Size = Size(170, 30)
+        self.attr_combo.DropDownStyle = ComboBoxStyle.DropDownList
+        self.attr_combo.Items.AddRange(Array[String]([label for label, _ in ATTRIBUTES]))
+        self.Controls.Add(self.attr_combo)
+
+        self.mode_combo = ComboBox()
+        self.mode_combo.Location = Point(210, 90)
+        self.mode_combo.Size = Size(160, 30)
+        self.mode_combo.DropDownStyle = ComboBoxStyle.DropDownList
+        self.mode_combo.Items.AddRange(Array[String](MODES))
+        self.mode_combo.SelectedIndex = 0
+        self.Controls.Add(self.mode_combo)
+
+        # Parameter name (only for "Parameter…")
+        self.param_box = TextBox()
+        self.param_box.Location = Point(30, 122)
+        self.param_box.Size = Size(250, 24)
+        self.param_box.Enabled = False
+        self.Controls.Add(self.param_box)
+
+        load_btn = Button()
+        load_btn.Text = "Load values"
+        load_btn.Size = Size(90, 24)
+        load_btn.Location = Point(280, 121)
+        load_btn.Click += self.fill_values
+        self.Controls.Add(load_btn)
+
+        # Values with counts
+        self.value_list = CheckedListBox()
+        self.value_list.Location = Point(30, 152)
+        self.value_list.Size = Size(340, 140)
+        self.value_list.CheckOnClick = True
+        self.Controls.Add(self.value_list)
+
+        add_btn = Button()
+        add_btn.Text = "Add criterion"
+        add_btn.Size = Size(110, 30)
+        add_btn.Location = Point(30, 300)
+        add_btn.Click += self.add_criterion
+        self.Controls.Add(add_btn)
+
+        clear_btn = Button()
+        clear_btn.Text = "Clear"
+        clear_btn.Size = Size(80, 30)
+        clear_btn.Location = Point(150, 300)
+        clear_btn.Click += self.clear_criteria
+        self.Controls.Add(clear_btn)
+
+        # Active criteria
+        self.criteria_list = ListBox()
+        self.criteria_list.Location = Point(30, 340)
+        self.criteria_list.Size = Size(340, 90)
+        self.Controls.Add(self.criteria_list)
+
+        self.result_label = Label()
+        self.result_label.Location = Point(30, 440)
+        self.result_label.Size = Size(340, 20)
+        self.Controls.Add(self.result_label)
+
+        # Select + OK
+        select_btn = Button()
+        select_btn.Text = "Select"
+        select_btn.Size = Size(100, 30)
+        select_btn.Location = Point(30, 470)
+        select_btn.Click += self.apply_filter
+        self.Controls.Add(select_btn)
+
+        ok_btn = Button()
+        ok_btn.Text = "OK"
+        ok_btn.Size = Size(100, 30)
+        ok_btn.Location = Point(270, 470)
+        ok_btn.Click += self.close_form
+        self.Controls.Add(ok_btn)
+
+        self.attr_combo.SelectedIndexChanged += self.fill_values
+        self.attr_combo.SelectedIndex = 0
+        self.update_count()
+
+    # ---------------------------------------
+    # Helpers
+    # ---------------------------------------
+    def current_attribute(self):
+        attribute = ATTRIBUTES[self.attr_combo.SelectedIndex][1]
+        if attribute == PARAM_PREFIX:
+            name = self.param_box.Text.strip()
+            return PARAM_PREFIX + name if name else None
+        return attribute
+
+    def current_match(self):
+        return index.query(self.criteria)
+
+    def update_count(self):
+        self.result_label.Text = "{} of {} elements match".format(
+            self.current_match().count(), index.size)
+
+    # ---------------------------------------
+    # Method: fill_values
+    # ---------------------------------------
+    def fill_values(self, sender, event):
+        is_param = ATTRIBUTES[self.attr_combo.SelectedIndex][1] == PARAM_PREFIX
+        self.param_box.Enabled = is_param
+        self.value_list.BeginUpdate()
+        self.value_list.Items.Clear()
+        self.values = []
+        attribute = self.current_attribute()
+        if attribute:
+            self.values = index.values(attribute)
+            self.value_list.Items.AddRange(Array[String](
+                ["{} ({})".format(value, count) for value, count in self.values]))
+        self.value_list.EndUpdate()
+
+    # ---------------------------------------
+    # Method: add_criterion
+    # ---------------------------------------
+    def add_criterion(self, sender, event):
+        attribute = self.current_attribute()
+        checked = [self.values[i][0] for i in self.value_list.CheckedIndices]
+        if not attribute or not checked:
+            return
+        exclude = self.mode_combo.SelectedIndex == 1
+        self.criteria.append((attribute, checked, exclude))
+        self.criteria_list.Items.Add("{} {} {}".format(
+            self.attr_combo.SelectedItem if not attribute.startswith(PARAM_PREFIX) else attribute,
+            MODES[1 if exclude else 0], ", ".join(str(v) for v in checked)))
+        self.update_count()
+
+    def clear_criteria(self, sender, event):
+        self.criteria = []
+        self.criteria_list.Items.Clear()
+        self.update_count()
+
+    # ---------------------------------------
+    # Method: apply_filter
+    # ---------------------------------------
+    def apply_filter(self, sender, event):
+        ids = self.current_match().ids()
+        uidoc.Selection.SetElementIds(List[ElementId](ids))
+        self.result_label.Text = "✅ Selected {} of {} elements".format(len(ids), index.size)
+
+    # ---------------------------------------
+    # Method: close_form
+    # ---------------------------------------
+    def close_form(self, sender, event):
+        self.Close()
+
+
+# Run the Form
+Application.Run(CriteriaFilterForm())
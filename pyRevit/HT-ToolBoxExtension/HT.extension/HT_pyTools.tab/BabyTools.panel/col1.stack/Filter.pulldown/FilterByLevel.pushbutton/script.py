@@ -1,12 +1,12 @@
 # -*- coding: utf-8 -*-
 __title__ = "Filter by Level"
 __author__ = "Hani M Tartour"
-__tooltip__ = "Filter picked elements by their Level"
+__tooltip__ = "Filter the selection, the active view or the whole model by Level"
 __highlight__ = "orange"
 __doc__ = """v1.0.0
 -----------------------
-Select elements, then filter them by the Level they are placed on.
-Useful for organizing selections across floors or zones.
+Filter the current selection, the active view or the whole model by the
+Level elements are placed on. Useful for organizing selections across floors or zones.
 """
 
 import clr
@@ -16,6 +16,7 @@ clr.AddReference("System.Windows.Forms")
 clr.AddReference("System.Drawing")
 
 from Autodesk.Revit.DB import *
+from Autodesk.Revit.Exceptions import OperationCanceledException
 from Autodesk.Revit.UI.Selection import ObjectType
 from RevitServices.Persistence import DocumentManager
 
@@ -29,68 +30,56 @@ import os
 import System
 from System import Array, String
 
+from ht_revit.levels import ACTIVE_VIEW, MODEL, build_level_index, collect_on_level, get_levels
+
 # Revit setup
 uidoc = __revit__.ActiveUIDocument
 doc = uidoc.Document
 
 # ----------------------------
-# Helper function: get level name of an element
-# ----------------------------   
-def get_element_level_name(element):
-    """
-    Attempts to extract the level name from various properties/parameters:
-    - LevelId property (default for many elements)
-    - "Reference Level" parameter (structural beams, framing)
-    - "Schedule Level" parameter (hosted families, etc.)
-    - Other fallback parameters if needed
-    
-    Returns the level name as string or None if not found.
-    """
+# STEP 1 – Scope: current selection, active view or whole model
+# ----------------------------
+MODE_SELECTION = "Selected elements"
+MODE_VIEW = "Active view"
+MODE_MODEL = "Whole model"
+MAX_LIST_ROWS = 500  # the ListBox only shows a preview; the Revit selection gets everything
+
+selected_ids = list(uidoc.Selection.GetElementIds())
+if not selected_ids:
+    # Nothing pre-selected: pick elements as before (Esc keeps the view / model scopes)
     try:
-        # 1. Try LevelId property (most common)
-        level_id = getattr(element, "LevelId", None)
-        if level_id and level_id != ElementId.InvalidElementId:
-            level = doc.GetElement(level_id)
-            if level:
-                return level.Name
-
-        # 2. Try "Reference Level" parameter (for beams, structural framing)
-        ref_level_param = element.LookupParameter("Reference Level")
-        if ref_level_param and ref_level_param.HasValue:
-            return ref_level_param.AsString()
-
-        # 3. Try "Schedule Level" parameter (some hosted families)
-        sched_level_param = element.LookupParameter("Schedule Level")
-        if sched_level_param and sched_level_param.HasValue:
-            return sched_level_param.AsString()
-
-        # 4. Try "Level" parameter (some families may have this as a parameter)
-        level_param = element.LookupParameter("Level")
-        if level_param and level_param.HasValue:
-            return level_param.AsString()
-
-    except Exception as ex:
-        # Optional: log or print ex for debugging
+        picked_refs = uidoc.Selection.PickObjects(ObjectType.Element, "Pick elements to filter by level")
+        selected_ids = [ref.ElementId for ref in picked_refs]
+    except OperationCanceledException:
         pass
+all_levels = get_levels(doc)  # lowest level first
+levels_by_name = dict((lvl.Name, lvl) for lvl in all_levels)
+modes = ([MODE_SELECTION] if selected_ids else []) + [MODE_VIEW, MODE_MODEL]
 
-    return None  # No level found
-   
-    
-# ----------------------------
-# STEP 1 – User picks elements
-# ----------------------------
-picked_refs = uidoc.Selection.PickObjects(ObjectType.Element, "Pick elements to filter by level")
-elements = [doc.GetElement(ref) for ref in picked_refs]
+_selection_index = []
+
+
+def selection_index():
+    """Level index of the selected elements, built once (one pass, dict lookups after)."""
+    if not _selection_index:
+        elements = [doc.GetElement(i) for i in selected_ids]
+        _selection_index.append(build_level_index(doc, elements))
+    return _selection_index[0]
 
-# Build unique list of level names from selected elements
-level_dict = {}  # key = level name, value = placeholder (we don't need ElementId here)
-for elem in elements:
-    lvl_name = get_element_level_name(elem)
-    if lvl_name:
-        level_dict[lvl_name] = None
 
-sorted_levels = sorted(level_dict.keys())  # for display in ComboBox
-    
+def level_names_for(mode):
+    if mode == MODE_SELECTION:
+        return selection_index().level_names()
+    return [lvl.Name for lvl in all_levels]
+
+
+def ids_on_level(mode, level_name):
+    """Element ids on the level; view/model modes run native collector filters."""
+    if mode == MODE_SELECTION:
+        return selection_index().ids(level_name)
+    scope = ACTIVE_VIEW if mode == MODE_VIEW else MODEL
+    return collect_on_level(doc, levels_by_name[level_name], scope, levels=all_levels)[0]
+
 
 # ----------------------------
 # STEP 2 – UI Form for filtering
@@ -130,22 +119,29 @@ class LevelFilterForm(Form):
 
         # ComboBox label
         lbl = Label()
-        lbl.Text = "Select a level:"
+        lbl.Text = "Select a scope and a level:"
         lbl.Location = Point(30, 80)
         lbl.AutoSize = True
         self.Controls.Add(lbl)
 
+        # Dropdown of scopes
+        self.mode_combo = ComboBox()
+        self.mode_combo.Location = Point(30, 110)
+        self.mode_combo.Size = Size(150, 30)
+        self.mode_combo.DropDownStyle = ComboBoxStyle.DropDownList
+        self.mode_combo.Items.AddRange(Array[String](modes))
+        self.Controls.Add(self.mode_combo)
+
         # Dropdown of levels
         self.level_combo = ComboBox()
-        self.level_combo.Location = Point(30, 110)
-        self.level_combo.Size = Size(320, 30)
+        self.level_combo.Location = Point(190, 110)
+        self.level_combo.Size = Size(160, 30)
         self.level_combo.DropDownStyle = ComboBoxStyle.DropDownList
-        self.level_combo.Items.AddRange(Array[String](sorted_levels))
-
-        if self.level_combo.Items.Count > 0:
-            self.level_combo.SelectedIndex = 0
         self.Controls.Add(self.level_combo)
 
+        self.mode_combo.SelectedIndexChanged += self.fill_levels
+        self.mode_combo.SelectedIndex = 0
+
         # Filter Button
         filter_btn = Button()
         filter_btn.Text = "Filter"
@@ -184,25 +180,38 @@ class LevelFilterForm(Form):
     # Method: apply_filter
     # ---------------------------------------
     def apply_filter(self, sender, event):
-        # Get level selected by user
+        # Get scope and level selected by user
+        mode = self.mode_combo.SelectedItem
         target_level_name = self.level_combo.SelectedItem
-
-        # Filter elements based on level name (flexible to source)
-        self.filtered_elements = [
-            e for e in elements
-            if get_element_level_name(e) == target_level_name
-        ]
-
-        # Update result list
+        if target_level_name is None:
+            return
+
+        # Elements on that level (Reference / Schedule Level included)
+        filtered_ids = ids_on_level(mode, target_level_name)
+        self.filtered_elements = [doc.GetElement(i) for i in filtered_ids[:MAX_LIST_ROWS]]
+
+        # Update result list in one batch instead of one repaint per row
+        rows = ["ID {} – {}".format(elem.Id, elem.Name if hasattr(elem, "Name") else
+                                    elem.GetType().Name) for elem in self.filtered_elements]
+        if len(filtered_ids) > MAX_LIST_ROWS:
+            rows.append("… and {} more".format(len(filtered_ids) - MAX_LIST_ROWS))
+        self.result_list.BeginUpdate()
         self.result_list.Items.Clear()
-        for elem in self.filtered_elements:
-            name = elem.Name if hasattr(elem, "Name") else elem.GetType().Name
-            self.result_list.Items.Add("ID {} – {}".format(elem.Id, name))
+        self.result_list.Items.AddRange(Array[String](rows))
+        self.result_list.EndUpdate()
 
         # Highlight filtered elements in Revit
-        if self.filtered_elements:
-            elem_ids = List[ElementId]([e.Id for e in self.filtered_elements])
-            uidoc.Selection.SetElementIds(elem_ids)
+        if filtered_ids:
+            uidoc.Selection.SetElementIds(List[ElementId](filtered_ids))
+
+    # ---------------------------------------
+    # Method: fill_levels
+    # ---------------------------------------
+    def fill_levels(self, sender, event):
+        self.level_combo.Items.Clear()
+        self.level_combo.Items.AddRange(Array[String](level_names_for(self.mode_combo.SelectedItem)))
+        if self.level_combo.Items.Count > 0:
+            self.level_combo.SelectedIndex = 0
 
     # ---------------------------------------
     # Method: close_form
@@ -3,10 +3,12 @@ __title__ = "Pick Revit Objects"
 __author__ = "Hani M Tartour"
 __highlight__ = "orange"
 __tooltip__ = "Pick multiple Revit elements and view their info in a ListView"
-__doc__ = """v1.1.0
+__doc__ = """v1.2.0
 ---------------------------------------
 Pick some Revit elements and view their details
 (ID, Name, Category, Level) in a scrollable table.
+Rows are filled as they scroll into view, so large
+picks open instantly.
 """
 
 import clr
@@ -21,18 +23,22 @@ from RevitServices.Persistence import DocumentManager
 
 from System.Windows.Forms import (
     Form, Label, Button, PictureBox, FormStartPosition, FormBorderStyle,
-    ListView, ColumnHeader, View, DockStyle
+    ListView, ListViewItem, ColumnHeader, View, DockStyle, SaveFileDialog, DialogResult
 )
 from System.Drawing import Point, Size, Font, FontStyle, Image
+from System import Array, String
 import os
 
+from ht_revit.rows import COLUMNS, ElementRows
+from ht_revit.snapshot import extract_snapshot
+
 # Revit API setup
 uidoc = __revit__.ActiveUIDocument
 doc = uidoc.Document
 
 # Pick multiple elements
 picked_refs = uidoc.Selection.PickObjects(ObjectType.Element, "Pick some elements")
-elements = [doc.GetElement(ref) for ref in picked_refs]
+rows = ElementRows(doc, picked_refs)  # rows are read from Revit when first shown
 
 # ----------------------------
 # Windows Form with ListView
@@ -79,36 +85,63 @@ class PickedElementsForm(Form):
         list_view.Location = Point(20, 100)
 
         # Define columns
-        columns = ["ID", "Name/Type", "Category", "Level"]
         widths = [80, 160, 140, 120]
-        for i, col in enumerate(columns):
+        for i, col in enumerate(COLUMNS):
             list_view.Columns.Add(col, widths[i])
 
-        # Populate list with element info
-        for elem in elements:
-            eid = str(elem.Id)
-            ename = elem.Name if hasattr(elem, "Name") else elem.GetType().Name
-            ecat = elem.Category.Name if elem.Category else "No Category"
-            level_name = "N/A"
-            if hasattr(elem, "LevelId") and elem.LevelId != ElementId.InvalidElementId:
-                level_elem = doc.GetElement(elem.LevelId)
-                if level_elem: level_name = level_elem.Name
-
-            item = list_view.Items.Add(eid)
-            item.SubItems.Add(ename)
-            item.SubItems.Add(ecat)
-            item.SubItems.Add(level_name)
+        # Virtual mode: the ListView asks for rows as they become visible
+        self.items = {}
+        list_view.VirtualMode = True
+        list_view.RetrieveVirtualItem += self.retrieve_item
+        list_view.CacheVirtualItems += self.cache_items
+        list_view.VirtualListSize = len(rows)
 
         self.Controls.Add(list_view)
 
+        # Export button
+        export_btn = Button()
+        export_btn.Text = "Export…"
+        export_btn.Size = Size(100, 30)
+        export_btn.Location = Point(140, 330)
+        export_btn.Click += self.export_rows
+        self.Controls.Add(export_btn)
+
         # Close button
         close_btn = Button()
         close_btn.Text = "Close"
         close_btn.Size = Size(100, 30)
-        close_btn.Location = Point(250, 330)
+        close_btn.Location = Point(360, 330)
         close_btn.Click += lambda s, e: self.Close()
         self.Controls.Add(close_btn)
 
+    # ---------------------------------------
+    # Virtual ListView callbacks
+    # ---------------------------------------
+    def cache_items(self, sender, event):
+        rows.prefetch(event.StartIndex, event.EndIndex)
+
+    def retrieve_item(self, sender, event):
+        item = self.items.get(event.ItemIndex)
+        if item is None:
+            item = self.items[event.ItemIndex] = ListViewItem(Array[String](rows.row(event.ItemIndex)))
+        event.Item = item
+
+    # ---------------------------------------
+    # Method: export_rows
+    # ---------------------------------------
+    def export_rows(self, sender, event):
+        dialog = SaveFileDialog()
+        dialog.Filter = "CSV (*.csv)|*.csv|JSON lines (*.jsonl)|*.jsonl"
+        dialog.FileName = "picked_elements.csv"
+        if dialog.ShowDialog() != DialogResult.OK:
+            return
+        snapshot = extract_snapshot(doc, picked_refs, rows.resolver)
+        order = snapshot.order_by("category", "name")
+        if dialog.FileName.lower().endswith(".jsonl"):
+            snapshot.write_jsonl(dialog.FileName, order)
+        else:
+            snapshot.write_csv(dialog.FileName, order)
+
 # Launch
 from System.Windows.Forms import Application
 Application.Run(PickedElementsForm())
@@ -29,6 +29,9 @@ from System.Drawing import Point, Size, Font, FontStyle, Color, Image
 import os
 import System
 
+from ht_revit.levels import LevelResolver
+from ht_revit.snapshot import element_fields
+
 
 # Revit doc refs
 uidoc = __revit__.ActiveUIDocument
@@ -41,16 +44,7 @@ picked_ref = uidoc.Selection.PickObject(ObjectType.Element, "Pick an element")
 element = doc.GetElement(picked_ref)
 
 # Extract info
-elem_id = str(element.Id)
-elem_name = element.Name if hasattr(element, "Name") else element.GetType().Name
-elem_cat = element.Category.Name if element.Category else "No Category"
-level_name = "N/A"
-
-# Try get Level if hosted
-if hasattr(element, "LevelId") and element.LevelId != ElementId.InvalidElementId:
-    level_elem = doc.GetElement(element.LevelId)
-    if level_elem:
-        level_name = level_elem.Name
+elem_id, elem_name, elem_cat, level_name = element_fields(element, LevelResolver(doc))
 
 
 # ----------------------------
@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 __title__ = "Window Selection"
-__doc__ = """v1.0.0
+__doc__ = """v1.1.0
 --------------------------
 Description:
-This Python script is intended to select some elements 
-from the project
+Profile the current selection: how many elements per
+category, type, level and workset, in one pass.
+Very large selections are sampled and every count
+shows its ± error (95%).
 --------------------------
 Author: Hani M Tartour
 """
@@ -14,20 +16,34 @@ import clr
 clr.AddReference('RevitAPI')
 from Autodesk.Revit.DB import *
 
-# Revit UI (for selection, if needed)
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
+from pyrevit import script
+from ht_revit.summary import summarise_selection, summary_table
 
 # Revit Document Setup (pyrevit style) : Current document reference
 uidoc = __revit__.ActiveUIDocument
 doc = uidoc.Document
+output = script.get_output()
+
+MAX_TABLE_ROWS = 25
+TITLES = [("category", "Category"), ("type", "Type"), ("level", "Level"), ("workset", "Workset")]
+
 # ---------------------------------------------
-# 🚀 STEP 1: Get User Selection (assumes ModelCurves selected)
+# 🚀 STEP 1: Profile the user selection (ids streamed, no element list)
 # ---------------------------------------------
 selection_ids = uidoc.Selection.GetElementIds()
-selected_elements = [doc.GetElement(ele_id) for ele_id in selection_ids]
+summary = summarise_selection(doc, selection_ids)
 
 # ---------------------------------------------
 # ✅ Output Summary
 # ---------------------------------------------
-print("✅ Selected {} Elements.".format(len(selected_elements)))
\ No newline at end of file
+print("✅ Selected {} Elements.".format(summary.total))
+if not summary.exact:
+    print("📊 Counts estimated from {:,} sampled elements (± = 95% error bound).".format(
+        summary.sampled))
+
+columns = ["Value", "Count", "Share"] + ([] if summary.exact else ["±"])
+for name, title in TITLES:
+    if summary.counts[name]:
+        output.print_table(table_data=summary_table(summary, name, MAX_TABLE_ROWS),
+                           title="{} ({})".format(title, len(summary.counts[name])),
+                           columns=columns)
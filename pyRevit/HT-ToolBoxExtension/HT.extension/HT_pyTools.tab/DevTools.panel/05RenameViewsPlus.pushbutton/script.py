@@ -1,15 +1,21 @@
 # -*- coding: utf-8 -*-
 __title__ = "Rename Views+"
-__doc__ = """Safely rename Revit views with Find/Replace, Prefix, Suffix.
-Includes preview grid, duplicate checking, and cancel/back options.
-Author: Hani M Tartour | Version: 1.2 | Date: 2025-06-26
+__doc__ = """Safely rename Revit views with Find/Replace (text or regex), Prefix, Suffix
+and name templates with tokens: {Name} {ViewType} {Level} {Scale} {Sheet}
+{SheetName} {Template} {Id} and counters {#}, {#:3}, {#:3:10}.
+The preview grid updates as you type, with duplicate checking.
+Swaps and chains (A -> B, B -> C) are planned as a whole and run in one transaction.
+Author: Hani M Tartour | Version: 1.4 | Date: 2025-06-26
 """
 
 # ================================
 # Revit & pyRevit Imports
 # ================================
 from Autodesk.Revit.DB import *
-from pyrevit import revit, forms
+from pyrevit import revit, forms, script
+
+from ht_revit.rename import (DUPLICATE, INVALID_NAME, UNCHANGED, NameTemplate, RenamePreview,
+                             TemplateError, execute_plan, existing_view_names)
 
 # ================================
 # .NET & Windows Forms Imports
@@ -19,46 +25,90 @@ clr.AddReference("System")
 clr.AddReference("System.Windows.Forms")
 clr.AddReference("System.Drawing")
 
-from System.Collections.Generic import List
 from System.Drawing import Size, Point, Font, Color
 from System.Windows.Forms import (
-    Form, Label, Button, DialogResult, FormStartPosition,
+    Form, Label, Button, DialogResult, FormStartPosition, TextBox, Timer,
     CheckBox, DataGridView, DataGridViewAutoSizeColumnsMode, AnchorStyles
 )
 
-# Optional - for FlexForm rename input UI
-from rpw.ui.forms import FlexForm, Label as FLabel, TextBox as FTextBox, Separator, Button as FButton
-
 # ================================
 # Revit Document Setup
 # ================================
 uidoc = __revit__.ActiveUIDocument
 doc = uidoc.Document
 
+PREVIEW_DELAY_MS = 300  # wait for a pause in typing before re-rendering
+
+
+def preview_status(status, blocked_by, in_cycle):
+    if status == DUPLICATE:
+        return "⚠ Duplicate! (kept by '{}')".format(blocked_by)
+    if status == INVALID_NAME:
+        return "⚠ Invalid name"
+    if status == UNCHANGED:
+        return "= Unchanged"
+    return "🔁 Swap / cycle" if in_cycle else ""
+
+
 # ================================
-# Preview Rename Grid Form
+# Rename Form: inputs + live preview grid
 # ================================
-class PreviewRenameGridForm(Form):
-    def __init__(self, rows):
-        self.Text = "Preview Rename Grid"
-        self.MinimumSize = Size(950, 600)
-        self.Size = Size(950, 600)
+class RenameViewsForm(Form):
+    def __init__(self, preview):
+        self.Text = "Rename Views+"
+        self.MinimumSize = Size(950, 650)
+        self.Size = Size(950, 650)
         self.StartPosition = FormStartPosition.CenterScreen
-        self.original_rows = rows
+        self.preview = preview
+        self.result = None
+
+        # Inputs
+        self.inputs = {}
+        fields = [("find", "Find:", 10, 10), ("replace", "Replace:", 320, 10),
+                  ("prefix", "Prefix:", 10, 45), ("suffix", "Suffix:", 320, 45),
+                  ("template", "Template:", 10, 80)]
+        for key, caption, x, y in fields:
+            label = Label()
+            label.Text = caption
+            label.Location = Point(x, y + 3)
+            label.Width = 65
+            self.Controls.Add(label)
+            box = TextBox()
+            box.Location = Point(x + 70, y)
+            box.Width = 530 if key == "template" else 220
+            box.TextChanged += self.schedule_preview
+            self.Controls.Add(box)
+            self.inputs[key] = box
+        self.inputs["template"].Text = "{Name}"
+
+        self.regex_checkbox = CheckBox()
+        self.regex_checkbox.Text = "Regex"
+        self.regex_checkbox.Location = Point(620, 10)
+        self.regex_checkbox.Width = 80
+        self.regex_checkbox.CheckedChanged += self.schedule_preview
+        self.Controls.Add(self.regex_checkbox)
+
+        tokens = Label()
+        tokens.Text = "{Name} {ViewType} {Level} {Scale} {Sheet} {SheetName} {Template} {Id} {#:3}"
+        tokens.Font = Font("Segoe UI", 8)
+        tokens.ForeColor = Color.Gray
+        tokens.Location = Point(80, 105)
+        tokens.AutoSize = True
+        self.Controls.Add(tokens)
 
         # Show Duplicates Checkbox
         self.dup_checkbox = CheckBox()
         self.dup_checkbox.Text = "Show only duplicates"
-        self.dup_checkbox.Location = Point(10, 15)
+        self.dup_checkbox.Location = Point(10, 125)
         self.dup_checkbox.Width = 180
         self.dup_checkbox.Anchor = AnchorStyles.Top | AnchorStyles.Left
         self.dup_checkbox.CheckedChanged += self.toggle_duplicates
         self.Controls.Add(self.dup_checkbox)
 
-        # DataGridView
+        # DataGridView: one row per view, created once and updated in place
         self.grid = DataGridView()
-        self.grid.Location = Point(10, 50)
-        self.grid.Size = Size(910, 440)
+        self.grid.Location = Point(10, 155)
+        self.grid.Size = Size(910, 390)
         self.grid.Anchor = AnchorStyles.Top | AnchorStyles.Bottom | AnchorStyles.Left | AnchorStyles.Right
         self.grid.ReadOnly = True
         self.grid.AllowUserToAddRows = False
@@ -68,8 +118,15 @@ class PreviewRenameGridForm(Form):
         self.grid.Columns[0].Name = "Original View Name"
         self.grid.Columns[1].Name = "Proposed View Name"
         self.grid.Columns[2].Name = "Status"
+        for view in preview.views:
+            self.grid.Rows.Add(view.Name, view.Name, "")
         self.Controls.Add(self.grid)
 
+        self.status_label = Label()
+        self.status_label.Anchor = AnchorStyles.Bottom | AnchorStyles.Left
+        self.status_label.AutoSize = True
+        self.Controls.Add(self.status_label)
+
         # Buttons
         self.rename_btn = Button()
         self.rename_btn.Text = "Rename"
@@ -78,13 +135,6 @@ class PreviewRenameGridForm(Form):
         self.rename_btn.Click += self.on_rename
         self.Controls.Add(self.rename_btn)
 
-        self.back_btn = Button()
-        self.back_btn.Text = "Back"
-        self.back_btn.Size = Size(100, 30)
-        self.back_btn.Anchor = AnchorStyles.Bottom | AnchorStyles.Right
-        self.back_btn.Click += self.on_back
-        self.Controls.Add(self.back_btn)
-
         self.cancel_btn = Button()
         self.cancel_btn.Text = "Cancel"
         self.cancel_btn.Size = Size(100, 30)
@@ -95,42 +145,74 @@ class PreviewRenameGridForm(Form):
         # Layout buttons relative to form
         self.Layout += self.position_buttons
 
-        self.result = None
-        self.load_rows(self.original_rows)
+        # Debounce: every edit restarts the timer, the preview runs on Tick
+        self.timer = Timer()
+        self.timer.Interval = PREVIEW_DELAY_MS
+        self.timer.Tick += self.refresh_preview
+
+        self.refresh_preview(None, None)
 
     def position_buttons(self, sender, args):
         btn_spacing = 110
         btn_y = self.ClientSize.Height - 45
-        base_x = self.ClientSize.Width - (btn_spacing * 3) - 20
+        base_x = self.ClientSize.Width - (btn_spacing * 2) - 20
 
+        self.status_label.Location = Point(10, btn_y + 8)
         self.cancel_btn.Location = Point(base_x, btn_y)
-        self.back_btn.Location = Point(base_x + btn_spacing, btn_y)
-        self.rename_btn.Location = Point(base_x + (btn_spacing * 2), btn_y)
-
-    def load_rows(self, rows):
-        self.grid.Rows.Clear()
-        for old_name, new_name, is_duplicate in rows:
-            row_index = self.grid.Rows.Add(old_name, new_name, "⚠ Duplicate!" if is_duplicate else "")
-            if is_duplicate:
-                self.grid.Rows[row_index].DefaultCellStyle.ForeColor = Color.Red
+        self.rename_btn.Location = Point(base_x + btn_spacing, btn_y)
+
+    def schedule_preview(self, sender, args):
+        self.timer.Stop()
+        self.timer.Start()
+
+    def refresh_preview(self, sender, args):
+        self.timer.Stop()
+        try:
+            template = NameTemplate(find=self.inputs["find"].Text,
+                                    replace=self.inputs["replace"].Text,
+                                    prefix=self.inputs["prefix"].Text,
+                                    suffix=self.inputs["suffix"].Text,
+                                    template=self.inputs["template"].Text,
+                                    regex=self.regex_checkbox.Checked)
+            changed = self.preview.update(template)
+        except TemplateError as e:
+            self.status_label.Text = "⚠ {}".format(e)
+            self.status_label.ForeColor = Color.Red
+            self.rename_btn.Enabled = False
+            return
+        self.update_rows(changed)
+        plan = self.preview.plan
+        self.status_label.Text = "{} to rename, {} skipped, {} swap/cycle group(s)".format(
+            len(plan.accepted()), len(plan.skipped()), plan.cycles)
+        self.status_label.ForeColor = Color.Black
+        self.rename_btn.Enabled = bool(plan.steps)
+
+    def update_rows(self, positions):
+        # Only rows whose proposal or status changed are touched
+        only_problems = self.dup_checkbox.Checked
+        for position in positions:
+            old_name, new_name, status, blocked_by, in_cycle = self.preview.rows[position]
+            row = self.grid.Rows[position]
+            row.Cells[1].Value = new_name
+            row.Cells[2].Value = preview_status(status, blocked_by, in_cycle)
+            is_problem = status in (DUPLICATE, INVALID_NAME)
+            row.DefaultCellStyle.ForeColor = Color.Red if is_problem else Color.Black
+            if only_problems:
+                row.Visible = is_problem
 
     def toggle_duplicates(self, sender, args):
-        if self.dup_checkbox.Checked:
-            filtered = [row for row in self.original_rows if row[2]]  # Only duplicates
-        else:
-            filtered = self.original_rows
-        self.load_rows(filtered)
+        only_problems = self.dup_checkbox.Checked
+        for position, (_, _, status, _, _) in enumerate(self.preview.rows):
+            self.grid.Rows[position].Visible = not only_problems or status in (DUPLICATE, INVALID_NAME)
 
     def on_rename(self, sender, args):
+        self.refresh_preview(None, None)  # a pending edit must not be skipped
+        if not self.rename_btn.Enabled:
+            return
         self.result = "rename"
         self.DialogResult = DialogResult.OK
         self.Close()
 
-    def on_back(self, sender, args):
-        self.result = "back"
-        self.DialogResult = DialogResult.Retry
-        self.Close()
-
     def on_cancel(self, sender, args):
         self.result = "cancel"
         self.DialogResult = DialogResult.Cancel
@@ -155,82 +237,24 @@ if not selected_views:
     script.exit()
 
 # ================================
-# Rename + Preview Loop
+# Step 2: Rename Form with live preview
 # ================================
-all_views = FilteredElementCollector(doc).OfClass(View).ToElements()
-existing_names = set(v.Name for v in all_views if not v.IsTemplate)
-
-while True:
-    components = [
-        FLabel('Find:'),       FTextBox('find'),
-        FLabel('Replace:'),    FTextBox('replace'),
-        FLabel('Prefix:'),     FTextBox('prefix'),
-        FLabel('Suffix:'),     FTextBox('suffix'),
-        Separator(),           FButton('Preview & Rename')
-    ]
-    form = FlexForm('Rename Views+', components)
-    form.show()
-
-    user_input = form.values
-    if not user_input:
-        forms.alert("❌ Rename cancelled by user.", title="Cancelled")
-        script.exit()
+# View names and token values are read once for the whole session
+preview = RenamePreview(doc, selected_views, existing_view_names(doc))
+rename_form = RenameViewsForm(preview)
+rename_form.ShowDialog()
 
-    prefix  = user_input.get("prefix", "").strip()
-    find    = user_input.get("find", "").strip()
-    replace = user_input.get("replace", "").strip()
-    suffix  = user_input.get("suffix", "").strip()
-
-    rows = []
-    renamable_views = []
-    temp_name_check = set(existing_names)
-
-    for view in selected_views:
-        original_name = view.Name
-        new_name = original_name.replace(find, replace) if find else original_name
-        new_name = prefix + new_name + suffix
-
-        is_duplicate = new_name in temp_name_check and new_name != original_name
-        if not is_duplicate:
-            temp_name_check.add(new_name)
-            renamable_views.append((view, new_name))
-        rows.append((original_name, new_name, is_duplicate))
-
-    preview_form = PreviewRenameGridForm(rows)
-    result = preview_form.ShowDialog()
-
-    if preview_form.result == "rename":
-        break
-    elif preview_form.result == "cancel":
-        forms.alert("🚫 Rename operation cancelled by user.", title="Cancelled")
-        script.exit()
-    else:
-        continue  # back to form
+if rename_form.result != "rename":
+    forms.alert("🚫 Rename operation cancelled by user.", title="Cancelled")
+    script.exit()
 
 # ================================
 # Final Rename Execution
 # ================================
-t = Transaction(doc, "Rename Views")
-t.Start()
-
-renamed_count = 0
-skipped_count = 0
-
-for view, new_name in renamable_views:
-    try:
-        if new_name in existing_names:
-            skipped_count += 1
-            continue
-        view.Name = new_name
-        existing_names.add(new_name)
-        renamed_count += 1
-    except Exception as e:
-        print("⚠ Error renaming '{}': {}".format(view.Name, str(e)))
-        skipped_count += 1
-
-t.Commit()
-
-forms.alert("✅ Renamed {} views.\n⚠ Skipped {} duplicate(s).".format(renamed_count, skipped_count), title="Done")
-
+result = execute_plan(doc, preview.plan, "Rename Views")
+if result.error is not None:
+    forms.alert("⚠ Error renaming '{}': {}\nNo view was renamed.".format(
+        result.failed_view, result.error), title="Rolled back")
+    script.exit()
 
-#
\ No newline at end of file
+forms.alert("✅ Renamed {} views.\n⚠ Skipped {} duplicate(s).".format(result.renamed, result.skipped), title="Done")
@@ -16,26 +16,15 @@ Author: Hani M Tartour
 # ----------------------------------------------------------
 # IMPORTS
 # ----------------------------------------------------------
-import os
-import sys
 from pyrevit import forms
 
-# ----------------------------------------------------------
-# LOAD CORE MODULE (CloneBuddyCore.py)
-# ----------------------------------------------------------
-# This assumes CloneBuddyCore.py is two levels up, under core script folder
-core_path = os.path.abspath(os.path.join(__file__, "..", "..", "CloneBuddyCore.py"))
-core_dir = os.path.dirname(core_path)
-
-if core_dir not in sys.path:
-    sys.path.append(core_dir)
-
+# clonebuddy lives in the extension's lib/ folder, which pyRevit puts on sys.path
 try:
-    from CloneBuddyCore import run_clonebuddy_workflow
+    from clonebuddy.workflow import run_clonebuddy_workflow
 except ImportError as e:
     forms.alert(
         title="CloneBuddy",
-        msg="❌ Failed to load CloneBuddyCore.\n\nError:\n{}".format(str(e)),
+        msg="❌ Failed to load clonebuddy.\n\nError:\n{}".format(str(e)),
         warn_icon=True
     )
     raise
@@ -54,8 +43,13 @@ repo_url = forms.ask_for_string(
 # ----------------------------------------------------------
 if repo_url:
     try:
-        run_clonebuddy_workflow(repo_url)
-        forms.alert("✅ Clone complete.\nCheck your extensions folder.", title="CloneBuddy")
+        path, issues = run_clonebuddy_workflow(repo_url)
+        if not path:
+            forms.alert("❌ Clone failed:\n{}".format("\n".join(issues)), title="CloneBuddy", warn_icon=True)
+        elif issues:
+            forms.alert("⚠ Cloned with unresolved issues:\n{}".format("\n".join(issues)), title="CloneBuddy")
+        else:
+            forms.alert("✅ Clone complete.\nCheck your extensions folder.", title="CloneBuddy")
     except Exception as ex:
         forms.alert(
             title="CloneBuddy - Error",
@@ -10,15 +10,13 @@ Refreshes the pyRevit ribbon by:
 """
 
 import os
-import subprocess
 from pyrevit import forms
 
-# ---------------------
-# Configuration
-# ---------------------
-EXT_FOLDER = os.path.expanduser("~\\CloneBuddyExtensions")
-PYREVIT_CLI = "pyrevit"
-REPO_SUFFIX = ".extension"
+from clonebuddy.catalog import get_local_extensions
+from clonebuddy.config import DEFAULT_CLONE_DIR as EXT_FOLDER
+from clonebuddy.registry import (
+    get_loaded_extension_paths, is_registered, register_extension, reload_pyrevit
+)
 
 # ---------------------
 # Log helper
@@ -26,50 +24,6 @@ REPO_SUFFIX = ".extension"
 def log(msg):
     print("[RefreshExtensions] " + str(msg))
 
-# ---------------------
-# Load pyRevit env output
-# ---------------------
-def get_loaded_extension_paths():
-    try:
-        proc = subprocess.Popen([PYREVIT_CLI, "env"],
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE)
-        stdout, _ = proc.communicate()
-        return os.path.normcase(stdout.decode("utf-8", errors="ignore"))
-    except Exception as e:
-        log("❌ Failed to get pyRevit env: {}".format(e))
-        return ""
-
-# ---------------------
-# Get .extension folders in the local directory
-# ---------------------
-def get_local_extensions():
-    if not os.path.exists(EXT_FOLDER):
-        return []
-    return [name for name in os.listdir(EXT_FOLDER)
-            if name.endswith(REPO_SUFFIX)
-            and os.path.isdir(os.path.join(EXT_FOLDER, name))]
-
-# ---------------------
-# Register extension
-# ---------------------
-def register_extension(ext_path):
-    try:
-        subprocess.call([PYREVIT_CLI, "extend", "extensions", ext_path])
-        log("📌 Registered: {}".format(ext_path))
-    except Exception as e:
-        log("❌ Failed to register extension: {}".format(e))
-
-# ---------------------
-# Reload pyRevit
-# ---------------------
-def reload_pyrevit():
-    try:
-        subprocess.call([PYREVIT_CLI, "reload"])
-        log("🔁 pyRevit reloaded.")
-    except Exception as e:
-        log("❌ pyRevit reload failed: {}".format(e))
-
 # ---------------------
 # Main Logic
 # ---------------------
@@ -87,7 +41,7 @@ def refresh_extensions():
 
     for ext in local:
         ext_path = os.path.normpath(os.path.join(EXT_FOLDER, ext))
-        if ext_path.lower() not in env_output:
+        if not is_registered(ext_path, env_output):
             missing.append(ext_path)
 
     if not missing:
@@ -3,71 +3,48 @@ __title__ = "Check Extensions"
 __doc__ = """Scan and report all extensions in CloneBuddyExtensions folder."""
 
 import os
-import json
-import subprocess
 from pyrevit import forms
 
-# === SETTINGS ===
-EXT_DIR = r"C:\Users\HaniTartour\CloneBuddyExtensions"
-PYREVIT_CLI = "pyrevit"
+from clonebuddy.config import DEFAULT_CLONE_DIR as EXT_DIR
+from clonebuddy.registry import get_loaded_extension_paths
+from clonebuddy.rules import ERROR
+from clonebuddy.validate import validate_extensions
 
 # === UTILS ===
 def log(msg):
     print("[CheckExtensions] " + msg)
 
-def get_loaded_extensions():
-    """Use pyrevit env CLI to detect loaded extensions."""
-    try:
-        result = subprocess.Popen([PYREVIT_CLI, "env"], stdout=subprocess.PIPE)
-        stdout, _ = result.communicate()
-        output = stdout.decode("utf-8")
-        return output.lower()
-    except:
-        return ""
-
-def analyze_extension_folder(path):
-    """Check validity of a single .extension folder."""
-    issues = []
-    folder = os.path.basename(path)
-
-    if not folder.endswith(".extension"):
-        issues.append("❌ Name must end with '.extension'")
-
-    ext_json = os.path.join(path, "extension.json")
-    if not os.path.isfile(ext_json):
-        issues.append("❌ Missing extension.json")
-    else:
-        try:
-            with open(ext_json) as f:
-                data = json.load(f)
-            if "name" not in data:
-                issues.append("❌ extension.json missing 'name'")
-        except Exception as e:
-            issues.append("❌ Invalid extension.json: {}".format(e))
-
-    return issues
-
 # === MAIN ===
-loaded_env = get_loaded_extensions()
-report = []
-
 if not os.path.exists(EXT_DIR):
     forms.alert("CloneBuddyExtensions folder not found!", title="Error")
     raise Exception("Extension folder missing.")
 
-for folder in os.listdir(EXT_DIR):
-    full_path = os.path.join(EXT_DIR, folder)
-    if not os.path.isdir(full_path):
-        continue
+loaded_env = get_loaded_extension_paths()
+# Every folder, not only *.extension ones: the folder-name rule reports the others
+paths = [os.path.join(EXT_DIR, name) for name in sorted(os.listdir(EXT_DIR))
+         if os.path.isdir(os.path.join(EXT_DIR, name))]
 
-    issues = analyze_extension_folder(full_path)
+# One pass over every extension: all rules run in parallel on a shared model
+validation = validate_extensions(paths)
+report = []
+
+for result in validation.results:
+    folder = result.model.folder_name
     is_loaded = folder.lower() in loaded_env
     status = "✅ Loaded" if is_loaded else "🚫 Not Loaded"
-    if issues:
-        status += " + Errors: " + ", ".join(issues)
+    errors = [str(f) for f in result.findings if f.severity == ERROR]
+    warnings = [f for f in result.findings if f.severity != ERROR]
+    if errors:
+        status += " + Errors: " + ", ".join(errors)
+    if warnings:
+        status += " + {} warning(s)".format(len(warnings))
+    for item in result.findings:
+        log("{} {} [{}] -> {}".format(folder, item, item.rule, item.fix_hint))
 
     report.append("[{}] {}".format(folder, status))
 
+log("Checked {} extension(s) in {:.2f}s".format(len(validation.results), validation.duration))
+
 # === SHOW RESULTS ===
 if report:
     forms.alert("\n".join(report), title="CloneBuddy Extension Check")
@@ -3,30 +3,11 @@ __title__ = "Validate Extension JSON"
 __doc__ = "Checks all .extension folders for valid extension.json files and offers to fix broken/missing ones."
 
 import os
-import json
 from pyrevit import forms
 
-# ------------------------------------------
-# Config
-# ------------------------------------------
-EXTENSION_SCAN_PATH = os.path.expanduser("~\\CloneBuddyExtensions")
-REPO_SUFFIX = ".extension"
-
-# Custom template based on pyRevit sharing guide
-TEMPLATE_JSON = {
-    "builtin": "False",
-    "default_enabled": "True",
-    "type": "extension",
-    "rocket_mode_compatible": "False",
-    "name": "",  # will be set dynamically
-    "description": "Auto-generated extension.json by CloneBuddy",
-    "author": "",
-    "author_profile": "",
-    "url": "",
-    "website": "",
-    "image": "",
-    "dependencies": []
-}
+from clonebuddy.config import DEFAULT_CLONE_DIR as EXTENSION_SCAN_PATH, REPO_SUFFIX
+from clonebuddy.fix import create_json, repair_json
+from clonebuddy.schema import validate_manifest_files
 
 # ------------------------------------------
 # Logger
@@ -35,36 +16,6 @@ def log(msg):
     print("[CheckJson] " + str(msg))
 
 
-# ------------------------------------------
-# Validate single extension.json
-# ------------------------------------------
-def validate_json_file(json_path):
-    try:
-        with open(json_path, 'r') as f:
-            json.load(f)
-        return True
-    except Exception as e:
-        return False
-
-
-# ------------------------------------------
-# Auto-create extension.json if needed
-# ------------------------------------------
-def create_json(path, ext_name):
-    template = TEMPLATE_JSON.copy()
-    template["name"] = ext_name.replace(REPO_SUFFIX, "")
-    json_path = os.path.join(path, "extension.json")
-
-    try:
-        with open(json_path, "w") as f:
-            json.dump(template, f, indent=4)
-        log("✅ Created extension.json at {}".format(json_path))
-        return True
-    except Exception as e:
-        log("❌ Failed to write JSON: {}".format(e))
-        return False
-
-
 # ------------------------------------------
 # Main workflow
 # ------------------------------------------
@@ -84,20 +35,20 @@ def run_check_json_workflow():
     valid = []
     broken = []
 
-    for folder in folders:
-        full_path = os.path.join(EXTENSION_SCAN_PATH, folder)
-        json_path = os.path.join(full_path, "extension.json")
+    # Schema-check every extension.json in one bulk pass (clonebuddy.schema)
+    paths = [os.path.join(EXTENSION_SCAN_PATH, folder) for folder in folders]
+    checked = validate_manifest_files(paths)
 
-        if os.path.isfile(json_path):
-            if validate_json_file(json_path):
-                valid.append(folder)
-                log("✅ Valid: " + folder)
-            else:
-                broken.append((folder, full_path))
-                log("⚠ Invalid JSON: " + folder)
+    for folder, full_path in zip(folders, paths):
+        errors = [e for e in checked[full_path] if e.severity == "error"]
+        if not errors:
+            valid.append(folder)
+            log("✅ Valid: " + folder)
         else:
             broken.append((folder, full_path))
-            log("⚠ Missing JSON: " + folder)
+            log("⚠ {}:".format(folder))
+            for error in errors:
+                log("    {}".format(error))
 
     # Report summary
     summary = "Valid: {}\nBroken or Missing: {}".format(len(valid), len(broken))
@@ -108,15 +59,21 @@ def run_check_json_workflow():
         return
 
     # Ask to fix
-    fix = forms.alert("Found {} extension(s) with missing/invalid extension.json.\n\nDo you want to auto-generate valid ones?".format(len(broken)),
+    fix = forms.alert("Found {} extension(s) with missing/invalid extension.json.\n\nDo you want to regenerate them from the schema template?".format(len(broken)),
                       title="CheckJson",
                       options=["Yes", "No"])
 
     if fix == "Yes":
         for folder, path in broken:
-            success = create_json(path, folder)
+            # Keep the valid parts of an existing file; generate a missing one
+            if os.path.isfile(os.path.join(path, "extension.json")):
+                success = repair_json(path, folder)
+            else:
+                success = create_json(path, folder)
             if success:
                 log("🛠 Fixed: " + folder)
+            else:
+                log("⚠ Not fixed (see above): " + folder)
         forms.alert("Auto-fix complete.\n\nYou may now reload pyRevit to see updated extensions.", title="CheckJson")
 
 
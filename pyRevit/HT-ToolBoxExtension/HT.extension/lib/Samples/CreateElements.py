@@ -152,6 +152,15 @@ list_boundaries.Add(boundary)
 # CREATE FILLED REGION
 region = FilledRegion.Create(doc, region_type_id, active_view.Id, list_boundaries)
 
+#💡 Thousands of them from survey / CSV rows? Chunked transactions, names resolved once (ht_revit.creation)
+from ht_revit.creation import FEET_PER_METRE, create_elements
+from ht_revit.exchange import read_records
+rows   = read_records(r"C:\temp\survey.csv")      # kind,x0,y0,x1,y1,x,y,points,level,type,view,text
+report = create_elements(doc, rows, scale=FEET_PER_METRE, level=active_level, view=active_view)
+print(report.summary())
+for failure in report.failed:
+    print('Row {}: {}'.format(failure.item, failure.error))
+
 # ╔═╗╔═╗╔═╗╦ ╦  ╦ ╦╦╔╦╗╦ ╦  ╦  ╦╔═╗╔═╗╔╦╗╔═╗╦═╗
 # ║  ║ ║╠═╝╚╦╝  ║║║║ ║ ╠═╣  ╚╗╔╝║╣ ║   ║ ║ ║╠╦╝
 # ╚═╝╚═╝╩   ╩   ╚╩╝╩ ╩ ╩ ╩   ╚╝ ╚═╝╚═╝ ╩ ╚═╝╩╚═ COPY WITH VECTOR
@@ -69,6 +69,15 @@ all_floor_types = FilteredElementCollector(doc).OfClass(Floor).ToElements()  #Cl
 all_ceil_types  = FilteredElementCollector(doc).OfClass(CeilingType).ToElements()  #Class of Wall/WallType alread
 #...
 
+#💡 Same collectors again on every run? Memoise them for the session (ht_revit.querycache)
+# Entries are dropped only when an element of their categories/classes changes.
+from ht_revit.querycache import get_query_cache
+query_cache     = get_query_cache(doc)
+all_levels      = query_cache.collect(element_class=Level, types=None)
+all_door_types  = query_cache.collect(BuiltInCategory.OST_Doors, types=True)
+all_sheet_ids   = query_cache.collect(BuiltInCategory.OST_Sheets, ids=True)
+print(query_cache.summary())                                   # hits, misses, time saved
+
 
 # ╔╦╗╔═╗╦═╗╔═╗  ╔═╗╔═╗╔╦╗╔═╗╦  ╔═╗╔═╗
 # ║║║║ ║╠╦╝║╣   ╚═╗╠═╣║║║╠═╝║  ║╣ ╚═╗
@@ -89,6 +98,15 @@ all_grids        = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_
 all_text_notes   = FilteredElementCollector(doc).OfClass(TextNote).ToElements()
 all_spot_elev    = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_SpotElevations).WhereElementIsNotElementType().ToElements()
 
+#💡 Need many of these lists at once (audits)? One collector pass fills them all (ht_revit.categories)
+from ht_revit.categories import categorise, AUDIT_CATEGORIES
+buckets          = categorise(doc, AUDIT_CATEGORIES)     # or categorise(doc) for every category
+all_doors        = buckets.elements(BuiltInCategory.OST_Doors)
+all_door_types   = buckets.elements(BuiltInCategory.OST_Doors, types=True)
+all_wall_ids     = buckets.ids(BuiltInCategory.OST_Walls)           # List of ElementIds
+all_symbol_ids   = buckets.of_class(FamilySymbol)                    # in the scanned categories
+audit_rows       = buckets.rows()                                    # [(Category, Instances, Types)]
+
 
 # ╔═╗╔═╗╔═╗  ╦  ╦╦╔═╗╦ ╦╔═╗
 # ╠╣ ║╣ ║    ╚╗╔╝║║╣ ║║║╚═╗
@@ -111,6 +129,12 @@ all_3D_views    = [view for view in all_views if view.ViewType == ViewType.Three
 all_details     = [view for view in all_views if view.ViewType == ViewType.Detail]
 all_legends     = [view for view in all_views if view.ViewType == ViewType.Legend]
 
+#💡 Or take them from the session view index: grouped by ViewType / ViewFamily in one pass (ht_revit.viewindex)
+from ht_revit.viewindex import get_view_index
+view_index      = get_view_index(doc)
+all_sections    = view_index.elements(view_index.views(ViewType.Section))
+all_templates   = view_index.elements(view_index.templates())
+
 # GET VIEW TYPES
 view_types          = FilteredElementCollector(doc).OfClass(ViewFamilyType).ToElements()
 view_types_sections = [vt for vt in view_types if vt.ViewFamily == ViewFamily.Section]
@@ -278,6 +302,14 @@ invert_filter       = BoundingBoxIntersectsFilter(my_out_ln, True)  # inverted f
 collector           = FilteredElementCollector(doc)
 not_intersect_walls = collector.OfClass(Wall).WherePasses(invert_filter).ToElements()
 
+#💡 Thousands of box / point queries (clash checks)? Read the boxes once into a grid (ht_revit.spatial)
+from ht_revit.spatial import index_elements
+index        = index_elements(doc, FilteredElementCollector(doc).WhereElementIsNotElementType())
+hit_ids      = index.intersecting(my_out_ln)                     # int ids, like the filter above
+contain_ids  = index.containing(base_pnt)
+nearest      = index.nearest(base_pnt, k=5)                      # [(distance, id)]
+clashes      = index.intersecting_many([w.get_BoundingBox(None) for w in not_intersect_walls])
+
 
 # ╔═╗╦  ╔═╗╔╦╗╔═╗╔╗╔╔╦╗  ╔╦╗╦ ╦╦ ╔╦╗╦  ╔═╗╔═╗╔╦╗╔═╗╔═╗╔═╗╦═╗╦ ╦  ╔═╗╦╦ ╔╦╗╔═╗╦═╗
 # ║╣ ║  ║╣ ║║║║╣ ║║║ ║   ║║║║ ║║  ║ ║  ║  ╠═╣ ║ ║╣ ║ ╦║ ║╠╦╝╚╦╝  ╠╣ ║║  ║ ║╣ ╠╦╝
@@ -386,6 +418,14 @@ List_el_ids = List[ElementId](el_ids)
 
 uidoc.Selection.SetElementIds(List_el_ids)
 
+#💡 Same filters, declared in one line: quick filters first, then rules, then Python (ht_revit.elementquery)
+from ht_revit.elementquery import ElementQuery
+query = ElementQuery(doc).category(BuiltInCategory.OST_Walls).instances()\
+                         .where(BuiltInParameter.CURVE_ELEM_LENGTH, ">", 20.0)\
+                         .intersects(XYZ(0, 0, 0), XYZ(100, 100, 30))
+print(query.explain())                                           # the plan, in order
+uidoc.Selection.SetElementIds(List[ElementId](query.ids()))
+
 
 # ╦ ╦╔═╗╔═╗╔═╗╦ ╦  ╔═╗╔═╗╔╦╗╦╔╗╔╔═╗  ||
 # ╠═╣╠═╣╠═╝╠═╝╚╦╝  ║  ║ ║ ║║║║║║║ ╦  ||
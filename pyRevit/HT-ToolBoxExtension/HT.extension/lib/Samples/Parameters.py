@@ -92,6 +92,35 @@ with Transaction(doc, __title__) as t:
 
     t.Commit()
 
+#--------------------------------------------------
+#🟠 Read / Write Parameters of Many Elements (ht_revit.params)
+# Each name is resolved once per element type (not LookupParameter per element),
+# type parameters are read once per type, values come back typed, one list per parameter.
+from ht_revit.params import ParameterReader, write_parameter
+
+element_ids = selection.GetElementIds()
+reader      = ParameterReader(doc, ['Comments', 'Mark', 'Type Mark', BuiltInParameter.ALL_MODEL_TYPE_NAME])
+columns     = reader.read(element_ids)       # {'Comments': [...], 'Mark': [...], ...}
+
+# Write one column inside a Transaction; elements without the parameter are skipped and reported
+with Transaction(doc, __title__) as t:
+    t.Start()
+    skipped = write_parameter(doc, element_ids, 'Mark', ['M-{}'.format(i) for i in range(len(element_ids))])
+    t.Commit()
+
+#--------------------------------------------------
+#🟠 Export / Import Parameters to CSV or JSON lines (ht_revit.exchange)
+# Rows are streamed a chunk at a time (memory stays flat on big models).
+# Import only Sets the cells that differ from the model, in chunked transactions (one undo item).
+# Edited type parameters (e.g. 'Type Name') are skipped and counted in report.type_cells.
+from ht_revit.exchange import export_parameters, import_parameters
+
+walls = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Walls).WhereElementIsNotElementType()
+n_rows = export_parameters(doc, walls, ['Mark', 'Comments', 'Length'], r'C:\temp\walls.csv')   # or .jsonl
+
+preview = import_parameters(doc, r'C:\temp\walls.csv', dry_run=True)    # preview.changes, preview.preview
+report  = import_parameters(doc, r'C:\temp\walls.csv')                  # report.changes, report.failed
+
 #--------------------------------------------------
 #🟠 Check Loaded Parameters / Ensure SharedParameter Loaded
 
@@ -127,6 +156,17 @@ def check_loaded_params(list_p_names):
 
     return missing_params
 
+#--------------------------------------------------
+#🟠 Check Loaded Parameters - cached bindings index (ht_revit.bindings)
+# The bindings map is read once per document and session (again only after a change),
+# then every check is a dict lookup. Also tells which categories a parameter is missing on.
+from ht_revit.bindings import get_bindings_index
+
+bindings       = get_bindings_index(doc)
+missing_params = bindings.missing(['P_NAME_1', 'P_NAME_2'])
+bound          = bindings.get('P_NAME_1')      # .is_instance, .categories, .guid
+problems       = bindings.check({'P_NAME_1': [BuiltInCategory.OST_Walls, BuiltInCategory.OST_Doors]})
+
 
 
 # ╦ ╦╔═╗╔═╗╔═╗╦ ╦  ╔═╗╔═╗╔╦╗╦╔╗╔╔═╗  ||
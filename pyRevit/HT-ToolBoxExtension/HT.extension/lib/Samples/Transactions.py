@@ -117,6 +117,24 @@ t2.Commit()
 
 tg.Assimilate() # Combine All Transacitons into one
 
+#--------------------------------------------------
+#🟠 Bulk edits - chunked Transactions inside a TransactionGroup (ht_revit.batch)
+# Per-chunk commits, failing elements skipped (SubTransaction), cancel between chunks
+from pyrevit.forms import ProgressBar
+from ht_revit.batch import run_batch
+
+def set_comment(element_id):
+    doc.GetElement(element_id).LookupParameter('Comments').Set('Checked')
+
+element_ids = uidoc.Selection.GetElementIds()
+with ProgressBar(cancellable=True) as pb:
+    report = run_batch(doc, element_ids, set_comment, 'Set Comments', chunk_size=1000,
+                       progress=lambda r: pb.update_progress(r.done, r.total),
+                       cancel=lambda: pb.cancelled)
+print(report.summary())
+for failure in report.failed:
+    print('❌ {}: {}'.format(failure.item, failure.error))
+
 # ╦ ╦╔═╗╔═╗╔═╗╦ ╦  ╔═╗╔═╗╔╦╗╦╔╗╔╔═╗  ||
 # ╠═╣╠═╣╠═╝╠═╝╚╦╝  ║  ║ ║ ║║║║║║║ ╦  ||
 # ╩ ╩╩ ╩╩  ╩   ╩   ╚═╝╚═╝═╩╝╩╝╚╝╚═╝  .. ⌨️ HAPPY CODING!
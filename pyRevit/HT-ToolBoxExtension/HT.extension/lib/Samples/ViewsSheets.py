@@ -31,6 +31,15 @@ view_types_ceil     = [vt for vt in view_types if vt.ViewFamily == ViewFamily.Ce
 view_types_stru     = [vt for vt in view_types if vt.ViewFamily == ViewFamily.StructuralPlan]
 view_types_area     = [vt for vt in view_types if vt.ViewFamily == ViewFamily.AreaPlan]
 
+# SAME BUCKETS FROM THE SESSION VIEW INDEX (grouped once, kept current by DocumentChanged)
+from ht_revit.viewindex import get_view_index
+view_index          = get_view_index(doc)
+view_types_sections = view_index.elements(view_index.view_family_types(ViewFamily.Section))  # raw ids
+all_floor_plans     = view_index.elements(view_index.views(ViewType.FloorPlan))
+plan_templates      = view_index.templates(ViewType.FloorPlan)        # records: .id .name .view_type
+unplaced_sections   = view_index.unplaced(ViewType.Section)           # on no sheet
+dependent_ids       = view_index.dependents(doc.ActiveView.Id)
+
 
 # ╔═╗╦═╗╔═╗╔═╗╔╦╗╔═╗  ╦  ╦╦╔═╗╦ ╦╔═╗
 # ║  ╠╦╝║╣ ╠═╣ ║ ║╣   ╚╗╔╝║║╣ ║║║╚═╗
@@ -59,10 +68,10 @@ view_draft         = ViewDrafting.Create(doc, view_type_draft_id)
 #----------------------------------------------------------------------------------------------------
 #🟠 Create Legend
 
-#Get All Legends
-all_views   = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Views).ToElements()
-all_views   = [view for view in all_views if not view.IsTemplate]
-all_legends = [view for view in all_views if view.ViewType == ViewType.Legend]
+#Get All Legends (session view index: no collector once it is built)
+from ht_revit.viewindex import get_view_index
+view_index  = get_view_index(doc)
+all_legends = view_index.elements(view_index.views(ViewType.Legend))
 
 #Check Legend in the Project
 if not all_legends:
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+-------- clonebuddy --------
+Purpose: Clone GitHub repos, validate and fix their folder structure and
+register them as pyRevit extensions.
+
+Submodules are loaded on first use so a button that only needs validation
+does not pay for cloning, registry or catalog imports:
+
+>>> from clonebuddy.validate import validate_structure
+>>> import clonebuddy
+>>> clonebuddy.validate_structure(path)   # same thing, resolved lazily
+
+Command line: ``clonebuddy --help`` (or ``python -m clonebuddy --help``).
+"""
+
+__version__ = "1.0.0"
+
+# Public name -> submodule that defines it
+_LAZY_ATTRS = {
+    "clone_repo": "clone",
+    "validate_structure": "validate",
+    "validate_extensions": "validate",
+    "validate_manifest": "schema",
+    "build_template": "schema",
+    "auto_fix_structure": "fix",
+    "create_json": "fix",
+    "is_registered": "registry",
+    "register_extension": "registry",
+    "reload_pyrevit": "registry",
+    "get_local_extensions": "catalog",
+    "load_catalog": "catalog",
+    "run_clonebuddy_workflow": "workflow",
+    "resolve": "deps",
+    "install_dependencies": "deps",
+    "space_report": "space",
+    "collect_garbage": "space",
+}
+
+_SUBMODULES = ("clone", "validate", "fix", "registry", "catalog", "schema", "deps", "space",
+               "workflow", "cli")
+
+__all__ = sorted(list(_LAZY_ATTRS) + list(_SUBMODULES))
+
+
+def __getattr__(name):
+    # PEP 562 hook (CPython 3.7+). Under IronPython import the submodule
+    # directly instead, e.g. ``from clonebuddy.validate import ...``.
+    import importlib
+    if name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module("." + _LAZY_ATTRS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""Allow ``python -m clonebuddy``."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
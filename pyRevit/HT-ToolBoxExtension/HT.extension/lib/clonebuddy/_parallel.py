@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Minimal thread-pool map that also works under IronPython 2.7.
+
+IronPython has no ``concurrent.futures`` but its threads run without a
+GIL, so the plain ``threading`` fallback is the fast path inside Revit.
+"""
+
+import os
+import threading
+
+
+def default_workers():
+    return min(32, (os.cpu_count() if hasattr(os, "cpu_count") else 4) or 4) + 4
+
+
+def parallel_map(func, items, workers=None):
+    """Return ``[func(item) for item in items]``, computed on worker threads.
+
+    Order is preserved. The first exception raised by ``func`` propagates.
+    """
+    items = list(items)
+    workers = min(workers or default_workers(), len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+    try:
+        from concurrent.futures import ThreadPoolExecutor  # deferred: slow to import
+    except ImportError:  # IronPython 2.7
+        return _threaded_map(func, items, workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items))
+
+
+def _threaded_map(func, items, workers):
+    results = [None] * len(items)
+    errors = []
+    lock = threading.Lock()
+    position = [0]
+
+    def worker():
+        while not errors:
+            with lock:
+                index = position[0]
+                position[0] += 1
+            if index >= len(items):
+                return
+            try:
+                results[index] = func(items[index])
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Local extension listing and the ``catalog.json`` of cloned repos.
+
+The catalog lives next to the clones and records where each extension came
+from, so later steps (checks, refresh, clean-up) do not have to guess.
+"""
+
+import json
+import os
+
+from .config import CATALOG_NAME, DEFAULT_CLONE_DIR, REPO_SUFFIX
+from .utils import log
+
+GITHUB_SEARCH_URL = "https://api.github.com/search/repositories"
+
+
+# -------------------------------
+# Local extensions
+# -------------------------------
+def get_local_extensions(clone_dir=None):
+    """Names of the ``.extension`` folders in the clone folder, sorted."""
+    clone_dir = clone_dir or DEFAULT_CLONE_DIR
+    if not os.path.isdir(clone_dir):
+        return []
+    return sorted(name for name in os.listdir(clone_dir)
+                  if name.endswith(REPO_SUFFIX)
+                  and os.path.isdir(os.path.join(clone_dir, name)))
+
+
+# -------------------------------
+# catalog.json
+# -------------------------------
+def catalog_path(clone_dir=None):
+    return os.path.join(clone_dir or DEFAULT_CLONE_DIR, CATALOG_NAME)
+
+
+def load_catalog(clone_dir=None):
+    """Return ``{extension name: entry dict}``; empty if there is no catalog."""
+    path = catalog_path(clone_dir)
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except Exception as e:
+        log("⚠ Could not read catalog {}: {}".format(path, e))
+        return {}
+    return data.get("extensions", {}) if isinstance(data, dict) else {}
+
+
+def save_catalog(entries, clone_dir=None):
+    path = catalog_path(clone_dir)
+    folder = os.path.dirname(path)
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    with open(path, "w") as f:
+        json.dump({"extensions": entries}, f, indent=4, sort_keys=True)
+    return path
+
+
+def add_to_catalog(extension_path, repo_url="", clone_dir=None, **extra):
+    """Record (or update) one extension in the catalog and return its entry."""
+    entries = load_catalog(clone_dir)
+    name = os.path.basename(extension_path.rstrip("\\/"))
+    entry = entries.get(name, {})
+    entry.update(extra)
+    entry["path"] = extension_path
+    if repo_url:
+        entry["url"] = repo_url.strip()
+    entries[name] = entry
+    save_catalog(entries, clone_dir)
+    return entry
+
+
+# -------------------------------
+# GitHub discovery
+# -------------------------------
+def find_pyrevit_repos(max_results=20):
+    """Yield clone URLs of public pyRevit repos from the GitHub search API."""
+    try:
+        from urllib.request import urlopen
+        from urllib.parse import urlencode
+    except ImportError:  # IronPython 2.7
+        from urllib2 import urlopen
+        from urllib import urlencode
+    query = urlencode({"q": "pyrevit language:python", "per_page": max_results})
+    response = urlopen(GITHUB_SEARCH_URL + "?" + query)
+    try:
+        payload = json.loads(response.read().decode("utf-8"))
+    finally:
+        response.close()
+    for item in payload.get("items", []):
+        yield item["clone_url"]
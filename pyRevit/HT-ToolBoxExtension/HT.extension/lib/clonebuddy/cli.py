@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""``clonebuddy`` command line entry point.
+
+Examples::
+
+    clonebuddy clone https://github.com/me/MyTools.git --register
+    clonebuddy validate --all --json
+    clonebuddy fix ~/CloneBuddyExtensions/MyTools
+    clonebuddy manifest --all
+    clonebuddy manifest --template MyTools
+    clonebuddy deps --all --install
+    clonebuddy space --json
+    clonebuddy gc --dry-run --prune
+    clonebuddy list --json
+
+Subcommands import only the submodules they need. Exit code is 0 on
+success, 1 when validation issues remain or a step failed.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from . import __version__
+from .utils import set_log_stream
+
+
+def _resolve_paths(args):
+    from .catalog import get_local_extensions
+    from .config import DEFAULT_CLONE_DIR
+    clone_dir = args.clone_dir or DEFAULT_CLONE_DIR
+    if getattr(args, "all", False):
+        return [os.path.join(clone_dir, name) for name in get_local_extensions(clone_dir)]
+    return [os.path.abspath(p) for p in args.paths]
+
+
+# -------------------------------
+# Subcommands -> (ok, results, summary)
+# -------------------------------
+def cmd_clone(args):
+    from .workflow import run_clonebuddy_workflow
+    results = []
+    for url in args.urls:
+        path, issues = run_clonebuddy_workflow(url, clone_dir=args.clone_dir,
+                                               with_deps=not args.no_deps)
+        entry = {"url": url, "path": path, "issues": issues, "registered": False}
+        if path and not issues and args.register:
+            from .registry import register_with_pyrevit
+            entry["registered"] = register_with_pyrevit(path, reload=False)
+        results.append(entry)
+    if args.register and any(r["registered"] for r in results):
+        from .registry import reload_pyrevit
+        reload_pyrevit()
+    ok = all(r["path"] and not r["issues"] for r in results)
+    return ok, results, {}
+
+
+def cmd_validate(args):
+    from .utils import log
+    from .validate import validate_extensions
+    rule_ids = [r.strip() for r in args.rules.split(",") if r.strip()] if args.rules else None
+    report = validate_extensions(_resolve_paths(args), rule_ids, workers=args.workers,
+                                 processes=args.processes)
+    for result in report.results:
+        log("{} {}".format("✅" if result.ok else "❌", result.path))
+        for item in result.findings:
+            log("   {} [{}]{}".format(item, item.rule,
+                                     " -> " + item.fix_hint if item.fix_hint else ""))
+    log("Checked {} extension(s) in {:.2f}s: {}".format(
+        len(report.results), report.duration,
+        ", ".join("{} {}".format(n, s) for s, n in sorted(report.counts().items()))))
+    data = report.to_dict()
+    return report.ok, data.pop("results"), data
+
+
+def cmd_fix(args):
+    from .fix import auto_fix_structure
+    from .validate import validate_structure
+    results = []
+    for path in _resolve_paths(args):
+        fixed = auto_fix_structure(path, args.url or "")
+        results.append({"path": path, "fixed_path": fixed,
+                        "issues": validate_structure(fixed)})
+    return all(not r["issues"] for r in results), results, {}
+
+
+def cmd_register(args):
+    from .registry import register_with_pyrevit, reload_pyrevit
+    results = [{"path": p, "registered": register_with_pyrevit(p, reload=False)}
+               for p in _resolve_paths(args)]
+    if not args.no_reload and any(r["registered"] for r in results):
+        reload_pyrevit()
+    return all(r["registered"] for r in results), results, {}
+
+
+def cmd_manifest(args):
+    from .schema import build_template, validate_manifest_files
+    from .utils import log
+    if args.template is not None:
+        template = build_template(args.template, url=args.url or None)
+        if not args.json:
+            print(json.dumps(template, indent=4))
+        return True, [template], {}
+    checked = validate_manifest_files(_resolve_paths(args), workers=args.workers)
+    results = []
+    for path in sorted(checked):
+        errors = checked[path]
+        results.append({"path": path, "ok": not any(e.severity == "error" for e in errors),
+                        "errors": [e.to_dict() for e in errors]})
+        for error in errors:
+            log("{} {} {}".format("❌" if error.severity == "error" else "⚠", path, error))
+    return all(r["ok"] for r in results), results, {"manifests": len(results)}
+
+
+def cmd_deps(args):
+    from .deps import DependencyError, install_dependencies, load_index, resolve
+    from .utils import log
+    extra = None
+    if args.index:
+        with open(args.index, "r") as f:
+            extra = json.load(f)
+    index = load_index(args.clone_dir, extra)
+    paths = _resolve_paths(args)
+    if args.install:
+        report = install_dependencies(paths, index, args.clone_dir, workers=args.workers)
+        data = report.to_dict()
+        return report.ok, data.pop("nodes"), data
+
+    graph = resolve(paths, index, args.clone_dir)
+    try:
+        waves = [[graph.nodes[k].name for k in wave] for wave in graph.topological_waves()]
+        cycles = []
+    except DependencyError as e:
+        waves, cycles = [], [e.cycle]
+        log("❌ " + str(e))
+    for number, wave in enumerate(waves, 1):
+        log("Wave {}: {}".format(number, ", ".join(
+            "{}{}".format(n, "" if graph.node(n).path else " (missing)") for n in wave)))
+    results = [graph.nodes[k].to_dict() for k in sorted(graph.nodes)]
+    missing = [r for r in results if r["status"] != "installed"]
+    for item in missing:
+        log("⚠ {} is not installed{}".format(
+            item["name"], "" if item["url"] else " and has no source URL in the index"))
+    ok = not missing and not cycles and not graph.conflicts
+    return ok, results, {"waves": waves, "cycles": cycles, "conflicts": graph.conflicts}
+
+
+def cmd_space(args):
+    from .space import format_bytes, space_report
+    from .utils import log
+    report = space_report(args.clone_dir, workers=args.workers)
+    for folder in report.folders:
+        log("{:>10}  {:>10} .git  {}{}".format(
+            format_bytes(folder.work_bytes), format_bytes(folder.git_bytes), folder.name,
+            "" if folder.catalogued else "  (not in catalog)"))
+    totals = report.totals()
+    log("Total {} ({} in .git) across {} folder(s)".format(
+        format_bytes(totals["total_bytes"]), format_bytes(totals["git_bytes"]), totals["folders"]))
+    data = report.to_dict()
+    return True, data.pop("results"), data
+
+
+def cmd_gc(args):
+    from .space import collect_garbage, load_policy
+    policy = load_policy(args.clone_dir, args.policy,
+                         prune_uncatalogued=False if args.no_prune else
+                         True if args.prune else None,
+                         gc_interval_days=0 if args.force_gc else None,
+                         gc_aggressive=True if args.aggressive else None)
+    policy["keep"] = list(policy["keep"]) + (args.keep or [])
+    report = collect_garbage(args.clone_dir, policy, dry_run=args.dry_run, workers=args.workers)
+    data = report.to_dict()
+    results = data.pop("results")
+    if not args.json:
+        # The summary is the point of this command: always print it
+        print(json.dumps(dict(data, results=results), indent=2, sort_keys=True))
+    return report.ok, results, data
+
+
+def cmd_list(args):
+    from .catalog import get_local_extensions, load_catalog
+    catalog = load_catalog(args.clone_dir)
+    names = sorted(set(get_local_extensions(args.clone_dir)) | set(catalog))
+    local = set(get_local_extensions(args.clone_dir))
+    results = [dict(catalog.get(name, {}), name=name, on_disk=name in local)
+               for name in names]
+    return True, results, {}
+
+
+# -------------------------------
+# Parser
+# -------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="clonebuddy",
+        description="Clone, validate, fix and register pyRevit extensions.")
+    parser.add_argument("--version", action="version", version="%(prog)s " + __version__)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true",
+                        help="print machine-readable JSON on stdout (logs go to stderr)")
+    common.add_argument("--clone-dir", default=None,
+                        help="extensions folder (default: ~/CloneBuddyExtensions)")
+
+    targets = argparse.ArgumentParser(add_help=False)
+    targets.add_argument("paths", nargs="*", help=".extension folders")
+    targets.add_argument("--all", action="store_true",
+                         help="every .extension folder in the clone folder")
+
+    sub = parser.add_subparsers(dest="command")
+    sub.required = True
+
+    p = sub.add_parser("clone", parents=[common], help="clone, validate and fix repos")
+    p.add_argument("urls", nargs="+")
+    p.add_argument("--register", action="store_true", help="register valid clones with pyRevit")
+    p.add_argument("--no-deps", action="store_true",
+                   help="do not install the extensions listed in 'dependencies'")
+    p.set_defaults(func=cmd_clone)
+
+    p = sub.add_parser("validate", parents=[common, targets], help="validate extension folders")
+    p.add_argument("--rules", default="", help="comma-separated rule ids (default: all)")
+    p.add_argument("--workers", type=int, default=None, help="thread / process pool size")
+    p.add_argument("--processes", action="store_true",
+                   help="run rules in worker processes (faster for many extensions on CPython)")
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("fix", parents=[common, targets], help="auto-fix extension folders")
+    p.add_argument("--url", default="", help="repo URL recorded in a generated extension.json")
+    p.set_defaults(func=cmd_fix)
+
+    p = sub.add_parser("register", parents=[common, targets], help="register extensions with pyRevit")
+    p.add_argument("--no-reload", action="store_true", help="skip 'pyrevit reload'")
+    p.set_defaults(func=cmd_register)
+
+    p = sub.add_parser("manifest", parents=[common, targets],
+                       help="check extension.json files against the schema")
+    p.add_argument("--template", metavar="NAME", default=None,
+                   help="print a schema-generated extension.json for NAME instead")
+    p.add_argument("--url", default="", help="repo URL for --template")
+    p.add_argument("--workers", type=int, default=None, help="thread pool size")
+    p.set_defaults(func=cmd_manifest)
+
+    p = sub.add_parser("deps", parents=[common, targets],
+                       help="show the dependency install plan, or install it")
+    p.add_argument("--install", action="store_true",
+                   help="clone missing dependencies, independent ones concurrently")
+    p.add_argument("--index", metavar="FILE", default=None,
+                   help="JSON index of name -> repo URL (pyRevit extensions.json works)")
+    p.add_argument("--workers", type=int, default=None, help="parallel clones per wave")
+    p.set_defaults(func=cmd_deps)
+
+    p = sub.add_parser("space", parents=[common],
+                       help="disk usage per extension (working tree and .git)")
+    p.add_argument("--workers", type=int, default=None, help="thread pool size")
+    p.set_defaults(func=cmd_space)
+
+    p = sub.add_parser("gc", parents=[common],
+                       help="prune abandoned clones, git gc, remove sample scaffolds")
+    p.add_argument("--dry-run", action="store_true", help="report only, delete nothing")
+    p.add_argument("--policy", metavar="FILE", default=None,
+                   help="policy JSON (default: gc_policy.json in the clone folder)")
+    p.add_argument("--keep", action="append", metavar="NAME",
+                   help="never prune this folder (repeatable)")
+    p.add_argument("--prune", action="store_true",
+                   help="delete *.extension folders missing from catalog.json")
+    p.add_argument("--no-prune", action="store_true",
+                   help="do not prune, even if the policy file says so")
+    p.add_argument("--force-gc", action="store_true", help="git gc every repo, ignoring the schedule")
+    p.add_argument("--aggressive", action="store_true", help="git gc --aggressive")
+    p.add_argument("--workers", type=int, default=None, help="thread pool size")
+    p.set_defaults(func=cmd_gc)
+
+    p = sub.add_parser("list", parents=[common], help="list cloned and catalogued extensions")
+    p.set_defaults(func=cmd_list)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "paths", None) == [] and not getattr(args, "all", True) \
+            and getattr(args, "template", None) is None:
+        parser.error("give at least one path or --all")
+    if args.json:
+        set_log_stream(sys.stderr)
+
+    ok, results, summary = args.func(args)
+
+    if args.json:
+        payload = dict(summary, command=args.command, ok=ok, results=results)
+        sys.stdout.write(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Step 1: clone a GitHub repo into the CloneBuddy extensions folder."""
+
+import os
+
+from .config import DEFAULT_CLONE_DIR, GIT_CLI, REPO_SUFFIX
+from .utils import log, run_command
+
+
+def extension_name_from_url(repo_url):
+    """``https://github.com/me/Tools.git`` -> ``Tools.extension``."""
+    name = repo_url.strip().rstrip('/').split("/")[-1]
+    if name.endswith(".git"):
+        name = name[:-len(".git")]
+    if not name.endswith(REPO_SUFFIX):
+        name += REPO_SUFFIX
+    return name
+
+
+# -------------------------------
+# Clone GitHub Repo
+# -------------------------------
+def clone_repo(repo_url, extension_name=None, clone_dir=None):
+    """Clone a repo, giving it a valid .extension suffix if it lacks one.
+
+    Returns the local path, or None when the clone failed. An existing
+    folder is reused as-is.
+    """
+    repo_url = repo_url.strip()
+    clone_dir = clone_dir or DEFAULT_CLONE_DIR
+    if not extension_name:
+        extension_name = extension_name_from_url(repo_url)
+    elif not extension_name.endswith(REPO_SUFFIX):
+        extension_name += REPO_SUFFIX
+
+    local_path = os.path.join(clone_dir, extension_name)
+    if os.path.exists(local_path):
+        log("Folder already exists: {}. Skipping clone.".format(local_path))
+        return local_path
+    if not os.path.exists(clone_dir):
+        os.makedirs(clone_dir)
+
+    log("Cloning into: {}".format(local_path))
+    code, _, stderr = run_command([GIT_CLI, "clone", repo_url, local_path])
+    if code != 0:
+        log("❌ Git clone failed: {}".format(stderr.strip() or "Unknown error"))
+        return None
+    log("✅ Repo cloned successfully.")
+    return local_path
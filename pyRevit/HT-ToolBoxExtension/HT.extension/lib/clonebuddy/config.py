@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""Shared CloneBuddy settings.
+
+``CLONEBUDDY_HOME`` overrides the clone folder, which is handy for the CLI
+and for pointing the tools at a scratch folder.
+"""
+
+import os
+
+# -------------------------------
+# Settings
+# -------------------------------
+DEFAULT_CLONE_DIR = os.environ.get(
+    "CLONEBUDDY_HOME",
+    os.path.join(os.path.expanduser("~"), "CloneBuddyExtensions"))
+PYREVIT_CLI = "pyrevit"
+GIT_CLI = "git"
+REPO_SUFFIX = ".extension"
+MANIFEST_NAME = "extension.json"
+CATALOG_NAME = "catalog.json"
+GC_POLICY_NAME = "gc_policy.json"
+GC_STATE_NAME = "gc_state.json"       # last git gc of clones not in catalog.json
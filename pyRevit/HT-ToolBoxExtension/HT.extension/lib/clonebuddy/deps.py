@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+"""Resolve and install the ``dependencies`` listed in extension.json.
+
+Each manifest names the extensions it needs, either by extension name
+(looked up in the index: catalog.json plus any extra index you pass) or
+directly by git URL. The resolver builds the dependency DAG from every
+manifest it can see, reports cycles, conflicts and unknown names, and
+installs missing extensions in topological waves: everything whose
+dependencies are already present is cloned concurrently, then the next
+wave starts. A bundle therefore installs in roughly the time of its
+longest dependency chain instead of the sum of all clones.
+
+>>> report = install_dependencies(["~/CloneBuddyExtensions/MyTools.extension"])
+>>> report.ok, [w for w in report.waves]
+(True, [['pyRevitPlus', 'pyChilizer'], ['SharedLib']])
+"""
+
+import io
+import json
+import os
+
+from ._parallel import parallel_map
+from .config import DEFAULT_CLONE_DIR, MANIFEST_NAME, REPO_SUFFIX
+from .utils import log, string_types
+
+INSTALLED = "installed"
+PENDING = "pending"
+FAILED = "failed"
+UNRESOLVED = "unresolved"
+CONFLICT = "conflict"
+CYCLE = "cycle"
+BLOCKED = "blocked"
+
+
+class DependencyError(Exception):
+    """Raised by ``DependencyGraph.topological_waves()`` on a cycle."""
+
+    def __init__(self, message, cycle=None):
+        super(DependencyError, self).__init__(message)
+        self.cycle = cycle or []
+
+
+def _key(name):
+    return name.lower()
+
+
+def _is_url(spec):
+    return "://" in spec or spec.startswith("git@") or spec.endswith(".git")
+
+
+def spec_name(spec):
+    """Extension name for a dependency spec (a name or a repo URL)."""
+    spec = spec.strip()
+    if _is_url(spec):
+        spec = spec.rstrip("/").split("/")[-1]
+        if spec.endswith(".git"):
+            spec = spec[:-len(".git")]
+    if spec.endswith(REPO_SUFFIX):
+        spec = spec[:-len(REPO_SUFFIX)]
+    return spec
+
+
+def _normalise_url(url):
+    url = (url or "").strip().rstrip("/")
+    if url.endswith(".git"):
+        url = url[:-len(".git")]
+    return url.lower()
+
+
+def read_manifest_dependencies(extension_path):
+    """``dependencies`` from an extension folder's manifest ([] if unreadable)."""
+    try:
+        with io.open(os.path.join(extension_path, MANIFEST_NAME), "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+    except (IOError, OSError, ValueError):
+        return []
+    deps = data.get("dependencies") if isinstance(data, dict) else None
+    if not isinstance(deps, list):
+        return []
+    return [d for d in deps if isinstance(d, string_types) and d.strip()]
+
+
+# -------------------------------
+# Index: name -> source
+# -------------------------------
+def load_index(clone_dir=None, extra=None):
+    """Build ``{name_lower: {"name", "url", "dependencies"}}``.
+
+    Sources, later ones winning: catalog.json entries, then ``extra``, which
+    may be a ``{name: url}`` dict, a ``{name: {"url": ...}}`` dict, or
+    pyRevit's ``{"extensions": [{"name", "url", "dependencies"}]}`` layout.
+    """
+    from .catalog import load_catalog
+    index = {}
+    for folder, entry in load_catalog(clone_dir).items():
+        if entry.get("url"):
+            _index_add(index, spec_name(folder), entry)
+    if extra:
+        entries = extra.get("extensions") if isinstance(extra, dict) and "extensions" in extra \
+            else extra
+        if isinstance(entries, dict):
+            entries = [dict(v, name=k) if isinstance(v, dict) else {"name": k, "url": v}
+                       for k, v in entries.items()]
+        for entry in entries or []:
+            if isinstance(entry, dict) and entry.get("name") and entry.get("url"):
+                _index_add(index, spec_name(entry["name"]), entry)
+    return index
+
+
+def _index_add(index, name, entry):
+    index[_key(name)] = {"name": name, "url": entry["url"],
+                         "dependencies": list(entry.get("dependencies") or [])}
+
+
+# -------------------------------
+# Graph
+# -------------------------------
+class DependencyNode(object):
+    __slots__ = ("name", "url", "path", "deps", "status", "error")
+
+    def __init__(self, name, url=None, path=None):
+        self.name = name
+        self.url = url
+        self.path = path
+        self.deps = []          # keys of the nodes this one depends on
+        self.status = INSTALLED if path else PENDING
+        self.error = None
+
+    def to_dict(self):
+        return {"name": self.name, "url": self.url, "path": self.path,
+                "dependencies": list(self.deps), "status": self.status, "error": self.error}
+
+    def __repr__(self):
+        return "<DependencyNode {} {}>".format(self.name, self.status)
+
+
+class DependencyGraph(object):
+    """Extensions keyed by lower-cased name, with edges to their dependencies."""
+
+    def __init__(self, index=None, clone_dir=None):
+        self.nodes = {}
+        self.index = index or {}
+        self.clone_dir = clone_dir or DEFAULT_CLONE_DIR
+        self.conflicts = []
+
+    def __contains__(self, name):
+        return _key(name) in self.nodes
+
+    def node(self, name):
+        return self.nodes[_key(name)]
+
+    def local_path(self, name):
+        path = os.path.join(self.clone_dir, name + REPO_SUFFIX)
+        return path if os.path.isdir(path) else None
+
+    def add_extension(self, path, name=None):
+        """Add an installed extension folder and everything it depends on."""
+        name = name or spec_name(os.path.basename(path.rstrip("\\/")))
+        node = self._ensure(name)
+        node.path, node.status = path, INSTALLED
+        self._add_deps(node, read_manifest_dependencies(path))
+        return node
+
+    def _ensure(self, name, url=None):
+        key = _key(name)
+        node = self.nodes.get(key)
+        if node is None:
+            entry = self.index.get(key, {})
+            node = DependencyNode(name, entry.get("url"), self.local_path(name))
+            self.nodes[key] = node
+            if node.path:
+                self._add_deps(node, read_manifest_dependencies(node.path))
+            elif entry.get("dependencies"):
+                self._add_deps(node, entry["dependencies"])
+        if url and node.url and _normalise_url(url) != _normalise_url(node.url):
+            conflict = {"name": node.name, "urls": [node.url, url]}
+            if conflict not in self.conflicts:
+                self.conflicts.append(conflict)
+            if node.status == PENDING:
+                node.status, node.error = CONFLICT, "conflicting sources: {} vs {}".format(
+                    node.url, url)
+        elif url and not node.url:
+            node.url = url
+        return node
+
+    def _add_deps(self, node, specs):
+        for spec in specs:
+            dep = self._ensure(spec_name(spec), spec.strip() if _is_url(spec) else None)
+            key = _key(dep.name)
+            if key != _key(node.name) and key not in node.deps:
+                node.deps.append(key)
+            elif key == _key(node.name):
+                node.status, node.error = CYCLE, "depends on itself"
+
+    # -------------------------------
+    # Ordering
+    # -------------------------------
+    def find_cycle(self):
+        """Return one cycle as a list of names (first == last), or []."""
+        WHITE, GREY, BLACK = 0, 1, 2
+        colour = dict((k, WHITE) for k in self.nodes)
+        for start in sorted(self.nodes):
+            if colour[start] != WHITE:
+                continue
+            stack = [(start, iter(self.nodes[start].deps))]
+            trail = [start]
+            colour[start] = GREY
+            while stack:
+                key, children = stack[-1]
+                for child in children:
+                    if colour.get(child) == GREY:
+                        cycle = trail[trail.index(child):] + [child]
+                        return [self.nodes[k].name for k in cycle]
+                    if colour.get(child) == WHITE:
+                        colour[child] = GREY
+                        stack.append((child, iter(self.nodes[child].deps)))
+                        trail.append(child)
+                        break
+                else:
+                    colour[key] = BLACK
+                    stack.pop()
+                    trail.pop()
+        return []
+
+    def topological_waves(self):
+        """Group node keys into waves; each wave only depends on earlier ones.
+
+        Raises ``DependencyError`` if the graph has a cycle.
+        """
+        remaining = dict((k, set(n.deps)) for k, n in self.nodes.items())
+        waves = []
+        while remaining:
+            ready = sorted(k for k, deps in remaining.items() if not deps)
+            if not ready:
+                cycle = self.find_cycle()
+                raise DependencyError("Dependency cycle: " + " -> ".join(cycle), cycle)
+            waves.append(ready)
+            for key in ready:
+                del remaining[key]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return waves
+
+    def ready_to_install(self):
+        """Pending nodes whose dependencies are all installed."""
+        return sorted(
+            (n for n in self.nodes.values() if n.status == PENDING
+             and all(self.nodes[d].status == INSTALLED for d in n.deps)),
+            key=lambda n: _key(n.name))
+
+
+# -------------------------------
+# Install
+# -------------------------------
+class InstallReport(object):
+    """Outcome of ``install_dependencies()``; ``ok`` means nothing is missing."""
+
+    def __init__(self, graph, waves, installed):
+        self.graph = graph
+        self.waves = waves          # names cloned per wave, in order
+        self.installed = installed  # names cloned in this run
+        self.cycles = []
+        cycle = graph.find_cycle()
+        if cycle:
+            self.cycles.append(cycle)
+
+    @property
+    def problems(self):
+        return [n for n in self.graph.nodes.values() if n.status != INSTALLED]
+
+    @property
+    def ok(self):
+        return not self.problems and not self.cycles and not self.graph.conflicts
+
+    def to_dict(self):
+        return {"ok": self.ok, "waves": self.waves, "installed": self.installed,
+                "cycles": self.cycles, "conflicts": self.graph.conflicts,
+                "nodes": [self.graph.nodes[k].to_dict() for k in sorted(self.graph.nodes)]}
+
+
+def resolve(extension_paths, index=None, clone_dir=None):
+    """Build the dependency graph for already-present extension folders."""
+    graph = DependencyGraph(index if index is not None else load_index(clone_dir), clone_dir)
+    for path in extension_paths:
+        graph.add_extension(os.path.abspath(os.path.expanduser(path)))
+    return graph
+
+
+def install_dependencies(extension_paths, index=None, clone_dir=None, workers=None,
+                         installer=None):
+    """Clone every missing dependency of ``extension_paths``, wave by wave.
+
+    ``installer(url, name, clone_dir)`` returns the new path or None; it
+    defaults to ``clonebuddy.clone.clone_repo``. Newly cloned manifests are
+    read straight away, so dependencies that only they declare join the
+    next wave. Returns an ``InstallReport``.
+    """
+    if installer is None:
+        from .clone import clone_repo
+
+        def installer(url, name, target_dir):
+            return clone_repo(url, name + REPO_SUFFIX, clone_dir=target_dir)
+
+    graph = resolve(extension_paths, index, clone_dir)
+    waves, installed = [], []
+
+    for node in graph.nodes.values():
+        if node.status == PENDING and not node.url:
+            node.status, node.error = UNRESOLVED, "no source URL in the index"
+
+    while True:
+        wave = graph.ready_to_install()
+        if not wave:
+            break
+        log("📦 Installing wave {}: {}".format(len(waves) + 1, ", ".join(n.name for n in wave)))
+
+        def install(node):
+            try:
+                return installer(node.url, node.name, graph.clone_dir), None
+            except Exception as e:
+                return None, str(e)
+
+        for node, (path, error) in zip(wave, parallel_map(install, wave, workers)):
+            if path:
+                graph.add_extension(path, node.name)
+                installed.append(node.name)
+            else:
+                node.status, node.error = FAILED, error or "clone failed"
+        waves.append([n.name for n in wave])
+        for node in graph.nodes.values():
+            if node.status == PENDING and not node.url:
+                node.status, node.error = UNRESOLVED, "no source URL in the index"
+
+    # Anything still pending waits on a failure, an unknown name or a cycle
+    for node in graph.nodes.values():
+        if node.status == PENDING:
+            node.status = BLOCKED
+            node.error = "waiting on: " + ", ".join(
+                graph.nodes[d].name for d in node.deps if graph.nodes[d].status != INSTALLED)
+
+    report = InstallReport(graph, waves, installed)
+    for cycle in report.cycles:
+        log("❌ Dependency cycle: " + " -> ".join(cycle))
+    for node in report.problems:
+        log("⚠ {}: {} ({})".format(node.name, node.status, node.error))
+    return report
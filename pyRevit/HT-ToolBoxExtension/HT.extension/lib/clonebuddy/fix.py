@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Step 3: auto-fix basic structural issues in a pyRevit extension."""
+
+import io
+import json
+import os
+
+from .config import MANIFEST_NAME, REPO_SUFFIX
+from .schema import build_template, repair_manifest
+from .utils import log
+from .validate import has_pushbutton
+
+SAMPLE_BUTTON_PARTS = ("tab", "SamplePanel", "Sample.pushbutton")
+SAMPLE_SCRIPT = "# Sample pushbutton created by CloneBuddy\nprint('Hello from CloneBuddy!')\n"
+
+
+# -------------------------------
+# Create extension.json file
+# -------------------------------
+def create_json(path, ext_name, repo_url=""):
+    """Write a default extension.json into ``path``. Returns True on success.
+
+    The content comes from ``clonebuddy.schema.build_template()``.
+    """
+    template = build_template(ext_name)
+    if repo_url:
+        template["url"] = repo_url.strip()
+        template["author"] = "Auto-Generated"
+    json_path = os.path.join(path, MANIFEST_NAME)
+    try:
+        with open(json_path, "w") as f:
+            json.dump(template, f, indent=4)
+        log("✅ Created extension.json at {}".format(json_path))
+        return True
+    except Exception as e:
+        log("❌ Failed to write JSON: {}".format(e))
+        return False
+
+
+def repair_json(path, ext_name):
+    """Rewrite an existing extension.json so it passes the schema.
+
+    Valid values are kept; broken ones are replaced by template defaults.
+    A file that does not parse as JSON is reported and left untouched, so
+    its content can still be fixed by hand. Returns True on success.
+    """
+    json_path = os.path.join(path, MANIFEST_NAME)
+    try:
+        with io.open(json_path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+    except Exception as e:
+        log("❌ Not valid JSON, left unchanged: {} ({})".format(json_path, e))
+        return False
+    try:
+        with open(json_path, "w") as f:
+            json.dump(repair_manifest(data, ext_name), f, indent=4)
+        log("✅ Repaired extension.json at {}".format(json_path))
+        return True
+    except Exception as e:
+        log("❌ Failed to write JSON: {}".format(e))
+        return False
+
+
+# -------------------------------
+# Auto-Fix Extension Structure
+# -------------------------------
+def auto_fix_structure(extension_path, repo_url=""):
+    """Rename, add extension.json and a sample button as needed.
+
+    Returns the (possibly renamed) extension path.
+    """
+    log("🛠 Attempting to fix structure at: {}".format(extension_path))
+    changes_made = []
+
+    extension_path = extension_path.rstrip("\\/")
+    base_dir = os.path.dirname(extension_path)
+    folder_name = os.path.basename(extension_path)
+    if not folder_name.endswith(REPO_SUFFIX):
+        fixed_name = folder_name + REPO_SUFFIX
+        new_path = os.path.join(base_dir, fixed_name)
+        os.rename(extension_path, new_path)
+        extension_path = new_path
+        folder_name = fixed_name
+        changes_made.append("✅ Renamed folder to: {}".format(fixed_name))
+
+    json_path = os.path.join(extension_path, MANIFEST_NAME)
+    if not os.path.isfile(json_path):
+        if create_json(extension_path, folder_name, repo_url):
+            changes_made.append("✅ Created extension.json")
+
+    if not has_pushbutton(extension_path):
+        sample_path = os.path.join(extension_path, *SAMPLE_BUTTON_PARTS)
+        try:
+            if not os.path.exists(sample_path):
+                os.makedirs(sample_path)
+            with open(os.path.join(sample_path, "script.py"), "w") as f:
+                f.write(SAMPLE_SCRIPT)
+            changes_made.append("✅ Created sample tab/panel/pushbutton structure")
+        except Exception as e:
+            log("❌ Failed to create sample structure: {}".format(e))
+
+    if changes_made:
+        log("🧩 Auto-fix complete:")
+        for msg in changes_made:
+            log(msg)
+    else:
+        log("✅ No fixes needed — structure already valid")
+    return extension_path
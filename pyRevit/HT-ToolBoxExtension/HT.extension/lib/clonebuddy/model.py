@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Shared, read-once model of an extension folder.
+
+``ExtensionModel.load()`` walks the folder a single time and parses
+extension.json once; validation rules, fixes and reports all work from the
+same model instead of re-reading the disk.
+"""
+
+import io
+import json
+import os
+import struct
+
+from .config import MANIFEST_NAME, REPO_SUFFIX
+from .utils import string_types
+
+# pyRevit bundle folder suffixes
+CONTAINER_TYPES = (".tab", ".panel", ".stack", ".pulldown", ".splitbutton", ".splitpushbutton")
+COMMAND_TYPES = (".pushbutton", ".smartbutton", ".invokebutton", ".urlbutton",
+                 ".linkbutton", ".panelbutton", ".nobutton", ".content")
+BUNDLE_TYPES = CONTAINER_TYPES + COMMAND_TYPES
+
+# Command bundles that pyRevit runs from a script file
+SCRIPTED_TYPES = (".pushbutton", ".smartbutton", ".nobutton", ".panelbutton")
+# Bundles that show an icon on the ribbon
+ICON_TYPES = (".pushbutton", ".smartbutton", ".invokebutton", ".urlbutton", ".linkbutton",
+              ".panelbutton", ".pulldown", ".splitbutton", ".splitpushbutton")
+
+SKIP_DIRS = (".git", ".idea", ".vs", "__pycache__", "node_modules")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class Bundle(object):
+    """One pyRevit bundle folder (``Foo.pushbutton``, ``Bar.panel``...)."""
+
+    __slots__ = ("path", "name", "type", "files")
+
+    def __init__(self, path, files):
+        folder = os.path.basename(path)
+        self.path = path
+        self.name, self.type = os.path.splitext(folder)
+        self.files = files
+
+    @property
+    def scripts(self):
+        return [f for f in self.files if f.endswith(".py")]
+
+    @property
+    def icons(self):
+        return [f for f in self.files
+                if f.lower().startswith("icon") and f.lower().endswith((".png", ".ico"))]
+
+    @property
+    def yaml_files(self):
+        return [f for f in self.files if f.lower().endswith((".yaml", ".yml"))]
+
+    def file_path(self, name):
+        return os.path.join(self.path, name)
+
+    def __repr__(self):
+        return "<Bundle {}{}>".format(self.name, self.type)
+
+
+class ExtensionModel(object):
+    """Everything the validators need to know about one extension folder."""
+
+    def __init__(self, path):
+        self.path = path.rstrip("\\/")
+        self.folder_name = os.path.basename(self.path)
+        self.manifest_path = os.path.join(self.path, MANIFEST_NAME)
+        self.manifest = None
+        self.manifest_error = None
+        self.bundles = []
+        self.exists = False
+        self._text_cache = {}
+
+    # -------------------------------
+    # Loading
+    # -------------------------------
+    @classmethod
+    def load(cls, path):
+        model = cls(path)
+        model.exists = os.path.isdir(model.path)
+        if model.exists:
+            model._load_manifest()
+            model._walk()
+        return model
+
+    def _load_manifest(self):
+        if not os.path.isfile(self.manifest_path):
+            return
+        try:
+            with io.open(self.manifest_path, "r", encoding="utf-8-sig") as f:
+                self.manifest = json.load(f)
+        except Exception as e:
+            self.manifest_error = str(e)
+
+    def _walk(self):
+        for root, dirs, files in os.walk(self.path):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            if root != self.path and root.endswith(BUNDLE_TYPES):
+                self.bundles.append(Bundle(root, sorted(files)))
+
+    # -------------------------------
+    # Derived properties
+    # -------------------------------
+    @property
+    def name(self):
+        """Extension name: manifest ``name`` if present, else the folder name."""
+        if isinstance(self.manifest, dict) and self.manifest.get("name"):
+            return self.manifest["name"]
+        return self.folder_name[:-len(REPO_SUFFIX)] if self.folder_name.endswith(REPO_SUFFIX) \
+            else self.folder_name
+
+    @property
+    def has_manifest(self):
+        return os.path.isfile(self.manifest_path)
+
+    @property
+    def dependencies(self):
+        deps = self.manifest.get("dependencies") if isinstance(self.manifest, dict) else None
+        return [d for d in deps if isinstance(d, string_types)] if isinstance(deps, list) else []
+
+    def bundles_of(self, types):
+        return [b for b in self.bundles if b.type in types]
+
+    def read_text(self, path):
+        """Read a file once per model; later calls hit the cache."""
+        if path not in self._text_cache:
+            with io.open(path, "r", encoding="utf-8-sig", errors="replace") as f:
+                self._text_cache[path] = f.read()
+        return self._text_cache[path]
+
+    def __repr__(self):
+        return "<ExtensionModel {} ({} bundles)>".format(self.folder_name, len(self.bundles))
+
+
+# -------------------------------
+# Small file helpers
+# -------------------------------
+def png_size(path):
+    """Return ``(width, height)`` from a PNG header, or None if not a PNG."""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    if len(header) < 24 or header[:8] != PNG_SIGNATURE:
+        return None
+    return struct.unpack(">II", header[16:24])
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Step 4: register extensions with pyRevit through its CLI."""
+
+import os
+
+from .config import PYREVIT_CLI, REPO_SUFFIX
+from .utils import log, run_command
+
+
+# -------------------------------
+# pyRevit env output
+# -------------------------------
+def get_loaded_extension_paths():
+    """Return ``pyrevit env`` output, normalised for case-insensitive lookups."""
+    code, stdout, stderr = run_command([PYREVIT_CLI, "env"])
+    if code != 0:
+        log("⚠ Could not read pyRevit env: {}".format(stderr.strip() or "Unknown error"))
+        return ""
+    return os.path.normcase(stdout).lower()
+
+
+def is_registered(extension_name_or_path, env_output=None):
+    """Check if the extension is already registered in pyRevit.
+
+    Pass ``env_output`` when checking many extensions so ``pyrevit env``
+    runs once.
+    """
+    if env_output is None:
+        env_output = get_loaded_extension_paths()
+    needle = os.path.normcase(extension_name_or_path).lower()
+    return bool(env_output) and needle in env_output
+
+
+# -------------------------------
+# Register / Reload
+# -------------------------------
+def register_extension(ext_path):
+    """Register an extension folder with pyRevit. Returns True on success."""
+    code, _, stderr = run_command([PYREVIT_CLI, "extend", "extensions", ext_path])
+    if code != 0:
+        log("❌ Failed to register extension: {}".format(stderr.strip() or ext_path))
+        return False
+    log("📌 Registered: {}".format(ext_path))
+    return True
+
+
+def reload_pyrevit():
+    code, _, stderr = run_command([PYREVIT_CLI, "reload"])
+    if code != 0:
+        log("❌ pyRevit reload failed: {}".format(stderr.strip() or "Unknown error"))
+        return False
+    log("🔁 pyRevit reloaded.")
+    return True
+
+
+def register_with_pyrevit(extension_path, reload=True):
+    """Register ``extension_path`` unless pyRevit already knows it."""
+    extension_name = os.path.basename(extension_path.rstrip("\\/")).replace(REPO_SUFFIX, "")
+    if is_registered(extension_path) or is_registered(extension_name):
+        log("✅ Extension '{}' is already registered. Skipping registration.".format(extension_name))
+        return True
+    log("🔗 Registering '{}' to pyRevit...".format(extension_name))
+    if not register_extension(extension_path):
+        return False
+    if reload:
+        reload_pyrevit()
+    return True
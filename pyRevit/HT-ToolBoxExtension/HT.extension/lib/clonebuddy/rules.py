@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""Validation rules for pyRevit extensions.
+
+A rule is a function ``rule(model, context)`` that yields ``Finding``
+objects. Register new rules with the ``@rule`` decorator:
+
+>>> @rule("readme-present", WARNING)
+... def check_readme(model, context):
+...     if not os.path.isfile(os.path.join(model.path, "README.md")):
+...         yield finding("Missing README.md", fix_hint="Add a README.md")
+
+``context`` is shared by every extension in one run and holds cross-
+extension data such as ``context.extension_names``.
+"""
+
+import os
+import sys
+
+from .config import REPO_SUFFIX
+from .model import ICON_TYPES, SCRIPTED_TYPES, png_size
+
+ERROR = "error"
+WARNING = "warning"
+INFO = "info"
+SEVERITY_ORDER = {ERROR: 0, WARNING: 1, INFO: 2}
+
+MAX_ICON_PIXELS = 256          # pyRevit scales icons down to 32x32 / 16x16
+MAX_ICON_BYTES = 200 * 1024
+
+RULES = []
+
+
+class Finding(object):
+    """One problem reported by a rule."""
+
+    __slots__ = ("rule", "severity", "message", "path", "fix_hint")
+
+    def __init__(self, rule, severity, message, path=None, fix_hint=None):
+        self.rule = rule
+        self.severity = severity
+        self.message = message
+        self.path = path
+        self.fix_hint = fix_hint
+
+    def to_dict(self):
+        return {"rule": self.rule, "severity": self.severity, "message": self.message,
+                "path": self.path, "fix_hint": self.fix_hint}
+
+    def __str__(self):
+        icon = {ERROR: "❌", WARNING: "⚠", INFO: "ℹ"}.get(self.severity, "-")
+        return "{} {}".format(icon, self.message)
+
+    def __repr__(self):
+        return "<Finding {} {}: {}>".format(self.severity, self.rule, self.message)
+
+
+def finding(message, path=None, fix_hint=None, severity=None):
+    """Build a finding; rule id and default severity are filled in by the engine."""
+    return Finding(None, severity, message, path, fix_hint)
+
+
+class Rule(object):
+    __slots__ = ("id", "severity", "func", "description")
+
+    def __init__(self, rule_id, severity, func):
+        self.id = rule_id
+        self.severity = severity
+        self.func = func
+        self.description = (func.__doc__ or "").strip()
+
+    def run(self, model, context):
+        results = []
+        for item in self.func(model, context) or ():
+            item.rule = self.id
+            item.severity = item.severity or self.severity
+            results.append(item)
+        return results
+
+    def __repr__(self):
+        return "<Rule {} ({})>".format(self.id, self.severity)
+
+
+def rule(rule_id, severity=ERROR):
+    """Decorator that registers a rule function in ``RULES``."""
+    def register(func):
+        RULES[:] = [r for r in RULES if r.id != rule_id]
+        RULES.append(Rule(rule_id, severity, func))
+        return func
+    return register
+
+
+def get_rules(ids=None):
+    """All registered rules, or only those whose id is in ``ids``."""
+    if not ids:
+        return list(RULES)
+    unknown = set(ids) - set(r.id for r in RULES)
+    if unknown:
+        raise ValueError("Unknown rule id(s): {}".format(", ".join(sorted(unknown))))
+    return [r for r in RULES if r.id in ids]
+
+
+# -------------------------------
+# Structure rules
+# -------------------------------
+@rule("folder-suffix")
+def check_folder_suffix(model, context):
+    """Extension folder must end with '.extension'."""
+    if not model.folder_name.endswith(REPO_SUFFIX):
+        yield finding("Folder name must end with '.extension'", model.path,
+                      "Rename the folder to '{}{}'".format(model.folder_name, REPO_SUFFIX))
+
+
+@rule("manifest")
+def check_manifest(model, context):
+    """extension.json must exist and parse to an object."""
+    if not model.has_manifest:
+        yield finding("Missing extension.json file", model.manifest_path,
+                      "Generate a default extension.json (clonebuddy fix)")
+    elif model.manifest_error:
+        yield finding("extension.json is invalid: {}".format(model.manifest_error),
+                      model.manifest_path, "Fix the JSON syntax or regenerate the file")
+    elif not isinstance(model.manifest, dict):
+        yield finding("extension.json must contain a JSON object", model.manifest_path,
+                      "Regenerate the file from the template")
+
+
+@rule("manifest-schema")
+def check_manifest_schema(model, context):
+    """extension.json keys must match the schema (clonebuddy.schema)."""
+    if not isinstance(model.manifest, dict):
+        return  # reported by the 'manifest' rule
+    from .schema import validate_manifest
+    for error in validate_manifest(model.manifest):
+        hint = "Add \"name\": \"{}\"".format(model.name) if "'name'" in error.message \
+            else "See clonebuddy.schema.EXTENSION_SCHEMA for allowed values"
+        yield finding("extension.json {}".format(error), model.manifest_path, hint,
+                      severity=error.severity)
+
+
+@rule("pushbutton-present")
+def check_pushbutton_present(model, context):
+    """At least one .pushbutton bundle with a script."""
+    if not any(b.scripts for b in model.bundles_of((".pushbutton",))):
+        yield finding("No pushbutton UI found (missing .pushbutton folder with script)",
+                      model.path, "Add a tab/panel/.pushbutton/script.py (clonebuddy fix)")
+
+
+@rule("bundle-script")
+def check_bundle_script(model, context):
+    """Scripted bundles must contain a Python script."""
+    for bundle in model.bundles_of(SCRIPTED_TYPES):
+        if not bundle.scripts:
+            yield finding("{}{} has no script".format(bundle.name, bundle.type), bundle.path,
+                          "Add a script.py to the bundle")
+
+
+@rule("duplicate-bundle", WARNING)
+def check_duplicate_bundles(model, context):
+    """Bundle names should be unique within a panel (stacks share the panel)."""
+    seen = {}
+    for bundle in model.bundles:
+        key = (_panel_of(bundle.path).lower(), bundle.name.lower(), bundle.type)
+        seen.setdefault(key, []).append(bundle)
+    for key in sorted(seen):
+        bundles = seen[key]
+        if len(bundles) > 1:
+            yield finding("Duplicate bundle name '{}{}' in {} ({} copies)".format(
+                              bundles[0].name, bundles[0].type,
+                              os.path.basename(key[0]) or "extension root", len(bundles)),
+                          bundles[1].path, "Rename one of the bundles so its title is unique")
+
+
+# -------------------------------
+# Resource rules
+# -------------------------------
+@rule("icon", WARNING)
+def check_icons(model, context):
+    """Ribbon bundles need a reasonably sized icon.png."""
+    for bundle in model.bundles_of(ICON_TYPES):
+        icons = bundle.icons
+        if not icons:
+            yield finding("{}{} has no icon".format(bundle.name, bundle.type), bundle.path,
+                          "Add a 96x96 icon.png")
+            continue
+        for icon in icons:
+            icon_path = bundle.file_path(icon)
+            if os.path.getsize(icon_path) > MAX_ICON_BYTES:
+                yield finding("{} is {} KB".format(icon, os.path.getsize(icon_path) // 1024),
+                              icon_path, "Shrink the icon below {} KB".format(MAX_ICON_BYTES // 1024))
+            if not icon.lower().endswith(".png"):
+                continue
+            size = png_size(icon_path)
+            if size is None:
+                yield finding("{} is not a valid PNG".format(icon), icon_path,
+                              "Re-export the icon as PNG", severity=ERROR)
+            elif max(size) > MAX_ICON_PIXELS:
+                yield finding("{} is {}x{} px".format(icon, size[0], size[1]), icon_path,
+                              "Resize the icon to 96x96 px")
+
+
+@rule("yaml")
+def check_yaml(model, context):
+    """Bundle metadata YAML files must parse."""
+    for bundle in model.bundles:
+        for name in bundle.yaml_files:
+            path = bundle.file_path(name)
+            error = _yaml_error(model.read_text(path))
+            if error:
+                yield finding("{} is invalid YAML: {}".format(name, error), path,
+                              "Fix the YAML syntax (indent with spaces, quote ':' in values)")
+
+
+@rule("script-syntax")
+def check_script_syntax(model, context):
+    """Bundle scripts must compile."""
+    for bundle in model.bundles_of(SCRIPTED_TYPES):
+        for name in bundle.scripts:
+            path = bundle.file_path(name)
+            source = model.read_text(path)
+            try:
+                compile(source, path, "exec", 0, True)
+            except SyntaxError as e:
+                message = "{} line {}: {}".format(name, e.lineno, e.msg)
+                if sys.version_info[0] >= 3 and not _targets_python3(source):
+                    # Most pyRevit scripts are IronPython 2.7; CPython 3 cannot judge them
+                    yield finding(message + " (may be IronPython 2 syntax)", path,
+                                  "Check the script under IronPython or add '#! python3'",
+                                  severity=WARNING)
+                else:
+                    yield finding(message, path, "Fix the syntax error")
+
+
+# -------------------------------
+# Dependency rules
+# -------------------------------
+@rule("dependencies")
+def check_dependencies(model, context):
+    """Every extension listed in 'dependencies' must be installed."""
+    available = context.extension_names
+    for dep in model.dependencies:
+        if dep.lower() not in available:
+            yield finding("Missing dependency extension '{}'".format(dep), model.manifest_path,
+                          "Clone '{}' next to this extension".format(dep))
+
+
+# -------------------------------
+# Helpers
+# -------------------------------
+def _panel_of(path):
+    """Path of the nearest enclosing .panel folder ('' if none)."""
+    parent = os.path.dirname(path)
+    while parent and not parent.endswith(".panel"):
+        if parent.endswith(REPO_SUFFIX) or os.path.dirname(parent) == parent:
+            return ""
+        parent = os.path.dirname(parent)
+    return parent
+
+
+def _targets_python3(source):
+    head = source[:200].lstrip()
+    return head.startswith("#!") and "python3" in head.splitlines()[0]
+
+
+def _yaml_error(text):
+    try:
+        import yaml
+    except ImportError:
+        yaml = None
+    if yaml is not None:
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)  # libyaml is ~10x faster
+        try:
+            yaml.load(text, Loader=loader)
+        except yaml.YAMLError as e:
+            return str(e).splitlines()[0]
+        return None
+    # No YAML parser (plain IronPython): catch the most common mistake only
+    for number, line in enumerate(text.splitlines(), 1):
+        if line[:len(line) - len(line.lstrip())].count("\t"):
+            return "tab used for indentation on line {}".format(number)
+    return None
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""extension.json schema, compiled once into a fast validator.
+
+The schema is the single source of truth for the manifest: validators,
+``build_template()`` (used by ``clonebuddy.fix`` and the CheckJson button)
+and the docs all derive from ``EXTENSION_SCHEMA``.
+
+It is a small JSON-Schema-like dialect (no jsonschema dependency, works
+under IronPython):
+
+* ``type``: ``object``, ``array``, ``string`` or ``boolstr`` - pyRevit's
+  string booleans (``"True"`` / ``"False"``; real JSON booleans pass too)
+* ``properties`` as an ordered list of ``(key, spec)``, plus ``required``
+* ``items``, ``unique`` for arrays; ``enum``, ``pattern``, ``min_length``
+  for strings; ``default`` feeds the template
+
+>>> errors = validate_manifest({"name": "Tools", "builtin": "no"})
+>>> errors[0].path, errors[0].message
+('$.builtin', "expected 'True' or 'False', got 'no'")
+"""
+
+import io
+import json
+import os
+import re
+from collections import OrderedDict
+
+from ._parallel import parallel_map
+from .config import MANIFEST_NAME, REPO_SUFFIX
+from .utils import string_types
+
+# -------------------------------
+# Schema
+# -------------------------------
+URL_PATTERN = r"^(https?://|git@)\S+$"
+
+EXTENSION_SCHEMA = {
+    "type": "object",
+    "required": ["name"],
+    "properties": [
+        ("builtin", {"type": "boolstr", "default": "False"}),
+        ("default_enabled", {"type": "boolstr", "default": "True"}),
+        ("type", {"type": "string", "enum": ["extension", "lib"], "default": "extension"}),
+        ("rocket_mode_compatible", {"type": "boolstr", "default": "False"}),
+        ("name", {"type": "string", "min_length": 1, "default": ""}),
+        ("description", {"type": "string",
+                         "default": "Auto-generated extension.json by CloneBuddy"}),
+        ("author", {"type": "string", "default": ""}),
+        ("author_profile", {"type": "string", "default": ""}),
+        ("url", {"type": "string", "pattern": URL_PATTERN, "allow_empty": True, "default": ""}),
+        ("website", {"type": "string", "pattern": URL_PATTERN, "allow_empty": True,
+                     "default": ""}),
+        ("image", {"type": "string", "default": ""}),
+        ("dependencies", {"type": "array", "unique": True, "default": [],
+                          "items": {"type": "string", "min_length": 1}}),
+    ],
+}
+
+
+class SchemaError(object):
+    """One schema violation at a JSON path like ``$.dependencies[2]``.
+
+    ``severity`` is ``"warning"`` for cosmetic problems pyRevit tolerates
+    (e.g. a malformed URL) and ``"error"`` otherwise.
+    """
+
+    __slots__ = ("path", "message", "severity")
+
+    def __init__(self, path, message, severity="error"):
+        self.path = path
+        self.message = message
+        self.severity = severity
+
+    def to_dict(self):
+        return {"path": self.path, "message": self.message, "severity": self.severity}
+
+    def __str__(self):
+        return "{}: {}".format(self.path, self.message)
+
+    def __repr__(self):
+        return "<SchemaError {}>".format(self)
+
+
+# -------------------------------
+# Compiler
+# -------------------------------
+_TYPE_NAMES = {dict: "object", list: "array", bool: "boolean", int: "number",
+               float: "number", type(None): "null"}
+
+
+def _type_name(value):
+    if isinstance(value, string_types):
+        return "string"
+    return _TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def compile_schema(spec):
+    """Turn a schema spec into ``check(value, path, errors)``.
+
+    All spec lookups happen here, once; the returned closures only do the
+    per-value work.
+    """
+    kind = spec.get("type")
+    if kind == "object":
+        return _compile_object(spec)
+    if kind == "array":
+        return _compile_array(spec)
+    if kind == "string":
+        return _compile_string(spec)
+    if kind == "boolstr":
+        return _check_boolstr
+    raise ValueError("Unsupported schema type: {!r}".format(kind))
+
+
+def _compile_object(spec):
+    properties = [(key, compile_schema(sub)) for key, sub in spec.get("properties", [])]
+    required = list(spec.get("required", []))
+
+    def check(value, path, errors):
+        if not isinstance(value, dict):
+            errors.append(SchemaError(path, "expected object, got " + _type_name(value)))
+            return
+        for key in required:
+            if key not in value:
+                errors.append(SchemaError(path, "missing required key '{}'".format(key)))
+        for key, check_value in properties:
+            if key in value:
+                check_value(value[key], path + "." + key, errors)
+    return check
+
+
+def _compile_array(spec):
+    check_item = compile_schema(spec["items"]) if "items" in spec else None
+    unique = spec.get("unique", False)
+
+    def check(value, path, errors):
+        if not isinstance(value, list):
+            errors.append(SchemaError(path, "expected array, got " + _type_name(value)))
+            return
+        seen = set()
+        for index, item in enumerate(value):
+            item_path = "{}[{}]".format(path, index)
+            if check_item is not None:
+                check_item(item, item_path, errors)
+            if unique and isinstance(item, string_types):
+                if item in seen:
+                    errors.append(SchemaError(item_path, "duplicate item {!r}".format(item)))
+                seen.add(item)
+    return check
+
+
+def _compile_string(spec):
+    enum = spec.get("enum")
+    min_length = spec.get("min_length", 0)
+    pattern = re.compile(spec["pattern"]) if "pattern" in spec else None
+    allow_empty = spec.get("allow_empty", False)
+
+    def check(value, path, errors):
+        if not isinstance(value, string_types):
+            errors.append(SchemaError(path, "expected string, got " + _type_name(value)))
+        elif len(value.strip()) < min_length:
+            errors.append(SchemaError(path, "must not be empty"))
+        elif enum is not None and value not in enum:
+            errors.append(SchemaError(path, "expected one of {}, got {!r}".format(
+                ", ".join(repr(e) for e in enum), value)))
+        elif pattern is not None and not (allow_empty and not value) \
+                and not pattern.match(value):
+            errors.append(SchemaError(path, "{!r} does not look like a URL".format(value),
+                                      "warning"))
+    return check
+
+
+def _check_boolstr(value, path, errors):
+    if isinstance(value, bool):
+        return
+    if not isinstance(value, string_types):
+        errors.append(SchemaError(path, "expected 'True' or 'False', got " + _type_name(value)))
+    elif value.lower() not in ("true", "false"):
+        errors.append(SchemaError(path, "expected 'True' or 'False', got {!r}".format(value)))
+
+
+_validator = None
+
+
+def get_validator():
+    """The compiled validator for ``EXTENSION_SCHEMA`` (compiled on first use)."""
+    global _validator
+    if _validator is None:
+        _validator = compile_schema(EXTENSION_SCHEMA)
+    return _validator
+
+
+# -------------------------------
+# Validation API
+# -------------------------------
+def validate_manifest(data):
+    """Validate already-parsed extension.json data; returns ``SchemaError`` list."""
+    errors = []
+    get_validator()(data, "$", errors)
+    return errors
+
+
+def validate_manifest_file(path):
+    """Parse and validate one file (or an extension folder's extension.json)."""
+    if os.path.isdir(path):
+        path = os.path.join(path, MANIFEST_NAME)
+    if not os.path.isfile(path):
+        return [SchemaError("$", "file not found")]
+    try:
+        with io.open(path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+    except ValueError as e:
+        return [SchemaError("$", "invalid JSON: {}".format(e))]
+    return validate_manifest(data)
+
+
+def validate_manifest_files(paths, workers=None):
+    """Bulk-validate many manifests; returns ``{path: [SchemaError, ...]}``."""
+    paths = list(paths)
+    get_validator()  # compile before fanning out
+    return dict(zip(paths, parallel_map(validate_manifest_file, paths, workers)))
+
+
+# -------------------------------
+# Template
+# -------------------------------
+def build_template(name="", **values):
+    """A fresh manifest dict filled with schema defaults, in schema order.
+
+    >>> build_template("MyTools.extension", url="https://github.com/me/MyTools")["name"]
+    'MyTools'
+    """
+    template = OrderedDict()
+    for key, spec in EXTENSION_SCHEMA["properties"]:
+        default = spec.get("default", "")
+        template[key] = list(default) if isinstance(default, list) else default
+    if name:
+        template["name"] = name[:-len(REPO_SUFFIX)] if name.endswith(REPO_SUFFIX) else name
+    for key, value in values.items():
+        if value is not None:
+            template[key] = value
+    return template
+
+
+def repair_manifest(data, name=""):
+    """Template defaults overlaid with every value from ``data`` that is valid.
+
+    Unknown keys are kept as-is; invalid values fall back to the default,
+    so a typo in one field does not wipe author, URL or dependencies.
+    """
+    template = build_template(name)
+    if not isinstance(data, dict):
+        return template
+    checks = dict((key, compile_schema(spec)) for key, spec in EXTENSION_SCHEMA["properties"])
+    for key, value in data.items():
+        errors = []
+        if key in checks:
+            checks[key](value, "$." + key, errors)
+        if not any(e.severity == "error" for e in errors):
+            template[key] = value
+    if not template.get("name"):
+        template["name"] = build_template(name)["name"]
+    return template
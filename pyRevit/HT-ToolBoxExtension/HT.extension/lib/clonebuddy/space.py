@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+"""Disk usage report and garbage collector for the clone folder.
+
+``space_report()`` measures every folder in the clone folder in parallel,
+splitting the working tree from ``.git``. ``collect_garbage()`` applies a
+policy on top of it:
+
+* prune ``*.extension`` folders that are neither in catalog.json nor a
+  dependency of a catalogued extension (abandoned clones, pre-rename
+  leftovers). Off by default: clones made before the catalog existed and
+  folders made by ``fix`` / BatchRepoProcessor are not catalogued either.
+  Nothing is pruned while catalog.json is missing or empty
+* run ``git gc`` on repos whose last gc is older than ``gc_interval_days``
+* delete the sample pushbutton ``auto_fix_structure()`` added once the
+  extension ships real buttons of its own
+
+The last two cover catalogued folders and every other ``*.extension``
+folder older than ``min_age_hours``. The last gc of a catalogued repo is
+kept in its catalog entry, that of any other in ``gc_state.json``.
+
+The policy comes from ``DEFAULT_POLICY``, then ``gc_policy.json`` in the
+clone folder, then keyword overrides:
+
+>>> report = collect_garbage(dry_run=True, gc_interval_days=0, prune_uncatalogued=True)
+>>> report.to_dict()["reclaimed_bytes"]
+48211968
+"""
+
+import io
+import json
+import os
+import shutil
+import stat
+import time
+
+from ._parallel import parallel_map
+from .catalog import load_catalog, save_catalog
+from .config import DEFAULT_CLONE_DIR, GC_POLICY_NAME, GC_STATE_NAME, GIT_CLI, REPO_SUFFIX
+from .utils import log, run_command
+
+DEFAULT_POLICY = {
+    "prune_uncatalogued": False,
+    "keep": [],                      # folder names that are never pruned
+    "min_age_hours": 24,             # leave fresh clones alone (may be mid-workflow)
+    "gc_interval_days": 14,          # 0 = every run, None = never
+    "gc_aggressive": False,
+    "remove_sample_scaffolds": True,
+}
+
+DAY = 24 * 3600
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return "{:.1f} {}".format(size, unit) if unit != "B" else "{} B".format(size)
+        size /= 1024.0
+
+
+# -------------------------------
+# Sizes
+# -------------------------------
+def tree_size(path):
+    """Bytes under ``path`` as ``(working_tree, git)``; symlinks are not followed."""
+    work = git = 0
+    for root, dirs, files in os.walk(path):
+        in_git = os.path.relpath(root, path).replace("\\", "/").split("/")[0] == ".git"
+        for name in files:
+            try:
+                size = os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+            if in_git or name == ".git":  # a .git file is a worktree / submodule pointer
+                git += size
+            else:
+                work += size
+    return work, git
+
+
+class FolderUsage(object):
+    __slots__ = ("name", "path", "work_bytes", "git_bytes", "catalogued", "mtime")
+
+    def __init__(self, name, path, work_bytes, git_bytes, catalogued, mtime):
+        self.name = name
+        self.path = path
+        self.work_bytes = work_bytes
+        self.git_bytes = git_bytes
+        self.catalogued = catalogued
+        self.mtime = mtime
+
+    @property
+    def total_bytes(self):
+        return self.work_bytes + self.git_bytes
+
+    @property
+    def is_repo(self):
+        return os.path.exists(os.path.join(self.path, ".git"))
+
+    def to_dict(self):
+        return {"name": self.name, "path": self.path, "work_bytes": self.work_bytes,
+                "git_bytes": self.git_bytes, "total_bytes": self.total_bytes,
+                "catalogued": self.catalogued, "repo": self.is_repo}
+
+
+class SpaceReport(object):
+    def __init__(self, clone_dir, folders, duration):
+        self.clone_dir = clone_dir
+        self.folders = folders
+        self.duration = duration
+
+    def totals(self):
+        return {"work_bytes": sum(f.work_bytes for f in self.folders),
+                "git_bytes": sum(f.git_bytes for f in self.folders),
+                "total_bytes": sum(f.total_bytes for f in self.folders),
+                "folders": len(self.folders)}
+
+    def to_dict(self):
+        return dict(self.totals(), clone_dir=self.clone_dir,
+                    duration_s=round(self.duration, 3),
+                    results=[f.to_dict() for f in self.folders])
+
+
+def space_report(clone_dir=None, workers=None):
+    """Measure every folder in the clone folder, largest first."""
+    started = time.time()
+    clone_dir = clone_dir or DEFAULT_CLONE_DIR
+    catalog = load_catalog(clone_dir)
+    names = sorted(n for n in os.listdir(clone_dir)
+                   if os.path.isdir(os.path.join(clone_dir, n))) if os.path.isdir(clone_dir) else []
+
+    def measure(name):
+        path = os.path.join(clone_dir, name)
+        work, git = tree_size(path)
+        return FolderUsage(name, path, work, git, name in catalog, os.path.getmtime(path))
+
+    folders = parallel_map(measure, names, workers)
+    folders.sort(key=lambda f: -f.total_bytes)
+    return SpaceReport(clone_dir, folders, time.time() - started)
+
+
+# -------------------------------
+# Policy
+# -------------------------------
+def load_policy(clone_dir=None, path=None, **overrides):
+    """``DEFAULT_POLICY`` < policy file < keyword overrides (None is ignored)."""
+    policy = dict(DEFAULT_POLICY)
+    path = path or os.path.join(clone_dir or DEFAULT_CLONE_DIR, GC_POLICY_NAME)
+    if os.path.isfile(path):
+        with io.open(path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+        unknown = set(data) - set(DEFAULT_POLICY)
+        if unknown:
+            raise ValueError("Unknown policy key(s) in {}: {}".format(
+                path, ", ".join(sorted(unknown))))
+        policy.update(data)
+    policy.update((k, v) for k, v in overrides.items() if v is not None)
+    return policy
+
+
+# -------------------------------
+# gc_state.json
+# -------------------------------
+def gc_state_path(clone_dir=None):
+    return os.path.join(clone_dir or DEFAULT_CLONE_DIR, GC_STATE_NAME)
+
+
+def load_gc_state(clone_dir=None):
+    """``{folder name: {"last_gc": time}}`` for repos that are not in catalog.json."""
+    path = gc_state_path(clone_dir)
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with io.open(path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+    except Exception as e:
+        log("⚠ Could not read gc state {}: {}".format(path, e))
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_gc_state(state, clone_dir=None):
+    path = gc_state_path(clone_dir)
+    with open(path, "w") as f:
+        json.dump(state, f, indent=4, sort_keys=True)
+    return path
+
+
+# -------------------------------
+# Collector
+# -------------------------------
+class GcAction(object):
+    __slots__ = ("action", "name", "path", "bytes", "error")
+
+    def __init__(self, action, name, path, size=0, error=None):
+        self.action = action
+        self.name = name
+        self.path = path
+        self.bytes = size
+        self.error = error
+
+    def to_dict(self):
+        return {"action": self.action, "name": self.name, "path": self.path,
+                "bytes": self.bytes, "error": self.error}
+
+
+class GcReport(object):
+    def __init__(self, actions, policy, dry_run, before, after, duration):
+        self.actions = actions
+        self.policy = policy
+        self.dry_run = dry_run
+        self.before = before
+        self.after = after
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return not any(a.error for a in self.actions)
+
+    @property
+    def reclaimed_bytes(self):
+        return sum(a.bytes for a in self.actions if not a.error)
+
+    def to_dict(self):
+        by_action = {}
+        for item in self.actions:
+            if not item.error:
+                by_action[item.action] = by_action.get(item.action, 0) + item.bytes
+        return {"ok": self.ok, "dry_run": self.dry_run, "reclaimed_bytes": self.reclaimed_bytes,
+                "reclaimed_by_action": by_action, "before_bytes": self.before,
+                "after_bytes": self.after, "duration_s": round(self.duration, 3),
+                "policy": self.policy, "results": [a.to_dict() for a in self.actions]}
+
+
+def _referenced_names(catalog, clone_dir):
+    """Lower-cased extension names kept alive by the catalog and its manifests."""
+    from .deps import read_manifest_dependencies, spec_name
+    names = set()
+    for folder, entry in catalog.items():
+        names.add(spec_name(folder).lower())
+        path = entry.get("path") or os.path.join(clone_dir, folder)
+        names.update(spec_name(d).lower() for d in read_manifest_dependencies(path))
+    return names
+
+
+def _on_rm_error(func, path, exc_info):
+    # git marks pack files read-only, which stops rmtree on Windows
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
+
+
+def remove_tree(path):
+    shutil.rmtree(path, onerror=_on_rm_error)
+
+
+def prune_candidates(report, catalog, policy, now=None):
+    """Folders the policy allows deleting, as ``FolderUsage`` objects."""
+    if not policy["prune_uncatalogued"]:
+        return []
+    if not catalog:
+        log("⚠ catalog.json is missing or empty in {}: nothing is pruned".format(
+            report.clone_dir))
+        return []
+    now = now or time.time()
+    keep = set(n.lower() for n in policy["keep"])
+    referenced = _referenced_names(catalog, report.clone_dir)
+    candidates = []
+    for folder in report.folders:
+        name = folder.name
+        if not name.endswith(REPO_SUFFIX):
+            continue    # only extension clones: other folders are not ours
+        bare = name[:-len(REPO_SUFFIX)]
+        if folder.catalogued or name.lower() in keep or bare.lower() in keep:
+            continue
+        if bare.lower() in referenced:
+            continue
+        if now - folder.mtime < policy["min_age_hours"] * 3600:
+            continue
+        candidates.append(folder)
+    return candidates
+
+
+def gc_due(entry, policy, now=None):
+    interval = policy["gc_interval_days"]
+    if interval is None:
+        return False
+    return (now or time.time()) - entry.get("last_gc", 0) >= interval * DAY
+
+
+def git_gc(path, aggressive=False):
+    """Run ``git gc``; returns ``(bytes reclaimed, error or None)``."""
+    before = sum(tree_size(os.path.join(path, ".git")))
+    args = [GIT_CLI, "gc", "--quiet"] + (["--aggressive"] if aggressive else [])
+    code, _, stderr = run_command(args, cwd=path)
+    if code != 0:
+        return 0, stderr.strip() or "git gc failed"
+    return max(0, before - sum(tree_size(os.path.join(path, ".git")))), None
+
+
+def stale_scaffold(extension_path):
+    """The sample pushbutton folder if it is unmodified and no longer needed."""
+    from .fix import SAMPLE_BUTTON_PARTS, SAMPLE_SCRIPT
+    sample = os.path.join(extension_path, *SAMPLE_BUTTON_PARTS)
+    script = os.path.join(sample, "script.py")
+    if not os.path.isfile(script) or os.listdir(sample) != ["script.py"]:
+        return None
+    with io.open(script, "r", encoding="utf-8") as f:
+        if f.read() != SAMPLE_SCRIPT:
+            return None  # edited by the user: keep it
+    for root, dirs, files in os.walk(extension_path):
+        dirs[:] = [d for d in dirs if d != ".git"]
+        if root.endswith(".pushbutton") and os.path.abspath(root) != os.path.abspath(sample) \
+                and any(f.endswith(".py") for f in files):
+            return sample
+    return None
+
+
+def _remove_scaffold(extension_path, sample):
+    size = sum(tree_size(sample))
+    remove_tree(sample)
+    # Drop the sample panel / tab folders too once they are empty
+    parent = os.path.dirname(sample)
+    while os.path.abspath(parent) != os.path.abspath(extension_path) and not os.listdir(parent):
+        os.rmdir(parent)
+        parent = os.path.dirname(parent)
+    return size
+
+
+def collect_garbage(clone_dir=None, policy=None, dry_run=False, workers=None, **overrides):
+    """Apply the clean-up policy to the clone folder; returns a ``GcReport``.
+
+    With ``dry_run`` nothing is touched and ``bytes`` is what pruning and
+    scaffold removal would free (git gc savings are unknown until it runs).
+    """
+    started = time.time()
+    clone_dir = clone_dir or DEFAULT_CLONE_DIR
+    policy = policy or load_policy(clone_dir, **overrides)
+    now = time.time()
+    report = space_report(clone_dir, workers)
+    catalog = load_catalog(clone_dir)
+    actions = []
+
+    # 1. Prune abandoned folders
+    for folder in prune_candidates(report, catalog, policy, now):
+        action = GcAction("prune", folder.name, folder.path, folder.total_bytes)
+        if not dry_run:
+            try:
+                remove_tree(folder.path)
+            except (IOError, OSError) as e:
+                action.error = str(e)
+        actions.append(action)
+
+    # Catalog entries whose folder is gone
+    for name in sorted(catalog):
+        if not os.path.isdir(os.path.join(clone_dir, name)):
+            actions.append(GcAction("catalog", name, catalog[name].get("path")))
+            if not dry_run:
+                del catalog[name]
+
+    # Catalogued folders, and extension clones the catalog does not know of
+    # (made before it existed, or by fix / BatchRepoProcessor) once settled
+    pruned = set(a.name for a in actions if a.action == "prune")
+    min_age = policy["min_age_hours"] * 3600
+    live = [f for f in report.folders if f.name not in pruned and (
+        f.name in catalog or f.name.endswith(REPO_SUFFIX) and now - f.mtime >= min_age)]
+    state = load_gc_state(clone_dir)
+    stale_state = [name for name in state
+                   if name in catalog or not os.path.isdir(os.path.join(clone_dir, name))]
+    for name in stale_state:
+        del state[name]
+
+    # 2. Sample scaffolds
+    if policy["remove_sample_scaffolds"]:
+        for folder in live:
+            sample = stale_scaffold(folder.path)
+            if not sample:
+                continue
+            action = GcAction("scaffold", folder.name, sample, sum(tree_size(sample)))
+            if not dry_run:
+                try:
+                    action.bytes = _remove_scaffold(folder.path, sample)
+                except (IOError, OSError) as e:
+                    action.error = str(e)
+            actions.append(action)
+
+    # 3. git gc on schedule, in parallel
+    due = [f for f in live if f.is_repo and gc_due(
+        catalog[f.name] if f.name in catalog else state.get(f.name, {}), policy, now)]
+    if dry_run:
+        actions.extend(GcAction("git-gc", f.name, f.path) for f in due)
+    elif due:
+        log("🧹 Running git gc on {} repo(s)".format(len(due)))
+        results = parallel_map(lambda f: git_gc(f.path, policy["gc_aggressive"]), due, workers)
+        for folder, (size, error) in zip(due, results):
+            actions.append(GcAction("git-gc", folder.name, folder.path, size, error))
+            if error:
+                continue
+            if folder.name in catalog:
+                catalog[folder.name]["last_gc"] = now
+            else:
+                state[folder.name] = {"last_gc": now}
+
+    if not dry_run:
+        gc_done = [a.name for a in actions if a.action == "git-gc" and not a.error]
+        if any(a.action == "catalog" for a in actions) or any(n in catalog for n in gc_done):
+            save_catalog(catalog, clone_dir)
+        if stale_state or any(n not in catalog for n in gc_done):
+            save_gc_state(state, clone_dir)
+
+    before = report.totals()["total_bytes"]
+    reclaimed = sum(a.bytes for a in actions if not a.error)
+    gc_report = GcReport(actions, policy, dry_run, before, before - reclaimed,
+                         time.time() - started)
+    log("🧹 {} {} in {} action(s)".format(
+        "Would reclaim" if dry_run else "Reclaimed", format_bytes(reclaimed), len(actions)))
+    return gc_report
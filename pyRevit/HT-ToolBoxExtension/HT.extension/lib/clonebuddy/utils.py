@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Logging and command-line helpers shared by the CloneBuddy submodules.
+
+Everything here must stay IronPython-safe: no ``subprocess.run`` and no
+``shutil.which``.
+"""
+
+import os
+import sys
+
+try:
+    string_types = (basestring,)  # IronPython 2.7: json gives unicode
+except NameError:
+    string_types = (str,)
+
+# -------------------------------
+# Logger
+# -------------------------------
+_log_stream = None  # None -> sys.stdout at call time (pyRevit swaps it)
+
+
+def set_log_stream(stream):
+    """Redirect log output, e.g. to stderr so stdout stays valid JSON."""
+    global _log_stream
+    _log_stream = stream
+
+
+def log(msg):
+    stream = _log_stream or sys.stdout
+    stream.write("[CloneBuddy] " + str(msg) + "\n")
+
+
+# -------------------------------
+# Command Checker (IronPython-safe)
+# -------------------------------
+def is_command_available(cmd):
+    """Check if a command-line tool is available (e.g. git, pyrevit)."""
+    for path in os.environ.get("PATH", "").split(os.pathsep):
+        full_path = os.path.join(path.strip('"'), cmd)
+        if os.path.isfile(full_path) or os.path.isfile(full_path + ".exe"):
+            return True
+    return False
+
+
+def run_command(args, cwd=None):
+    """Run a command and return ``(returncode, stdout, stderr)`` as text.
+
+    A missing executable is reported as returncode ``None`` instead of
+    raising, so callers can log it like any other failure.
+    """
+    import subprocess  # deferred: keeps validation-only imports cheap
+    try:
+        process = subprocess.Popen(args, cwd=cwd,
+                                   stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE)
+        stdout, stderr = process.communicate()
+    except OSError as e:
+        return None, "", str(e)
+    return (process.returncode,
+            _decode(stdout),
+            _decode(stderr))
+
+
+def _decode(data):
+    if not data:
+        return ""
+    if isinstance(data, bytes):
+        return data.decode("utf-8", "ignore")
+    return data
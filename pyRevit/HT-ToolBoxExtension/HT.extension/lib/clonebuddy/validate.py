@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""Step 2: validate that folders are proper pyRevit extensions.
+
+``validate_extensions()`` is the rule engine: it loads one shared
+``ExtensionModel`` per folder, then runs every (extension, rule) pair on a
+thread pool. ``validate_structure()`` keeps the original single-folder API
+and returns the error messages only.
+"""
+
+import os
+import time
+
+from ._parallel import default_workers, parallel_map
+from .config import REPO_SUFFIX
+from .model import ExtensionModel
+from .rules import ERROR, SEVERITY_ORDER, Finding, get_rules
+from .utils import log
+
+
+def has_pushbutton(extension_path):
+    """True if any ``.pushbutton`` folder under the path holds a script."""
+    for root, dirs, files in os.walk(extension_path):
+        if root.endswith(".pushbutton") and any(f.endswith(".py") for f in files):
+            return True
+    return False
+
+
+# -------------------------------
+# Results
+# -------------------------------
+class ValidationContext(object):
+    """Data shared by all rules in one run."""
+
+    def __init__(self, extension_names=()):
+        self.extension_names = set(n.lower() for n in extension_names)
+
+
+class ExtensionResult(object):
+    def __init__(self, model, findings):
+        self.model = model
+        self.findings = sorted(findings, key=lambda f: (SEVERITY_ORDER.get(f.severity, 9), f.rule))
+
+    @property
+    def path(self):
+        return self.model.path
+
+    @property
+    def errors(self):
+        return [f for f in self.findings if f.severity == ERROR]
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def to_dict(self):
+        return {"path": self.path, "name": self.model.name, "ok": self.ok,
+                "findings": [f.to_dict() for f in self.findings]}
+
+
+class ValidationReport(object):
+    def __init__(self, results, duration):
+        self.results = results
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return all(r.ok for r in self.results)
+
+    def counts(self):
+        counts = dict((severity, 0) for severity in SEVERITY_ORDER)
+        for result in self.results:
+            for item in result.findings:
+                counts[item.severity] = counts.get(item.severity, 0) + 1
+        return counts
+
+    def to_dict(self):
+        return {"ok": self.ok, "extensions": len(self.results), "counts": self.counts(),
+                "duration_s": round(self.duration, 3),
+                "results": [r.to_dict() for r in self.results]}
+
+
+# -------------------------------
+# Rule engine
+# -------------------------------
+def _sibling_extension_names(paths):
+    names = set()
+    for folder in set(os.path.dirname(p.rstrip("\\/")) for p in paths):
+        if os.path.isdir(folder):
+            names.update(n[:-len(REPO_SUFFIX)] for n in os.listdir(folder)
+                         if n.endswith(REPO_SUFFIX))
+    return names
+
+
+def _rule_runner(context):
+    """Return ``run((model, rule)) -> findings``; a crashing rule becomes a finding."""
+    def run(task):
+        model, current = task
+        try:
+            return current.run(model, context)
+        except Exception as e:
+            return [Finding(current.id, ERROR, "Rule crashed: {}".format(e), model.path)]
+    return run
+
+
+def _process_worker(args):
+    # Runs in a child process: rules are looked up again by id there
+    models, rule_ids, names = args
+    rules = get_rules(rule_ids)
+    run = _rule_runner(ValidationContext(names))
+    return [[f for r in rules for f in run((m, r))] for m in models]
+
+
+def _chunks(items, count):
+    size = max(1, (len(items) + count - 1) // count)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def validate_extensions(paths, rule_ids=None, workers=None, extra_names=(), processes=False):
+    """Run the validation rules over many extension folders at once.
+
+    Every (extension, rule) pair runs on a thread pool; under IronPython
+    that is truly parallel. On CPython, ``processes=True`` spreads the
+    CPU-bound rules (script compiling, YAML parsing) over worker processes
+    instead; only rules registered at import time of ``clonebuddy.rules``
+    are available there.
+
+    ``extra_names`` adds installed extension names (e.g. pyRevit's own) that
+    satisfy ``dependencies`` without living next to the validated folders.
+    Returns a ``ValidationReport``.
+    """
+    started = time.time()
+    rules = get_rules(rule_ids)
+    paths = list(paths)
+
+    models = parallel_map(ExtensionModel.load, paths, workers)
+    names = _sibling_extension_names(paths) | set(extra_names)
+    names.update(m.name for m in models)
+
+    if processes and len(models) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        chunks = _chunks(models, (workers or default_workers()) * 4)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [(chunk, rule_ids, names) for chunk in chunks]
+            findings = [f for part in pool.map(_process_worker, jobs) for f in part]
+    else:
+        tasks = [(m, r) for m in models for r in rules]
+        outputs = parallel_map(_rule_runner(ValidationContext(names)), tasks, workers)
+        per_model = dict((id(m), []) for m in models)
+        for (model, _), found in zip(tasks, outputs):
+            per_model[id(model)].extend(found)
+        findings = [per_model[id(m)] for m in models]
+
+    results = [ExtensionResult(m, found) for m, found in zip(models, findings)]
+    return ValidationReport(results, time.time() - started)
+
+
+# -------------------------------
+# Validate Extension Structure
+# -------------------------------
+STRUCTURE_RULES = ("folder-suffix", "manifest", "pushbutton-present")
+
+
+def validate_structure(extension_path, rule_ids=STRUCTURE_RULES):
+    """Return a list of error strings for one folder; an empty list means valid.
+
+    Only the basic structure rules run by default, which are the ones
+    ``auto_fix_structure()`` can repair. Pass ``rule_ids=None`` for all.
+    """
+    log("🔍 Validating structure at: {}".format(extension_path))
+    result = validate_extensions([extension_path], rule_ids, workers=1).results[0]
+    issues = [str(f) for f in result.errors]
+
+    if not issues:
+        log("✅ Structure is valid")
+    else:
+        log("⚠ Structure issues found:")
+        for issue in issues:
+            log(issue)
+    return issues
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""The full clone -> validate -> fix -> catalog -> dependencies pipeline used by the buttons."""
+
+import os
+
+from .catalog import add_to_catalog
+from .clone import clone_repo
+from .config import GIT_CLI
+from .deps import install_dependencies
+from .fix import auto_fix_structure
+from .utils import is_command_available, log
+from .validate import validate_structure
+
+
+# -------------------------------
+# Run Workflow
+# -------------------------------
+def run_clonebuddy_workflow(repo_url, clone_dir=None, with_deps=True):
+    """Clone, validate and fix one repo, then install its dependencies.
+
+    Returns ``(extension_path, issues)``; ``extension_path`` is None when
+    the clone failed. Dependencies that could not be installed, cycles
+    and conflicting dependency sources are added to ``issues``. Registration is left to the caller.
+    """
+    if not is_command_available(GIT_CLI):
+        log("❌ Git is not available in your PATH. Please install Git CLI.")
+        return None, ["❌ Git is not available in your PATH"]
+
+    path = clone_repo(repo_url, clone_dir=clone_dir)
+    if not path:
+        return None, ["❌ Git clone failed"]
+
+    if validate_structure(path):
+        path = auto_fix_structure(path, repo_url)
+    issues = validate_structure(path)
+    add_to_catalog(path, repo_url, clone_dir=clone_dir, valid=not issues)
+
+    if with_deps:
+        report = install_dependencies([path], clone_dir=clone_dir)
+        for name in report.installed:
+            add_to_catalog(report.graph.node(name).path, report.graph.node(name).url,
+                           clone_dir=clone_dir, dependency_of=os.path.basename(path))
+        issues.extend("❌ Dependency {}: {} ({})".format(n.name, n.status, n.error)
+                      for n in report.problems)
+        issues.extend("❌ Dependency cycle: " + " -> ".join(c) for c in report.cycles)
+        reported = set(n.name for n in report.problems)
+        issues.extend("❌ Dependency {}: conflicting sources {}".format(
+            c["name"], " vs ".join(c["urls"])) for c in report.graph.conflicts
+            if c["name"] not in reported)
+    return path, issues
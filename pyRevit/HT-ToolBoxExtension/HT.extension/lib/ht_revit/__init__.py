@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+-------- ht_revit --------
+Purpose: Revit-side helpers shared by the HT buttons, written against
+``ht_revit.api`` so they also run outside Revit.
+
+* ``ht_revit.api``: Revit API names (real ones in Revit, stand-ins elsewhere)
+* ``ht_revit.standin``: in-memory Revit document for Linux / CPython
+* ``ht_revit.levels``: element -> level index and native level queries
+* ``ht_revit.query``: inverted indexes for multi-criteria filtering
+* ``ht_revit.categories``: every category list of an audit from one collector pass
+* ``ht_revit.elementquery``: declarative element queries compiled to collector filters
+* ``ht_revit.spatial``: bounding-box grid for repeated region / point / nearest queries
+* ``ht_revit.snapshot``: columnar id / name / category / level snapshots
+* ``ht_revit.rows``: on-demand table rows for virtual ListViews
+* ``ht_revit.summary``: one-pass (or sampled) selection profile
+* ``ht_revit.rename``: whole-request view rename planner (swaps, chains)
+* ``ht_revit.viewindex``: session view index kept current by DocumentChanged
+* ``ht_revit.batch``: chunked transactions with progress, cancel and per-item failures
+* ``ht_revit.params``: bulk parameter columns, resolved once per element type
+* ``ht_revit.bindings``: loaded project / shared parameters by name and GUID
+* ``ht_revit.exchange``: streaming parameter export / import (CSV, JSON lines)
+* ``ht_revit.creation``: bulk element creation from tabular rows
+* ``ht_revit.session``: per-document caches kept for the Revit session
+* ``ht_revit.querycache``: memoised collector results, dropped on relevant changes
+* ``ht_revit.bench``: timing harness, ``python -m ht_revit.bench --help``
+"""
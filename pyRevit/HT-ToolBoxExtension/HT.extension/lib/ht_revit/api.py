@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Revit API names for ``ht_revit`` library code.
+
+Inside Revit (IronPython / pyRevit) these are the real
+``Autodesk.Revit.DB`` classes; anywhere else they come from
+``ht_revit.standin``, so the same module runs in Revit and in the
+Linux benchmarks. ``REVIT`` tells which one was loaded.
+"""
+
+try:
+    import clr
+    clr.AddReference("RevitAPI")
+    clr.AddReference("RevitAPIUI")
+    import Autodesk.Revit.DB  # noqa: F401
+    REVIT = True
+except Exception:   # no Revit: plain CPython, or pythonnet without RevitAPI
+    REVIT = False   # (AddReference raises a .NET FileNotFoundException there)
+
+if REVIT:
+    # inside Revit a name that fails to import is an error, not a cue for stand-ins
+    from Autodesk.Revit.DB import (
+        BoundingBoxContainsPointFilter, BoundingBoxIntersectsFilter, BoundingBoxIsInsideFilter,
+        BuiltInCategory, BuiltInParameter, Category, CurveLoop, Element, ElementCategoryFilter,
+        ElementClassFilter, ElementFilter, ElementId, ElementIsElementTypeFilter,
+        ElementLevelFilter, ElementMulticategoryFilter, ElementParameterFilter, ElementType,
+        FamilyInstance, FamilySymbol, FilledRegion, FilledRegionType, FilteredElementCollector,
+        InstanceBinding, Level, Line, LogicalAndFilter, LogicalOrFilter, Outline,
+        ParameterFilterRuleFactory, StorageType, SubTransaction, TextNote, TextNoteType,
+        Transaction, TransactionGroup, TransactionStatus, UV, View, ViewFamily, ViewFamilyType,
+        ViewSheet, ViewType, Viewport, Wall, WallType, WorksetId, XYZ)
+    from Autodesk.Revit.DB.Structure import StructuralType
+    from Autodesk.Revit.Exceptions import (
+        ArgumentException, InvalidOperationException, ModificationOutsideTransactionException)
+    from Autodesk.Revit.UI.Selection import ObjectType
+    from System.Collections.Generic import List
+else:
+    from .standin import (  # noqa: F401
+        ArgumentException, BoundingBoxContainsPointFilter, BoundingBoxIntersectsFilter,
+        BoundingBoxIsInsideFilter, BuiltInCategory, BuiltInParameter, Category, CurveLoop,
+        Element, ElementCategoryFilter, ElementClassFilter, ElementFilter, ElementId,
+        ElementIsElementTypeFilter, ElementLevelFilter, ElementMulticategoryFilter,
+        ElementParameterFilter, ElementType, FamilyInstance, FamilySymbol, FilledRegion,
+        FilledRegionType, FilteredElementCollector, InstanceBinding, InvalidOperationException,
+        Level, Line, List, LogicalAndFilter, LogicalOrFilter,
+        ModificationOutsideTransactionException, ObjectType, Outline, ParameterFilterRuleFactory,
+        StorageType, StructuralType, SubTransaction, TextNote, TextNoteType, Transaction,
+        TransactionGroup, TransactionStatus, UV, View, ViewFamily, ViewFamilyType, ViewSheet,
+        ViewType, Viewport, Wall, WallType, WorksetId, XYZ)
+
+INVALID_ID = -1
+
+
+def id_value(element_id):
+    """Integer value of an ``ElementId`` (``Value`` in Revit 2024+)."""
+    try:
+        return element_id.Value
+    except AttributeError:
+        return element_id.IntegerValue
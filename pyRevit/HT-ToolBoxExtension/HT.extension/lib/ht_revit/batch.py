@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""Chunked transactions for bulk edits: progress, cancel, per-item failures.
+
+The samples and buttons wrap a bulk edit in one hand-made ``Transaction``:
+one bad element rolls everything back, and the undo record (and Revit's
+regeneration at commit) grows with the whole edit. ``run_batch()``
+streams the work list in chunks instead:
+
+* each chunk is its own transaction, all inside one ``TransactionGroup``
+  that is assimilated at the end (one undo item, as before)
+* a chunk first runs straight through; if an item raises, the chunk is
+  rolled back and replayed with one ``SubTransaction`` per item, so only
+  the failing items are skipped (and reported)
+* ``cancel()`` is checked between chunks: committed chunks are kept
+* items are pulled from the iterable a chunk at a time, so a generator
+  of 100k ids never becomes a list
+
+>>> report = run_batch(doc, ids, set_comment, "Set Comments", chunk_size=1000,
+...                    progress=lambda r: pb.update_progress(r.done, r.total),
+...                    cancel=lambda: pb.cancelled)
+>>> report.succeeded, len(report.failed), int(report.throughput)
+(99998, 2, 5210)
+
+``action(item)`` may run twice for the items of a failing chunk, both
+times against the model as it was before the chunk.
+"""
+
+import time
+from itertools import islice
+
+from .api import SubTransaction, Transaction, TransactionGroup, TransactionStatus
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class BatchFailure(object):
+    __slots__ = ("item", "error")
+
+    def __init__(self, item, error):
+        self.item = item
+        self.error = error
+
+
+class BatchReport(object):
+    """Counters of one ``run_batch``; passed to ``progress`` after every chunk."""
+
+    def __init__(self, total=None):
+        self.total = total          # None when the items have no length
+        self.done = 0               # items attempted
+        self.failed = []            # BatchFailure per skipped item
+        self.chunks = 0             # chunks committed
+        self.replayed_chunks = 0    # chunks replayed item by item after a failure
+        self.cancelled = False
+        self.seconds = 0.0
+
+    @property
+    def succeeded(self):
+        return self.done - len(self.failed)
+
+    @property
+    def throughput(self):
+        """Items per second."""
+        return self.done / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        text = u"✅ {:,} item(s) in {} chunk(s), {:,.0f} items/s".format(
+            self.succeeded, self.chunks, self.throughput)
+        if self.failed:
+            text += u"\n❌ {:,} failed".format(len(self.failed))
+        if self.cancelled:
+            text += u"\n🚫 Cancelled after {:,} of {}".format(
+                self.done, "{:,}".format(self.total) if self.total is not None else "?")
+        return text
+
+
+def chunks(items, size):
+    """Lists of up to ``size`` items, pulled from ``items`` one chunk at a time."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _length(items):
+    try:
+        return len(items)
+    except TypeError:
+        count = getattr(items, "Count", None)      # .NET collections
+        return count if isinstance(count, int) else None
+
+
+def run_batch(doc, items, action, name="Batch edit", chunk_size=DEFAULT_CHUNK_SIZE,
+              group=True, progress=None, cancel=None):
+    """Call ``action(item)`` for every item, one transaction per chunk.
+
+    ``group=False`` skips the ``TransactionGroup``: every chunk is then
+    its own undo item, and Revit can release each chunk's undo data
+    instead of holding the whole edit until the group closes.
+    Returns a ``BatchReport``.
+    """
+    report = BatchReport(_length(items))
+    start = time.time()
+    transaction_group = TransactionGroup(doc, name) if group else None
+    if transaction_group is not None:
+        transaction_group.Start()
+    try:
+        for number, chunk in enumerate(chunks(items, max(1, chunk_size)), 1):
+            if cancel is not None and cancel():
+                report.cancelled = True
+                break
+            _run_chunk(doc, chunk, action, u"{} ({})".format(name, number), report)
+            report.seconds = time.time() - start
+            if progress is not None:
+                progress(report)
+    finally:
+        if transaction_group is not None:
+            if report.chunks:
+                transaction_group.Assimilate()
+            else:
+                transaction_group.RollBack()
+        report.seconds = time.time() - start
+    return report
+
+
+def _run_chunk(doc, chunk, action, name, report):
+    first_failure = len(report.failed)
+    transaction = Transaction(doc, name)
+    transaction.Start()
+    try:
+        for item in chunk:
+            action(item)
+    except Exception:
+        transaction.RollBack()
+        report.replayed_chunks += 1
+        transaction = Transaction(doc, name)
+        transaction.Start()
+        _replay(doc, chunk, action, report)
+    if transaction.Commit() == TransactionStatus.Committed:
+        report.chunks += 1
+    else:   # Revit's failure handling rolled the chunk back
+        failed = set(id(f.item) for f in report.failed[first_failure:])
+        error = u"Transaction '{}' was rolled back".format(name)
+        report.failed.extend(BatchFailure(item, error) for item in chunk if id(item) not in failed)
+    report.done += len(chunk)
+
+
+def _replay(doc, chunk, action, report):
+    for item in chunk:
+        sub = SubTransaction(doc)
+        sub.Start()
+        try:
+            action(item)
+        except Exception as error:
+            sub.RollBack()
+            report.failed.append(BatchFailure(item, error))
+        else:
+            sub.Commit()
@@ -0,0 +1,1222 @@
+# -*- coding: utf-8 -*-
+"""Timing harness for the HT tools on synthetic stand-in models.
+
+A benchmark is a function ``bench(ctx)`` registered with ``@benchmark``.
+It times the interesting parts with ``ctx.timer(label)`` and records
+extra facts with ``ctx.note(key, value)``:
+
+>>> @benchmark("filter.by_level")
+... def filter_by_level(ctx):
+...     ctx.select_instances()
+...     with ctx.timer("index"):
+...         build_index(ctx.doc, ctx.uidoc.Selection.GetElementIds())
+
+Models come from ``standin.generate_model`` and are cached per size, so
+one run can compare several implementations on the same document. The
+``legacy.*`` benchmarks replay what the buttons do today and serve as
+the baseline for later optimisations.
+
+Command line::
+
+    python -m ht_revit.bench --list
+    python -m ht_revit.bench legacy --size 1000000 --repeat 3
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import sys
+import time
+from collections import OrderedDict
+
+from . import standin
+from .standin import (BuiltInCategory, ElementId, FilteredElementCollector, List, ObjectType,
+                      StorageType, Transaction, TransactionGroup, UIDocument, View, ViewType)
+
+BENCHMARKS = OrderedDict()
+DEFAULT_SIZE = 100000
+
+_models = {}
+
+
+def benchmark(name):
+    """Decorator that registers ``func(ctx)`` in ``BENCHMARKS``."""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def get_model(size=DEFAULT_SIZE, levels=10):
+    """Cached ``generate_model(size, levels)``; treat it as read-only or roll back."""
+    key = (size, levels)
+    if key not in _models:
+        _models[key] = standin.generate_model(size, levels=levels)
+    return _models[key]
+
+
+# -------------------------------
+# Context
+# -------------------------------
+class BenchContext(object):
+    """What a benchmark sees: the document, a fresh UIDocument and timers."""
+
+    def __init__(self, doc, size):
+        self.doc = doc
+        self.uidoc = UIDocument(doc)
+        self.size = size
+        self.timings = OrderedDict()
+        self.notes = OrderedDict()
+
+    def timer(self, label):
+        return _Timer(self, label)
+
+    def note(self, key, value):
+        self.notes[key] = value
+
+    def instance_ids(self):
+        """Ids of every model instance (no types, views or annotations)."""
+        model_cats = set(int(c[0]) for c in standin.MODEL_CATEGORIES)
+        return [i for i in self.doc._order
+                if i in self.doc._elements and self.doc._elements[i]._cat in model_cats
+                and not self.doc._elements[i]._is_type]
+
+    def select_instances(self, limit=None):
+        """Select (and queue as picks) every model instance, or the first ``limit``."""
+        ids = self.instance_ids()[:limit] if limit else self.instance_ids()
+        self.uidoc.Selection.SetElementIds(List[ElementId](ElementId(i) for i in ids))
+        return len(ids)
+
+    def rollback(self):
+        """Undo whatever a benchmark changed inside an open transaction."""
+        transaction = self.doc._transaction
+        if transaction is not None:
+            transaction.RollBack()
+
+
+class _Timer(object):
+    def __init__(self, ctx, label):
+        self.ctx = ctx
+        self.label = label
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds = time.time() - self.start
+        self.ctx.timings.setdefault(self.label, []).append(self.seconds)
+
+
+# -------------------------------
+# Runner
+# -------------------------------
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2.0
+
+
+def select_benchmarks(patterns=None):
+    """Benchmark names matching any pattern (exact name or ``prefix``/``prefix.*``)."""
+    if not patterns:
+        return list(BENCHMARKS)
+    names = [n for n in BENCHMARKS
+             if any(n == p or n.startswith(p.rstrip(".*") + ".") for p in patterns)]
+    unknown = [p for p in patterns
+               if not any(n == p or n.startswith(p.rstrip(".*") + ".") for n in BENCHMARKS)]
+    if unknown:
+        raise ValueError("Unknown benchmark(s): {}".format(", ".join(unknown)))
+    return names
+
+
+def run_benchmark(name, size=DEFAULT_SIZE, repeat=3, levels=10):
+    """Run one benchmark ``repeat`` times; returns a result dict."""
+    func = BENCHMARKS[name]
+    doc = get_model(size, levels)
+    timings, notes = OrderedDict(), OrderedDict()
+    for _ in range(repeat):
+        ctx = BenchContext(doc, size)
+        try:
+            func(ctx)
+        finally:
+            ctx.rollback()
+        for label, values in ctx.timings.items():
+            timings.setdefault(label, []).extend(values)
+        notes.update(ctx.notes)
+    return {"name": name, "size": size, "repeat": repeat, "notes": notes,
+            "timings": OrderedDict((label, {"min": min(v), "median": _median(v), "runs": len(v)})
+                                   for label, v in timings.items())}
+
+
+def format_results(results):
+    lines = ["{:<32} {:<24} {:>10} {:>10}".format("benchmark", "step", "min ms", "median ms")]
+    for result in results:
+        for label, stats in result["timings"].items():
+            lines.append("{:<32} {:<24} {:>10.1f} {:>10.1f}".format(
+                result["name"], label, stats["min"] * 1000, stats["median"] * 1000))
+        for key, value in result["notes"].items():
+            lines.append("{:<32}   {} = {}".format("", key, value))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ht_revit.bench",
+                                     description="Time HT tools on synthetic Revit models.")
+    parser.add_argument("names", nargs="*", help="benchmark names or prefixes (default: all)")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE,
+                        help="model instances (default: %(default)s)")
+    parser.add_argument("--levels", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, func in BENCHMARKS.items():
+            print("{:<32} {}".format(name, (func.__doc__ or "").strip().splitlines()[0]
+                                     if func.__doc__ else ""))
+        return 0
+    try:
+        names = select_benchmarks(args.names)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+
+    start = time.time()
+    get_model(args.size, args.levels)
+    build_seconds = time.time() - start
+    results = [run_benchmark(n, args.size, args.repeat, args.levels) for n in names]
+    if args.json:
+        print(json.dumps({"size": args.size, "model_seconds": build_seconds,
+                          "results": results}, indent=2))
+    else:
+        print("Model: {} instances built in {:.1f}s".format(args.size, build_seconds))
+        print(format_results(results))
+    return 0
+
+
+# -------------------------------
+# Baselines: the buttons as they are today
+# -------------------------------
+def _legacy_level_name(doc, element):
+    # FilterByLevel's get_element_level_name(), verbatim apart from ``doc``
+    try:
+        level_id = getattr(element, "LevelId", None)
+        if level_id and level_id != ElementId.InvalidElementId:
+            level = doc.GetElement(level_id)
+            if level:
+                return level.Name
+        for name in ("Reference Level", "Schedule Level", "Level"):
+            param = element.LookupParameter(name)
+            if param and param.HasValue:
+                return param.AsString()
+    except Exception:
+        pass
+    return None
+
+
+@benchmark("legacy.filter_by_level")
+def legacy_filter_by_level(ctx):
+    """FilterByLevel: level names for the combo, then one Filter click."""
+    doc = ctx.doc
+    ctx.note("elements", ctx.select_instances())
+    with ctx.timer("pick"):
+        elements = [doc.GetElement(r) for r in ctx.uidoc.Selection.PickObjects(ObjectType.Element)]
+    with ctx.timer("combo"):
+        level_dict = {}
+        for elem in elements:
+            name = _legacy_level_name(doc, elem)
+            if name:
+                level_dict[name] = None
+        levels = sorted(level_dict)
+    with ctx.timer("filter_click"):
+        target = levels[0]
+        filtered = [e for e in elements if _legacy_level_name(doc, e) == target]
+        rows = ["ID {} – {}".format(e.Id, e.Name) for e in filtered]
+        ctx.uidoc.Selection.SetElementIds(List[ElementId]([e.Id for e in filtered]))
+    ctx.note("levels", len(levels))
+    ctx.note("matched", len(rows))
+
+
+@benchmark("legacy.pick_rows")
+def legacy_pick_rows(ctx):
+    """PickMultiOpjetcs: one ListView row per picked element."""
+    doc = ctx.doc
+    ctx.note("elements", ctx.select_instances())
+    with ctx.timer("rows"):
+        rows = []
+        for ref in ctx.uidoc.Selection.PickObjects(ObjectType.Element):
+            elem = doc.GetElement(ref.ElementId)
+            level = doc.GetElement(elem.LevelId)
+            rows.append((str(elem.Id.IntegerValue), elem.Name,
+                         elem.Category.Name if elem.Category else "N/A",
+                         level.Name if level else "N/A"))
+    ctx.note("rows", len(rows))
+
+
+@benchmark("legacy.window_selection")
+def legacy_window_selection(ctx):
+    """WindowSelection: resolve the current selection to elements."""
+    doc = ctx.doc
+    ctx.note("elements", ctx.select_instances())
+    with ctx.timer("resolve"):
+        selected = [doc.GetElement(i) for i in ctx.uidoc.Selection.GetElementIds()]
+    ctx.note("selected", len(selected))
+
+
+@benchmark("legacy.rename_views")
+def legacy_rename_views(ctx):
+    """RenameViewsPlus: name set, preview rows and the rename transaction."""
+    doc = ctx.doc
+    with ctx.timer("collect"):
+        all_views = FilteredElementCollector(doc).OfClass(View).ToElements()
+        existing_names = set(v.Name for v in all_views if not v.IsTemplate)
+    selected = [v for v in all_views if not v.IsTemplate and v.ViewType != ViewType.DrawingSheet]
+    with ctx.timer("preview"):
+        temp_name_check = set(existing_names)
+        renamable = []
+        for view in selected:
+            new_name = "HT - " + view.Name.replace("Level", "L")
+            if not (new_name in temp_name_check and new_name != view.Name):
+                temp_name_check.add(new_name)
+                renamable.append((view, new_name))
+    with ctx.timer("rename"):
+        t = Transaction(doc, "Rename Views")
+        t.Start()
+        renamed = 0
+        for view, new_name in renamable:
+            try:
+                if new_name in existing_names:
+                    continue
+                view.Name = new_name
+                existing_names.add(new_name)
+                renamed += 1
+            except Exception:
+                pass
+    ctx.rollback()
+    ctx.note("views", len(selected))
+    ctx.note("renamed", renamed)
+
+# -------------------------------
+# FilterByLevel
+# -------------------------------
+@benchmark("filter_by_level.index")
+def filter_by_level_index(ctx):
+    """FilterByLevel with the one-pass level index (ht_revit.levels)."""
+    from .levels import build_level_index
+    doc = ctx.doc
+    ctx.note("elements", ctx.select_instances())
+    with ctx.timer("pick"):
+        elements = [doc.GetElement(r) for r in ctx.uidoc.Selection.PickObjects(ObjectType.Element)]
+    with ctx.timer("combo"):
+        index = build_level_index(doc, elements)
+        levels = index.level_names()
+    with ctx.timer("filter_click"):
+        ids = index.ids(levels[0])
+        ctx.uidoc.Selection.SetElementIds(List[ElementId](ids))
+    ctx.note("levels", len(levels))
+    ctx.note("matched", len(ids))
+    ctx.note("unresolved", len(index.unresolved))
+    ctx.note("parameter_reads", index.resolver.lookups)
+
+
+
+@benchmark("filter_by_level.native")
+def filter_by_level_native(ctx):
+    """FilterByLevel whole-model / active-view modes (native level filters).
+
+    The stand-in evaluates "native" filters in Python, so compare the
+    ``*_python_checked`` notes rather than absolute times with Revit.
+    """
+    from .levels import ACTIVE_VIEW, MODEL, LevelResolver, collect_on_level, get_levels
+    doc = ctx.doc
+    levels = get_levels(doc)
+    with ctx.timer("model"):
+        ids, stats = collect_on_level(doc, levels[0], MODEL, levels=levels)
+    ctx.note("model_matched", len(ids))
+    ctx.note("model_python_checked", stats["checked"])
+    with ctx.timer("active_view"):
+        ids, stats = collect_on_level(doc, levels[0], ACTIVE_VIEW, levels=levels)
+    ctx.note("view_matched", len(ids))
+    with ctx.timer("python_scan"):
+        # the same question answered element by element, for comparison
+        resolver = LevelResolver(doc)
+        matched = sum(1 for e in FilteredElementCollector(doc).WhereElementIsNotElementType()
+                      if resolver.resolve(e)[0] == levels[0].Id.IntegerValue)
+    ctx.note("python_matched", matched)
+
+
+# -------------------------------
+# PickMultiOpjetcs
+# -------------------------------
+@benchmark("pick_rows.virtual")
+def pick_rows_virtual(ctx):
+    """PickMultiOpjetcs with a virtual ListView: open, then scroll 50 pages."""
+    from .rows import ElementRows
+    ctx.note("elements", ctx.select_instances())
+    refs = ctx.uidoc.Selection.PickObjects(ObjectType.Element)
+    page = 30
+    with ctx.timer("open"):
+        rows = ElementRows(ctx.doc, refs)
+        rows.prefetch(0, page - 1)
+        first = [rows.row(p) for p in range(page)]
+    with ctx.timer("scroll"):
+        for start in range(page, page * 51, page):
+            rows.prefetch(start, start + page - 1)
+            visible = [rows.row(p) for p in range(start, min(start + page, len(rows)))]
+    ctx.note("rows", len(rows))
+    ctx.note("materialised", rows.materialised())
+
+
+@benchmark("pick_rows.snapshot")
+def pick_rows_snapshot(ctx):
+    """Columnar snapshot of the selection, then grouping, sorting and CSV export."""
+    import os
+    import tempfile
+    from .snapshot import extract_snapshot
+    ctx.note("elements", ctx.select_instances())
+    ids = ctx.uidoc.Selection.GetElementIds()
+    with ctx.timer("extract"):
+        snap = extract_snapshot(ctx.doc, ids)
+    with ctx.timer("group"):
+        groups = snap.group_by("level")
+    with ctx.timer("sort"):
+        order = snap.order_by("category", "name")
+    handle, path = tempfile.mkstemp(suffix=".csv")
+    os.close(handle)
+    try:
+        with ctx.timer("csv"):
+            snap.write_csv(path, order)
+    finally:
+        os.remove(path)
+    ctx.note("array_bytes", snap.ids.itemsize * len(snap.ids)
+             + sum(codes.itemsize * len(codes) for codes in snap.codes.values()))
+    ctx.note("strings", sum(len(table) for table in snap.tables.values()))
+    ctx.note("groups", len(groups))
+
+
+# -------------------------------
+# WindowSelection
+# -------------------------------
+@benchmark("window_selection.summary")
+def window_selection_summary(ctx):
+    """WindowSelection profile: exact one-pass counts, then the sampled estimate."""
+    from .summary import summarise_selection
+    ctx.note("elements", ctx.select_instances())
+    ids = ctx.uidoc.Selection.GetElementIds()
+    with ctx.timer("exact"):
+        exact = summarise_selection(ctx.doc, ids, max_exact=len(ids))
+    with ctx.timer("sampled"):
+        sampled = summarise_selection(ctx.doc, ids, max_exact=0)
+    truth = exact.counts["category"]
+    worst = max(abs(count - truth.get(value, 0)) - error
+                for value, count, error in sampled.rows("category"))
+    ctx.note("sampled", sampled.sampled)
+    ctx.note("categories", len(truth))
+    ctx.note("worst_miss_beyond_bound", max(worst, 0))
+
+
+# -------------------------------
+# RenameViewsPlus
+# -------------------------------
+@benchmark("rename_views.plan")
+def rename_views_plan(ctx):
+    """RenameViewsPlus planner: legacy workload, then swapping every pair of floor plans."""
+    from .rename import execute_plan, existing_view_names, plan_renames
+    doc = ctx.doc
+    with ctx.timer("collect"):
+        names = existing_view_names(doc)
+    views = [v for v in FilteredElementCollector(doc).OfClass(View)
+             if not v.IsTemplate and v.ViewType != ViewType.DrawingSheet]
+    with ctx.timer("plan"):
+        plan = plan_renames(doc, [(v, "HT - " + v.Name.replace("Level", "L")) for v in views],
+                            names)
+    with ctx.timer("rename"):
+        result = execute_plan(doc, plan)
+    # execute_plan() commits: undo with the reverse plan to keep the cached model intact
+    execute_plan(doc, plan_renames(doc, [(item.view, item.old) for item in plan.accepted()]))
+    plans = [v for v in views if v.ViewType == ViewType.FloorPlan]
+    swaps = []
+    for first, second in zip(plans[::2], plans[1::2]):
+        swaps += [(first, second.Name), (second, first.Name)]
+    with ctx.timer("swap_plan"):
+        swap_plan = plan_renames(doc, swaps, names)
+    with ctx.timer("swap_rename"):
+        swapped = execute_plan(doc, swap_plan)
+    execute_plan(doc, plan_renames(doc, [(item.view, item.old) for item in swap_plan.accepted()]))
+    ctx.note("views", len(views))
+    ctx.note("renamed", result.renamed)
+    ctx.note("swapped", swapped.renamed)
+    ctx.note("cycles", swap_plan.cycles)
+
+
+@benchmark("rename_views.preview")
+def rename_views_preview(ctx):
+    """RenameViewsPlus live preview: typing a regex and a token template, key by key."""
+    from .rename import NameTemplate, RenamePreview, TemplateError
+    doc = ctx.doc
+    views = [v for v in FilteredElementCollector(doc).OfClass(View)
+             if not v.IsTemplate and v.ViewType != ViewType.DrawingSheet]
+    with ctx.timer("open"):
+        preview = RenamePreview(doc, views)
+        preview.update(NameTemplate())
+    template = "{ViewType} - {Level} - {Name} {#:4}"
+    find = r"Level (\d+)"
+    changed = 0
+    for typed in range(1, len(template) + 1):
+        with ctx.timer("keystroke"):
+            try:
+                changed += len(preview.update(NameTemplate(find, r"L\1", "", "",
+                                                           template[:typed], regex=True)))
+            except TemplateError:
+                pass    # half-typed token
+    ctx.note("views", len(views))
+    ctx.note("keystrokes", len(template))
+    ctx.note("rows_repainted", changed)
+
+
+# -------------------------------
+# Session view index
+# -------------------------------
+@benchmark("views.index")
+def views_index(ctx):
+    """ViewIndex: one build, then DocumentChanged updates vs. re-collecting every view."""
+    from .viewindex import ViewIndex
+    doc = ctx.doc
+    with ctx.timer("build"):
+        index = ViewIndex(doc)
+    app = doc.Application
+    app.DocumentChanged += index.on_document_changed
+    try:
+        views = [v for v in FilteredElementCollector(doc).OfClass(View)
+                 if not v.IsTemplate and v.ViewType == ViewType.FloorPlan][:100]
+        t = Transaction(doc, "Rename")
+        t.Start()
+        with ctx.timer("rename_100_views"):
+            for view in views:
+                view.Name = view.Name + " *"
+            t.Commit()
+        plan_names = index.names[("view", int(ViewType.FloorPlan))]
+        consistent = all(plan_names.get(v.Name) == v.Id.IntegerValue for v in views)
+        t = Transaction(doc, "Rename")
+        t.Start()
+        for view in views:
+            view.Name = view.Name[:-2]
+        t.Commit()
+        # an unrelated edit: thousands of modified model elements
+        edited = ctx.instance_ids()[:20000]
+        with ctx.timer("model_edit_event"):
+            doc.simulate_document_changed(modified=edited)
+        with ctx.timer("recollect"):
+            ViewIndex(doc)
+    finally:
+        app.DocumentChanged -= index.on_document_changed
+    ctx.note("views", len(index.records))
+    ctx.note("updates", index.updates)
+    ctx.note("consistent", consistent)
+
+
+_LEGACY_VIEW_TYPES = ("DraftingView", "CeilingPlan", "FloorPlan", "Elevation", "AreaPlan",
+                      "Section", "ThreeD", "Detail", "Legend")
+
+
+@benchmark("views.classify")
+def views_classify(ctx):
+    """Nine view lists, view family types, templates, sheets, dependents: 100 tool runs.
+
+    Legacy collects every view and filters once per list (Samples/ViewsSheets.py);
+    the ViewIndex answers each list from its buckets.
+    """
+    from .api import ViewFamily, ViewFamilyType
+    from .viewindex import ViewIndex
+    doc = ctx.doc
+    view_types = [getattr(ViewType, name) for name in _LEGACY_VIEW_TYPES]
+    families = (ViewFamily.FloorPlan, ViewFamily.Section, ViewFamily.Legend)
+    runs = 100
+
+    def legacy():
+        all_views = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Views) \
+            .WhereElementIsNotElementType().ToElements()
+        lists = [[v for v in all_views if v.ViewType == t and not v.IsTemplate]
+                 for t in view_types]
+        family_types = FilteredElementCollector(doc).OfClass(ViewFamilyType).ToElements()
+        lists += [[vt for vt in family_types if vt.ViewFamily == f] for f in families]
+        lists.append([v for v in all_views if v.IsTemplate])
+        on_sheets = set(i.IntegerValue for sheet in FilteredElementCollector(doc).OfCategory(
+            BuiltInCategory.OST_Sheets).WhereElementIsNotElementType()
+            for i in sheet.GetAllPlacedViews())
+        lists.append([v for v in lists[2] if v.Id.IntegerValue not in on_sheets])
+        lists.append([d for v in lists[2] for d in v.GetDependentViewIds()])
+        return [len(items) for items in lists]
+
+    def indexed(index):
+        lists = [index.views(t) for t in view_types]
+        lists += [index.view_family_types(f) for f in families]
+        lists.append(index.templates())
+        lists.append(index.unplaced(ViewType.FloorPlan))
+        lists.append([d for r in lists[2] for d in index.dependents(r.id)])
+        return [len(items) for items in lists]
+
+    with ctx.timer("list_comprehensions"):
+        for _ in range(runs):
+            expected = legacy()
+    with ctx.timer("index_build"):
+        index = ViewIndex(doc)
+    with ctx.timer("index_buckets"):
+        for _ in range(runs):
+            counts = indexed(index)
+    # the Samples/ViewsSheets.py call: elements of raw ids
+    sections = index.elements(index.view_family_types(ViewFamily.Section))
+    ctx.note("runs", runs)
+    ctx.note("views", len(index.records))
+    ctx.note("same_counts", counts == expected)
+    ctx.note("same_section_types", sorted(vt.Id.IntegerValue for vt in sections) == sorted(
+        vt.Id.IntegerValue for vt in FilteredElementCollector(doc).OfClass(ViewFamilyType)
+        if vt.ViewFamily == ViewFamily.Section))
+
+
+# -------------------------------
+# Bulk parameters
+# -------------------------------
+BENCH_PARAMETERS = ("Type", "Workset", "Phase Created", "Comments", "Mark", "Length", "Area",
+                    "Base Constraint", "Type Name", "Family Name")
+
+
+def _legacy_param_value(param):
+    # Samples/Parameters.py get_param_value()
+    value = None
+    if param.StorageType == StorageType.Double: value = param.AsDouble()
+    elif param.StorageType == StorageType.ElementId: value = param.AsElementId()
+    elif param.StorageType == StorageType.Integer: value = param.AsInteger()
+    elif param.StorageType == StorageType.String: value = param.AsString()
+    return value
+
+
+@benchmark("params.read")
+def params_read(ctx):
+    """10 parameters of every instance: LookupParameter per value vs. ParameterReader."""
+    from .params import ParameterReader
+    doc = ctx.doc
+    elements = [doc.GetElement(ElementId(i)) for i in ctx.instance_ids()]
+    with ctx.timer("lookup_per_element"):
+        rows = []
+        for element in elements:
+            row = []
+            for name in BENCH_PARAMETERS:
+                param = element.LookupParameter(name)
+                if param is None:
+                    element_type = doc.GetElement(element.GetTypeId())
+                    param = element_type.LookupParameter(name) if element_type else None
+                row.append(_legacy_param_value(param) if param is not None else None)
+            rows.append(row)
+    with ctx.timer("reader"):
+        reader = ParameterReader(doc, BENCH_PARAMETERS)
+        columns = reader.read(elements)
+    filled = sum(1 for column in columns.values() for value in column if value is not None)
+    ctx.note("elements", len(elements))
+    ctx.note("values", filled)
+    ctx.note("type_resolutions", reader.resolutions)
+
+
+@benchmark("params.write")
+def params_write(ctx):
+    """Set Mark on every instance: LookupParameter + Set vs. ParameterWriter."""
+    from .params import write_parameter
+    doc = ctx.doc
+    elements = [doc.GetElement(ElementId(i)) for i in ctx.instance_ids()]
+    marks = ["M-{}".format(i) for i in range(len(elements))]
+    t = Transaction(doc, "Set Marks")
+    t.Start()
+    try:
+        with ctx.timer("lookup_per_element"):
+            for element, mark in zip(elements, marks):
+                element.LookupParameter("Mark").Set(mark)
+        with ctx.timer("writer"):
+            skipped = write_parameter(doc, elements, "Mark", marks)
+    finally:
+        t.RollBack()
+    ctx.note("elements", len(elements))
+    ctx.note("skipped", len(skipped))
+
+
+@benchmark("params.bindings")
+def params_bindings(ctx):
+    """400 loaded-parameter checks, 300 bindings: ForwardIterator + list scan vs. BindingsIndex."""
+    from .bindings import get_bindings_index, release_bindings_index
+    from .standin import Category, CategorySet, Definition, InstanceBinding
+    doc = ctx.doc
+    walls = [BuiltInCategory.OST_Walls, BuiltInCategory.OST_Doors, BuiltInCategory.OST_Windows]
+    outer = TransactionGroup(doc, "Benchmark")     # rolled back: the cached model stays clean
+    outer.Start()
+    try:
+        t = Transaction(doc, "Bind")
+        t.Start()
+        wall_categories = CategorySet(Category.GetCategory(doc, c) for c in walls[:2])
+        for number in range(300 - doc.ParameterBindings.Size):
+            doc.ParameterBindings.Insert(Definition("HT_Bench {:03d}".format(number),
+                                                    StorageType.String),
+                                         InstanceBinding(wall_categories))
+        t.Commit()
+        loaded = []
+        iterator = doc.ParameterBindings.ForwardIterator()
+        while iterator.MoveNext():
+            loaded.append(iterator.Key.Name)
+        required = loaded[::2] + ["Missing Parameter {:03d}".format(n) for n in range(250)]
+
+        def legacy_missing(names):
+            # Samples/Parameters.py check_loaded_params()
+            bindings = doc.ParameterBindings.ForwardIterator()
+            bindings.Reset()
+            loaded_parameters = []
+            while bindings.MoveNext():
+                loaded_parameters.append(bindings.Key.Name)
+            return [name for name in names if name not in loaded_parameters]
+
+        with ctx.timer("legacy_check"):
+            missing = legacy_missing(required)
+        release_bindings_index(doc)
+        with ctx.timer("index_build"):
+            bindings = get_bindings_index(doc)
+            bindings.rebuild()
+        with ctx.timer("index_check"):
+            assert bindings.missing(required) == missing
+        with ctx.timer("index_coverage"):
+            problems = bindings.check(dict((name, walls) for name in loaded))
+        t = Transaction(doc, "Unbind")
+        t.Start()
+        iterator = doc.ParameterBindings.ForwardIterator()
+        iterator.MoveNext()
+        doc.ParameterBindings.Remove(iterator.Key)
+        t.Commit()                              # DocumentChanged: the index goes stale
+        with ctx.timer("check_after_change"):
+            after = bindings.missing(required)
+    finally:
+        outer.RollBack()
+        release_bindings_index(doc)
+    ctx.note("bindings", len(loaded))
+    ctx.note("required", len(required))
+    ctx.note("missing", len(missing))
+    ctx.note("not_on_walls_doors_windows", len(problems))
+    ctx.note("missing_after_unbind", len(after))
+    ctx.note("builds", bindings.builds)
+
+
+# -------------------------------
+# Chunked transactions
+# -------------------------------
+@benchmark("batch.set_comments")
+def batch_set_comments(ctx):
+    """run_batch vs. one hand-made transaction: set Comments on every instance.
+
+    In the ``*_failures`` runs every 25,000th element raises: the legacy
+    loop loses the whole edit, run_batch replays that element's chunk
+    and skips only the element.
+    """
+    from .batch import run_batch
+    doc = ctx.doc
+    ids = ctx.instance_ids()
+    failing = [False]
+
+    def set_comment(element_id):
+        if failing[0] and element_id % 25000 == 0:
+            raise ValueError("bad element")
+        doc.GetElement(ElementId(element_id)).LookupParameter("Comments").Set("HT batch")
+
+    def legacy():
+        t = Transaction(doc, "Set Comments")
+        t.Start()
+        try:
+            for element_id in ids:
+                set_comment(element_id)
+            t.Commit()
+        except ValueError:
+            t.RollBack()
+
+    outer = TransactionGroup(doc, "Benchmark")     # rolled back: the cached model stays clean
+    outer.Start()
+    try:
+        with ctx.timer("single_transaction"):
+            legacy()
+        for chunk_size in (100, 1000, 10000):
+            with ctx.timer("run_batch_{}".format(chunk_size)):
+                run_batch(doc, ids, set_comment, "Set Comments", chunk_size=chunk_size)
+        failing[0] = True
+        with ctx.timer("single_transaction_failures"):
+            legacy()
+        with ctx.timer("run_batch_1000_failures"):
+            report = run_batch(doc, ids, set_comment, "Set Comments", chunk_size=1000)
+        calls = [0]
+
+        def cancel_halfway():
+            calls[0] += 1
+            return calls[0] > len(ids) // 2000
+        cancelled = run_batch(doc, ids, set_comment, "Set Comments", chunk_size=1000,
+                              cancel=cancel_halfway)
+    finally:
+        outer.RollBack()
+    ctx.note("items", len(ids))
+    ctx.note("failed", len(report.failed))
+    ctx.note("replayed_chunks", report.replayed_chunks)
+    ctx.note("items_per_s", int(report.throughput))
+    ctx.note("cancelled_after", cancelled.done)
+
+
+# -------------------------------
+# Parameter export / import
+# -------------------------------
+EXCHANGE_PARAMETERS = ("Comments", "Mark", "Length", "Base Constraint", "Type Name")
+
+
+def _peak_memory(func):
+    """Peak traced allocation of ``func()`` in MB (None without tracemalloc)."""
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+    tracemalloc.start()
+    try:
+        func()
+        return round(tracemalloc.get_traced_memory()[1] / 1048576.0, 1)
+    finally:
+        tracemalloc.stop()
+
+
+@benchmark("exchange.parameters")
+def exchange_parameters(ctx):
+    """Export 5 parameters, edit 1% of the rows, import: whole-list legacy vs. streaming."""
+    import csv
+    import os
+    import shutil
+    import tempfile
+    from .exchange import export_parameters, import_parameters
+    doc = ctx.doc
+    ids = ctx.instance_ids()
+    folder = tempfile.mkdtemp(prefix="ht_bench_")
+    paths = dict((ext, os.path.join(folder, "params." + ext)) for ext in ("csv", "jsonl"))
+    edited = os.path.join(folder, "edited.csv")
+
+    def legacy_rows():
+        rows = [["id"] + list(EXCHANGE_PARAMETERS)]
+        for element_id in ids:
+            element = doc.GetElement(ElementId(element_id))
+            row = [element_id]
+            for name in EXCHANGE_PARAMETERS:
+                param = element.LookupParameter(name)
+                if param is None:
+                    element_type = doc.GetElement(element.GetTypeId())
+                    param = element_type.LookupParameter(name) if element_type else None
+                value = _legacy_param_value(param) if param is not None else None
+                row.append(value.IntegerValue if isinstance(value, ElementId) else value)
+            rows.append(row)
+        return rows
+
+    def legacy_export():
+        rows = legacy_rows()
+        with open(os.path.join(folder, "legacy.csv"), "w") as f:
+            csv.writer(f).writerows(rows)
+
+    def stream_export():
+        export_parameters(doc, (ElementId(i) for i in ids), EXCHANGE_PARAMETERS, paths["csv"])
+
+    outer = TransactionGroup(doc, "Benchmark")     # rolled back: the cached model stays clean
+    outer.Start()
+    try:
+        with ctx.timer("legacy_export_csv"):
+            legacy_export()
+        with ctx.timer("export_csv"):
+            stream_export()
+        with ctx.timer("export_jsonl"):
+            rows = export_parameters(doc, (ElementId(i) for i in ids), EXCHANGE_PARAMETERS,
+                                     paths["jsonl"])
+        with open(paths["csv"]) as source, open(edited, "w") as target:
+            for number, line in enumerate(source):
+                if number and number % 100 == 0:   # new Comments on 1% of the rows
+                    cells = line.split(",", 2)
+                    line = u"{},HT edited {},{}".format(cells[0], number, cells[2])
+                target.write(line)
+        with ctx.timer("import_dry_run"):
+            preview = import_parameters(doc, edited, dry_run=True)
+        with ctx.timer("import"):
+            report = import_parameters(doc, edited)
+        with ctx.timer("import_again"):                     # nothing left to change
+            again = import_parameters(doc, edited)
+        with ctx.timer("legacy_import"):
+            # Comments and Mark of every row Set in one transaction
+            t = Transaction(doc, "Import")
+            t.Start()
+            with open(edited) as f:
+                reader = csv.reader(f)
+                header = next(reader)
+                for row in reader:
+                    element = doc.GetElement(ElementId(int(row[0].lstrip(u"\ufeff"))))
+                    for name, value in zip(header[1:3], row[1:3]):
+                        element.LookupParameter(name).Set(value)
+            t.Commit()
+        ctx.note("legacy_export_peak_mb", _peak_memory(legacy_export))
+        ctx.note("export_peak_mb", _peak_memory(stream_export))
+    finally:
+        outer.RollBack()
+        shutil.rmtree(folder, ignore_errors=True)
+    ctx.note("rows", rows)
+    ctx.note("changes", preview.changes)
+    ctx.note("unchanged", report.unchanged)
+    ctx.note("failed", len(report.failed))
+    ctx.note("chunks", report.batch.chunks)
+    ctx.note("changes_second_import", again.changes)
+
+
+# -------------------------------
+# Single-pass categoriser
+# -------------------------------
+@benchmark("categories.scan")
+def categories_scan(ctx):
+    """18 audit categories: two OfCategory collectors each (instances, types) vs. one pass."""
+    from .categories import AUDIT_CATEGORIES, categorise
+    doc = ctx.doc
+    with ctx.timer("collector_per_list"):
+        lists = {}
+        for category in AUDIT_CATEGORIES:
+            lists[category, False] = FilteredElementCollector(doc).OfCategory(category) \
+                .WhereElementIsNotElementType().ToElements()
+            lists[category, True] = FilteredElementCollector(doc).OfCategory(category) \
+                .WhereElementIsElementType().ToElements()
+    with ctx.timer("categorise"):
+        buckets = categorise(doc, AUDIT_CATEGORIES)
+    with ctx.timer("ids_of_every_list"):
+        for category in AUDIT_CATEGORIES:
+            buckets.ids(category)
+            buckets.ids(category, True)
+    with ctx.timer("elements_of_every_list"):
+        for key, elements in lists.items():
+            assert len(buckets.elements(*key)) == len(elements)
+    with ctx.timer("whole_model"):
+        everything = categorise(doc)
+    # the stand-in answers OfCategory from a per-category dict; Revit's quick
+    # filters visit every element record once per collector
+    ctx.note("collectors", len(lists))
+    ctx.note("revit_records_visited_per_list", len(lists) * len(doc._elements))
+    ctx.note("revit_records_visited_one_pass", len(doc._elements))
+    ctx.note("elements", len(buckets))
+    ctx.note("buckets", sum(len(by_class) for by_class in buckets.buckets.values()))
+    ctx.note("whole_model_elements", len(everything))
+
+
+# -------------------------------
+# Memoised collector queries
+# -------------------------------
+@benchmark("querycache.collectors")
+def querycache_collectors(ctx):
+    """200 button runs collecting levels, views, sheets and door types: raw vs. QueryCache.
+
+    Between runs 50 and 51 a wall edit (kept entries) and a level rename
+    (drops the level entry only) go through DocumentChanged.
+    """
+    from .querycache import get_query_cache, release_query_cache
+    from .standin import FamilySymbol, Level
+    doc = ctx.doc
+    runs = 200
+
+    def raw():
+        return [FilteredElementCollector(doc).OfClass(Level).ToElements(),
+                FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Views)
+                .WhereElementIsNotElementType().ToElements(),
+                FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Sheets)
+                .WhereElementIsNotElementType().ToElements(),
+                FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Doors)
+                .OfClass(FamilySymbol).ToElements()]
+
+    def cached(cache):
+        return [cache.collect(element_class=Level, types=None),
+                cache.collect(BuiltInCategory.OST_Views),
+                cache.collect(BuiltInCategory.OST_Sheets),
+                cache.collect(BuiltInCategory.OST_Doors, FamilySymbol, types=None)]
+
+    walls = [i for i in ctx.instance_ids()
+             if doc._elements[i]._cat == int(BuiltInCategory.OST_Walls)][:1000]
+    level = FilteredElementCollector(doc).OfClass(Level).FirstElement()
+    outer = TransactionGroup(doc, "Benchmark")     # rolled back: the cached model stays clean
+    outer.Start()
+    release_query_cache(doc)
+    cache = get_query_cache(doc)
+    try:
+        with ctx.timer("collectors"):
+            for _ in range(runs):
+                expected = [len(items) for items in raw()]
+        with ctx.timer("cached"):
+            for run in range(runs):
+                counts = [len(items) for items in cached(cache)]
+                if run == 50:
+                    t = Transaction(doc, "Edit")
+                    t.Start()
+                    for element_id in walls:
+                        doc.GetElement(ElementId(element_id)).LookupParameter("Comments") \
+                            .Set("HT")
+                    t.Commit()
+                    kept = len(cache.entries)
+                    t = Transaction(doc, "Rename Level")
+                    t.Start()
+                    level.Name = level.Name + " *"
+                    t.Commit()
+                    after_rename = len(cache.entries)
+    finally:
+        outer.RollBack()
+        release_query_cache(doc)
+    ctx.note("runs", runs)
+    ctx.note("same_counts", counts == expected)
+    ctx.note("entries_after_wall_edit", kept)
+    ctx.note("entries_after_level_rename", after_rename)
+    ctx.note("hits", cache.hits)
+    ctx.note("misses", cache.misses)
+    ctx.note("ms_saved", int(cache.seconds_saved * 1000))
+
+
+# -------------------------------
+# Multi-criteria query engine
+# -------------------------------
+@benchmark("query.filter")
+def query_filter(ctx):
+    """ElementIndex: one indexing pass, then interactive AND/OR/NOT re-filters."""
+    from .query import ElementIndex
+    doc = ctx.doc
+    ctx.note("elements", ctx.select_instances())
+    elements = [doc.GetElement(i) for i in ctx.uidoc.Selection.GetElementIds()]
+    with ctx.timer("index"):
+        index = ElementIndex(doc, elements)
+    levels = [value for value, _ in index.values("level")]
+    for number in range(10):
+        with ctx.timer("refilter"):
+            match = (index.where("category", ["Walls", "Doors", "Windows"])
+                     | index.where("family", "Furniture Family 1")) \
+                & ~index.where("level", levels[number % len(levels)]) \
+                & index.where("workset", ["Workset1", "Workset2"])
+            ids = match.ids()
+    ctx.note("matched", len(ids))
+
+
+
+# -------------------------------
+# Element query DSL
+# -------------------------------
+def _box_hits(element, low, high):
+    box = element.get_BoundingBox(None)
+    return box is not None and box.Min.X <= high.X and box.Max.X >= low.X \
+        and box.Min.Y <= high.Y and box.Max.Y >= low.Y and box.Min.Z <= high.Z \
+        and box.Max.Z >= low.Z
+
+
+@benchmark("query.dsl")
+def query_dsl(ctx):
+    """Three queries: ToElements() plus list comprehensions vs. a compiled ElementQuery."""
+    from .elementquery import ElementQuery
+    from .standin import BuiltInParameter, Level, Outline, XYZ
+    doc = ctx.doc
+    walls, openings = BuiltInCategory.OST_Walls, (BuiltInCategory.OST_Doors,
+                                                  BuiltInCategory.OST_Windows)
+    length = BuiltInParameter.CURVE_ELEM_LENGTH
+    level = FilteredElementCollector(doc).OfClass(Level).FirstElement()
+    low, high = XYZ(0, 0, -1000), XYZ(standin.SITE_SIZE / 4, standin.SITE_SIZE / 4, 1000)
+
+    with ctx.timer("comprehension"):
+        all_walls = FilteredElementCollector(doc).OfCategory(walls) \
+            .WhereElementIsNotElementType().ToElements()
+        long_walls = [w for w in all_walls if w.get_Parameter(length).AsDouble() > 20.0]
+        level_openings = [e for category in openings
+                          for e in FilteredElementCollector(doc).OfCategory(category)
+                          .WhereElementIsNotElementType().ToElements()
+                          if e.LevelId == level.Id and _box_hits(e, low, high)]
+        everything = FilteredElementCollector(doc).WhereElementIsNotElementType().ToElements()
+        in_region = [e for e in everything if _box_hits(e, low, high)]
+        expected = [len(long_walls), len(level_openings), len(in_region)]
+
+    queries = [
+        ElementQuery(doc).category(walls).instances().where(length, ">", 20.0),
+        ElementQuery(doc).category(*openings).instances().on_level(level, native_only=True)
+        .intersects(Outline(low, high)),
+        ElementQuery(doc).instances().intersects(low, high),
+    ]
+    with ctx.timer("element_query"):
+        found = [len(query.elements()) for query in queries]
+    with ctx.timer("element_query_ids"):
+        counted = [len(query.ids()) for query in queries]
+    ctx.note("matched", expected)
+    ctx.note("same_results", expected == found == counted)
+    ctx.note("plan", queries[1].explain().splitlines()[1:])
+
+
+# -------------------------------
+# Spatial index
+# -------------------------------
+@benchmark("spatial.queries")
+def spatial_queries(ctx):
+    """10k box and point queries: one native collector each vs. SpatialIndex."""
+    import random
+    from .spatial import index_elements
+    from .standin import BoundingBoxIntersectsFilter, Outline, XYZ
+    doc = ctx.doc
+    rnd = random.Random(49)
+    with ctx.timer("index"):
+        index = index_elements(doc, (ElementId(i) for i in ctx.instance_ids()))
+    top = max(box[5] for box in index._boxes)
+    boxes = []
+    for _ in range(10000):
+        x, y = rnd.uniform(0, standin.SITE_SIZE), rnd.uniform(0, standin.SITE_SIZE)
+        z = rnd.uniform(0, top)
+        boxes.append((x, y, z, x + 10.0, y + 10.0, z + 10.0))
+    points = [box[:3] for box in boxes]
+
+    with ctx.timer("collector_x10"):
+        native = [sorted(i.IntegerValue for i in FilteredElementCollector(doc).WherePasses(
+            BoundingBoxIntersectsFilter(Outline(XYZ(*box[:3]), XYZ(*box[3:])))).ToElementIds())
+            for box in boxes[:10]]
+    with ctx.timer("box_10k"):
+        hits = [index.intersecting(box) for box in boxes]
+    with ctx.timer("batch_arrays"):       # once per index state, on the first batch
+        index.intersecting_many(boxes[:1])
+    with ctx.timer("box_10k_batch"):
+        batch = index.intersecting_many(boxes)
+    with ctx.timer("point_10k"):
+        inside = [index.containing(point) for point in points]
+    with ctx.timer("point_10k_batch"):
+        inside_batch = index.containing_many(points)
+    with ctx.timer("nearest5_1k"):
+        for point in points[:1000]:
+            index.nearest(point, 5)
+    moved = [element_id for found in hits[:200] for element_id in found][:1000]
+    with ctx.timer("move_1k"):
+        for element_id in moved:
+            index.add(element_id, tuple(v + 5.0 for v in index.box(element_id)))
+    ctx.note("boxes", len(index))
+    ctx.note("cells", len(index.cells))
+    ctx.note("cell_size_ft", round(index.cell_size, 1))
+    ctx.note("same_as_collector", native == [sorted(found) for found in hits[:10]])
+    ctx.note("same_batches", [sorted(f) for f in hits] == [sorted(f) for f in batch] and
+             [sorted(f) for f in inside] == [sorted(f) for f in inside_batch])
+    ctx.note("box_hits", sum(len(found) for found in hits))
+    ctx.note("point_hits", sum(len(found) for found in inside))
+
+
+# -------------------------------
+# Bulk creation
+# -------------------------------
+def _creation_rows(kind, count, rnd):
+    """``count`` rows of ``kind`` in metres; every 500th row is bad (reported, not created)."""
+    rows = []
+    for number in range(1, count + 1):
+        bad = number % 500 == 0
+        x, y = rnd.uniform(0, 300), rnd.uniform(0, 300)
+        if kind in ("wall", "beam", "detail_line"):
+            end = x if bad else x + rnd.uniform(1, 6)      # bad: zero length
+            row = {"x0": x, "y0": y, "x1": end, "y1": y}
+            if kind == "beam":
+                row["z0"] = row["z1"] = 3.0
+        elif kind == "filled_region":
+            size = rnd.uniform(1, 4)
+            corners = [(x, y), (x + size, y), (x + size, y + size), (x, y + size)]
+            if bad:                                     # bad: two points
+                corners = corners[:2]
+            row = {"points": "; ".join("{:.3f} {:.3f}".format(*c) for c in corners)}
+        else:
+            row = {"x": x, "y": y}
+            if kind == "text_note":
+                row["text"] = "" if bad else "Note {}".format(number)
+            elif bad:
+                row["level"] = "Level 99"
+        rows.append(row)
+    return rows
+
+
+@benchmark("creation.bulk")
+def creation_bulk(ctx):
+    """Create rows of each kind: one transaction per element (CreateElements.py) vs. bulk.
+
+    The stand-in commits for free; in Revit every commit also regenerates,
+    so the transaction counts matter as much as the timings. The garbage
+    collector is off while timing, as in ``timeit``: its full passes over
+    the model land at random in one step or another.
+    """
+    import gc
+    import random
+    from .creation import FEET_PER_METRE, KINDS, create_elements
+    from .standin import (CurveLoop, FamilySymbol, FilledRegion, FilledRegionType, Line,
+                          StructuralType, TextNote, TextNoteType, UV, Wall, XYZ)
+    doc = ctx.doc
+    view = doc.ActiveView
+    level = view.GenLevel
+    count = max(100, min(ctx.size // 20, 10000))
+    rnd = random.Random(50)
+    rows = dict((kind, _creation_rows(kind, count, rnd)) for kind in KINDS)
+    report_chunks = [0]
+
+    def point(row, suffix=""):
+        return XYZ(row["x" + suffix] * FEET_PER_METRE, row["y" + suffix] * FEET_PER_METRE,
+                   row.get("z" + suffix, 0.0) * FEET_PER_METRE)
+
+    def legacy_element(kind, row):
+        if kind == "wall":
+            Wall.Create(doc, Line.CreateBound(point(row, "0"), point(row, "1")), level.Id, False)
+        elif kind == "beam":
+            beam_type = FilteredElementCollector(doc).OfCategory(
+                BuiltInCategory.OST_StructuralFraming).OfClass(FamilySymbol).FirstElement()
+            doc.Create.NewFamilyInstance(Line.CreateBound(point(row, "0"), point(row, "1")),
+                                         beam_type, level, StructuralType.Beam)
+        elif kind == "detail_line":
+            doc.Create.NewDetailCurve(view, Line.CreateBound(point(row, "0"), point(row, "1")))
+        elif kind == "text_note":
+            text_type_id = FilteredElementCollector(doc).OfClass(TextNoteType).FirstElementId()
+            TextNote.Create(doc, view.Id, point(row), row["text"], text_type_id)
+        elif kind == "room":
+            if row.get("level"):
+                raise ValueError("no such level")
+            doc.Create.NewRoom(level, UV(row["x"] * FEET_PER_METRE, row["y"] * FEET_PER_METRE))
+        else:
+            region_type_id = FilteredElementCollector(doc).OfClass(
+                FilledRegionType).FirstElementId()
+            points = [XYZ(*[float(v) * FEET_PER_METRE for v in item.split()] + [0.0])
+                      for item in row["points"].split(";")]
+            boundary = CurveLoop()
+            for start, end in zip(points, points[1:] + points[:1]):
+                boundary.Append(Line.CreateBound(start, end))
+            FilledRegion.Create(doc, region_type_id, view.Id, List[CurveLoop]([boundary]))
+
+    def legacy(kind):
+        for row in rows[kind]:
+            t = Transaction(doc, "Create")
+            t.Start()
+            try:
+                legacy_element(kind, row)
+                t.Commit()
+            except Exception:
+                t.RollBack()
+
+    outer = TransactionGroup(doc, "Benchmark")     # rolled back: the cached model stays clean
+    outer.Start()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for kind in KINDS:
+            with ctx.timer("legacy_" + kind):
+                legacy(kind)
+            with ctx.timer("bulk_" + kind):
+                report = create_elements(doc, rows[kind], kind=kind, scale=FEET_PER_METRE)
+            legacy_seconds = ctx.timings["legacy_" + kind][-1]
+            ctx.note(kind + "_per_s", "{:,.0f} (legacy {:,.0f})".format(
+                report.throughput, count / legacy_seconds if legacy_seconds else 0.0))
+            ctx.note(kind + "_failed", len(report.failed))
+            report_chunks[0] = report.batch.chunks
+        mixed = [dict(row, kind=kind) for kind in KINDS for row in rows[kind]]
+        random.Random(51).shuffle(mixed)
+        with ctx.timer("bulk_mixed"):
+            report = create_elements(doc, mixed, scale=FEET_PER_METRE)
+    finally:
+        if gc_enabled:
+            gc.enable()
+        outer.RollBack()
+    ctx.note("rows_per_kind", count)
+    ctx.note("transactions_per_kind", "{} (legacy {})".format(report_chunks[0], count))
+    ctx.note("mixed_created", len(report.created))
+    ctx.note("mixed_replayed_chunks", report.batch.replayed_chunks)
+
+if __name__ == "__main__":
+    sys.exit(main())
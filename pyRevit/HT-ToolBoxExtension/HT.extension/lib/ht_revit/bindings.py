@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""Loaded project / shared parameters, indexed by name and GUID.
+
+``check_loaded_params()`` in the samples walked
+``doc.ParameterBindings.ForwardIterator()`` on every call and then
+scanned the collected names once per required parameter. The
+``BindingsIndex`` walks the map once per document and answers from
+dicts and category sets:
+
+>>> bindings = get_bindings_index(doc)
+>>> bindings.missing(["HT_Zone", "HT_Code", "Fire Rating"])
+['Fire Rating']
+>>> bindings.uncovered("HT_Zone", [BuiltInCategory.OST_Walls, BuiltInCategory.OST_Doors])
+[-2000023]                      # category ids HT_Zone is not bound to
+
+It is a ``session`` cache: any DocumentChanged marks it stale and the
+next question re-reads the map (a few hundred entries), so an unrelated
+edit costs nothing until a check actually runs.
+"""
+
+from .api import ElementId, InstanceBinding
+from .levels import INVALID, int_id
+from .session import get_cached, release, same_document
+
+_SESSION_KEY = "bindings"
+
+
+class BoundParameter(object):
+    """One entry of ``doc.ParameterBindings``."""
+
+    __slots__ = ("name", "definition", "is_instance", "categories", "guid", "id")
+
+    def __init__(self, name, definition, is_instance, categories, guid, element_id):
+        self.name = name
+        self.definition = definition
+        self.is_instance = is_instance
+        self.categories = categories    # frozenset of category ids
+        self.guid = guid                # str for shared parameters, else None
+        self.id = element_id            # ParameterElement id
+
+    @property
+    def is_shared(self):
+        return self.guid is not None
+
+
+def category_key(category):
+    """Category id from a ``Category``, ``ElementId``, ``BuiltInCategory`` or int."""
+    category_id = getattr(category, "Id", None)
+    if category_id is not None:
+        return int_id(category_id)
+    if isinstance(category, ElementId):
+        return int_id(category)
+    return int(category)
+
+
+def _guid_of(doc, definition):
+    guid = getattr(definition, "GUID", None)        # ExternalDefinition / stand-in
+    if guid is None:
+        element_id = getattr(definition, "Id", None)
+        element = doc.GetElement(element_id) if element_id is not None else None
+        guid = getattr(element, "GuidValue", None)  # SharedParameterElement
+    return str(guid) if guid is not None else None
+
+
+class BindingsIndex(object):
+    """Name / GUID -> ``BoundParameter`` for one document, rebuilt when stale."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.by_name = {}       # name -> [BoundParameter] (project names may repeat)
+        self.by_guid = {}       # GUID string -> BoundParameter
+        self.stale = True
+        self.builds = 0
+
+    def rebuild(self):
+        self.by_name.clear()
+        self.by_guid.clear()
+        iterator = self.doc.ParameterBindings.ForwardIterator()
+        iterator.Reset()
+        while iterator.MoveNext():
+            definition, binding = iterator.Key, iterator.Current
+            if definition is None or binding is None:
+                continue
+            categories = frozenset(int_id(c.Id) for c in binding.Categories)
+            bound = BoundParameter(definition.Name, definition,
+                                   isinstance(binding, InstanceBinding), categories,
+                                   _guid_of(self.doc, definition),
+                                   int_id(definition.Id) if hasattr(definition, "Id") else INVALID)
+            self.by_name.setdefault(bound.name, []).append(bound)
+            if bound.guid is not None:
+                self.by_guid[bound.guid] = bound
+        self.stale = False
+        self.builds += 1
+
+    def on_document_changed(self, sender, args):
+        if same_document(args.GetDocument(), self.doc):
+            self.stale = True
+
+    # -------------------------------
+    # Queries (O(1) each, after at most one rebuild)
+    # -------------------------------
+    def get(self, key):
+        """``BoundParameter`` by name or GUID (str or System.Guid), or None."""
+        if self.stale:
+            self.rebuild()
+        found = self.by_name.get(key)
+        if found:
+            return found[0]
+        return self.by_guid.get(str(key))
+
+    def is_loaded(self, key):
+        return self.get(key) is not None
+
+    def missing(self, keys):
+        """The names / GUIDs in ``keys`` that are not bound, in order."""
+        return [key for key in keys if self.get(key) is None]
+
+    def uncovered(self, key, categories):
+        """Category ids of ``categories`` that ``key`` is not bound to (all if not loaded)."""
+        wanted = [category_key(c) for c in categories]
+        bound = self.get(key)
+        covered = set()
+        if bound is not None:
+            for entry in self.by_name.get(bound.name, [bound]):
+                covered |= entry.categories
+        return [c for c in wanted if c not in covered]
+
+    def check(self, requirements):
+        """``{name: [categories]}`` -> ``{name: uncovered category ids}`` for the failures.
+
+        A parameter that is not loaded at all lists every category.
+        """
+        problems = {}
+        for key, categories in requirements.items():
+            uncovered = self.uncovered(key, categories)
+            if uncovered:
+                problems[key] = uncovered
+        return problems
+
+
+def get_bindings_index(doc):
+    """The session's ``BindingsIndex`` for ``doc``."""
+    return get_cached(doc, _SESSION_KEY, BindingsIndex)
+
+
+def release_bindings_index(doc):
+    release(doc, _SESSION_KEY)
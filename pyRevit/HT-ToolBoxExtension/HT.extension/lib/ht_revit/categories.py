@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Every category list of an audit from one collector pass.
+
+Samples/FilteredElementCollector.py builds each list with its own
+``FilteredElementCollector(doc).OfCategory(...)``, once for instances
+and again for types: one document scan per list. ``categorise()`` runs
+a single collector with an ``ElementMulticategoryFilter`` and files each
+element id under its category, instance / type and class:
+
+>>> buckets = categorise(doc, AUDIT_CATEGORIES)
+>>> buckets.count(BuiltInCategory.OST_Doors), buckets.count(BuiltInCategory.OST_Doors, True)
+(1840, 12)
+>>> walls = buckets.elements(BuiltInCategory.OST_Walls)
+>>> symbols = buckets.of_class(FamilySymbol)            # ElementIds, any scanned category
+>>> buckets.rows()[:1]
+[('Ceilings', 6120, 12)]                                # name, instances, types
+
+Buckets hold raw integer ids. ``ids()`` builds a bucket's ``ElementId``
+list on first use (and keeps it); ``elements()`` fetches the elements
+only when asked, so lists nobody looks at cost one int each.
+"""
+
+from .api import (BuiltInCategory, ElementId, ElementIsElementTypeFilter,
+                  ElementMulticategoryFilter, ElementType, FilteredElementCollector, List,
+                  LogicalOrFilter)
+from .bindings import category_key
+from .levels import int_id
+
+# The categories of the Samples' collector lists
+AUDIT_CATEGORIES = (
+    BuiltInCategory.OST_Walls, BuiltInCategory.OST_Floors, BuiltInCategory.OST_Ceilings,
+    BuiltInCategory.OST_Roofs, BuiltInCategory.OST_Doors, BuiltInCategory.OST_Windows,
+    BuiltInCategory.OST_Furniture, BuiltInCategory.OST_GenericModel,
+    BuiltInCategory.OST_StructuralColumns, BuiltInCategory.OST_StructuralFraming,
+    BuiltInCategory.OST_Rooms, BuiltInCategory.OST_Stairs, BuiltInCategory.OST_Lines,
+    BuiltInCategory.OST_TextNotes, BuiltInCategory.OST_Grids, BuiltInCategory.OST_Levels,
+    BuiltInCategory.OST_Views, BuiltInCategory.OST_Sheets,
+)
+
+
+def category_filter(categories):
+    """``ElementMulticategoryFilter`` over categories given as anything ``category_key`` takes."""
+    return ElementMulticategoryFilter(List[ElementId](ElementId(category_key(c))
+                                                      for c in categories))
+
+
+def any_element_filter():
+    """Passes everything: Revit wants at least one filter before iterating a collector."""
+    return LogicalOrFilter(ElementIsElementTypeFilter(False), ElementIsElementTypeFilter(True))
+
+
+class CategoryIndex(object):
+    """``(category id, is type) -> {class: [int ids]}`` from one ``categorise()`` pass."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.buckets = {}
+        self.categories = {}    # category id -> Category, for names
+        self._ids = {}          # memoised ElementId lists
+
+    def _raw(self, category, types=False, element_class=None):
+        by_class = self.buckets.get((category_key(category), bool(types)), {})
+        if element_class is None and len(by_class) == 1:
+            return next(iter(by_class.values()))
+        return [i for cls, ids in by_class.items()
+                if element_class is None or issubclass(cls, element_class) for i in ids]
+
+    def count(self, category, types=False):
+        return sum(len(ids) for ids in
+                   self.buckets.get((category_key(category), bool(types)), {}).values())
+
+    def ids(self, category, types=False, element_class=None):
+        """``ElementId`` list of one bucket (memoised); ``element_class`` narrows it."""
+        key = (category_key(category), bool(types), element_class)
+        ids = self._ids.get(key)
+        if ids is None:
+            ids = self._ids[key] = [ElementId(i)
+                                    for i in self._raw(category, types, element_class)]
+        return ids
+
+    def elements(self, category, types=False, element_class=None):
+        get_element = self.doc.GetElement
+        return [get_element(i) for i in self.ids(category, types, element_class)]
+
+    def of_class(self, element_class, types=None):
+        """``ElementId`` list of every scanned element of ``element_class`` (or a subclass).
+
+        ``types`` None keeps instances and types, else only one of them.
+        """
+        key = ("class", element_class, types)
+        ids = self._ids.get(key)
+        if ids is None:
+            ids = self._ids[key] = [
+                ElementId(i) for (_, is_type), by_class in sorted(self.buckets.items())
+                if types is None or is_type == types
+                for cls, raw in by_class.items() if issubclass(cls, element_class) for i in raw]
+        return ids
+
+    def rows(self):
+        """``[(category name, instances, types)]`` sorted by name."""
+        rows = [(category.Name, self.count(category_id), self.count(category_id, True))
+                for category_id, category in self.categories.items()]
+        rows.sort()
+        return rows
+
+    def __len__(self):
+        return sum(len(ids) for by_class in self.buckets.values() for ids in by_class.values())
+
+
+def categorise(doc, categories=None, view_id=None):
+    """Bucket ``categories`` (every categorised element if None) in one collector pass.
+
+    ``view_id`` limits the pass to the elements visible in that view.
+    Returns a ``CategoryIndex``.
+    """
+    collector = FilteredElementCollector(doc, view_id) if view_id is not None \
+        else FilteredElementCollector(doc)
+    collector.WherePasses(category_filter(categories) if categories is not None
+                          else any_element_filter())
+    index = CategoryIndex(doc)
+    by_key = {}             # (category id, class) -> [int ids]
+    for element in collector:
+        category = element.Category
+        if category is None:
+            continue
+        key = (int_id(category.Id), type(element))
+        bucket = by_key.get(key)
+        if bucket is None:
+            bucket = by_key[key] = []
+            index.categories.setdefault(key[0], category)
+        bucket.append(int_id(element.Id))
+
+    is_type = {}            # class -> derives from ElementType, checked once per class
+    for (category_id, cls), ids in by_key.items():
+        if cls not in is_type:
+            is_type[cls] = issubclass(cls, ElementType)
+        index.buckets.setdefault((category_id, is_type[cls]), {})[cls] = ids
+    return index
@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+"""Bulk element creation from tabular rows (survey points, CSV, JSON lines).
+
+Samples/CreateElements.py places one wall, room, text note, beam or
+filled region at a time: its own type lookup, its own transaction.
+``create_elements()`` takes a stream of rows (``{column: value}``
+dicts, e.g. ``exchange.read_records(path)``) and:
+
+* resolves level, view and type names once per name (``Resolver``)
+* converts the coordinates of a chunk of rows in one pass:
+  ``(point - origin) * scale`` and every curve length, so rows with a
+  curve under Revit's short curve tolerance are reported before the
+  transaction instead of failing (and replaying) a chunk
+* creates the elements with ``batch.run_batch``: one transaction per
+  chunk inside one ``TransactionGroup``; a row that still raises is
+  isolated with a ``SubTransaction`` and reported
+
+>>> report = create_elements(doc, read_records(r"C:\\temp\\survey.csv"), kind=WALL,
+...                          scale=FEET_PER_METRE, origin=(512000.0, 181000.0, 0.0))
+>>> print(report.summary())
+✅ 4,998 element(s) from 5,000 row(s), 3,120 elements/s
+🧱 wall 4,998
+❌ 2 row(s) failed, first: row 17: curve shorter than the short curve tolerance
+>>> report.created[:1]                                  # (row, kind, ElementId)
+[(1, 'wall', <ElementId 351201>)]
+
+Columns per kind (coordinates in input units, ``z`` columns optional):
+
+* ``wall``: x0 y0 z0 x1 y1 z1, level, type, height
+* ``beam``: x0 y0 z0 x1 y1 z1, level, type (``Family: Type`` or type name)
+* ``detail_line``: x0 y0 x1 y1, view
+* ``text_note``: x y z, text, view, type
+* ``room``: x y, level
+* ``filled_region``: points (``"x y; x y; x y"``, a closed loop), view, type
+
+A ``kind`` column lets one table mix kinds. An empty name takes the
+``level`` / ``view`` argument (lowest level, active view) or the first
+type. Row numbers count data rows from 1.
+"""
+
+import math
+import time
+
+from .api import (BuiltInCategory, CurveLoop, FamilySymbol, FilledRegion, FilledRegionType,
+                  FilteredElementCollector, Line, List, StructuralType, TextNote, TextNoteType,
+                  UV, View, Wall, WallType, XYZ)
+from .batch import DEFAULT_CHUNK_SIZE, BatchFailure, chunks, run_batch
+from .levels import get_levels
+from .spatial import as_point
+
+try:
+    _text = unicode     # noqa: F821 - IronPython 2.7
+except NameError:
+    _text = str
+
+WALL, BEAM, DETAIL_LINE, TEXT_NOTE, ROOM, FILLED_REGION = (
+    "wall", "beam", "detail_line", "text_note", "room", "filled_region")
+KINDS = (WALL, BEAM, DETAIL_LINE, TEXT_NOTE, ROOM, FILLED_REGION)
+CURVE_KINDS = (WALL, BEAM, DETAIL_LINE)
+KIND_COLUMN = "kind"
+
+FEET_PER_METRE = 1 / 0.3048
+SHORT_CURVE_TOLERANCE = 0.00256     # ft, when the application does not say
+DEFAULT_WALL_HEIGHT = 10.0          # ft
+
+# kind -> (type class, category narrowing it)
+TYPE_SOURCES = {
+    WALL: (WallType, None),
+    BEAM: (FamilySymbol, BuiltInCategory.OST_StructuralFraming),
+    TEXT_NOTE: (TextNoteType, None),
+    FILLED_REGION: (FilledRegionType, None),
+}
+
+
+# -------------------------------
+# Names
+# -------------------------------
+def _name(value):
+    return _text(value).strip() if value is not None else u""
+
+
+class Resolver(object):
+    """Level, view and type names -> elements, each collected once.
+
+    ``level`` / ``view`` are the defaults for empty names (lowest level,
+    ``doc.ActiveView`` if None). Unknown names raise ``ValueError``.
+    """
+
+    def __init__(self, doc, level=None, view=None):
+        self.doc = doc
+        self.default_level = level
+        self.default_view = view
+        self._levels = None
+        self._views = None
+        self._types = {}        # kind -> ({name: type}, first type)
+
+    def level(self, name):
+        name = _name(name)
+        if self._levels is None:
+            levels = get_levels(self.doc)
+            self._levels = dict((level.Name, level) for level in reversed(levels))
+            if self.default_level is None and levels:
+                self.default_level = levels[0]
+        if not name:
+            if self.default_level is None:
+                raise ValueError(u"The document has no level")
+            return self.default_level
+        return self._find(self._levels, name, u"level")
+
+    def view(self, name):
+        name = _name(name)
+        if not name:
+            view = self.default_view if self.default_view is not None else self.doc.ActiveView
+            if view is None:
+                raise ValueError(u"No view given and no active view")
+            return view
+        if self._views is None:
+            views = [v for v in FilteredElementCollector(self.doc).OfClass(View)
+                     if not v.IsTemplate]
+            self._views = dict((view.Name, view) for view in reversed(views))
+        return self._find(self._views, name, u"view")
+
+    def element_type(self, kind, name):
+        """Type of ``kind`` named ``Family: Type`` or ``Type``; the first one if empty."""
+        entry = self._types.get(kind)
+        if entry is None:
+            type_class, category = TYPE_SOURCES[kind]
+            collector = FilteredElementCollector(self.doc)
+            if category is not None:
+                collector.OfCategory(category)
+            types = list(collector.OfClass(type_class))
+            by_name = {}
+            for element_type in reversed(types):
+                by_name[element_type.Name] = element_type
+                by_name[u"{}: {}".format(element_type.FamilyName, element_type.Name)] = \
+                    element_type
+            entry = self._types[kind] = (by_name, types[0] if types else None)
+        name = _name(name)
+        if not name:
+            if entry[1] is None:
+                raise ValueError(u"The document has no {} type".format(kind))
+            return entry[1]
+        return self._find(entry[0], name, u"{} type".format(kind))
+
+    def _find(self, by_name, name, what):
+        element = by_name.get(name)
+        if element is None:
+            raise ValueError(u"Unknown {} '{}'".format(what, name))
+        return element
+
+
+# -------------------------------
+# Rows
+# -------------------------------
+def _number(row, key, default=None):
+    value = row.get(key)
+    if value is None or value == u"":
+        if default is None:
+            raise ValueError(u"'{}' is missing".format(key))
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(u"'{}' is not a number: '{}'".format(key, value))
+
+
+def row_kind(row):
+    kind = _name(row.get(KIND_COLUMN)).lower().replace(u" ", u"_")
+    if kind not in KINDS:
+        raise ValueError(u"Unknown kind '{}'".format(row.get(KIND_COLUMN)))
+    return str(kind)
+
+
+def row_points(kind, row):
+    """The input-unit points of a row: 2 for a curve, 1 for a note / room, n for a region."""
+    if kind in CURVE_KINDS:
+        return [(_number(row, "x0"), _number(row, "y0"), _number(row, "z0", 0.0)),
+                (_number(row, "x1"), _number(row, "y1"), _number(row, "z1", 0.0))]
+    if kind != FILLED_REGION:
+        return [(_number(row, "x"), _number(row, "y"), _number(row, "z", 0.0))]
+    points = []
+    for item in _name(row.get("points")).split(u";"):
+        values = item.split()
+        if not values:
+            continue
+        if len(values) not in (2, 3):
+            raise ValueError(u"'points' needs 'x y' or 'x y z' per point: '{}'".format(item))
+        try:
+            values = [float(v) for v in values]
+        except ValueError:
+            raise ValueError(u"'points' is not a list of numbers: '{}'".format(item))
+        points.append(tuple(values) if len(values) == 3 else (values[0], values[1], 0.0))
+    if len(points) < 3:
+        raise ValueError(u"A filled region needs three or more points")
+    return points
+
+
+def transform(points, segments, origin=(0.0, 0.0, 0.0), scale=1.0):
+    """``(points, lengths)``: every ``(point - origin) * scale`` and segment length of a chunk.
+
+    ``segments`` are ``(start, end)`` indexes into ``points``.
+    """
+    ox, oy, oz = origin
+    coords = [((x - ox) * scale, (y - oy) * scale, (z - oz) * scale) for x, y, z in points]
+    lengths = [math.sqrt((coords[b][0] - coords[a][0]) ** 2 + (coords[b][1] - coords[a][1]) ** 2
+                         + (coords[b][2] - coords[a][2]) ** 2) for a, b in segments]
+    return coords, lengths
+
+
+# -------------------------------
+# Creation
+# -------------------------------
+def _new_wall(doc, curve, type_id, level_id, height):
+    return Wall.Create(doc, curve, type_id, level_id, height, 0.0, False, False)
+
+
+def _new_beam(doc, curve, symbol, level):
+    if not symbol.IsActive:
+        symbol.Activate()
+    return doc.Create.NewFamilyInstance(curve, symbol, level, StructuralType.Beam)
+
+
+def _new_detail_line(doc, view, curve):
+    return doc.Create.NewDetailCurve(view, curve)
+
+
+def _new_room(doc, level, point):
+    return doc.Create.NewRoom(level, point)
+
+
+def _new_text_note(doc, view_id, point, text, type_id):
+    return TextNote.Create(doc, view_id, point, text, type_id)
+
+
+def _new_filled_region(doc, type_id, view_id, loops):
+    return FilledRegion.Create(doc, type_id, view_id, loops)
+
+
+class _Job(object):
+    """One prepared row: ``create(doc, *args)`` inside the chunk transaction."""
+
+    __slots__ = ("row", "kind", "create", "args")
+
+    def __init__(self, row, kind, create, args):
+        self.row = row
+        self.kind = kind
+        self.create = create
+        self.args = args
+
+
+def _build_job(number, kind, row, points, resolver, scale):
+    """Resolve the names of a row and build its geometry (no transaction needed)."""
+    if kind in CURVE_KINDS:
+        curve = Line.CreateBound(points[0], points[1])
+        if kind == WALL:
+            height = _number(row, "height", 0.0) * scale or DEFAULT_WALL_HEIGHT
+            return _Job(number, kind, _new_wall,
+                        (curve, resolver.element_type(kind, row.get("type")).Id,
+                         resolver.level(row.get("level")).Id, height))
+        if kind == BEAM:
+            return _Job(number, kind, _new_beam, (curve, resolver.element_type(
+                kind, row.get("type")), resolver.level(row.get("level"))))
+        return _Job(number, kind, _new_detail_line, (resolver.view(row.get("view")), curve))
+    if kind == ROOM:
+        return _Job(number, kind, _new_room,
+                    (resolver.level(row.get("level")), UV(points[0].X, points[0].Y)))
+    if kind == TEXT_NOTE:
+        text = _text(row.get("text") or u"")
+        if not text.strip():
+            raise ValueError(u"'text' is missing")
+        return _Job(number, kind, _new_text_note,
+                    (resolver.view(row.get("view")).Id, points[0], text,
+                     resolver.element_type(kind, row.get("type")).Id))
+    loop = CurveLoop()
+    for start, end in zip(points, points[1:] + points[:1]):
+        loop.Append(Line.CreateBound(start, end))
+    return _Job(number, kind, _new_filled_region,
+                (resolver.element_type(kind, row.get("type")).Id,
+                 resolver.view(row.get("view")).Id, List[CurveLoop]([loop])))
+
+
+def prepare(resolver, numbered_rows, report, kind=None, origin=(0.0, 0.0, 0.0), scale=1.0,
+            tolerance=SHORT_CURVE_TOLERANCE):
+    """``_Job`` list for one chunk of ``(row number, row)``; bad rows go to ``report.failed``."""
+    pending = []            # (number, kind, row, first point, point count)
+    points, segments, segment_rows = [], [], []
+    for number, row in numbered_rows:
+        report.rows += 1
+        try:
+            this_kind = kind or row_kind(row)
+            these = row_points(this_kind, row)
+        except Exception as error:
+            report.failed.append(BatchFailure(number, error))
+            continue
+        first, count = len(points), len(these)
+        points.extend(these)
+        if this_kind == FILLED_REGION:
+            segments.extend((first + i, first + (i + 1) % count) for i in range(count))
+            segment_rows.extend([number] * count)
+        elif this_kind in CURVE_KINDS:
+            segments.append((first, first + 1))
+            segment_rows.append(number)
+        pending.append((number, this_kind, row, first, count))
+
+    coords, lengths = transform(points, segments, origin, scale)
+    short = set(segment_rows[i] for i, length in enumerate(lengths) if length < tolerance)
+    jobs = []
+    for number, this_kind, row, first, count in pending:
+        try:
+            if number in short:
+                raise ValueError(u"curve shorter than the short curve tolerance")
+            jobs.append(_build_job(number, this_kind, row,
+                                   [XYZ(*point) for point in coords[first:first + count]],
+                                   resolver, scale))
+        except Exception as error:
+            report.failed.append(BatchFailure(number, error))
+    return jobs
+
+
+class CreationReport(object):
+    """What ``create_elements`` did; ``batch`` is the ``BatchReport`` of the creation."""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = []       # (row number, kind, ElementId), by row
+        self.failed = []        # BatchFailure(row number, error), by row
+        self.batch = None
+        self.seconds = 0.0
+
+    @property
+    def ids(self):
+        return [element_id for _, _, element_id in self.created]
+
+    @property
+    def kinds(self):
+        """``[(kind, created count)]`` in ``KINDS`` order."""
+        counts = {}
+        for _, kind, _ in self.created:
+            counts[kind] = counts.get(kind, 0) + 1
+        return [(kind, counts[kind]) for kind in KINDS if kind in counts]
+
+    @property
+    def throughput(self):
+        """Elements per second, preparation included."""
+        return len(self.created) / self.seconds if self.seconds else 0.0
+
+    @property
+    def cancelled(self):
+        return self.batch is not None and self.batch.cancelled
+
+    def summary(self):
+        text = u"✅ {:,} element(s) from {:,} row(s), {:,.0f} elements/s".format(
+            len(self.created), self.rows, self.throughput)
+        if self.created:
+            text += u"\n🧱 " + u", ".join(u"{} {:,}".format(kind, count)
+                                          for kind, count in self.kinds)
+        if self.failed:
+            first = self.failed[0]
+            text += u"\n❌ {:,} row(s) failed, first: row {}: {}".format(
+                len(self.failed), first.item, first.error)
+        if self.cancelled:
+            text += u"\n🚫 Cancelled after {:,} row(s)".format(self.rows)
+        return text
+
+
+def create_elements(doc, rows, kind=None, scale=1.0, origin=(0.0, 0.0, 0.0), level=None,
+                    view=None, chunk_size=DEFAULT_CHUNK_SIZE, name="Create elements",
+                    progress=None, cancel=None):
+    """Create one element per row, ``chunk_size`` rows per transaction.
+
+    ``kind`` None reads each row's ``kind`` column. ``scale`` and
+    ``origin`` (input units) map the coordinates to feet; lengths such as
+    the wall height are scaled too. ``progress`` / ``cancel`` are passed
+    to ``run_batch``. Returns a ``CreationReport``.
+    """
+    if kind is not None and kind not in KINDS:
+        raise ValueError(u"Unknown kind '{}'".format(kind))
+    start = time.time()
+    report = CreationReport()
+    resolver = Resolver(doc, level, view)
+    origin = as_point(origin)
+    tolerance = getattr(doc.Application, "ShortCurveTolerance", SHORT_CURVE_TOLERANCE)
+    created = {}            # row -> (kind, ElementId); a replayed chunk overwrites
+
+    def jobs():
+        for chunk in chunks(enumerate(rows, 1), max(1, chunk_size)):
+            for job in prepare(resolver, chunk, report, kind, origin, scale, tolerance):
+                yield job
+
+    def create(job):
+        created[job.row] = (job.kind, job.create(doc, *job.args).Id)
+
+    report.batch = run_batch(doc, jobs(), create, name, chunk_size, progress=progress,
+                             cancel=cancel)
+    report.failed.extend(BatchFailure(f.item.row, f.error) for f in report.batch.failed)
+    report.failed.sort(key=lambda f: f.item)
+    failed = set(f.item for f in report.failed)
+    report.created = [(number, created[number][0], created[number][1])
+                      for number in sorted(created) if number not in failed]
+    report.seconds = time.time() - start
+    return report
+
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""Declarative element queries, compiled to collector filters.
+
+The samples filter after ``ToElements()``::
+
+    all_lines    = FilteredElementCollector(doc).OfClass(CurveElement).ToElements()
+    detail_lines = [l for l in all_lines if l.CurveElementType == CurveElementType.DetailCurve]
+
+which wraps every element in Python before testing it. An
+``ElementQuery`` collects the conditions first and runs them cheapest
+first:
+
+1. quick filters: category, class, instance / type, bounding box (and
+   level, for the elements whose ``LevelId`` carries it), checked by
+   Revit on the element record without expanding the element
+2. slow filters: parameter rules built with ``ParameterFilterRuleFactory``
+3. Python predicates, only on the elements that passed 1 and 2
+
+>>> query = (ElementQuery(doc).category(BuiltInCategory.OST_Walls).instances()
+...          .where(BuiltInParameter.CURVE_ELEM_LENGTH, ">", 20.0)
+...          .intersects(XYZ(0, 0, 0), XYZ(100, 100, 30)))
+>>> print(query.explain())
+FilteredElementCollector(doc)
+ 1. quick   category OST_Walls                      ElementCategoryFilter
+ 2. quick   instances                               ElementIsElementTypeFilter
+ 3. quick   box intersects (0, 0, 0)-(100, 100, 30) BoundingBoxIntersectsFilter
+ 4. slow    CURVE_ELEM_LENGTH > 20.0                ElementParameterFilter
+>>> ids = query.ids()
+
+Parameters given by ``BuiltInParameter``, or by the name of a loaded
+project / shared parameter, become native rules. Other names (family
+parameters, built-ins given by their display name) are looked up by
+name in Python; ``explain()`` marks them "(by name)".
+"""
+
+import operator
+
+from .api import (BoundingBoxContainsPointFilter, BoundingBoxIntersectsFilter,
+                  BoundingBoxIsInsideFilter, ElementCategoryFilter, ElementClassFilter,
+                  ElementFilter, ElementId, ElementIsElementTypeFilter, ElementLevelFilter,
+                  ElementParameterFilter, FilteredElementCollector, List, LogicalOrFilter,
+                  Outline, ParameterFilterRuleFactory)
+from .bindings import get_bindings_index
+from .categories import any_element_filter, category_filter
+from .levels import INVALID, int_id, level_filter
+from .query import parameter_value
+
+try:
+    _text_types = (str, unicode)  # noqa: F821 - IronPython 2.7
+except NameError:
+    _text_types = (str,)
+
+QUICK, SLOW, PYTHON = "quick", "slow", "python"
+_TIERS = (QUICK, SLOW, PYTHON)
+# Order of the quick filters: the index-backed, most selective ones first
+_QUICK_RANK = {"category": 0, "class": 1, "kind": 2, "level": 3, "box": 4}
+
+DEFAULT_TOLERANCE = 1e-6      # feet, for rules on Double parameters
+
+_RULE_FACTORIES = {
+    "==": "CreateEqualsRule", "!=": "CreateNotEqualsRule",
+    ">": "CreateGreaterRule", ">=": "CreateGreaterOrEqualRule",
+    "<": "CreateLessRule", "<=": "CreateLessOrEqualRule",
+    "contains": "CreateContainsRule", "not contains": "CreateNotContainsRule",
+    "begins with": "CreateBeginsWithRule", "ends with": "CreateEndsWithRule",
+}
+_NO_VALUE_RULES = {"has value": "CreateHasValueParameterRule",
+                   "has no value": "CreateHasNoValueParameterRule"}
+
+
+def _text_test(test):
+    # string rules are case-insensitive in Revit 2023+; the Python side follows
+    return lambda a, b: a is not None and test(a.lower(), b.lower())
+
+
+_PYTHON_TESTS = {
+    "==": operator.eq, "!=": operator.ne, ">": operator.gt, ">=": operator.ge,
+    "<": operator.lt, "<=": operator.le,
+    "contains": _text_test(lambda a, b: b in a),
+    "not contains": _text_test(lambda a, b: b not in a),
+    "begins with": _text_test(lambda a, b: a.startswith(b)),
+    "ends with": _text_test(lambda a, b: a.endswith(b)),
+}
+
+
+class QueryStep(object):
+    """One condition: a collector filter (quick / slow) or a Python predicate."""
+
+    __slots__ = ("tier", "rank", "label", "filter", "predicate")
+
+    def __init__(self, tier, label, element_filter=None, predicate=None, rank=0):
+        self.tier = tier
+        self.rank = rank
+        self.label = label
+        self.filter = element_filter
+        self.predicate = predicate
+
+    def describe(self):
+        name = type(self.filter).__name__ if self.filter is not None else ""
+        return u"{:<7} {:<39} {}".format(self.tier, self.label, name).rstrip()
+
+
+def _point(xyz):
+    return u"({:g}, {:g}, {:g})".format(xyz.X, xyz.Y, xyz.Z)
+
+
+def _outline(minimum, maximum=None):
+    if maximum is None:
+        return minimum
+    return Outline(minimum, maximum)
+
+
+class ElementQuery(object):
+    """Conditions on the elements of ``doc``; narrowed in place, like a collector."""
+
+    def __init__(self, doc, view_id=None, element_ids=None):
+        self.doc = doc
+        self.view_id = view_id
+        self.element_ids = element_ids
+        self._steps = []
+        self._order = 0
+
+    # -------------------------------
+    # Conditions
+    # -------------------------------
+    def _add(self, tier, label, element_filter=None, predicate=None, kind=None):
+        if tier == QUICK and element_filter is not None and \
+                not element_filter.IsElementQuickFilter():
+            tier = SLOW
+        rank = (_QUICK_RANK.get(kind, len(_QUICK_RANK)) if tier == QUICK else 0, self._order)
+        self._order += 1
+        self._steps.append(QueryStep(tier, label, element_filter, predicate, rank))
+        return self
+
+    def category(self, *categories):
+        label = u"category " + u", ".join(str(c) for c in categories)
+        element_filter = ElementCategoryFilter(categories[0]) if len(categories) == 1 \
+            else category_filter(categories)
+        return self._add(QUICK, label, element_filter, kind="category")
+
+    def of_class(self, *classes):
+        label = u"class " + u", ".join(c.__name__ for c in classes)
+        filters = [ElementClassFilter(c) for c in classes]
+        element_filter = filters[0] if len(filters) == 1 \
+            else LogicalOrFilter(List[ElementFilter](filters))
+        return self._add(QUICK, label, element_filter, kind="class")
+
+    def instances(self):
+        return self._add(QUICK, u"instances", ElementIsElementTypeFilter(True), kind="kind")
+
+    def types(self):
+        return self._add(QUICK, u"types", ElementIsElementTypeFilter(False), kind="kind")
+
+    def on_level(self, level, native_only=False):
+        """On ``level`` (element or id): ``LevelId``, or a level parameter unless ``native_only``.
+
+        The full test ors parameter rules in, so it runs as a slow filter.
+        """
+        level_id = level if isinstance(level, ElementId) else level.Id
+        if native_only:
+            return self._add(QUICK, u"LevelId {}".format(int_id(level_id)),
+                             ElementLevelFilter(level_id), kind="level")
+        return self._add(QUICK, u"level {}".format(int_id(level_id)), level_filter(level_id),
+                         kind="level")
+
+    def intersects(self, minimum, maximum=None, tolerance=0.0):
+        """Bounding box intersects an ``Outline`` (or the box ``minimum``-``maximum``)."""
+        outline = _outline(minimum, maximum)
+        label = u"box intersects {}-{}".format(_point(outline.MinimumPoint),
+                                                _point(outline.MaximumPoint))
+        return self._add(QUICK, label, BoundingBoxIntersectsFilter(outline, tolerance, False),
+                         kind="box")
+
+    def inside(self, minimum, maximum=None, tolerance=0.0):
+        """Bounding box lies inside an ``Outline`` (or the box ``minimum``-``maximum``)."""
+        outline = _outline(minimum, maximum)
+        label = u"box inside {}-{}".format(_point(outline.MinimumPoint),
+                                           _point(outline.MaximumPoint))
+        return self._add(QUICK, label, BoundingBoxIsInsideFilter(outline, tolerance, False),
+                         kind="box")
+
+    def contains_point(self, point, tolerance=0.0):
+        return self._add(QUICK, u"box contains {}".format(_point(point)),
+                         BoundingBoxContainsPointFilter(point, tolerance, False), kind="box")
+
+    def where(self, parameter, op, value=None, tolerance=DEFAULT_TOLERANCE):
+        """Parameter condition: ``op`` is one of ==, !=, >, >=, <, <=, contains,
+        not contains, begins with, ends with, has value, has no value.
+
+        ``parameter`` is a ``BuiltInParameter`` or a parameter name.
+        """
+        if op not in _RULE_FACTORIES and op not in _NO_VALUE_RULES:
+            raise ValueError(u"Unknown operator {!r}; use one of {}".format(
+                op, u", ".join(sorted(_RULE_FACTORIES) + sorted(_NO_VALUE_RULES))))
+        name = parameter if isinstance(parameter, _text_types) else str(parameter)
+        if op in _NO_VALUE_RULES:
+            label = u"{} {}".format(name, op)
+        elif isinstance(value, _text_types):
+            label = u"{} {} '{}'".format(name, op, value)
+        else:
+            label = u"{} {} {}".format(name, op, value)
+        parameter_id = self._parameter_id(parameter)
+        if parameter_id is None:
+            return self._add(PYTHON, label + u" (by name)",
+                             predicate=_parameter_predicate(parameter, op, value))
+        rule = _rule(parameter_id, op, value, tolerance)
+        return self._add(SLOW, label, ElementParameterFilter(rule))
+
+    def matching(self, predicate, label=None):
+        """Python ``predicate(element)``, run last on what the filters let through."""
+        return self._add(PYTHON, label or getattr(predicate, "__name__", u"predicate"),
+                         predicate=predicate)
+
+    def _parameter_id(self, parameter):
+        if not isinstance(parameter, _text_types):
+            return ElementId(parameter)                     # BuiltInParameter
+        bound = get_bindings_index(self.doc).get(parameter)
+        if bound is not None and bound.id != INVALID:
+            return ElementId(bound.id)                      # ParameterElement
+        return None
+
+    # -------------------------------
+    # Plan
+    # -------------------------------
+    def plan(self):
+        """The steps in execution order: quick filters, slow filters, predicates."""
+        return sorted(self._steps, key=lambda s: (_TIERS.index(s.tier), s.rank))
+
+    def explain(self):
+        if self.view_id is not None:
+            source = u"FilteredElementCollector(doc, view {})".format(int_id(self.view_id))
+        elif self.element_ids is not None:
+            source = u"FilteredElementCollector(doc, {} ids)".format(len(self.element_ids))
+        else:
+            source = u"FilteredElementCollector(doc)"
+        lines = [source]
+        lines.extend(u"{:>2}. {}".format(number, step.describe())
+                     for number, step in enumerate(self.plan(), 1))
+        return u"\n".join(lines)
+
+    # -------------------------------
+    # Running
+    # -------------------------------
+    def collector(self):
+        """The collector with every filter applied (Python predicates excluded)."""
+        if self.view_id is not None:
+            collector = FilteredElementCollector(self.doc, self.view_id)
+        elif self.element_ids is not None:
+            collector = FilteredElementCollector(self.doc, List[ElementId](self.element_ids))
+        else:
+            collector = FilteredElementCollector(self.doc)
+        filters = [step.filter for step in self.plan() if step.filter is not None]
+        for element_filter in filters or [any_element_filter()]:
+            collector.WherePasses(element_filter)
+        return collector
+
+    def _predicates(self):
+        return [step.predicate for step in self.plan() if step.predicate is not None]
+
+    def __iter__(self):
+        predicates = self._predicates()
+        for element in self.collector():
+            if all(predicate(element) for predicate in predicates):
+                yield element
+
+    def elements(self):
+        return list(self)
+
+    def ids(self):
+        """``ElementId`` list; without predicates no element is expanded."""
+        if not self._predicates():
+            return list(self.collector().ToElementIds())
+        return [element.Id for element in self]
+
+    def count(self):
+        if not self._predicates():
+            return self.collector().GetElementCount()
+        return sum(1 for _ in self)
+
+    def first(self):
+        for element in self:
+            return element
+        return None
+
+
+def _rule(parameter_id, op, value, tolerance):
+    if op in _NO_VALUE_RULES:
+        return getattr(ParameterFilterRuleFactory, _NO_VALUE_RULES[op])(parameter_id)
+    factory = getattr(ParameterFilterRuleFactory, _RULE_FACTORIES[op])
+    if isinstance(value, float):
+        return factory(parameter_id, value, tolerance)
+    if isinstance(value, _text_types):
+        try:
+            return factory(parameter_id, value)
+        except TypeError:       # before Revit 2023: caseSensitive argument
+            return factory(parameter_id, value, False)
+    return factory(parameter_id, value)         # int, ElementId
+
+
+def _parameter_predicate(name, op, value):
+    """Python test of the parameter called ``name``, for names Revit rules cannot reach."""
+    if op in _NO_VALUE_RULES:
+        wanted = op == "has value"
+
+        def has_value(element):
+            param = element.LookupParameter(name)
+            return (param is not None and param.HasValue) == wanted
+        return has_value
+    test = _PYTHON_TESTS[op]
+    as_id = isinstance(value, ElementId)
+    if as_id:
+        value = int_id(value)
+
+    def compare(element):
+        param = element.LookupParameter(name)
+        if param is None or not param.HasValue:
+            return False
+        current = int_id(param.AsElementId()) if as_id else parameter_value(param)
+        return current is not None and test(current, value)
+    return compare
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""Stream parameter values to CSV / JSON-lines and push edits back.
+
+Export reads the elements a chunk at a time with a ``ParameterReader``
+and writes each chunk in one call, so a collector over the whole model
+is never turned into a list:
+
+>>> walls = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Walls) \\
+...     .WhereElementIsNotElementType()
+>>> export_parameters(doc, walls, ["Mark", "Comments", "Length"], r"C:\\temp\\walls.csv")
+20102
+
+Import reads the file back in chunks. For each chunk it reads the current
+values, keeps only the cells that differ, and applies them with
+``batch.run_batch``: one transaction per chunk, inside one
+``TransactionGroup``, and failing cells are reported rather than aborting:
+
+>>> report = import_parameters(doc, r"C:\\temp\\walls.csv")
+>>> report.rows, report.changes, len(report.failed)
+(20102, 311, 2)
+
+The first column is ``id``; the other headers are parameter names
+(``BuiltInParameter`` names such as ``ALL_MODEL_MARK`` also work).
+Values are in Revit internal units; ElementId parameters hold the
+integer id. An empty cell clears a text parameter and leaves numbers
+alone. A column the element only has on its type (``Type Name``, a type
+parameter) is exported, but edits to it are skipped on import and
+counted in ``report.type_cells``: ``ParameterWriter`` sets instance
+parameters only.
+"""
+
+import csv
+import io
+import json
+import sys
+from collections import OrderedDict
+
+from .api import BuiltInParameter, ElementId
+from .batch import DEFAULT_CHUNK_SIZE, chunks, run_batch
+from .levels import int_id
+from .params import ParameterReader, ParameterWriter, column_name
+
+try:
+    _text = unicode     # noqa: F821 - IronPython 2.7
+    _text_types = (str, unicode)  # noqa: F821
+except NameError:
+    _text = str
+    _text_types = (str,)
+
+ID_COLUMN = "id"
+CSV, JSONL = "csv", "jsonl"
+_BUFFER_SIZE = 1 << 16
+_ABSENT = object()      # a JSON-lines row without that key
+
+
+def file_format(path):
+    return JSONL if path.lower().endswith((".jsonl", ".json")) else CSV
+
+
+def parameter_key(header):
+    """``BuiltInParameter`` for an upper-case header that names one, else the header."""
+    if header.isupper():
+        bip = getattr(BuiltInParameter, header, None)
+        if bip is not None:
+            return bip
+    return header
+
+
+# -------------------------------
+# Export
+# -------------------------------
+def iter_parameter_rows(doc, elements, names, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield ``(element id, value, value, ...)`` per element, reading a chunk at a time."""
+    reader = ParameterReader(doc, names)
+    get_element = doc.GetElement
+    for chunk in chunks(elements, chunk_size):
+        chunk = [get_element(e) if isinstance(e, ElementId) else e for e in chunk]
+        chunk = [e for e in chunk if e is not None]
+        columns = list(reader.read(chunk).values())
+        for element, row in zip(chunk, zip(*columns)):
+            yield (int_id(element.Id),) + row
+
+
+def _cell(value):
+    """Text form of a value: the CSV cell, and what the diff compares."""
+    if value is None:
+        return u""
+    if isinstance(value, float):
+        return _text(repr(value))
+    return _text(value)
+
+
+def _csv_field(value):
+    text = _cell(value)
+    if any(c in text for c in u',"\r\n'):
+        return u'"' + text.replace(u'"', u'""') + u'"'
+    return text
+
+
+def _json_line(headers, row):
+    return _text(json.dumps(OrderedDict(zip(headers, row)), ensure_ascii=False)) + u"\n"
+
+
+def export_parameters(doc, elements, names, path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write ``id`` plus one column per parameter to ``path`` (.csv or .jsonl).
+
+    Returns the number of rows written.
+    """
+    headers = [ID_COLUMN] + [column_name(name) for name in names]
+    rows = iter_parameter_rows(doc, elements, names, chunk_size)
+    count = 0
+    if file_format(path) == JSONL:
+        with io.open(path, "w", encoding="utf-8", buffering=_BUFFER_SIZE) as f:
+            for chunk in chunks(rows, chunk_size):
+                f.write(u"".join(_json_line(headers, row) for row in chunk))
+                count += len(chunk)
+        return count
+    with io.open(path, "w", encoding="utf-8-sig", newline="", buffering=_BUFFER_SIZE) as f:
+        f.write(u",".join(_csv_field(h) for h in headers) + u"\r\n")
+        for chunk in chunks(rows, chunk_size):
+            f.write(u"".join(u",".join([_text(row[0])] + [_csv_field(v) for v in row[1:]])
+                             + u"\r\n" for row in chunk))
+            count += len(chunk)
+    return count
+
+
+# -------------------------------
+# Import
+# -------------------------------
+def _read_csv(path):
+    if sys.version_info[0] < 3:     # csv works on byte strings there
+        with open(path, "rb") as f:
+            for number, row in enumerate(csv.reader(f)):
+                row = [cell.decode("utf-8") for cell in row]
+                if number == 0 and row and row[0].startswith(u"\ufeff"):
+                    row[0] = row[0][1:]
+                yield row
+        return
+    with io.open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.reader(f):
+            yield row
+
+
+def read_rows(path):
+    """``(headers, rows)``: rows are ``(element id, [cell per parameter header])``."""
+    if file_format(path) == JSONL:
+        return _read_jsonl(path)
+    lines = _read_csv(path)
+    header = next(lines, None)
+    if not header or header[0] != ID_COLUMN:
+        raise ValueError(u"'{}' must start with an '{}' column".format(path, ID_COLUMN))
+    return header[1:], ((int(row[0]), row[1:]) for row in lines if row and row[0])
+
+
+def read_records(path):
+    """Yield each row of ``path`` (.csv or .jsonl) as a ``{header: cell}`` dict, streaming.
+
+    Unlike ``read_rows`` no ``id`` column is needed: used for tables of
+    new elements (``creation.create_elements``).
+    """
+    if file_format(path) == JSONL:
+        with io.open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    lines = _read_csv(path)
+    header = next(lines, None)
+    if header:
+        for row in lines:
+            if any(row):
+                yield dict(zip(header, row))
+
+
+def _read_jsonl(path):
+    # the parameter columns are the keys of the first object
+    with io.open(path, encoding="utf-8") as f:
+        first = f.readline()
+    if not first.strip():
+        return [], iter(())
+    headers = [key for key in json.loads(first, object_pairs_hook=OrderedDict)
+               if key != ID_COLUMN]
+
+    def rows():
+        with io.open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    item = json.loads(line)
+                    yield int(item[ID_COLUMN]), [item.get(h, _ABSENT) for h in headers]
+    return headers, rows()
+
+
+class ParameterChange(object):
+    __slots__ = ("element_id", "name", "old", "new")
+
+    def __init__(self, element_id, name, old, new):
+        self.element_id = element_id
+        self.name = name
+        self.old = old
+        self.new = new
+
+
+class ImportReport(object):
+    """What an import found and did; ``batch`` is the ``BatchReport`` (None for a dry run)."""
+
+    def __init__(self, headers):
+        self.headers = headers
+        self.rows = 0
+        self.missing_elements = 0   # ids that no longer resolve
+        self.unchanged = 0          # cells equal to the current value
+        self.changes = 0
+        self.type_cells = 0         # edited cells of type parameters: skipped, not written
+        self.type_columns = []      # headers those cells were in
+        self.preview = []           # the first changes, for a confirmation dialog
+        self.batch = None
+
+    @property
+    def failed(self):
+        return self.batch.failed if self.batch is not None else []
+
+
+def diff_rows(doc, headers, rows, report, chunk_size=DEFAULT_CHUNK_SIZE, preview_limit=100):
+    """Yield a ``ParameterChange`` per cell that differs from the model, a chunk at a time."""
+    names = [parameter_key(h) for h in headers]
+    reader = ParameterReader(doc, names)
+    get_element = doc.GetElement
+    for chunk in chunks(rows, chunk_size):
+        report.rows += len(chunk)
+        elements, cells = [], []
+        for element_id, row in chunk:
+            element = get_element(ElementId(element_id))
+            if element is None:
+                report.missing_elements += 1
+                continue
+            elements.append(element)
+            cells.append(row)
+        current = list(reader.read(elements).values())
+        for position, (element, row) in enumerate(zip(elements, cells)):
+            for column, new in enumerate(row[:len(names)]):
+                if new is _ABSENT:
+                    continue
+                old = current[column][position]
+                if new is None:     # JSON null
+                    new = u""
+                if _cell(new) == _cell(old) or (new == u"" and not isinstance(old, _text_types)):
+                    report.unchanged += 1
+                    continue
+                if column in reader.type_columns(element):
+                    report.type_cells += 1
+                    if headers[column] not in report.type_columns:
+                        report.type_columns.append(headers[column])
+                    continue
+                # only text cells get here empty: u"" clears them (Set(None) is
+                # ambiguous between the string and ElementId overloads in IronPython)
+                change = ParameterChange(int_id(element.Id), names[column], old, new)
+                report.changes += 1
+                if len(report.preview) < preview_limit:
+                    report.preview.append(change)
+                yield change
+
+
+def import_parameters(doc, path, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False,
+                      name="Import Parameters", progress=None, cancel=None):
+    """Apply the cells of ``path`` that differ from the model; returns an ``ImportReport``.
+
+    ``dry_run`` only diffs (``report.changes`` / ``report.preview``) and
+    changes nothing.
+    """
+    headers, rows = read_rows(path)
+    report = ImportReport(headers)
+    changes = diff_rows(doc, headers, rows, report, chunk_size)
+    if dry_run:
+        for _ in changes:
+            pass
+        return report
+    writers = {}
+
+    def apply_change(change):
+        writer = writers.get(change.name)
+        if writer is None:
+            writer = writers[change.name] = ParameterWriter(doc, change.name)
+        writer.set(ElementId(change.element_id), change.new)
+
+    report.batch = run_batch(doc, changes, apply_change, name, chunk_size=chunk_size,
+                             progress=progress, cancel=cancel)
+    return report
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""Element -> level resolution for FilterByLevel and friends.
+
+``get_element_level_name()`` used to run once per element for the combo
+and again per element on every Filter click, each time doing
+``doc.GetElement(level_id)`` and up to three ``LookupParameter`` scans.
+Here one pass builds a ``{level name: [elements]}`` index:
+
+* level id -> name is memoised (each Level element is fetched once)
+* when ``LevelId`` is invalid, the parameter that carries the level is
+  remembered per category (built-in parameter or definition), so the
+  next element of that category reads it directly
+* ElementId parameters are read with ``AsElementId()`` ("Reference Level"
+  on framing used to come back as None from ``AsString()``)
+
+>>> index = build_level_index(doc, elements)
+>>> index.level_names()
+['Level 1', 'Level 2', 'Level 3']
+>>> ids = index.ids("Level 2")      # a dict lookup per click
+
+For the whole model or a view, ``collect_on_level()`` pushes the level
+test into the collector instead (``ElementLevelFilter`` or'ed with
+parameter filters on the two level parameters that replace ``LevelId``),
+and only elements those filters cannot classify reach Python.
+"""
+
+from operator import attrgetter
+
+from .api import (BuiltInParameter, ElementFilter, ElementId, ElementLevelFilter,
+                  ElementParameterFilter, FilteredElementCollector, Level, List,
+                  LogicalAndFilter, LogicalOrFilter, ParameterFilterRuleFactory, StorageType)
+
+# ElementId.Value (Revit 2024+) or IntegerValue, read by a C-level getter
+int_id = attrgetter("Value" if hasattr(ElementId.InvalidElementId, "Value") else "IntegerValue")
+
+INVALID = -1
+
+
+def raw_id(value):
+    """Integer id of an ``ElementId``; a raw id is returned as is.
+
+    Tests for ``ElementId`` rather than ``int``: on Revit 2024+ raw ids
+    are ``System.Int64``, which IronPython does not count as ``int``.
+    """
+    return int_id(value) if isinstance(value, ElementId) else value
+
+
+# Parameters that may carry the level when LevelId is invalid, in order
+FALLBACK_PARAMETERS = (
+    BuiltInParameter.INSTANCE_REFERENCE_LEVEL_PARAM,   # framing, MEP curves
+    BuiltInParameter.SCHEDULE_LEVEL_PARAM,             # face-hosted families
+    BuiltInParameter.FAMILY_LEVEL_PARAM,
+    BuiltInParameter.LEVEL_PARAM,
+    BuiltInParameter.WALL_BASE_CONSTRAINT,
+)
+FALLBACK_NAMES = ("Reference Level", "Schedule Level", "Level")
+
+# Level parameters of elements whose LevelId is invalid; native filters cover these
+NATIVE_LEVEL_PARAMETERS = (
+    BuiltInParameter.INSTANCE_REFERENCE_LEVEL_PARAM,
+    BuiltInParameter.SCHEDULE_LEVEL_PARAM,
+)
+
+# Scopes for collect_on_level()
+MODEL = "model"
+ACTIVE_VIEW = "view"
+SELECTION = "selection"
+SCOPES = (MODEL, ACTIVE_VIEW, SELECTION)
+
+class LevelResolver(object):
+    """Resolve elements to ``(level id, level name)`` with per-document caches."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._names = {}        # level id -> name (None if not a level)
+        self._accessors = {}    # category id -> parameter key (only ones found)
+        self.lookups = 0        # parameter reads, for benchmarks
+
+    def level_name(self, level_id):
+        """Name of the level with integer id ``level_id`` (memoised)."""
+        try:
+            return self._names[level_id]
+        except KeyError:
+            level = self.doc.GetElement(ElementId(level_id))
+            name = level.Name if level is not None else None
+            self._names[level_id] = name
+            return name
+
+    def resolve(self, element):
+        """``(level id or -1, level name or None)`` for one element."""
+        level_id = int_id(element.LevelId)
+        if level_id != INVALID:
+            return level_id, self.level_name(level_id)
+        return self.resolve_parameter(element)
+
+    def resolve_parameter(self, element):
+        """Like ``resolve()`` for an element whose ``LevelId`` is invalid."""
+        category = element.Category
+        key = int_id(category.Id) if category is not None else None
+        accessor = self._accessors.get(key) if key is not None else None
+        if accessor is None:
+            # misses are not cached: another family of the category may have one
+            accessor = self._find_accessor(element)
+            if accessor is None:
+                return INVALID, None
+            if key is not None:
+                self._accessors[key] = accessor
+        self.lookups += 1
+        param = element.get_Parameter(accessor)
+        level_id, name = self._read(param) if param is not None else (INVALID, None)
+        if name is None:
+            # Another family in the same category, or an empty value: scan this element
+            level_id, name = self._scan(element)
+        return level_id, name
+
+    def _find_accessor(self, element):
+        for bip in FALLBACK_PARAMETERS:
+            if element.get_Parameter(bip) is not None:
+                return bip
+        for name in FALLBACK_NAMES:
+            param = element.LookupParameter(name)
+            if param is not None:
+                return param.Definition
+        return None
+
+    def _scan(self, element):
+        for bip in FALLBACK_PARAMETERS:
+            level_id, name = self._read(element.get_Parameter(bip))
+            if name is not None:
+                return level_id, name
+        for param_name in FALLBACK_NAMES:
+            level_id, name = self._read(element.LookupParameter(param_name))
+            if name is not None:
+                return level_id, name
+        return INVALID, None
+
+    def _read(self, param):
+        if param is None or not param.HasValue:
+            return INVALID, None
+        if param.StorageType == StorageType.ElementId:
+            level_id = int_id(param.AsElementId())
+            return (level_id, self.level_name(level_id)) if level_id != INVALID \
+                else (INVALID, None)
+        return INVALID, param.AsString() or param.AsValueString()
+
+
+class LevelIndex(object):
+    """``{level name: [elements]}`` plus the elements with no level.
+
+    ``ids(name)`` builds the ``ElementId`` list for a level on first use,
+    so only the levels the user actually filters on pay for it.
+    """
+
+    def __init__(self, doc, resolver=None):
+        self.doc = doc
+        self.resolver = resolver or LevelResolver(doc)
+        self.by_level = {}
+        self.unresolved = []
+        self._elevations = {}
+        self._ids = {}
+
+    def add(self, element):
+        """Index one element; returns its level name or None."""
+        level_id, name = self.resolver.resolve(element)
+        if name is None:
+            self.unresolved.append(element)
+        else:
+            self._bucket(name, level_id).append(element)
+            self._ids.pop(name, None)
+        return name
+
+    def _bucket(self, name, level_id=INVALID):
+        elements = self.by_level.get(name)
+        if elements is None:
+            elements = self.by_level[name] = []
+        if level_id != INVALID and name not in self._elevations:
+            level = self.doc.GetElement(ElementId(level_id))
+            self._elevations[name] = getattr(level, "Elevation", None)
+        return elements
+
+    def level_names(self):
+        """Level names, lowest elevation first (text-only levels last, by name)."""
+        return sorted(self.by_level, key=lambda n: (
+            self._elevations.get(n) is None, self._elevations.get(n) or 0.0, n))
+
+    def elements(self, name):
+        return self.by_level.get(name, [])
+
+    def ids(self, name):
+        """``ElementId`` list of the elements on level ``name`` (memoised)."""
+        ids = self._ids.get(name)
+        if ids is None:
+            ids = self._ids[name] = [e.Id for e in self.by_level.get(name, ())]
+        return ids
+
+    def counts(self):
+        return dict((name, len(elements)) for name, elements in self.by_level.items())
+
+    def __len__(self):
+        return sum(len(elements) for elements in self.by_level.values())
+
+
+def build_level_index(doc, elements, resolver=None):
+    """Index ``elements`` by level name in one pass; returns a ``LevelIndex``.
+
+    Elements are grouped by raw level id first and names are looked up
+    once per level at the end, which keeps the per-element loop to an
+    attribute read and a dict append.
+    """
+    index = LevelIndex(doc, resolver)
+    by_level_id = {}
+    by_text = {}
+    resolve_parameter = index.resolver.resolve_parameter
+    unresolved = index.unresolved
+    for element in elements:
+        if element is None:
+            continue
+        level_id = int_id(element.LevelId)
+        if level_id == INVALID:
+            level_id, name = resolve_parameter(element)
+            if level_id == INVALID:
+                target = by_text.setdefault(name, []) if name else unresolved
+                target.append(element)
+                continue
+        bucket = by_level_id.get(level_id)
+        if bucket is None:
+            bucket = by_level_id[level_id] = []
+        bucket.append(element)
+
+    level_name = index.resolver.level_name
+    for level_id, bucket in by_level_id.items():
+        name = level_name(level_id)
+        if name is None:
+            unresolved.extend(bucket)
+        else:
+            index._bucket(name, level_id).extend(bucket)
+    for name, bucket in by_text.items():
+        index._bucket(name).extend(bucket)
+    return index
+
+
+# -------------------------------
+# Native level queries
+# -------------------------------
+def get_levels(doc):
+    """All levels, lowest elevation first."""
+    return sorted(FilteredElementCollector(doc).OfClass(Level).ToElements(),
+                  key=lambda level: (level.Elevation, level.Name))
+
+
+def scope_collector(doc, scope, view_id=None, element_ids=None):
+    """Instance collector over the model, a view or a set of ids (None if empty)."""
+    if scope == MODEL:
+        collector = FilteredElementCollector(doc)
+    elif scope == ACTIVE_VIEW:
+        collector = FilteredElementCollector(doc, view_id or doc.ActiveView.Id)
+    elif scope == SELECTION:
+        if not element_ids:
+            return None  # Revit rejects an empty id collection
+        collector = FilteredElementCollector(doc, List[ElementId](element_ids))
+    else:
+        raise ValueError("Unknown scope {!r}; expected one of {}".format(scope, SCOPES))
+    return collector.WhereElementIsNotElementType()
+
+
+def _has_level_rule(bip):
+    # Level ids are positive, so "> InvalidElementId" means "has a level";
+    # works on every Revit version, unlike the HasValue rules
+    return ParameterFilterRuleFactory.CreateGreaterRule(ElementId(bip),
+                                                        ElementId.InvalidElementId)
+
+
+def level_filter(level_id):
+    """Native filter: ``LevelId`` is ``level_id`` or a level parameter points at it."""
+    filters = [ElementLevelFilter(level_id)]
+    for bip in NATIVE_LEVEL_PARAMETERS:
+        rule = ParameterFilterRuleFactory.CreateEqualsRule(ElementId(bip), level_id)
+        filters.append(ElementParameterFilter(rule))
+    return LogicalOrFilter(List[ElementFilter](filters))
+
+
+def unclassified_filter(levels):
+    """Native filter for elements ``level_filter()`` can place on no level."""
+    filters = [ElementLevelFilter(level.Id, True) for level in levels]
+    for bip in NATIVE_LEVEL_PARAMETERS:
+        filters.append(ElementParameterFilter(_has_level_rule(bip), True))
+    return LogicalAndFilter(List[ElementFilter](filters))
+
+
+def collect_on_level(doc, level, scope=MODEL, view_id=None, element_ids=None, levels=None,
+                     resolver=None):
+    """Ids of the elements on ``level`` within ``scope``; returns ``(ids, stats)``.
+
+    The native pass does the bulk of the work. Elements it cannot classify
+    (no LevelId on any level and no level parameter value, e.g. families
+    with a plain "Level" text parameter) are resolved in Python with
+    ``LevelResolver``. ``stats`` counts ``native``, ``checked`` and
+    ``fallback`` elements.
+    """
+    stats = {"native": 0, "checked": 0, "fallback": 0}
+    collector = scope_collector(doc, scope, view_id, element_ids)
+    if collector is None:
+        return [], stats
+    ids = list(collector.WherePasses(level_filter(level.Id)).ToElementIds())
+    stats["native"] = len(ids)
+
+    levels = levels if levels is not None else get_levels(doc)
+    resolver = resolver or LevelResolver(doc)
+    target_id, target_name = int_id(level.Id), level.Name
+    rest = scope_collector(doc, scope, view_id, element_ids)
+    for element in rest.WhereElementIsViewIndependent().WherePasses(unclassified_filter(levels)):
+        stats["checked"] += 1
+        level_id, name = resolver.resolve_parameter(element)
+        if level_id == target_id or (level_id == INVALID and name == target_name):
+            ids.append(element.Id)
+            stats["fallback"] += 1
+    return ids, stats
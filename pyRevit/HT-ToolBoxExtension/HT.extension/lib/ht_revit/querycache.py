@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""Collector results memoised for the Revit session, dropped on relevant changes.
+
+Buttons collect the same levels, views, sheets and family symbols on
+every run. ``get_query_cache(doc)`` keeps those results per document,
+keyed by the query, and watches ``DocumentChanged``:
+
+* every event bumps ``version``, the document change counter
+* an entry is dropped when a change touches it: an added or modified
+  element of one of its categories (or classes), or the deletion of one
+  of its members. An edit to a thousand walls leaves the levels alone;
+  a collect with neither category nor class goes on any change
+* entries are kept in LRU order under ``max_bytes`` (estimated from the
+  number of items held)
+
+>>> cache = get_query_cache(doc)
+>>> levels = cache.collect(element_class=Level)           # collector: a miss
+>>> levels = cache.collect(element_class=Level)           # a hit
+>>> symbols = cache.collect(BuiltInCategory.OST_Doors, types=True)
+>>> cache.get(("sorted levels",), lambda: get_levels(doc), classes=(Level,))
+>>> print(cache.summary())
+🎯 1,204 hit(s), 4 miss(es), 812 ms saved
+
+Cached lists are shared between callers: copy them before changing them.
+"""
+
+import time
+from collections import OrderedDict
+
+from .api import BuiltInCategory, ElementId, ElementIsElementTypeFilter, FilteredElementCollector
+from .bindings import category_key
+from .levels import INVALID, int_id
+from .session import get_cached, release, same_document
+
+_SESSION_KEY = "querycache"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+ITEM_BYTES = 64             # rough cost of one cached element / id, wrapper included
+_VIEWS = int(BuiltInCategory.OST_Views)
+
+
+def estimate_bytes(value):
+    try:
+        return (len(value) + 1) * ITEM_BYTES
+    except TypeError:
+        return ITEM_BYTES
+
+
+class CacheEntry(object):
+    """One cached result and what invalidates it.
+
+    ``categories`` / ``classes`` None means "any change"; ``members``
+    (int ids) lets a deletion drop only the entries that held the element.
+    """
+
+    __slots__ = ("key", "value", "categories", "classes", "members", "seconds", "size", "hits")
+
+    def __init__(self, key, value, categories, classes, members, seconds):
+        self.key = key
+        self.value = value
+        self.categories = categories
+        self.classes = classes
+        self.members = members
+        self.seconds = seconds      # what building it took: saved on every hit
+        self.size = estimate_bytes(value)
+        self.hits = 0
+
+    def touched_by(self, categories, classes, deleted):
+        if self.categories is None and self.classes is None:
+            return True
+        if self.categories and not self.categories.isdisjoint(categories):
+            return True
+        if self.classes and any(issubclass(cls, self.classes) for cls in classes):
+            return True
+        if deleted:
+            return self.members is None or not self.members.isdisjoint(deleted)
+        return False
+
+
+class QueryCache(object):
+    """LRU cache of query results for one document."""
+
+    def __init__(self, doc, max_bytes=DEFAULT_MAX_BYTES):
+        self.doc = doc
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()    # key -> CacheEntry, least recently used first
+        self.bytes = 0
+        self.version = 0                # DocumentChanged events seen
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0              # dropped for room
+        self.invalidations = 0          # dropped by a change
+        self.seconds_saved = 0.0
+
+    # -------------------------------
+    # Lookup
+    # -------------------------------
+    def get(self, key, factory, categories=None, classes=None, members=None):
+        """Cached ``factory()`` for ``key``.
+
+        ``categories`` (anything ``category_key`` takes) and ``classes``
+        say which changes invalidate it; leave both None to drop it on any
+        change. ``members`` are the int ids whose deletion drops it.
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.pop(key)
+            self.entries[key] = entry
+            entry.hits += 1
+            self.hits += 1
+            self.seconds_saved += entry.seconds
+            return entry.value
+        self.misses += 1
+        start = time.time()
+        value = factory()
+        seconds = time.time() - start
+        if categories is not None:
+            categories = frozenset(category_key(c) for c in categories)
+        if classes is not None:
+            classes = tuple(classes)
+        if members is not None:
+            members = frozenset(members)
+        self._store(CacheEntry(key, value, categories, classes, members, seconds))
+        return value
+
+    def _store(self, entry):
+        if entry.size > self.max_bytes:
+            return
+        self.entries[entry.key] = entry
+        self.bytes += entry.size
+        while self.bytes > self.max_bytes:
+            _, oldest = self.entries.popitem(last=False)
+            self.bytes -= oldest.size
+            self.evictions += 1
+
+    def collect(self, category=None, element_class=None, types=False, view_id=None, ids=False):
+        """Cached ``FilteredElementCollector`` result (elements, or ``ElementId``s if ``ids``).
+
+        ``types`` False / True / None: instances, types, or both. The entry
+        depends on the categories of what it returned plus ``category``
+        and ``element_class``; view-scoped results also on any view change.
+        """
+        view = int_id(view_id) if view_id is not None else INVALID
+        key = ("collect", category_key(category) if category is not None else None,
+               element_class, types, view, bool(ids))
+        if key in self.entries:
+            return self.get(key, None)
+        self.misses += 1
+        start = time.time()
+        collector = FilteredElementCollector(self.doc, view_id) if view_id is not None \
+            else FilteredElementCollector(self.doc)
+        if category is not None:
+            collector.OfCategory(category)
+        if element_class is not None:
+            collector.OfClass(element_class)
+        if types is not None:
+            collector.WherePasses(ElementIsElementTypeFilter(not types))
+        elements = collector.ToElements()
+        value = [e.Id for e in elements] if ids else elements
+        seconds = time.time() - start
+        members = frozenset(int_id(e.Id) for e in elements)
+        if category is None and element_class is None:
+            # unscoped: a new element of any category could join it
+            self._store(CacheEntry(key, value, None, None, members, seconds))
+            return value
+        # dependencies: what the result holds, and what could join it
+        categories = set(int_id(e.Category.Id) for e in elements if e.Category is not None)
+        if category is not None:
+            categories.add(category_key(category))
+        if view_id is not None:
+            categories.add(_VIEWS)
+        self._store(CacheEntry(key, value, frozenset(categories),
+                               (element_class,) if element_class is not None else (),
+                               members, seconds))
+        return value
+
+    # -------------------------------
+    # Invalidation
+    # -------------------------------
+    def invalidate(self, key=None):
+        """Drop ``key`` (everything if None)."""
+        keys = list(self.entries) if key is None else [key] if key in self.entries else []
+        for key in keys:
+            self.bytes -= self.entries.pop(key).size
+            self.invalidations += 1
+
+    def apply_changes(self, added=(), modified=(), deleted=()):
+        """Drop the entries touched by raw int ids; returns how many were dropped."""
+        self.version += 1
+        if not self.entries:
+            return 0
+        get_element = self.doc.GetElement
+        categories, classes = set(), set()
+        for element_id in list(added) + list(modified):
+            element = get_element(ElementId(element_id))
+            if element is None:
+                continue
+            classes.add(type(element))
+            category = element.Category
+            if category is not None:
+                categories.add(int_id(category.Id))
+        deleted = frozenset(deleted)
+        stale = [key for key, entry in self.entries.items()
+                 if entry.touched_by(categories, classes, deleted)]
+        for key in stale:
+            self.invalidate(key)
+        return len(stale)
+
+    def on_document_changed(self, sender, args):
+        if same_document(args.GetDocument(), self.doc):
+            self.apply_changes(map(int_id, args.GetAddedElementIds()),
+                               map(int_id, args.GetModifiedElementIds()),
+                               map(int_id, args.GetDeletedElementIds()))
+
+    # -------------------------------
+    # Counters
+    # -------------------------------
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+    def summary(self):
+        text = u"🎯 {:,} hit(s), {:,} miss(es), {:,.0f} ms saved".format(
+            self.hits, self.misses, self.seconds_saved * 1000)
+        text += u"\n📦 {:,} entries, {:,.1f} MB (cap {:,.0f} MB)".format(
+            len(self.entries), self.bytes / 1048576.0, self.max_bytes / 1048576.0)
+        if self.invalidations or self.evictions:
+            text += u"\n♻️ {:,} dropped by changes, {:,} evicted".format(
+                self.invalidations, self.evictions)
+        return text
+
+
+def get_query_cache(doc):
+    """The session's ``QueryCache`` for ``doc``."""
+    return get_cached(doc, _SESSION_KEY, QueryCache)
+
+
+def release_query_cache(doc):
+    release(doc, _SESSION_KEY)
@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+"""Plan and run bulk view renames in one transaction.
+
+RenameViewsPlus used to rename views one by one against a set of taken
+names, so A -> B, B -> C only worked in the right order and a swap
+A <-> B was always "skipped duplicate". ``plan_renames()`` looks at the
+whole request at once:
+
+* every view's target is checked against the final state, in O(n) dict
+  lookups: a name is free if nobody holds it or its holder is renamed
+  away too; a rejected rename keeps its old name, and that can reject
+  the rename that wanted it (propagated with a work list)
+* accepted renames form chains and cycles ("X wants the name Y holds");
+  chains run from their free end, and each cycle is opened with one
+  temporary name
+
+>>> plan = plan_renames(doc, [(view_a, "B"), (view_b, "A")])
+>>> [(step.view.Name, step.name) for step in plan.steps]
+[('A', 'A (renaming 1234)'), ('B', 'A'), ('A (renaming 1234)', 'B')]
+>>> execute_plan(doc, plan).renamed
+2
+
+New names come from a ``NameTemplate`` (find/replace, optionally as a
+regex, plus tokens such as ``{Level}`` or ``{#:3}``), rendered with
+view properties read once per session by ``ViewProperties``.
+``RenamePreview`` re-renders on every edit and reports which rows
+changed, so a grid only repaints those.
+"""
+
+import re
+
+from .api import ElementId, Transaction
+from .levels import INVALID, int_id
+from .viewindex import get_view_index, view_name_scope
+
+# Statuses of a planned rename
+RENAME = "rename"
+UNCHANGED = "unchanged"
+DUPLICATE = "duplicate"
+INVALID_NAME = "invalid"
+
+# Characters Revit rejects in view names
+INVALID_CHARACTERS = u'\\:{}[]|;<>?`~'
+
+
+def invalid_name(name):
+    """True for an empty name or one with characters Revit rejects."""
+    return not name or any(c in INVALID_CHARACTERS for c in name)
+
+
+class PlannedRename(object):
+    """One requested rename and what the planner decided for it."""
+
+    __slots__ = ("view", "old", "new", "status", "blocked_by", "in_cycle")
+
+    def __init__(self, view, old, new):
+        self.view = view
+        self.old = old
+        self.new = new
+        self.status = RENAME
+        self.blocked_by = None      # name of the view that keeps the target, if any
+        self.in_cycle = False
+
+    @property
+    def accepted(self):
+        return self.status == RENAME
+
+
+class RenameStep(object):
+    __slots__ = ("view", "name", "temporary")
+
+    def __init__(self, view, name, temporary=False):
+        self.view = view
+        self.name = name
+        self.temporary = temporary
+
+
+class RenamePlan(object):
+    """Planned renames in request order, plus the ``steps`` that execute them."""
+
+    def __init__(self, items):
+        self.items = items
+        self.steps = []
+        self.cycles = 0
+
+    def accepted(self):
+        return [item for item in self.items if item.accepted]
+
+    def skipped(self):
+        return [item for item in self.items if item.status in (DUPLICATE, INVALID_NAME)]
+
+
+def existing_view_names(doc):
+    """``{scope: {name: view id}}`` for every view in the document.
+
+    This is the session ``ViewIndex``'s live map: read-only here.
+    """
+    return get_view_index(doc).names
+
+
+def plan_renames(doc, requests, names=None):
+    """Plan ``[(view, new name)]``; returns a ``RenamePlan``.
+
+    Requests are honoured first come, first served when two views ask for
+    the same name. ``names`` is the ``existing_view_names()`` index, if the
+    caller already has one.
+    """
+    names = names if names is not None else existing_view_names(doc)
+    items = []
+    by_id = {}                  # view id -> item
+    for view, new_name in requests:
+        view_id = int_id(view.Id)
+        if view_id in by_id:
+            continue            # the first request for a view wins
+        item = PlannedRename(view, view.Name, new_name)
+        by_id[view_id] = item
+        items.append(item)
+
+    claims = {}                 # (scope, name) -> item that wants it
+    for item in items:
+        scope = view_name_scope(item.view)
+        if item.new == item.old:
+            item.status = UNCHANGED
+        elif invalid_name(item.new):
+            item.status = INVALID_NAME
+        elif scope is not None:
+            key = (scope, item.new)
+            if key in claims:
+                item.status = DUPLICATE
+                item.blocked_by = claims[key].old
+            else:
+                claims[key] = item
+
+    # A target is blocked while its holder keeps its name; rejecting one
+    # rename can block the rename that wanted the freed name, and so on
+    pending = [item for item in items if not item.accepted]
+    for item in items:
+        if item.accepted and view_name_scope(item.view) is not None:
+            holder_id = names.get(view_name_scope(item.view), {}).get(item.new)
+            holder = by_id.get(holder_id)
+            if holder_id is not None and (holder is None or not holder.accepted):
+                _reject(item, holder.old if holder is not None else item.new)
+                pending.append(item)
+    while pending:
+        item = pending.pop()
+        waiting = claims.get((view_name_scope(item.view), item.old))
+        if waiting is not None and waiting.accepted:
+            _reject(waiting, item.old)
+            pending.append(waiting)
+
+    plan = RenamePlan(items)
+    _order_steps(plan, names, by_id, claims)
+    return plan
+
+
+def _reject(item, holder_name):
+    item.status = DUPLICATE
+    item.blocked_by = holder_name
+
+
+def _order_steps(plan, names, by_id, claims):
+    # next_of[item] = accepted item currently holding item's target name
+    def next_of(item):
+        scope = view_name_scope(item.view)
+        if scope is None:
+            return None
+        holder = by_id.get(names.get(scope, {}).get(item.new))
+        return holder if holder is not None and holder.accepted and holder is not item else None
+
+    done = set()
+    for start in plan.accepted():
+        if id(start) in done:
+            continue
+        # Walk to the end of the chain (a free target) or back into a cycle
+        path, on_path = [], {}
+        item = start
+        while item is not None and id(item) not in done and id(item) not in on_path:
+            on_path[id(item)] = len(path)
+            path.append(item)
+            item = next_of(item)
+        if item is not None and id(item) in on_path:
+            cycle = path[on_path[id(item)]:]
+            path = path[:on_path[id(item)]]
+            _open_cycle(plan, cycle, names, claims)
+            for member in cycle:
+                done.add(id(member))
+        # The last item's target is free (or freed by the cycle above)
+        for item in reversed(path):
+            plan.steps.append(RenameStep(item.view, item.new))
+            done.add(id(item))
+
+
+def _open_cycle(plan, cycle, names, claims):
+    """Steps for a cycle: park the head on a temporary name, rotate, finish the head."""
+    plan.cycles += 1
+    head = cycle[0]
+    scope = view_name_scope(head.view)
+    taken = names.get(scope, {})
+    temp = u"{} (renaming {})".format(head.old, int_id(head.view.Id))
+    while temp in taken or (scope, temp) in claims:
+        temp = u"_" + temp
+    plan.steps.append(RenameStep(head.view, temp, temporary=True))
+    for item in reversed(cycle[1:]):
+        plan.steps.append(RenameStep(item.view, item.new))
+    plan.steps.append(RenameStep(head.view, head.new))
+    for item in cycle:
+        item.in_cycle = True
+
+
+class RenameResult(object):
+    def __init__(self, renamed=0, skipped=0, error=None, failed_view=None):
+        self.renamed = renamed
+        self.skipped = skipped
+        self.error = error
+        self.failed_view = failed_view
+
+
+def execute_plan(doc, plan, transaction_name="Rename Views"):
+    """Run ``plan.steps`` in one transaction; returns a ``RenameResult``.
+
+    The plan guarantees every step's name is free when it runs, so any
+    failure is unexpected: the whole transaction is rolled back (no view
+    is left on a temporary name) and the error is reported.
+    """
+    result = RenameResult(skipped=len(plan.skipped()))
+    if not plan.steps:
+        return result
+    t = Transaction(doc, transaction_name)
+    t.Start()
+    try:
+        for step in plan.steps:
+            result.failed_view = step.view.Name
+            step.view.Name = step.name
+    except Exception as e:
+        t.RollBack()
+        result.error = e
+        return result
+    t.Commit()
+    result.failed_view = None
+    result.renamed = len(plan.accepted())
+    return result
+
+
+# -------------------------------
+# Name templates and live preview
+# -------------------------------
+TOKENS = ("Name", "ViewType", "Level", "Scale", "Sheet", "SheetName", "Template", "Id")
+COUNTER = "#"
+_TOKEN_PATTERN = re.compile(r"\{(\w+|#)(?::(\d+))?(?::(\d+))?\}")
+
+
+class TemplateError(ValueError):
+    """Bad regex or unknown token; the message is meant for the user."""
+
+
+class ViewProperties(object):
+    """Token values per view, read from Revit once per session.
+
+    Sheet placement comes from the session ``ViewIndex``; everything
+    else is read the first time a view is rendered.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._cache = {}
+        self._sheets = {}       # sheet id -> sheet
+        self._names = {}        # element id -> name (levels, templates)
+
+    def get(self, view):
+        view_id = int_id(view.Id)
+        props = self._cache.get(view_id)
+        if props is None:
+            props = self._cache[view_id] = self._read(view)
+        return props
+
+    def _read(self, view):
+        level = getattr(view, "GenLevel", None)
+        sheet = self._sheet_of(int_id(view.Id))
+        template_id = int_id(view.ViewTemplateId) if not view.IsTemplate else INVALID
+        return {
+            "ViewType": str(view.ViewType),
+            "Level": level.Name if level is not None else "",
+            "Scale": str(view.Scale) if view.Scale else "",
+            "Sheet": sheet.SheetNumber if sheet is not None else "",
+            "SheetName": sheet.Name if sheet is not None else "",
+            "Template": self._name(template_id),
+            "Id": str(int_id(view.Id)),
+        }
+
+    def _sheet_of(self, view_id):
+        sheet_id = get_view_index(self.doc).sheet_id(view_id)
+        if sheet_id == INVALID:
+            return None
+        if sheet_id not in self._sheets:
+            self._sheets[sheet_id] = self.doc.GetElement(ElementId(sheet_id))
+        return self._sheets[sheet_id]
+
+    def _name(self, element_id):
+        if element_id == INVALID:
+            return ""
+        name = self._names.get(element_id)
+        if name is None:
+            element = self.doc.GetElement(ElementId(element_id))
+            name = self._names[element_id] = element.Name if element is not None else ""
+        return name
+
+
+class NameTemplate(object):
+    """Compiled rename rule: find/replace (literal or regex), then ``template``.
+
+    ``template`` is text with tokens: ``{Name}`` (the name after find /
+    replace), ``{ViewType}``, ``{Level}``, ``{Scale}``, ``{Sheet}``,
+    ``{SheetName}``, ``{Template}``, ``{Id}`` and the counter ``{#}``,
+    ``{#:3}`` (zero-padded to 3) or ``{#:3:10}`` (starting at 10).
+    ``prefix`` and ``suffix`` wrap the result.
+    """
+
+    def __init__(self, find="", replace="", prefix="", suffix="", template="{Name}",
+                 regex=False):
+        self.key = (find, replace, prefix, suffix, template, regex)
+        self.find = find
+        self.replace = replace
+        self.prefix = prefix
+        self.suffix = suffix
+        self.pattern = None
+        if find and regex:
+            try:
+                self.pattern = re.compile(find)
+            except re.error as e:
+                raise TemplateError("Invalid regular expression: {}".format(e))
+        self.parts = self._compile(template or "{Name}")
+        self.uses_properties = any(p[0] not in (None, "Name", COUNTER) for p in self.parts)
+
+    @staticmethod
+    def _compile(template):
+        # (token, width, start) per part; literal text is (None, text, 0)
+        parts, end = [], 0
+        for match in _TOKEN_PATTERN.finditer(template):
+            if match.start() > end:
+                parts.append((None, template[end:match.start()], 0))
+            token, width, start = match.groups()
+            if token != COUNTER and token not in TOKENS:
+                raise TemplateError("Unknown token {{{}}}; use one of {}".format(
+                    token, ", ".join("{" + t + "}" for t in TOKENS + (COUNTER,))))
+            parts.append((token, int(width or 0), int(start) if start else 1))
+            end = match.end()
+        if end < len(template):
+            parts.append((None, template[end:], 0))
+        return parts
+
+    def base_name(self, name):
+        if not self.find:
+            return name
+        if self.pattern is not None:
+            try:
+                return self.pattern.sub(self.replace, name)
+            except (re.error, IndexError) as e:     # e.g. \2 with one group
+                raise TemplateError("Invalid replacement: {}".format(e))
+        return name.replace(self.find, self.replace)
+
+    def render(self, view, position=0, properties=None):
+        """New name for ``view``, the ``position``-th view of the request."""
+        name = view.Name
+        props = properties.get(view) if self.uses_properties else None
+        out = [self.prefix]
+        for token, arg, start in self.parts:
+            if token is None:
+                out.append(arg)             # literal text
+            elif token == "Name":
+                out.append(self.base_name(name))
+            elif token == COUNTER:
+                out.append(str(start + position).zfill(arg))
+            else:
+                out.append(props[token])
+        out.append(self.suffix)
+        return u"".join(out)
+
+
+class RenamePreview(object):
+    """Rows ``(old, new, status)`` for a fixed list of views, updated in place.
+
+    ``update(template)`` re-renders, re-plans and returns the positions
+    whose row changed; an unchanged template returns ``[]`` at once.
+    """
+
+    def __init__(self, doc, views, names=None, properties=None):
+        self.doc = doc
+        self.views = []
+        seen = set()
+        for view in views:      # one row per view, in the order given
+            if int_id(view.Id) not in seen:
+                seen.add(int_id(view.Id))
+                self.views.append(view)
+        self.names = names if names is not None else existing_view_names(doc)
+        self.properties = properties or ViewProperties(doc)
+        self.template = None
+        self.plan = None
+        self.rows = [None] * len(self.views)
+
+    def update(self, template):
+        if self.template is not None and template.key == self.template.key:
+            return []
+        render, props = template.render, self.properties
+        requests = [(view, render(view, i, props)) for i, view in enumerate(self.views)]
+        self.template = template    # only once it rendered without a TemplateError
+        self.plan = plan_renames(self.doc, requests, self.names)
+        changed = []
+        for position, item in enumerate(self.plan.items):
+            row = (item.old, item.new, item.status, item.blocked_by, item.in_cycle)
+            if row != self.rows[position]:
+                self.rows[position] = row
+                changed.append(position)
+        return changed
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""On-demand table rows for picked elements (PickMultiOpjetcs).
+
+The table used to build a ``ListViewItem`` per picked element before the
+form opened, with a ``doc.GetElement(LevelId)`` for each one. With a
+virtual ``ListView`` only the rows on screen are asked for, so
+``ElementRows`` keeps the picked references as they are and turns a row
+into strings the first time it is shown:
+
+>>> rows = ElementRows(doc, picked_refs)
+>>> len(rows)                    # no element touched yet
+20000
+>>> rows.prefetch(0, 30)         # ListView.CacheVirtualItems
+>>> rows.row(0)
+('1301', 'Generic - 200mm', 'Walls', 'Level 1')
+
+Fields come from ``snapshot.element_fields()`` with a ``LevelResolver``,
+so each distinct level is fetched once for the whole table, not once per
+row.
+"""
+
+from .levels import LevelResolver
+from .snapshot import element_fields
+
+COLUMNS = ("ID", "Name/Type", "Category", "Level")
+
+
+class ElementRows(object):
+    """Rows of ``COLUMNS`` for a list of references or element ids, built lazily."""
+
+    def __init__(self, doc, keys, resolver=None):
+        self.doc = doc
+        self.keys = keys            # anything doc.GetElement() accepts
+        self.resolver = resolver or LevelResolver(doc)
+        self._rows = {}             # position -> row tuple
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, position):
+        return position in self._rows
+
+    def element(self, position):
+        return self.doc.GetElement(self.keys[position])
+
+    def row(self, position):
+        """Strings for row ``position`` (memoised)."""
+        try:
+            return self._rows[position]
+        except KeyError:
+            row = self._rows[position] = self._build(self.element(position))
+            return row
+
+    def prefetch(self, start, end):
+        """Build rows ``start..end`` (inclusive) ahead of the ListView asking."""
+        for position in range(start, min(end + 1, len(self))):
+            if position not in self._rows:
+                self._rows[position] = self._build(self.element(position))
+
+    def _build(self, element):
+        if element is None:
+            return ("", "<deleted>", "", "")
+        fields = element_fields(element, self.resolver)
+        return (str(fields[0]),) + fields[1:]
+
+    def materialised(self):
+        """Number of rows built so far."""
+        return len(self._rows)
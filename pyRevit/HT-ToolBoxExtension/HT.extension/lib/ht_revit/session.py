@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Per-document caches that live for the whole Revit session.
+
+A cache is any object built as ``factory(doc)`` with an
+``on_document_changed(sender, args)`` method. ``get_cached()`` builds
+it on first use, subscribes it to ``DocumentChanged`` and drops it when
+the document closes:
+
+>>> index = get_cached(doc, "viewindex", ViewIndex)     # built once
+>>> get_cached(doc, "viewindex", ViewIndex) is index
+True
+
+Inside Revit the caches live in the AppDomain, so they survive pyRevit
+reloading the scripts (and the modules that defined them).
+"""
+
+_SESSION_KEY = "ht_revit.session"
+_session = []       # fallback store outside Revit
+
+
+def same_document(a, b):
+    # Revit hands out new Document wrappers; == is Document.Equals there
+    return a is b or a == b
+
+
+def _store():
+    try:
+        from System import AppDomain
+    except ImportError:
+        return _session
+    store = AppDomain.CurrentDomain.GetData(_SESSION_KEY)
+    if store is None:
+        store = []
+        AppDomain.CurrentDomain.SetData(_SESSION_KEY, store)
+    return store
+
+
+class _Entry(object):
+    def __init__(self, key, doc, cache):
+        self.key = key
+        self.doc = doc
+        self.cache = cache
+
+    def on_document_closing(self, sender, args):
+        if same_document(args.Document, self.doc):
+            release(self.doc, self.key)
+
+
+def get_cached(doc, key, factory):
+    """The session's ``key`` cache of ``doc``, built and subscribed on first use."""
+    store = _store()
+    for entry in store:
+        if entry.key == key and same_document(entry.doc, doc):
+            return entry.cache
+    entry = _Entry(key, doc, factory(doc))
+    app = doc.Application
+    app.DocumentChanged += entry.cache.on_document_changed
+    app.DocumentClosing += entry.on_document_closing
+    store.append(entry)
+    return entry.cache
+
+
+def release(doc, key=None):
+    """Unsubscribe and forget the ``key`` cache (every cache if None) of ``doc``."""
+    store = _store()
+    for entry in list(store):
+        if (key is None or entry.key == key) and same_document(entry.doc, doc):
+            app = entry.doc.Application
+            app.DocumentChanged -= entry.cache.on_document_changed
+            app.DocumentClosing -= entry.on_document_closing
+            store.remove(entry)
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""Columnar "id / name / category / level" snapshots of elements.
+
+PickObject and PickMultiOpjetcs used to read the same four facts with
+their own ``hasattr`` checks. ``element_fields()`` is now the one reader
+for a single element (level via ``LevelResolver``, like FilterByLevel); ``extract_snapshot()`` reads many into
+parallel arrays:
+
+* ``ids``: the raw element ids (``array``)
+* ``codes[column]``: one small int per element, an index into
+  ``tables[column]`` (each distinct name/category/level stored once)
+
+500k elements take a few MB instead of 500k dicts, and grouping,
+counting and sorting work on the int codes:
+
+>>> snap = extract_snapshot(doc, uidoc.Selection.GetElementIds())
+>>> snap.counts("category")[:2]
+[('Doors', 4210), ('Walls', 20102)]
+>>> order = snap.order_by("level", "name")
+>>> snap.write_csv(r"C:\\temp\\picked.csv", order)
+"""
+
+import io
+import json
+from array import array
+
+from .api import ElementId
+from .levels import INVALID, LevelResolver, int_id
+from .query import natural_key
+
+FIELDS = ("id", "name", "category", "level")
+STRING_COLUMNS = FIELDS[1:]
+NO_CATEGORY = "No Category"
+NO_LEVEL = "N/A"
+
+try:
+    _ID_TYPECODE = array("q").typecode    # 64-bit ids (Revit 2024+)
+except ValueError:
+    _ID_TYPECODE = "l"
+
+try:
+    _text = unicode                       # IronPython / Python 2
+except NameError:
+    _text = str
+
+
+def element_fields(element, resolver):
+    """``(id, name, category, level)`` of one element, with the usual fallbacks."""
+    category = element.Category
+    level_id = int_id(element.LevelId)
+    if level_id != INVALID:
+        level_name = resolver.level_name(level_id)
+    else:
+        level_name = resolver.resolve_parameter(element)[1]
+    return (int_id(element.Id),
+            element.Name or element.GetType().Name,
+            category.Name if category is not None else NO_CATEGORY,
+            level_name or NO_LEVEL)
+
+
+class StringTable(object):
+    """Interned strings: ``code(value)`` -> small int, ``table[code]`` -> value."""
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def code(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __getitem__(self, code):
+        return self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+    def ranks(self):
+        """Position of each code in natural sort order of the values."""
+        ranks = [0] * len(self.values)
+        for rank, code in enumerate(sorted(range(len(self.values)),
+                                           key=lambda c: natural_key(self.values[c]))):
+            ranks[code] = rank
+        return ranks
+
+
+class Snapshot(object):
+    """Parallel arrays for a list of elements; positions follow the input order."""
+
+    def __init__(self):
+        self.ids = array(_ID_TYPECODE)
+        self.codes = dict((column, array("i")) for column in STRING_COLUMNS)
+        self.tables = dict((column, StringTable()) for column in STRING_COLUMNS)
+
+    def __len__(self):
+        return len(self.ids)
+
+    # -------------------------------
+    # Reading
+    # -------------------------------
+    def value(self, column, position):
+        if column == "id":
+            return self.ids[position]
+        return self.tables[column][self.codes[column][position]]
+
+    def row(self, position):
+        return tuple(self.value(column, position) for column in FIELDS)
+
+    def rows(self, positions=None):
+        """Decoded row tuples, for all positions or ``positions`` in that order."""
+        columns = [self.column(column) for column in FIELDS]
+        if positions is None:
+            return zip(*columns)
+        return (tuple(values[p] for values in columns) for p in positions)
+
+    def column(self, column):
+        """Decoded values of one column, in position order."""
+        if column == "id":
+            return list(self.ids)
+        values = self.tables[column].values
+        return [values[code] for code in self.codes[column]]
+
+    def element_ids(self, positions=None):
+        ids = self.ids
+        if positions is None:
+            return [ElementId(i) for i in ids]
+        return [ElementId(ids[p]) for p in positions]
+
+    # -------------------------------
+    # Grouping and sorting
+    # -------------------------------
+    def counts(self, column):
+        """``[(value, count)]`` for a string column, in natural value order."""
+        table = self.tables[column]
+        counts = [0] * len(table)
+        for code in self.codes[column]:
+            counts[code] += 1
+        return sorted(((table[code], count) for code, count in enumerate(counts) if count),
+                      key=lambda item: natural_key(item[0]))
+
+    def group_by(self, column):
+        """``[(value, positions array)]`` for a string column, in natural value order."""
+        table = self.tables[column]
+        groups = [array("i") for _ in range(len(table))]
+        for position, code in enumerate(self.codes[column]):
+            groups[code].append(position)
+        return sorted(((table[code], group) for code, group in enumerate(groups) if group),
+                      key=lambda item: natural_key(item[0]))
+
+    def order_by(self, *columns):
+        """Positions sorted by ``columns`` (string columns in natural order, "id" numerically).
+
+        The columns are packed into one int key per position, so the sort
+        compares ints rather than tuples.
+        """
+        key = [0] * len(self)
+        for column in columns or ("id",):
+            if column == "id":
+                width = max(self.ids or [0]) + 1
+                values = self.ids
+            else:
+                ranks = self.tables[column].ranks()
+                width = len(ranks) or 1
+                values = [ranks[code] for code in self.codes[column]]
+            key = [k * width + v for k, v in zip(key, values)]
+        return array("i", sorted(range(len(self)), key=key.__getitem__))
+
+    # -------------------------------
+    # Export
+    # -------------------------------
+    def write_csv(self, path, positions=None):
+        """CSV with a header row; UTF-8 with BOM so Excel keeps the accents."""
+        with io.open(path, "w", encoding="utf-8-sig", newline="") as f:
+            f.write(_text(",".join(FIELDS)) + u"\r\n")
+            fields = {}     # the string tables are small: quote each value once
+            for row in self.rows(positions):
+                f.write(u",".join([_text(row[0])] + [
+                    fields.get(v) or fields.setdefault(v, _csv_field(v)) for v in row[1:]])
+                    + u"\r\n")
+
+    def write_jsonl(self, path, positions=None):
+        """One JSON object per element and line."""
+        with io.open(path, "w", encoding="utf-8") as f:
+            for row in self.rows(positions):
+                f.write(_text(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False,
+                                         sort_keys=True)) + u"\n")
+
+
+def _csv_field(value):
+    text = _text(value)
+    if any(c in text for c in u',"\r\n'):
+        return u'"' + text.replace(u'"', u'""') + u'"'
+    return text
+
+
+def extract_snapshot(doc, element_ids, resolver=None):
+    """``Snapshot`` of the elements behind ``element_ids`` (or references), in order.
+
+    Ids that no longer resolve to an element are skipped.
+    """
+    resolver = resolver or LevelResolver(doc)
+    snapshot = Snapshot()
+    ids = snapshot.ids.append
+    names, categories, levels = (snapshot.codes[c].append for c in STRING_COLUMNS)
+    name_code, category_code, level_code = (snapshot.tables[c].code for c in STRING_COLUMNS)
+    category_codes = {}     # category id -> code
+    level_codes = {}        # level id -> code
+    for key in element_ids:
+        element = doc.GetElement(key)
+        if element is None:
+            continue
+        ids(int_id(element.Id))
+        names(name_code(element.Name or element.GetType().Name))
+
+        category = element.Category
+        category_id = int_id(category.Id) if category is not None else None
+        code = category_codes.get(category_id)
+        if code is None:
+            code = category_codes[category_id] = category_code(
+                category.Name if category is not None else NO_CATEGORY)
+        categories(code)
+
+        level_id = int_id(element.LevelId)
+        if level_id == INVALID:
+            levels(level_code(resolver.resolve_parameter(element)[1] or NO_LEVEL))
+            continue
+        code = level_codes.get(level_id)
+        if code is None:
+            code = level_codes[level_id] = level_code(resolver.level_name(level_id) or NO_LEVEL)
+        levels(code)
+    return snapshot
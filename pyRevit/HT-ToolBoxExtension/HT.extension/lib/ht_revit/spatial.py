@@ -0,0 +1,473 @@
+# -*- coding: utf-8 -*-
+"""In-memory spatial index over element bounding boxes.
+
+Each ``BoundingBoxIntersectsFilter`` / ``BoundingBoxContainsPointFilter``
+collector in Samples/FilteredElementCollector.py is a pass over the
+model, and a clash check runs thousands of them. ``SpatialIndex`` reads
+every bounding box once into a uniform 3D grid (cell -> box slots), so a
+query only tests the boxes filed in the cells it touches:
+
+>>> index = index_elements(doc, FilteredElementCollector(doc).WhereElementIsNotElementType())
+>>> index.intersecting(Outline(XYZ(0, 0, 0), XYZ(20, 20, 10)))       # int ids
+[310544, 310871]
+>>> index.containing(XYZ(15, 15, 0))
+[310544]
+>>> index.nearest(XYZ(15, 15, 0), k=2)                               # (distance, id)
+[(0.0, 310544), (2.5, 311020)]
+>>> index.add(310544, wall.get_BoundingBox(None))                    # moved: re-filed
+>>> clashes = index.intersecting_many(duct_boxes)                    # one id list per box
+
+Boxes are ``(min x, min y, min z, max x, max y, max z)`` tuples in
+feet; ``BoundingBoxXYZ``, ``Outline`` and ``(min XYZ, max XYZ)`` are
+accepted too. Single queries run in plain Python. With NumPy (CPython)
+the ``*_many`` batches are answered as one vectorised join of query
+cells against box cells; without it (IronPython) they loop over the
+single queries and return the same lists.
+"""
+
+import heapq
+import math
+
+from .api import ElementId
+from .levels import int_id
+from .session import same_document
+
+try:
+    import numpy as np
+except ImportError:     # IronPython, or CPython without NumPy
+    np = None
+
+DEFAULT_CELL_SIZE = 10.0        # feet, when there is nothing to size the grid from
+BATCH_QUERIES = 2048            # queries joined at once: bounds the candidate arrays
+MAX_CELLS_PER_BOX = 64          # larger boxes go to the overflow list, tested by every query
+
+
+def as_box(shape):
+    """``(min x, min y, min z, max x, max y, max z)`` of a box, outline or 6-sequence."""
+    if hasattr(shape, "MinimumPoint"):
+        low, high = shape.MinimumPoint, shape.MaximumPoint
+    elif hasattr(shape, "Min"):
+        low, high = shape.Min, shape.Max
+    elif len(shape) == 2:
+        low, high = shape
+    else:
+        return tuple(float(v) for v in shape)
+    return (low.X, low.Y, low.Z, high.X, high.Y, high.Z)
+
+
+def as_point(point):
+    if hasattr(point, "X"):
+        return (point.X, point.Y, point.Z)
+    return tuple(float(v) for v in point)
+
+
+def box_distance(box, point):
+    """Distance from ``point`` to the nearest point of ``box`` (0 inside)."""
+    dx = max(box[0] - point[0], 0.0, point[0] - box[3])
+    dy = max(box[1] - point[1], 0.0, point[1] - box[4])
+    dz = max(box[2] - point[2], 0.0, point[2] - box[5])
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+
+def _grown(box, tolerance):
+    if not tolerance:
+        return box
+    return (box[0] - tolerance, box[1] - tolerance, box[2] - tolerance,
+            box[3] + tolerance, box[4] + tolerance, box[5] + tolerance)
+
+
+class SpatialIndex(object):
+    """Uniform grid of bounding boxes keyed by int element id.
+
+    ``cell_size`` None sizes the cells from the first ``load()``: the median
+    side of its boxes, so a typical box spans a cell or two on each axis.
+    A box that would cover more than ``MAX_CELLS_PER_BOX`` cells (a site
+    or a level-wide slab) is kept in a short overflow list instead, which
+    every query tests directly.
+    """
+
+    def __init__(self, cell_size=None, use_numpy=True):
+        self.cell_size = cell_size
+        self.doc = None                 # set by index_elements(), for DocumentChanged
+        self.view = None
+        self.accept = None              # element -> bool: which added elements to index
+        self.cells = {}                 # (i, j, k) -> [slots]
+        self._ids = []                  # slot -> element id (None once removed)
+        self._boxes = []                # slot -> box tuple (None once removed)
+        self._slot_of = {}              # element id -> slot
+        self._free = []                 # slots to reuse
+        self._overflow = set()          # slots of boxes too large to file in cells
+        self._numpy = use_numpy and np is not None
+        self._joined = None             # NumPy arrays of the grid, rebuilt after changes
+
+    # -------------------------------
+    # Building
+    # -------------------------------
+    def load(self, items):
+        """Add ``(element id, box)`` pairs in bulk; returns how many were added."""
+        items = [(element_id, as_box(box)) for element_id, box in items]
+        if not items:
+            return 0
+        if self.cell_size is None:
+            sides = sorted(b[3] - b[0] + b[4] - b[1] + b[5] - b[2] for _, b in items)
+            self.cell_size = max(sides[len(sides) // 2] / 3.0, 1e-3)
+        if self._slot_of:
+            for element_id, box in items:
+                self.add(element_id, box)
+            return len(items)
+        self._ids = [element_id for element_id, _ in items]
+        self._boxes = [box for _, box in items]
+        self._slot_of = dict((element_id, slot) for slot, element_id in enumerate(self._ids))
+        self._joined = None
+        cells = self.cells
+        if self._numpy:
+            ranges = np.floor(np.array(self._boxes) / self.cell_size).astype(int).tolist()
+        else:
+            ranges = [self._cell_range(box) for box in self._boxes]
+        for slot, (i0, j0, k0, i1, j1, k1) in enumerate(ranges):
+            if (i1 - i0 + 1) * (j1 - j0 + 1) * (k1 - k0 + 1) > MAX_CELLS_PER_BOX:
+                self._overflow.add(slot)
+                continue
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    for k in range(k0, k1 + 1):
+                        bucket = cells.get((i, j, k))
+                        if bucket is None:
+                            cells[(i, j, k)] = [slot]
+                        else:
+                            bucket.append(slot)
+        return len(items)
+
+    def _cell_range(self, box):
+        size = self.cell_size
+        return tuple(int(math.floor(v / size)) for v in box)
+
+    def _cells_of(self, box):
+        """Cells ``box`` is filed in; None if it spans too many and overflows."""
+        i0, j0, k0, i1, j1, k1 = self._cell_range(box)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) * (k1 - k0 + 1) > MAX_CELLS_PER_BOX:
+            return None
+        return [(i, j, k) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)
+                for k in range(k0, k1 + 1)]
+
+    def add(self, element_id, box):
+        """Index (or re-file, if already there) ``element_id`` under ``box``."""
+        box = as_box(box)
+        if self.cell_size is None:
+            self.cell_size = DEFAULT_CELL_SIZE
+        self.remove(element_id)
+        if self._free:
+            slot = self._free.pop()
+            self._ids[slot], self._boxes[slot] = element_id, box
+        else:
+            slot = len(self._ids)
+            self._ids.append(element_id)
+            self._boxes.append(box)
+        self._slot_of[element_id] = slot
+        cells = self._cells_of(box)
+        if cells is None:
+            self._overflow.add(slot)
+        for cell in cells or ():
+            self.cells.setdefault(cell, []).append(slot)
+        self._joined = None
+
+    def remove(self, element_id):
+        """Drop ``element_id``; False if it was not indexed."""
+        slot = self._slot_of.pop(element_id, None)
+        if slot is None:
+            return False
+        if slot in self._overflow:
+            self._overflow.discard(slot)
+        else:
+            for cell in self._cells_of(self._boxes[slot]):
+                bucket = self.cells[cell]
+                bucket.remove(slot)
+                if not bucket:
+                    del self.cells[cell]
+        self._ids[slot] = self._boxes[slot] = None
+        self._free.append(slot)
+        self._joined = None
+        return True
+
+    def apply_changes(self, added=(), modified=(), deleted=()):
+        """Apply raw int ids from a change event: drop deleted ones, re-file moved ones.
+
+        Only modified ids already in the index are re-read. Added ids are
+        indexed only if ``accept`` (set by ``index_elements``) takes the
+        element; without it they are left to the caller.
+        """
+        for element_id in deleted:
+            self.remove(element_id)
+        get_element = self.doc.GetElement
+        for element_id in modified:
+            if element_id in self._slot_of:
+                self._refile(element_id, get_element(ElementId(element_id)))
+        if self.accept is None:
+            return
+        for element_id in added:
+            element = get_element(ElementId(element_id))
+            if element is not None and self.accept(element):
+                self._refile(element_id, element)
+
+    def _refile(self, element_id, element):
+        box = element.get_BoundingBox(self.view) if element is not None else None
+        if box is None:
+            self.remove(element_id)
+        else:
+            self.add(element_id, box)
+
+    def on_document_changed(self, sender, args):
+        if self.doc is not None and same_document(args.GetDocument(), self.doc):
+            self.apply_changes(map(int_id, args.GetAddedElementIds()),
+                               map(int_id, args.GetModifiedElementIds()),
+                               map(int_id, args.GetDeletedElementIds()))
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    def __contains__(self, element_id):
+        return element_id in self._slot_of
+
+    def box(self, element_id):
+        slot = self._slot_of.get(element_id)
+        return self._boxes[slot] if slot is not None else None
+
+    # -------------------------------
+    # Queries
+    # -------------------------------
+    def _candidates(self, box):
+        if not self.cells:
+            return set(self._overflow)
+        cells = self.cells
+        i0, j0, k0, i1, j1, k1 = self._cell_range(box)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) * (k1 - k0 + 1) > len(cells):
+            # a query larger than the grid: walk the occupied cells instead
+            found = set(slot for (i, j, k), slots in cells.items()
+                        if i0 <= i <= i1 and j0 <= j <= j1 and k0 <= k <= k1 for slot in slots)
+            return found | self._overflow
+        found = set(self._overflow)
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                for k in range(k0, k1 + 1):
+                    slots = cells.get((i, j, k))
+                    if slots:
+                        found.update(slots)
+        return found
+
+    def intersecting(self, shape, tolerance=0.0):
+        """Ids whose box intersects ``shape`` (touching counts)."""
+        x0, y0, z0, x1, y1, z1 = search = _grown(as_box(shape), tolerance)
+        boxes, ids = self._boxes, self._ids
+        return [ids[slot] for slot in self._candidates(search) for b in (boxes[slot],)
+                if b[0] <= x1 and b[3] >= x0 and b[1] <= y1 and b[4] >= y0 and
+                b[2] <= z1 and b[5] >= z0]
+
+    def inside(self, shape, tolerance=0.0):
+        """Ids whose box lies inside ``shape``."""
+        x0, y0, z0, x1, y1, z1 = search = _grown(as_box(shape), tolerance)
+        boxes, ids = self._boxes, self._ids
+        return [ids[slot] for slot in self._candidates(search) for b in (boxes[slot],)
+                if b[0] >= x0 and b[3] <= x1 and b[1] >= y0 and b[4] <= y1 and
+                b[2] >= z0 and b[5] <= z1]
+
+    def containing(self, point, tolerance=0.0):
+        """Ids whose box contains ``point``."""
+        return self.intersecting(as_point(point) * 2, tolerance)
+
+    def nearest(self, point, k=1, max_distance=None):
+        """``[(distance, id)]`` of the ``k`` boxes nearest ``point``, nearest first.
+
+        Searches rings of cells outwards and stops once the cells left
+        cannot hold anything nearer; ``max_distance`` caps the search.
+        """
+        point = as_point(point)
+        if not self._slot_of or k < 1:
+            return []
+        size, cells, boxes, ids = self.cell_size, self.cells, self._boxes, self._ids
+        px, py, pz = point
+        ci, cj, ck = (int(math.floor(v / size)) for v in point)
+        best, seen, ring = [], set(), 0     # heap of (-distance, -id): the worst on top
+        for slot in self._overflow:
+            distance = box_distance(boxes[slot], point)
+            if max_distance is None or distance <= max_distance:
+                heapq.heappush(best, (-distance, -ids[slot]))
+                if len(best) > k:
+                    heapq.heappop(best)
+        while True:
+            if (2 * ring + 1) ** 3 > len(cells):
+                return self._nearest_all(point, k, max_distance)
+            for i in range(ci - ring, ci + ring + 1):
+                for j in range(cj - ring, cj + ring + 1):
+                    if ring in (abs(i - ci), abs(j - cj)):
+                        layers = range(ck - ring, ck + ring + 1)
+                    else:
+                        layers = (ck - ring, ck + ring) if ring else (ck,)
+                    for layer in layers:
+                        for slot in cells.get((i, j, layer), ()):
+                            if slot in seen:
+                                continue
+                            seen.add(slot)
+                            b = boxes[slot]
+                            dx = max(b[0] - px, 0.0, px - b[3])
+                            dy = max(b[1] - py, 0.0, py - b[4])
+                            dz = max(b[2] - pz, 0.0, pz - b[5])
+                            distance = math.sqrt(dx * dx + dy * dy + dz * dz)
+                            if max_distance is not None and distance > max_distance:
+                                continue
+                            entry = (-distance, -ids[slot])
+                            if len(best) < k:
+                                heapq.heappush(best, entry)
+                            elif entry > best[0]:
+                                heapq.heapreplace(best, entry)
+            # nothing outside the visited block of cells is nearer than its faces
+            reach = min(min(v - (c - ring) * size, (c + ring + 1) * size - v)
+                        for v, c in ((px, ci), (py, cj), (pz, ck)))
+            if len(best) == k and -best[0][0] <= reach or \
+                    max_distance is not None and reach >= max_distance:
+                return sorted((-d, -element_id) for d, element_id in best)
+            ring += 1
+
+    def _nearest_all(self, point, k, max_distance):
+        pairs = heapq.nsmallest(k, ((box_distance(self._boxes[slot], point), self._ids[slot])
+                                    for slot in self._slot_of.values()))
+        return [pair for pair in pairs if max_distance is None or pair[0] <= max_distance]
+
+    # -------------------------------
+    # Batches
+    # -------------------------------
+    def intersecting_many(self, shapes, tolerance=0.0):
+        """``intersecting()`` for each shape: a list of id lists, in order."""
+        return self._many([_grown(as_box(s), tolerance) for s in shapes], False)
+
+    def inside_many(self, shapes, tolerance=0.0):
+        return self._many([_grown(as_box(s), tolerance) for s in shapes], True)
+
+    def containing_many(self, points, tolerance=0.0):
+        return self._many([_grown(as_point(p) * 2, tolerance) for p in points], False)
+
+    def _many(self, queries, inside):
+        if not self._slot_of:
+            return [[] for _ in queries]
+        if not self._numpy:
+            query = self.inside if inside else self.intersecting
+            return [query(box) for box in queries]
+        query = self.inside if inside else self.intersecting
+        results = []
+        for start in range(0, len(queries), BATCH_QUERIES):
+            block = np.array(queries[start:start + BATCH_QUERIES], dtype=float).reshape(-1, 6)
+            # a query over more cells than the grid holds is cheaper on its own
+            spans = np.floor(block[:, 3:] / self.cell_size) - \
+                np.floor(block[:, :3] / self.cell_size) + 1
+            joined = spans.prod(axis=1) <= len(self.cells)
+            found = [[] for _ in block]
+            positions = np.flatnonzero(joined).tolist()
+            if positions and self.cells:
+                for position, ids in zip(positions, self._join(block[joined], inside)):
+                    found[position] = ids
+            for slot in self._overflow:
+                b = np.array(self._boxes[slot])
+                if inside:
+                    keep = ((block[:, :3] <= b[:3]) & (block[:, 3:] >= b[3:])).all(1)
+                else:
+                    keep = ((block[:, :3] <= b[3:]) & (block[:, 3:] >= b[:3])).all(1)
+                for position in np.flatnonzero(keep & joined).tolist():
+                    found[position].append(self._ids[slot])
+            for position in np.flatnonzero(~joined).tolist():
+                found[position] = query(tuple(block[position].tolist()))
+            results.extend(found)
+        return results
+
+    def _grid_arrays(self):
+        """``(origin, shape, sorted cell keys, row per key, boxes, ids)`` of the grid."""
+        if self._joined is None:
+            slots = sorted(set(self._slot_of.values()) - self._overflow)
+            boxes = np.array([self._boxes[slot] for slot in slots], dtype=float).reshape(-1, 6)
+            ids = np.array([self._ids[slot] for slot in slots], dtype=np.int64)
+            ranges = np.floor(boxes / self.cell_size).astype(np.int64)
+            origin = ranges[:, :3].min(axis=0)
+            shape = ranges[:, 3:].max(axis=0) - origin + 1
+            rows, keys = _cell_pairs(ranges[:, :3] - origin, ranges[:, 3:] - origin, shape)
+            order = np.argsort(keys, kind="stable")
+            self._joined = (origin, shape, keys[order], rows[order], boxes, ids)
+        return self._joined
+
+    def _join(self, queries, inside):
+        origin, shape, keys, rows, boxes, ids = self._grid_arrays()
+        ranges = np.floor(queries / self.cell_size).astype(np.int64)
+        low = np.maximum(ranges[:, :3] - origin, 0)
+        high = np.minimum(ranges[:, 3:] - origin, shape - 1)
+        query_of, query_keys = _cell_pairs(low, high, shape)
+        # every box filed in each query cell
+        first = np.searchsorted(keys, query_keys, "left")
+        counts = np.searchsorted(keys, query_keys, "right") - first
+        pair_query = np.repeat(query_of, counts)
+        pair_key = np.repeat(query_keys, counts)
+        pair_row = rows[np.repeat(first, counts) + _ramp(counts)]
+        found, wanted = boxes[pair_row], queries[pair_query]
+        if inside:
+            keep = ((found[:, :3] >= wanted[:, :3]) & (found[:, 3:] <= wanted[:, 3:])).all(1)
+        else:
+            keep = ((found[:, :3] <= wanted[:, 3:]) & (found[:, 3:] >= wanted[:, :3])).all(1)
+        # a pair meets in several cells: keep it in the one holding the corner
+        # max(box min, query min), which both always share
+        corner = np.floor(np.maximum(found[:, :3], wanted[:, :3]) / self.cell_size)
+        corner = corner.astype(np.int64) - origin
+        keep &= ((corner[:, 0] * shape[1] + corner[:, 1]) * shape[2] + corner[:, 2]) == pair_key
+        pair_query, pair_row = pair_query[keep], pair_row[keep]
+        order = np.argsort(pair_query, kind="stable")
+        matched = ids[pair_row[order]].tolist()
+        results, start = [], 0
+        for count in np.bincount(pair_query, minlength=len(queries)).tolist():
+            results.append(matched[start:start + count])
+            start += count
+        return results
+
+    def summary(self):
+        entries = sum(len(slots) for slots in self.cells.values())
+        text = u"📦 {:,} boxes in {:,} cells of {:.1f} ft ({:.1f} per cell, {:,} oversized{})"
+        return text.format(
+            len(self), len(self.cells), self.cell_size or 0.0,
+            float(entries) / len(self.cells) if self.cells else 0.0,
+            len(self._overflow), ", NumPy batches" if self._numpy else "")
+
+
+def _ramp(counts):
+    """``0..n-1`` for each ``n`` in ``counts``, concatenated."""
+    return np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def _cell_pairs(low, high, shape):
+    """``(row, cell key)`` for every cell of every ``low``-``high`` range (none if inverted)."""
+    span = np.maximum(high - low + 1, 0)
+    counts = span.prod(axis=1)
+    row = np.repeat(np.arange(len(low)), counts)
+    offset = _ramp(counts)
+    layer = span[row, 2]
+    plane = span[row, 1] * layer
+    i = low[row, 0] + offset // plane
+    j = low[row, 1] + offset % plane // layer
+    k = low[row, 2] + offset % layer
+    return row, (i * shape[1] + j) * shape[2] + k
+
+
+def index_elements(doc, elements, view=None, cell_size=None, accept=None):
+    """``SpatialIndex`` of the bounding boxes of ``elements`` (ids or elements).
+
+    Elements without a box in ``view`` (None: model extents) are skipped.
+    The index keeps ``doc`` so ``on_document_changed`` can re-read boxes
+    of the elements it holds; ``accept`` (element -> bool, e.g. a category
+    test) picks which newly added elements join it too.
+    """
+    index = SpatialIndex(cell_size)
+    index.doc, index.view, index.accept = doc, view, accept
+    get_element = doc.GetElement
+
+    def boxes():
+        for element in elements:
+            if not hasattr(element, "get_BoundingBox"):
+                element = get_element(element)
+            box = element.get_BoundingBox(view) if element is not None else None
+            if box is not None:
+                yield int_id(element.Id), box
+    index.load(boxes())
+    return index
@@ -0,0 +1,2833 @@
+# -*- coding: utf-8 -*-
+"""In-memory stand-in for the slice of the Revit API the HT tools use.
+
+Lets the tools' core logic run, and be timed, on Linux / CPython without
+Revit. Class and member names follow ``Autodesk.Revit.DB`` so library code
+written against ``ht_revit.api`` runs unchanged in both places:
+
+* ``Document``: ``GetElement``, ``Delete``, ``ActiveView``, ``IsModifiable``
+* ``Element`` and subclasses: ``Id``, ``Name``, ``Category``, ``LevelId``,
+  ``GetTypeId()``, ``LookupParameter``, ``get_Parameter``, ``Parameters``
+* ``FilteredElementCollector``: ``OfClass``, ``OfCategory``,
+  ``WhereElementIsNotElementType``, ``WherePasses``... Category and class
+  filters start from per-document indexes, like Revit's quick filters;
+  everything else is checked element by element
+* ``get_BoundingBox``: model instances get a synthetic box on a
+  ``SITE_SIZE`` square (derived from the id and level, not stored);
+  ``BoundingBoxIntersectsFilter`` / ``IsInside`` / ``ContainsPoint``
+* creation: ``Line.CreateBound``, ``Wall.Create``, ``TextNote.Create``,
+  ``FilledRegion.Create`` and ``doc.Create.NewFamilyInstance`` (curve-based),
+  ``NewRoom`` / ``NewDetailCurve``; new elements keep their ``Location``
+* ``Transaction`` with rollback, ``SubTransaction``, ``TransactionGroup``
+  (nested, ``Assimilate`` / ``RollBack``), ``UIDocument.Selection``
+* ``doc.Application.DocumentChanged``: raised on commit with the net
+  added / modified / deleted ids; ``simulate_document_changed()`` raises
+  it for changes made elsewhere
+
+Behaviour worth knowing when comparing with Revit:
+
+* elements are light ``__slots__`` objects and parameters are computed from
+  them (only written values are stored), so ``generate_model(1000000)``
+  fits in a few hundred MB
+* ``Element.Id`` / ``LevelId`` build a new ``ElementId`` on every access and
+  ``LookupParameter`` is a linear name scan, as in Revit
+* ``AsString()`` returns None for ElementId parameters (use
+  ``AsValueString()``), exactly like Revit does for "Reference Level"
+
+>>> doc = generate_model(100000, levels=8)
+>>> uidoc = UIDocument(doc)
+>>> walls = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Walls)
+>>> len(walls.WhereElementIsNotElementType().ToElementIds()) > 0
+True
+"""
+
+from __future__ import division
+
+from collections import OrderedDict
+
+try:
+    basestring_types = (str, unicode)  # noqa: F821 - IronPython 2.7
+except NameError:
+    basestring_types = (str,)
+
+# -------------------------------
+# Exceptions (Autodesk.Revit.Exceptions)
+# -------------------------------
+class ArgumentException(Exception):
+    pass
+
+
+class InvalidOperationException(Exception):
+    pass
+
+
+class ModificationOutsideTransactionException(InvalidOperationException):
+    pass
+
+
+# -------------------------------
+# Enums
+# -------------------------------
+class EnumValue(int):
+    """An int that prints as its enum member name, like a .NET enum value."""
+
+    def __new__(cls, value, name):
+        obj = int.__new__(cls, value)
+        obj.name = name
+        return obj
+
+    def __repr__(self):
+        return self.name
+
+    __str__ = __repr__
+
+    def ToString(self):
+        return self.name
+
+
+def _enum(type_name, members):
+    """Build an enum class from ``[(name, value)]``; ``_by_value`` maps back."""
+    attrs = dict((name, EnumValue(value, name)) for name, value in members)
+    attrs["_by_value"] = dict((int(v), v) for v in attrs.values())
+    return type(type_name, (object,), attrs)
+
+
+BuiltInCategory = _enum("BuiltInCategory", [
+    ("INVALID", -1),
+    ("OST_Walls", -2000011), ("OST_Windows", -2000014), ("OST_Doors", -2000023),
+    ("OST_Floors", -2000032), ("OST_Roofs", -2000035), ("OST_Ceilings", -2000038),
+    ("OST_Lines", -2000051), ("OST_Furniture", -2000080), ("OST_Stairs", -2000120),
+    ("OST_GenericModel", -2000151), ("OST_Rooms", -2000160), ("OST_Grids", -2000220),
+    ("OST_Levels", -2000240), ("OST_Views", -2000279), ("OST_TextNotes", -2000300),
+    ("OST_Casework", -2001000), ("OST_LightingFixtures", -2001120),
+    ("OST_MechanicalEquipment", -2001140), ("OST_PlumbingFixtures", -2001160),
+    ("OST_SpecialityEquipment", -2001350), ("OST_StructuralFraming", -2001320),
+    ("OST_StructuralColumns", -2001330), ("OST_Sheets", -2003100),
+    ("OST_Viewports", -2000510), ("OST_Phases", -2000570),
+    ("OST_DuctCurves", -2008000), ("OST_PipeCurves", -2008044),
+    ("OST_DetailComponents", -2002000),
+])
+
+BuiltInParameter = _enum("BuiltInParameter", [
+    ("INVALID", -1),
+    ("ELEM_TYPE_PARAM", -1002052), ("ELEM_FAMILY_PARAM", -1002051),
+    ("ELEM_PARTITION_PARAM", -1002067), ("PHASE_CREATED", -1012200),
+    ("ALL_MODEL_MARK", -1001203), ("ALL_MODEL_INSTANCE_COMMENTS", -1010106),
+    ("ALL_MODEL_TYPE_NAME", -1002002), ("ALL_MODEL_FAMILY_NAME", -1002001),
+    ("SYMBOL_NAME_PARAM", -1002050),
+    ("LEVEL_PARAM", -1007250), ("FAMILY_LEVEL_PARAM", -1001352),
+    ("SCHEDULE_LEVEL_PARAM", -1001570), ("INSTANCE_REFERENCE_LEVEL_PARAM", -1001567),
+    ("WALL_BASE_CONSTRAINT", -1001107),
+    ("CURVE_ELEM_LENGTH", -1004005), ("HOST_AREA_COMPUTED", -1012805),
+    ("ROOM_NAME", -1006916), ("ROOM_NUMBER", -1006917),
+    ("LEVEL_ELEV", -1007000), ("DATUM_TEXT", -1007001),
+    ("VIEW_NAME", -1005800), ("VIEW_SCALE", -1005506), ("VIEW_TEMPLATE", -1005801),
+    ("VIEWPORT_SHEET_NUMBER", -1152325), ("VIEWPORT_SHEET_NAME", -1152326),
+    ("SHEET_NUMBER", -1007400), ("SHEET_NAME", -1007401),
+])
+
+StorageType = _enum("StorageType", [
+    ("None", 0), ("Integer", 1), ("Double", 2), ("String", 3), ("ElementId", 4)])
+
+StructuralType = _enum("StructuralType", [
+    ("NonStructural", 0), ("Beam", 1), ("Brace", 2), ("Column", 3), ("Footing", 4),
+    ("UnknownFraming", 5)])
+
+CategoryType = _enum("CategoryType", [("Invalid", 0), ("Model", 1), ("Annotation", 2)])
+
+ViewType = _enum("ViewType", [
+    ("Undefined", 0), ("FloorPlan", 1), ("CeilingPlan", 2), ("Elevation", 3),
+    ("ThreeD", 4), ("Schedule", 5), ("DrawingSheet", 6), ("Report", 8),
+    ("DraftingView", 10), ("Legend", 11), ("EngineeringPlan", 115),
+    ("AreaPlan", 116), ("Section", 117), ("Detail", 118)])
+
+ViewFamily = _enum("ViewFamily", [
+    ("Invalid", 0), ("ThreeDimensional", 102), ("Walkthrough", 103), ("Legend", 105),
+    ("Section", 107), ("Detail", 108), ("Elevation", 109), ("FloorPlan", 110),
+    ("AreaPlan", 111), ("CeilingPlan", 112), ("Drafting", 113), ("Sheet", 114),
+    ("Schedule", 115), ("StructuralPlan", 116)])
+
+TransactionStatus = _enum("TransactionStatus", [
+    ("Uninitialized", 0), ("Started", 1), ("RolledBack", 2), ("Committed", 3),
+    ("Pending", 4), ("Error", 5)])
+
+ObjectType = _enum("ObjectType", [
+    ("Nothing", 0), ("Element", 1), ("PointOnElement", 2), ("Edge", 3), ("Face", 4)])
+UndoOperation = _enum("UndoOperation", [
+    ("TransactionCommitted", 0), ("TransactionUndone", 1), ("TransactionRedone", 2),
+    ("TransactionGroupRolledBack", 3)])
+
+# Generic .NET types used by the scripts
+class _DotNetType(object):
+    def __init__(self, name):
+        self.Name = name
+        self.FullName = "Autodesk.Revit.DB." + name
+
+
+class _TypedList(list):
+    """``System.Collections.Generic.List[T]`` as far as the scripts use it."""
+
+    @property
+    def Count(self):
+        return len(self)
+
+    def Add(self, item):
+        self.append(item)
+
+    def Contains(self, item):
+        return item in self
+
+
+class _ListFactory(object):
+    def __getitem__(self, item_type):
+        return _TypedList
+
+
+List = _ListFactory()
+
+
+# -------------------------------
+# Ids
+# -------------------------------
+class ElementId(object):
+    __slots__ = ("IntegerValue",)
+
+    def __init__(self, value):
+        self.IntegerValue = int(value)
+
+    @property
+    def Value(self):  # Revit 2024+ name
+        return self.IntegerValue
+
+    def __eq__(self, other):
+        return isinstance(other, ElementId) and other.IntegerValue == self.IntegerValue
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __lt__(self, other):
+        return self.IntegerValue < other.IntegerValue
+
+    def __hash__(self):
+        return hash(self.IntegerValue)
+
+    def __str__(self):
+        return str(self.IntegerValue)
+
+    def __repr__(self):
+        return "<ElementId {}>".format(self.IntegerValue)
+
+    ToString = __str__
+
+    def Compare(self, other):
+        return (self.IntegerValue > other.IntegerValue) - (self.IntegerValue < other.IntegerValue)
+
+
+ElementId.InvalidElementId = ElementId(-1)
+INVALID = -1
+
+
+class WorksetId(ElementId):
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<WorksetId {}>".format(self.IntegerValue)
+
+
+class Reference(object):
+    def __init__(self, element_id):
+        self.ElementId = element_id
+
+
+# -------------------------------
+# Categories
+# -------------------------------
+class Category(object):
+    def __init__(self, bic, name, category_type=CategoryType.Model):
+        self.Id = ElementId(bic)
+        self.Name = name
+        self.BuiltInCategory = bic
+        self.CategoryType = category_type
+
+    @staticmethod
+    def GetCategory(doc, category):
+        key = category.IntegerValue if isinstance(category, ElementId) else int(category)
+        return doc._categories.get(key)
+
+    def __eq__(self, other):
+        return isinstance(other, Category) and other.Id == self.Id
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.Id)
+
+    def __repr__(self):
+        return "<Category {}>".format(self.Name)
+
+
+# -------------------------------
+# Parameters
+# -------------------------------
+_MISSING = object()
+
+
+class Definition(object):
+    """A parameter definition; ``getter(element)`` supplies unwritten values.
+
+    Written values live in ``_values`` keyed by element id, so only
+    parameters that were actually set cost memory.
+    """
+
+    __slots__ = ("Name", "StorageType", "BuiltInParameter", "ReadOnly", "GUID",
+                 "_get", "_set", "_values", "_id")
+
+    def __init__(self, name, storage, bip=BuiltInParameter.INVALID, getter=None, setter=None,
+                 read_only=False, guid=None, definition_id=None):
+        self.Name = name
+        self.StorageType = storage
+        self.BuiltInParameter = bip
+        self.ReadOnly = read_only
+        self.GUID = guid
+        self._get = getter
+        self._set = setter
+        self._values = {}
+        self._id = int(bip) if bip != BuiltInParameter.INVALID else definition_id
+
+    @property
+    def Id(self):
+        """Built-in parameter id, or the ParameterElement id of a project parameter."""
+        return ElementId(self._id if self._id is not None else INVALID)
+
+    def __repr__(self):
+        return "<Definition {}>".format(self.Name)
+
+
+class Parameter(object):
+    __slots__ = ("_element", "Definition")
+
+    def __init__(self, element, definition):
+        self._element = element
+        self.Definition = definition
+
+    @property
+    def Id(self):
+        return ElementId(self.Definition._id)
+
+    @property
+    def StorageType(self):
+        return self.Definition.StorageType
+
+    @property
+    def IsReadOnly(self):
+        return self.Definition.ReadOnly
+
+    @property
+    def IsShared(self):
+        return self.Definition.GUID is not None
+
+    @property
+    def GUID(self):
+        return self.Definition.GUID
+
+    @property
+    def Element(self):
+        return self._element
+
+    def _value(self):
+        definition = self.Definition
+        value = definition._values.get(self._element._id, _MISSING)
+        if value is _MISSING:
+            value = definition._get(self._element) if definition._get else None
+        return value
+
+    @property
+    def HasValue(self):
+        value = self._value()
+        if self.Definition.StorageType == StorageType.ElementId:
+            return value is not None and value != INVALID
+        return value is not None
+
+    def AsString(self):
+        return self._value() if self.Definition.StorageType == StorageType.String else None
+
+    def AsInteger(self):
+        value = self._value()
+        return int(value or 0) if self.Definition.StorageType == StorageType.Integer else 0
+
+    def AsDouble(self):
+        value = self._value()
+        return float(value or 0.0) if self.Definition.StorageType == StorageType.Double else 0.0
+
+    def AsElementId(self):
+        if self.Definition.StorageType != StorageType.ElementId:
+            return ElementId.InvalidElementId
+        value = self._value()
+        return ElementId(INVALID if value is None else value)
+
+    def AsValueString(self):
+        value = self._value()
+        storage = self.Definition.StorageType
+        if value is None:
+            return None
+        if storage == StorageType.ElementId:
+            target = self._element._doc._elements.get(value)
+            return target.Name if target is not None else None
+        if storage == StorageType.Double:
+            return "{:.2f}".format(value)
+        return str(value)
+
+    def Set(self, value):
+        element = self._element
+        doc = element._doc
+        if self.Definition.ReadOnly:
+            raise InvalidOperationException(
+                "The parameter '{}' is read-only.".format(self.Definition.Name))
+        doc._require_transaction()
+        storage = self.Definition.StorageType
+        if storage == StorageType.ElementId:
+            value = value.IntegerValue
+        elif storage == StorageType.Integer:
+            value = int(value)
+        elif storage == StorageType.Double:
+            value = float(value)
+        elif value is not None and not isinstance(value, basestring_types):
+            raise ArgumentException("Expected a string for '{}'".format(self.Definition.Name))
+        if self.Definition._set is not None:
+            self.Definition._set(element, value)
+        else:
+            values = self.Definition._values
+            old = values.get(element._id, _MISSING)
+            values[element._id] = value
+            doc._record_undo(_restore_value, values, element._id, old)
+        doc._mark_modified(element._id)
+        return True
+
+    def __repr__(self):
+        return "<Parameter {}>".format(self.Definition.Name)
+
+
+def _restore_value(values, key, old):
+    if old is _MISSING:
+        values.pop(key, None)
+    else:
+        values[key] = old
+
+
+class CategorySet(object):
+    def __init__(self, categories=()):
+        self._categories = []
+        for category in categories:
+            self.Insert(category)
+
+    def Insert(self, category):
+        if self.Contains(category):
+            return False
+        self._categories.append(category)
+        return True
+
+    def Erase(self, category):
+        if not self.Contains(category):
+            return 0
+        self._categories = [c for c in self._categories if c.Id != category.Id]
+        return 1
+
+    def Contains(self, category):
+        return any(c.Id == category.Id for c in self._categories)
+
+    @property
+    def Size(self):
+        return len(self._categories)
+
+    @property
+    def IsEmpty(self):
+        return not self._categories
+
+    def __iter__(self):
+        return iter(list(self._categories))
+
+    def __len__(self):
+        return len(self._categories)
+
+
+class ElementBinding(object):
+    def __init__(self, categories=None):
+        self.Categories = categories if categories is not None else CategorySet()
+
+
+class InstanceBinding(ElementBinding):
+    pass
+
+
+class TypeBinding(ElementBinding):
+    pass
+
+
+class DefinitionBindingMapIterator(object):
+    def __init__(self, items):
+        self._items = items
+        self._position = -1
+
+    def Reset(self):
+        self._position = -1
+
+    def MoveNext(self):
+        self._position += 1
+        return self._position < len(self._items)
+
+    @property
+    def Key(self):
+        return self._items[self._position][0]
+
+    @property
+    def Current(self):
+        return self._items[self._position][1]
+
+
+class BindingMap(object):
+    """``doc.ParameterBindings``: project and shared parameters bound to categories.
+
+    Inserting binds the definition to the categories' elements (it shows
+    up in ``LookupParameter``); the definition id stands for the
+    ParameterElement in DocumentChanged.
+    """
+
+    def __init__(self, doc):
+        self._doc = doc
+
+    @property
+    def Size(self):
+        return len(self._doc._bindings)
+
+    @property
+    def IsEmpty(self):
+        return not self._doc._bindings
+
+    def Contains(self, definition):
+        return definition in self._doc._bindings
+
+    def get_Item(self, definition):
+        return self._doc._bindings.get(definition)
+
+    def Insert(self, definition, binding, group=None):
+        doc = self._doc
+        doc._require_transaction()
+        if definition in doc._bindings:
+            return False
+        doc._bind(definition, binding)
+        doc._record_undo(doc._unbind, definition)
+        doc._mark_added(definition._id)
+        return True
+
+    def ReInsert(self, definition, binding, group=None):
+        doc = self._doc
+        doc._require_transaction()
+        old = doc._bindings.get(definition)
+        if old is None:
+            return self.Insert(definition, binding, group)
+        doc._unbind(definition)
+        doc._bind(definition, binding)
+        doc._record_undo(self._rebind, definition, old)
+        doc._mark_modified(definition._id)
+        return True
+
+    def _rebind(self, definition, binding):
+        self._doc._unbind(definition)
+        self._doc._bind(definition, binding)
+
+    def Remove(self, definition):
+        doc = self._doc
+        doc._require_transaction()
+        binding = doc._bindings.get(definition)
+        if binding is None:
+            return False
+        doc._unbind(definition)
+        doc._record_undo(doc._bind, definition, binding)
+        doc._mark_deleted(definition._id)
+        return True
+
+    def ForwardIterator(self):
+        return DefinitionBindingMapIterator(list(self._doc._bindings.items()))
+
+    def __len__(self):
+        return self.Size
+
+
+# -------------------------------
+# Elements
+# -------------------------------
+class Element(object):
+    """Base element; ``_level`` / ``_owner`` hold raw int ids (-1 for none)."""
+
+    __slots__ = ("_doc", "_id", "_cat", "_type", "_level", "_name", "_workset", "_phase",
+                 "_owner")
+    _is_type = False
+    _has_level_id = True     # False: LevelId is invalid, level lives in a parameter
+
+    def __init__(self, doc, element_id, category=INVALID, type_id=INVALID, level=INVALID,
+                 name=None, workset=0, phase=INVALID, owner=INVALID):
+        self._doc = doc
+        self._id = element_id
+        self._cat = category
+        self._type = type_id
+        self._level = level
+        self._name = name
+        self._workset = workset
+        self._phase = phase
+        self._owner = owner
+
+    # -------------------------------
+    # Identity
+    # -------------------------------
+    @property
+    def Id(self):
+        return ElementId(self._id)
+
+    @property
+    def Document(self):
+        return self._doc
+
+    @property
+    def IsValidObject(self):
+        return self._doc._elements.get(self._id) is self
+
+    def GetType(self):
+        return _DotNetType(type(self).__name__)
+
+    @property
+    def Category(self):
+        return self._doc._categories.get(self._cat)
+
+    @property
+    def Name(self):
+        if self._name is not None:
+            return self._name
+        element_type = self._doc._elements.get(self._type)
+        if element_type is not None:
+            return element_type.Name
+        category = self._doc._categories.get(self._cat)
+        return category.Name if category is not None else type(self).__name__
+
+    @Name.setter
+    def Name(self, value):
+        self._doc._require_transaction()
+        self._rename(value)
+
+    def _rename(self, value):
+        old = self._name
+        self._name = value
+        self._doc._record_undo(setattr, self, "_name", old)
+        self._doc._mark_modified(self._id)
+
+    def GetTypeId(self):
+        return ElementId(self._type)
+
+    def ChangeTypeId(self, type_id):
+        self._doc._require_transaction()
+        old = self._type
+        self._type = type_id.IntegerValue
+        self._doc._record_undo(setattr, self, "_type", old)
+        self._doc._mark_modified(self._id)
+        return self.Id
+
+    @property
+    def LevelId(self):
+        if not self._has_level_id or self._cat in self._doc._level_param_only:
+            return ElementId.InvalidElementId
+        return ElementId(self._level)
+
+    @property
+    def OwnerViewId(self):
+        return ElementId(self._owner)
+
+    @property
+    def ViewSpecific(self):
+        return self._owner != INVALID
+
+    @property
+    def WorksetId(self):
+        return WorksetId(self._workset)
+
+    @property
+    def CreatedPhaseId(self):
+        return ElementId(self._phase)
+
+    # -------------------------------
+    # Parameters
+    # -------------------------------
+    def _definitions(self):
+        return self._doc._param_defs(self)
+
+    def LookupParameter(self, name):
+        for definition in self._doc._param_defs(self):
+            if definition.Name == name:
+                return Parameter(self, definition)
+        return None
+
+    def GetParameters(self, name):
+        return [Parameter(self, d) for d in self._doc._param_defs(self) if d.Name == name]
+
+    def get_Parameter(self, key):
+        """Parameter by ``BuiltInParameter``, shared-parameter GUID or ``Definition``."""
+        if isinstance(key, Definition):
+            if key._id is not None:     # Revit looks definitions up by id, too
+                definition = self._doc._param_index(self).get(key._id)
+                definition = definition if definition is key else None
+            else:
+                definition = key if key in self._doc._param_defs(self) else None
+        else:
+            definition = self._doc._param_index(self).get(key if isinstance(key, basestring_types)
+                                                          else int(key))
+        return Parameter(self, definition) if definition is not None else None
+
+    @property
+    def Parameters(self):
+        return [Parameter(self, d) for d in self._doc._param_defs(self)]
+
+    # -------------------------------
+    # Geometry
+    # -------------------------------
+    @property
+    def Location(self):
+        """``LocationCurve`` / ``LocationPoint`` of created elements, else None."""
+        return self._doc._locations.get(self._id)
+
+    def _box(self):
+        """``(min x, min y, min z, max x, max y, max z)`` or None; see ``SITE_SIZE``."""
+        if self._is_type or self._owner != INVALID or self._level == INVALID:
+            return None
+        level = self._doc._elements.get(self._level)
+        z = level.Elevation if level is not None else 0.0
+        element_id = self._id
+        x = _scramble(element_id, 100000) * (SITE_SIZE / 100000)
+        y = _scramble(element_id * 31 + 7, 100000) * (SITE_SIZE / 100000)
+        length = 1.0 + _scramble(element_id >> 2, 24)           # 1 to 24 ft
+        if element_id % 2:
+            return (x, y, z, x + length, y + 1.0, z + 10.0)
+        return (x, y, z, x + 1.0, y + length, z + 10.0)
+
+    def get_BoundingBox(self, view):
+        box = self._box()
+        if box is None:
+            return None
+        result = BoundingBoxXYZ()
+        result.Min = XYZ(box[0], box[1], box[2])
+        result.Max = XYZ(box[3], box[4], box[5])
+        return result
+
+    def __repr__(self):
+        return "<{} {} {}>".format(type(self).__name__, self._id, self.Name)
+
+
+class ElementType(Element):
+    __slots__ = ()
+    _is_type = True
+    _has_level_id = False
+
+    @property
+    def FamilyName(self):
+        category = self.Category
+        return category.Name if category is not None else ""
+
+
+class FamilySymbol(ElementType):
+    __slots__ = ()
+    IsActive = True         # every stand-in symbol is placed somewhere
+
+    @property
+    def FamilyName(self):
+        return self._doc._family_names.get(self._id, "")
+
+    def Activate(self):
+        self._doc._require_transaction()
+
+
+class WallType(ElementType):
+    __slots__ = ()
+
+
+class FloorType(ElementType):
+    __slots__ = ()
+
+
+class CeilingType(ElementType):
+    __slots__ = ()
+
+
+class RoofType(ElementType):
+    __slots__ = ()
+
+
+class MEPCurveType(ElementType):
+    __slots__ = ()
+
+
+class TextNoteType(ElementType):
+    __slots__ = ()
+
+
+class FilledRegionType(ElementType):
+    __slots__ = ()
+
+
+class GridType(ElementType):
+    __slots__ = ()
+
+
+class ViewFamilyType(ElementType):
+    __slots__ = ()
+
+    @property
+    def ViewFamily(self):
+        return self._doc._view_families[self._id]
+
+
+class Wall(Element):
+    __slots__ = ()
+
+    @property
+    def WallType(self):
+        return self._doc._elements.get(self._type)
+
+    @staticmethod
+    def Create(doc, curve, *args):
+        """``(doc, curve, level_id, structural)`` with the first wall type, or
+        ``(doc, curve, wall_type_id, level_id, height, offset, flip, structural)``."""
+        if len(args) == 2:
+            type_id, level_id = doc._first_type(WallType), args[0]
+        else:
+            type_id, level_id = args[0].IntegerValue, args[1]
+            doc._check_type(type_id, WallType, "wallTypeId")
+            if args[2] <= 0:
+                raise ArgumentException("height must be positive.")
+        level = doc._check_level(level_id)
+        return doc._create(Wall(doc, doc.new_id(), BuiltInCategory.OST_Walls, type_id,
+                                level._id), LocationCurve(curve))
+
+
+class Floor(Element):
+    __slots__ = ()
+
+
+class Ceiling(Element):
+    __slots__ = ()
+
+
+class RoofBase(Element):
+    __slots__ = ()
+
+
+class FamilyInstance(Element):
+    __slots__ = ()
+
+    @property
+    def Symbol(self):
+        return self._doc._elements.get(self._type)
+
+
+class MEPCurve(Element):
+    __slots__ = ()
+
+
+class SpatialElement(Element):
+    __slots__ = ()
+
+    @property
+    def Number(self):
+        return str(self._id)
+
+
+class Room(SpatialElement):
+    __slots__ = ()
+
+
+class CurveElement(Element):
+    __slots__ = ()
+    _has_level_id = False
+
+
+class DetailCurve(CurveElement):
+    __slots__ = ()
+
+
+class TextNote(Element):
+    __slots__ = ("_text",)
+    _has_level_id = False
+
+    @property
+    def Text(self):
+        return getattr(self, "_text", "")
+
+    @staticmethod
+    def Create(doc, view_id, position, text, type_id):
+        if not text:
+            raise ArgumentException("text cannot be empty.")
+        view = doc._check_view(view_id)
+        doc._check_type(type_id.IntegerValue, TextNoteType, "typeId")
+        note = TextNote(doc, doc.new_id(), BuiltInCategory.OST_TextNotes, type_id.IntegerValue,
+                        owner=view._id)
+        note._text = text
+        return doc._create(note, LocationPoint(position))
+
+
+class FilledRegion(Element):
+    __slots__ = ()
+    _has_level_id = False
+
+    @staticmethod
+    def Create(doc, type_id, view_id, boundaries):
+        view = doc._check_view(view_id)
+        doc._check_type(type_id.IntegerValue, FilledRegionType, "typeId")
+        loops = list(boundaries)
+        if not loops or any(loop.IsOpen() or loop.NumberOfCurves() < 3 for loop in loops):
+            raise ArgumentException("The boundaries must be closed loops of three or more "
+                                    "curves.")
+        return doc._create(FilledRegion(doc, doc.new_id(), BuiltInCategory.OST_DetailComponents,
+                                        type_id.IntegerValue, owner=view._id))
+
+
+class Grid(Element):
+    __slots__ = ()
+    _has_level_id = False
+
+
+class Phase(Element):
+    __slots__ = ()
+    _has_level_id = False
+
+
+class Level(Element):
+    __slots__ = ("Elevation",)
+    _has_level_id = False
+
+    def __init__(self, doc, element_id, name, elevation):
+        Element.__init__(self, doc, element_id, BuiltInCategory.OST_Levels, name=name)
+        self.Elevation = elevation
+
+    @property
+    def ProjectElevation(self):
+        return self.Elevation
+
+
+class View(Element):
+    """Views are few, so they keep plain attributes next to the slots."""
+
+    __slots__ = ("ViewType", "IsTemplate", "Scale", "_gen_level", "_template", "_primary")
+    _has_level_id = False
+
+    def __init__(self, doc, element_id, name, view_type, type_id=INVALID, gen_level=INVALID,
+                 is_template=False, scale=100, template=INVALID, primary=INVALID,
+                 category=BuiltInCategory.OST_Views):
+        Element.__init__(self, doc, element_id, category, type_id, name=name)
+        self.ViewType = view_type
+        self.IsTemplate = is_template
+        self.Scale = scale
+        self._gen_level = gen_level
+        self._template = template
+        self._primary = primary
+
+    @property
+    def Name(self):
+        return self._name
+
+    @Name.setter
+    def Name(self, value):
+        doc = self._doc
+        doc._require_transaction()
+        if not value or any(c in value for c in "{}[]|;<>?`~\\:"):
+            raise ArgumentException("Name contains prohibited characters or is empty.")
+        if value != self._name and doc._view_name_taken(self, value):
+            raise ArgumentException("The name entered is already in use. Enter a unique name.")
+        self._rename(value)
+
+    @property
+    def GenLevel(self):
+        return self._doc._elements.get(self._gen_level)
+
+    @property
+    def ViewTemplateId(self):
+        return ElementId(self._template)
+
+    def _rename(self, value):
+        doc = self._doc
+        old = self._name
+        doc._rename_view(self, old, value)
+        self._name = value
+        doc._record_undo(self._rename_back, value, old)
+        doc._mark_modified(self._id)
+
+    def _rename_back(self, current, old):
+        self._doc._rename_view(self, current, old)
+        self._name = old
+
+    def GetPrimaryViewId(self):
+        return ElementId(self._primary)
+
+    def GetDependentViewIds(self):
+        return _TypedList(ElementId(i) for i in self._doc._dependents.get(self._id, ()))
+
+    def _name_scope(self):
+        return ("template",) if self.IsTemplate else ("view", int(self.ViewType))
+
+
+class ViewPlan(View):
+    __slots__ = ()
+
+
+class View3D(View):
+    __slots__ = ()
+
+
+class ViewSection(View):
+    __slots__ = ()
+
+
+class ViewDrafting(View):
+    __slots__ = ()
+
+
+class ViewSheet(View):
+    __slots__ = ("SheetNumber",)
+
+    def __init__(self, doc, element_id, number, name, type_id=INVALID):
+        View.__init__(self, doc, element_id, name, ViewType.DrawingSheet, type_id,
+                      category=BuiltInCategory.OST_Sheets)
+        self.SheetNumber = number
+
+    @property
+    def Name(self):
+        return self._name
+
+    @Name.setter
+    def Name(self, value):
+        self._doc._require_transaction()
+        self._rename(value)  # sheet names may repeat; numbers may not
+
+    def _name_scope(self):
+        return ("sheet", self.SheetNumber)
+
+    def GetAllPlacedViews(self):
+        return set(ElementId(i) for i in self._doc._sheet_views.get(self._id, ()))
+
+    def GetAllViewports(self):
+        return _TypedList(ElementId(i) for i in self._doc._sheet_viewports.get(self._id, ()))
+
+
+class Viewport(Element):
+    __slots__ = ("_sheet", "_view")
+    _has_level_id = False
+
+    def __init__(self, doc, element_id, sheet_id, view_id):
+        Element.__init__(self, doc, element_id, BuiltInCategory.OST_Viewports,
+                         owner=sheet_id)
+        self._sheet = sheet_id
+        self._view = view_id
+
+    @property
+    def SheetId(self):
+        return ElementId(self._sheet)
+
+    @property
+    def ViewId(self):
+        return ElementId(self._view)
+
+    @staticmethod
+    def Create(doc, sheet_id, view_id, point=None):
+        doc._require_transaction()
+        if view_id.IntegerValue in doc._view_sheet:
+            raise ArgumentException("The view is already placed on a sheet.")
+        return doc.add(Viewport(doc, doc.new_id(), sheet_id.IntegerValue, view_id.IntegerValue))
+
+
+# -------------------------------
+# Geometry
+# -------------------------------
+SITE_SIZE = 1000.0      # model elements are spread over a SITE_SIZE x SITE_SIZE ft square
+
+
+class XYZ(object):
+    __slots__ = ("X", "Y", "Z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def Add(self, other):
+        return XYZ(self.X + other.X, self.Y + other.Y, self.Z + other.Z)
+
+    def Subtract(self, other):
+        return XYZ(self.X - other.X, self.Y - other.Y, self.Z - other.Z)
+
+    def Multiply(self, value):
+        return XYZ(self.X * value, self.Y * value, self.Z * value)
+
+    __add__, __sub__, __mul__ = Add, Subtract, Multiply
+
+    def __repr__(self):
+        return "({}, {}, {})".format(self.X, self.Y, self.Z)
+
+
+class BoundingBoxXYZ(object):
+    def __init__(self):
+        self.Min = XYZ()
+        self.Max = XYZ()
+        self.Enabled = True
+
+
+class Outline(object):
+    def __init__(self, minimum, maximum):
+        self.MinimumPoint = minimum
+        self.MaximumPoint = maximum
+
+    def _bounds(self):
+        low, high = self.MinimumPoint, self.MaximumPoint
+        return (low.X, low.Y, low.Z, high.X, high.Y, high.Z)
+
+    def Intersects(self, other, tolerance=0.0):
+        return _boxes_intersect(self._bounds(), other._bounds(), tolerance)
+
+    def Contains(self, point, tolerance=0.0):
+        return _box_contains(self._bounds(), (point.X, point.Y, point.Z), tolerance)
+
+    def IsEmpty(self):
+        low, high = self.MinimumPoint, self.MaximumPoint
+        return low.X > high.X or low.Y > high.Y or low.Z > high.Z
+
+
+def _boxes_intersect(a, b, tolerance=0.0):
+    return (a[0] <= b[3] + tolerance and b[0] <= a[3] + tolerance and
+            a[1] <= b[4] + tolerance and b[1] <= a[4] + tolerance and
+            a[2] <= b[5] + tolerance and b[2] <= a[5] + tolerance)
+
+
+def _box_contains(box, point, tolerance=0.0):
+    return all(box[k] - tolerance <= point[k] <= box[k + 3] + tolerance for k in range(3))
+
+
+SHORT_CURVE_TOLERANCE = 0.00256     # ft, Application.ShortCurveTolerance
+
+
+class UV(object):
+    __slots__ = ("U", "V")
+
+    def __init__(self, u=0.0, v=0.0):
+        self.U = float(u)
+        self.V = float(v)
+
+
+class Curve(object):
+    __slots__ = ()
+
+
+class Line(Curve):
+    __slots__ = ("_start", "_end")
+
+    def __init__(self, start, end):
+        self._start = start
+        self._end = end
+
+    @staticmethod
+    def CreateBound(start, end):
+        line = Line(start, end)
+        if line.Length < SHORT_CURVE_TOLERANCE:
+            raise ArgumentException("Curve length is too small for Revit's tolerance "
+                                    "(as identified by Application.ShortCurveTolerance).")
+        return line
+
+    def GetEndPoint(self, index):
+        return self._end if index else self._start
+
+    @property
+    def Length(self):
+        return _distance(self._start, self._end)
+
+
+class CurveLoop(object):
+    def __init__(self):
+        self._curves = []
+
+    def Append(self, curve):
+        self._curves.append(curve)
+
+    def NumberOfCurves(self):
+        return len(self._curves)
+
+    def IsOpen(self):
+        curves = self._curves
+        if not curves:
+            return True
+        return any(_distance(curves[n - 1].GetEndPoint(1), curve.GetEndPoint(0)) >
+                   SHORT_CURVE_TOLERANCE for n, curve in enumerate(curves))
+
+    def __iter__(self):
+        return iter(self._curves)
+
+
+def _distance(a, b):
+    return ((b.X - a.X) ** 2 + (b.Y - a.Y) ** 2 + (b.Z - a.Z) ** 2) ** 0.5
+
+
+class LocationCurve(object):
+    def __init__(self, curve):
+        self.Curve = curve
+
+
+class LocationPoint(object):
+    def __init__(self, point):
+        self.Point = point
+
+
+# -------------------------------
+# Filters
+# -------------------------------
+class ElementFilter(object):
+    """Base filter. ``_candidates(doc)`` may return an id list from an index.
+
+    When ``_exact`` is False the candidates are only a superset and the
+    collector still runs ``_passes`` on each of them.
+    """
+
+    _quick = False
+    _exact = True
+
+    def __init__(self, inverted=False):
+        self._inverted = inverted
+
+    def IsElementQuickFilter(self):
+        return self._quick
+
+    def _candidates(self, doc):
+        return None
+
+    def _match(self, element):
+        raise NotImplementedError
+
+    def _passes(self, element):
+        return self._match(element) != self._inverted
+
+    def PassesFilter(self, doc, element_id):
+        element = doc._elements.get(element_id.IntegerValue)
+        return element is not None and self._passes(element)
+
+    @property
+    def Inverted(self):
+        return self._inverted
+
+
+class ElementQuickFilter(ElementFilter):
+    _quick = True
+
+
+class ElementSlowFilter(ElementFilter):
+    _quick = False
+
+
+class ElementCategoryFilter(ElementQuickFilter):
+    def __init__(self, category, inverted=False):
+        ElementQuickFilter.__init__(self, inverted)
+        self.CategoryId = category if isinstance(category, ElementId) else ElementId(category)
+        self._cat = self.CategoryId.IntegerValue
+
+    def _candidates(self, doc):
+        return None if self._inverted else doc._by_cat.get(self._cat, [])
+
+    def _match(self, element):
+        return element._cat == self._cat
+
+
+class ElementMulticategoryFilter(ElementQuickFilter):
+    def __init__(self, categories, inverted=False):
+        ElementQuickFilter.__init__(self, inverted)
+        self._cats = frozenset(c.IntegerValue if isinstance(c, ElementId) else int(c)
+                               for c in categories)
+
+    def GetCategoryIds(self):
+        return _TypedList(ElementId(c) for c in self._cats)
+
+    def _candidates(self, doc):
+        if self._inverted:
+            return None
+        ids = []
+        for cat in self._cats:
+            ids.extend(doc._by_cat.get(cat, ()))
+        ids.sort()
+        return ids
+
+    def _match(self, element):
+        return element._cat in self._cats
+
+
+class ElementClassFilter(ElementQuickFilter):
+    def __init__(self, element_class, inverted=False):
+        ElementQuickFilter.__init__(self, inverted)
+        self.ElementClass = element_class
+
+    def _candidates(self, doc):
+        if self._inverted:
+            return None
+        lists = [ids for cls, ids in doc._by_class.items() if issubclass(cls, self.ElementClass)]
+        if len(lists) == 1:
+            return lists[0]
+        return sorted(i for ids in lists for i in ids)
+
+    def _match(self, element):
+        return isinstance(element, self.ElementClass)
+
+
+class ElementIsElementTypeFilter(ElementQuickFilter):
+    """Passes element types; ``inverted=True`` passes instances."""
+
+    def _match(self, element):
+        return element._is_type
+
+
+class LogicalAndFilter(ElementFilter):
+    _exact = False
+
+    def __init__(self, *filters):
+        ElementFilter.__init__(self)
+        self._filters = list(filters[0]) if len(filters) == 1 else list(filters)
+        self._quick = all(f._quick for f in self._filters)
+
+    def GetFilters(self):
+        return list(self._filters)
+
+    def _candidates(self, doc):
+        best = None
+        for item in self._filters:
+            ids = item._candidates(doc)
+            if ids is not None and (best is None or len(ids) < len(best)):
+                best = ids
+        return best
+
+    def _match(self, element):
+        for item in self._filters:
+            if not item._passes(element):
+                return False
+        return True
+
+
+class LogicalOrFilter(ElementFilter):
+    _exact = False
+
+    def __init__(self, *filters):
+        ElementFilter.__init__(self)
+        self._filters = list(filters[0]) if len(filters) == 1 else list(filters)
+        self._quick = all(f._quick for f in self._filters)
+
+    def GetFilters(self):
+        return list(self._filters)
+
+    def _candidates(self, doc):
+        lists = [item._candidates(doc) for item in self._filters]
+        if any(ids is None for ids in lists):
+            return None
+        return sorted(set(i for ids in lists for i in ids))
+
+    def _match(self, element):
+        for item in self._filters:
+            if item._passes(element):
+                return True
+        return False
+
+
+class ElementLevelFilter(ElementQuickFilter):
+    """Passes elements whose ``LevelId`` is ``level_id``.
+
+    Elements that only carry their level in a parameter (framing, MEP
+    curves, face-hosted families) do not pass, as in Revit.
+    """
+
+    def __init__(self, level_id, inverted=False):
+        ElementQuickFilter.__init__(self, inverted)
+        self._level = level_id.IntegerValue
+
+    def GetLevelId(self):
+        return ElementId(self._level)
+
+    def _candidates(self, doc):
+        if self._inverted:
+            return None
+        elements = doc._elements
+        return [i for i in doc._by_level.get(self._level, ())
+                if i in elements and self._match(elements[i])]
+
+    def _match(self, element):
+        return element._level == self._level and element._has_level_id \
+            and element._cat not in element._doc._level_param_only
+
+
+class _BoundingBoxFilter(ElementQuickFilter):
+    """Quick filter on ``get_BoundingBox(None)``; elements without one never pass."""
+
+    def __init__(self, shape, *args):
+        # (shape[, inverted]) or (shape, tolerance, inverted), as in Revit
+        inverted = args[-1] if args else False
+        ElementQuickFilter.__init__(self, inverted)
+        self.Tolerance = args[0] if len(args) == 2 else 0.0
+        self._shape = shape
+
+    def _passes(self, element):
+        box = element._box()
+        return box is not None and self._match_box(box) != self._inverted
+
+    def _match(self, element):
+        box = element._box()
+        return box is not None and self._match_box(box)
+
+
+class BoundingBoxIntersectsFilter(_BoundingBoxFilter):
+    def GetBoundingBox(self):
+        return self._shape
+
+    def _match_box(self, box):
+        return _boxes_intersect(box, self._shape._bounds(), self.Tolerance)
+
+
+class BoundingBoxIsInsideFilter(_BoundingBoxFilter):
+    def GetBoundingBox(self):
+        return self._shape
+
+    def _match_box(self, box):
+        bounds, tolerance = self._shape._bounds(), self.Tolerance
+        return all(bounds[k] - tolerance <= box[k] and box[k + 3] <= bounds[k + 3] + tolerance
+                   for k in range(3))
+
+
+class BoundingBoxContainsPointFilter(_BoundingBoxFilter):
+    def GetPoint(self):
+        return self._shape
+
+    def _match_box(self, box):
+        point = self._shape
+        return _box_contains(box, (point.X, point.Y, point.Z), self.Tolerance)
+
+
+class ElementParameterFilter(ElementSlowFilter):
+    """Passes elements for which every rule passes."""
+
+    _exact = False
+
+    def __init__(self, rules, inverted=False):
+        ElementSlowFilter.__init__(self, inverted)
+        self._rules = list(rules) if isinstance(rules, (list, tuple)) else [rules]
+
+    def GetRules(self):
+        return list(self._rules)
+
+    def _candidates(self, doc):
+        # Only categories that have the parameter need checking
+        if self._inverted:
+            return None
+        param_ids = set(rule._param for rule in self._rules if rule._param is not None)
+        if not param_ids:
+            return None
+        ids = []
+        for (category, is_type), index in doc._defs_index.items():
+            if all(p in index for p in param_ids):
+                ids.extend(i for i in doc._by_cat.get(category, ())
+                           if doc._elements.get(i) is not None
+                           and doc._elements[i]._is_type == is_type)
+        ids.sort()
+        return ids
+
+    def _match(self, element):
+        for rule in self._rules:
+            if not rule._passes(element):
+                return False
+        return True
+
+
+# -------------------------------
+# Parameter filter rules
+# -------------------------------
+class ParameterValueProvider(object):
+    def __init__(self, parameter_id):
+        self.Parameter = parameter_id
+
+
+class FilterRule(object):
+    _param = None
+
+    def GetRuleParameter(self):
+        return ElementId(self._param)
+
+    def _raw(self, element):
+        definition = element._doc._param_index(element).get(self._param)
+        if definition is None:
+            return _MISSING
+        return Parameter(element, definition)._value()
+
+    def _passes(self, element):
+        raise NotImplementedError
+
+
+class FilterValueRule(FilterRule):
+    """``value <evaluator> rule value``; elements without the parameter fail."""
+
+    def __init__(self, provider, evaluator, value, tolerance=None):
+        self._param = provider.Parameter.IntegerValue
+        self._evaluator = evaluator
+        if isinstance(value, ElementId):
+            value = value.IntegerValue
+        self._value = value
+        self._tolerance = tolerance
+
+    def _passes(self, element):
+        raw = self._raw(element)
+        if raw is _MISSING:
+            return False
+        return self._evaluator._test(raw, self._value, self._tolerance)
+
+
+class FilterElementIdRule(FilterValueRule):
+    pass
+
+
+class FilterIntegerRule(FilterValueRule):
+    pass
+
+
+class FilterDoubleRule(FilterValueRule):
+    pass
+
+
+class FilterStringRule(FilterValueRule):
+    pass
+
+
+class HasValueFilterRule(FilterRule):
+    def __init__(self, parameter_id):
+        self._param = parameter_id.IntegerValue
+
+    def _passes(self, element):
+        raw = self._raw(element)
+        return raw is not _MISSING and raw is not None and raw != INVALID and raw != ""
+
+
+class HasNoValueFilterRule(HasValueFilterRule):
+    def _passes(self, element):
+        return self._raw(element) is not _MISSING and not HasValueFilterRule._passes(self, element)
+
+
+class FilterInverseRule(FilterRule):
+    def __init__(self, rule):
+        self._rule = rule
+        self._param = rule._param
+
+    def GetInnerRule(self):
+        return self._rule
+
+    def _passes(self, element):
+        return self._raw(element) is not _MISSING and not self._rule._passes(element)
+
+
+class FilterRuleEvaluator(object):
+    """Compares a parameter's raw value with the rule value."""
+
+    def _test(self, raw, value, tolerance):
+        if isinstance(value, basestring_types):
+            return self._compare_text((raw or "").lower(), value.lower())
+        if raw is None:
+            raw = INVALID if isinstance(value, int) else 0.0
+        return self._compare(raw - value, tolerance or 0)
+
+    def _compare(self, difference, tolerance):
+        return False
+
+    def _compare_text(self, text, value):
+        return False
+
+
+class FilterNumericEquals(FilterRuleEvaluator):
+    def _compare(self, difference, tolerance):
+        return abs(difference) <= tolerance
+
+    def _compare_text(self, text, value):
+        return text == value
+
+
+class FilterNumericGreater(FilterRuleEvaluator):
+    def _compare(self, difference, tolerance):
+        return difference > tolerance
+
+    def _compare_text(self, text, value):
+        return text > value
+
+
+class FilterNumericGreaterOrEqual(FilterRuleEvaluator):
+    def _compare(self, difference, tolerance):
+        return difference >= -tolerance
+
+    def _compare_text(self, text, value):
+        return text >= value
+
+
+class FilterNumericLess(FilterRuleEvaluator):
+    def _compare(self, difference, tolerance):
+        return difference < -tolerance
+
+    def _compare_text(self, text, value):
+        return text < value
+
+
+class FilterNumericLessOrEqual(FilterRuleEvaluator):
+    def _compare(self, difference, tolerance):
+        return difference <= tolerance
+
+    def _compare_text(self, text, value):
+        return text <= value
+
+
+class FilterStringContains(FilterRuleEvaluator):
+    def _compare_text(self, text, value):
+        return value in text
+
+
+class FilterStringBeginsWith(FilterRuleEvaluator):
+    def _compare_text(self, text, value):
+        return text.startswith(value)
+
+
+class FilterStringEndsWith(FilterRuleEvaluator):
+    def _compare_text(self, text, value):
+        return text.endswith(value)
+
+
+FilterStringEquals = FilterNumericEquals
+FilterStringGreater = FilterNumericGreater
+FilterStringLess = FilterNumericLess
+
+
+class ParameterFilterRuleFactory(object):
+    """The rule factory; string rules are case-insensitive (Revit 2023+)."""
+
+    @staticmethod
+    def _rule(parameter_id, evaluator, value, extra=None):
+        provider = ParameterValueProvider(parameter_id)
+        if isinstance(value, ElementId):
+            return FilterElementIdRule(provider, evaluator, value)
+        if isinstance(value, basestring_types):
+            return FilterStringRule(provider, evaluator, value)
+        if isinstance(value, float):
+            return FilterDoubleRule(provider, evaluator, value, extra or 1e-9)
+        return FilterIntegerRule(provider, evaluator, value)
+
+    @staticmethod
+    def CreateEqualsRule(parameter_id, value, extra=None):
+        return ParameterFilterRuleFactory._rule(parameter_id, FilterNumericEquals(), value, extra)
+
+    @staticmethod
+    def CreateNotEqualsRule(parameter_id, value, extra=None):
+        return FilterInverseRule(ParameterFilterRuleFactory.CreateEqualsRule(
+            parameter_id, value, extra))
+
+    @staticmethod
+    def CreateGreaterRule(parameter_id, value, extra=None):
+        return ParameterFilterRuleFactory._rule(parameter_id, FilterNumericGreater(), value, extra)
+
+    @staticmethod
+    def CreateGreaterOrEqualRule(parameter_id, value, extra=None):
+        return ParameterFilterRuleFactory._rule(parameter_id, FilterNumericGreaterOrEqual(),
+                                                value, extra)
+
+    @staticmethod
+    def CreateLessRule(parameter_id, value, extra=None):
+        return ParameterFilterRuleFactory._rule(parameter_id, FilterNumericLess(), value, extra)
+
+    @staticmethod
+    def CreateLessOrEqualRule(parameter_id, value, extra=None):
+        return ParameterFilterRuleFactory._rule(parameter_id, FilterNumericLessOrEqual(),
+                                                value, extra)
+
+    @staticmethod
+    def CreateContainsRule(parameter_id, value, extra=None):
+        return ParameterFilterRuleFactory._rule(parameter_id, FilterStringContains(), value)
+
+    @staticmethod
+    def CreateNotContainsRule(parameter_id, value, extra=None):
+        return FilterInverseRule(ParameterFilterRuleFactory.CreateContainsRule(parameter_id, value))
+
+    @staticmethod
+    def CreateBeginsWithRule(parameter_id, value, extra=None):
+        return ParameterFilterRuleFactory._rule(parameter_id, FilterStringBeginsWith(), value)
+
+    @staticmethod
+    def CreateEndsWithRule(parameter_id, value, extra=None):
+        return ParameterFilterRuleFactory._rule(parameter_id, FilterStringEndsWith(), value)
+
+    @staticmethod
+    def CreateHasValueParameterRule(parameter_id):
+        return HasValueFilterRule(parameter_id)
+
+    @staticmethod
+    def CreateHasNoValueParameterRule(parameter_id):
+        return HasNoValueFilterRule(parameter_id)
+
+
+# -------------------------------
+# Collector
+# -------------------------------
+class FilteredElementCollector(object):
+    """``FilteredElementCollector(doc[, view_id | element_ids])``.
+
+    Like Revit's, the collector is narrowed in place and each call returns
+    the same collector.
+    """
+
+    def __init__(self, doc, scope=None):
+        self._doc = doc
+        self._filters = []
+        self._excluded = None
+        if scope is None:
+            self._source = None
+        elif isinstance(scope, ElementId):
+            self._source = doc._ids_in_view(scope.IntegerValue)
+        else:
+            self._source = [i.IntegerValue for i in scope]
+
+    def WherePasses(self, element_filter):
+        self._filters.append(element_filter)
+        return self
+
+    def OfClass(self, element_class):
+        return self.WherePasses(ElementClassFilter(element_class))
+
+    def OfCategory(self, category):
+        return self.WherePasses(ElementCategoryFilter(category))
+
+    def OfCategoryId(self, category_id):
+        return self.WherePasses(ElementCategoryFilter(category_id))
+
+    def WhereElementIsElementType(self):
+        return self.WherePasses(ElementIsElementTypeFilter())
+
+    def WhereElementIsNotElementType(self):
+        return self.WherePasses(ElementIsElementTypeFilter(True))
+
+    def WhereElementIsViewIndependent(self):
+        return self.WherePasses(_ViewIndependentFilter())
+
+    def Excluding(self, element_ids):
+        self._excluded = set(i.IntegerValue for i in element_ids)
+        return self
+
+    def _iter_elements(self):
+        doc = self._doc
+        elements = doc._elements
+        filters = list(self._filters)
+        ids = self._source
+        if ids is None:
+            best = None
+            for item in filters:
+                candidates = item._candidates(doc)
+                if candidates is not None and (best is None or len(candidates) < len(best[1])):
+                    best = (item, candidates)
+            if best is not None:
+                ids = best[1]
+                if best[0]._exact:
+                    filters.remove(best[0])
+            else:
+                ids = doc._order
+        checks = [f._passes for f in filters]
+        excluded = self._excluded
+        for element_id in ids:
+            element = elements.get(element_id)
+            if element is None or (excluded and element_id in excluded):
+                continue
+            for check in checks:
+                if not check(element):
+                    break
+            else:
+                yield element
+
+    def __iter__(self):
+        return self._iter_elements()
+
+    def ToElements(self):
+        return _TypedList(self._iter_elements())
+
+    def ToElementIds(self):
+        return _TypedList(ElementId(e._id) for e in self._iter_elements())
+
+    def GetElementCount(self):
+        return sum(1 for _ in self._iter_elements())
+
+    def FirstElement(self):
+        for element in self._iter_elements():
+            return element
+        return None
+
+    def FirstElementId(self):
+        element = self.FirstElement()
+        return ElementId(element._id) if element is not None else ElementId.InvalidElementId
+
+
+class _ViewIndependentFilter(ElementQuickFilter):
+    def _match(self, element):
+        return element._owner == INVALID
+
+
+# -------------------------------
+# Transactions
+# -------------------------------
+class Transaction(object):
+    def __init__(self, doc, name=None):
+        self._doc = doc
+        self._name = name
+        self._status = TransactionStatus.Uninitialized
+
+    def GetName(self):
+        return self._name
+
+    def SetName(self, name):
+        self._name = name
+
+    def Start(self, name=None):
+        if name:
+            self._name = name
+        if self._doc._transaction is not None:
+            raise InvalidOperationException("A transaction is already open.")
+        if not self._name:
+            raise InvalidOperationException("A transaction needs a name.")
+        self._doc._transaction = self
+        self._doc._undo = []
+        self._doc._changes = (set(), set(), set())
+        self._status = TransactionStatus.Started
+        return self._status
+
+    def _end(self, status):
+        if self._status != TransactionStatus.Started:
+            raise InvalidOperationException("The transaction has not been started.")
+        self._doc._transaction = None
+        self._status = status
+        return status
+
+    def Commit(self):
+        doc = self._doc
+        if doc._subtransactions:
+            raise InvalidOperationException("A sub-transaction is still open.")
+        undo, doc._undo = doc._undo, []
+        changes, doc._changes = doc._changes, None
+        status = self._end(TransactionStatus.Committed)
+        if doc._groups:
+            doc._groups[-1]._absorb(undo, changes)
+        if changes is not None and any(changes):
+            doc._document_changed(changes, [self._name])
+        return status
+
+    def RollBack(self):
+        self._doc._rollback(0)
+        self._doc._changes = None   # nothing reaches DocumentChanged
+        del self._doc._subtransactions[:]
+        return self._end(TransactionStatus.RolledBack)
+
+    def GetStatus(self):
+        return self._status
+
+    def HasStarted(self):
+        return self._status != TransactionStatus.Uninitialized
+
+    def HasEnded(self):
+        return self._status in (TransactionStatus.Committed, TransactionStatus.RolledBack)
+
+    def Dispose(self):
+        if self._status == TransactionStatus.Started:
+            self.RollBack()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Dispose()
+
+
+class SubTransaction(object):
+    """Undo point inside the open transaction; ``RollBack`` undoes only its part."""
+
+    def __init__(self, doc):
+        self._doc = doc
+        self._status = TransactionStatus.Uninitialized
+        self._mark = 0
+
+    def Start(self):
+        doc = self._doc
+        if doc._transaction is None:
+            raise InvalidOperationException(
+                "A sub-transaction can only be started inside a transaction.")
+        self._mark = len(doc._undo)
+        doc._subtransactions.append(self)
+        self._status = TransactionStatus.Started
+        return self._status
+
+    def _end(self, status):
+        subtransactions = self._doc._subtransactions
+        if self._status != TransactionStatus.Started or not subtransactions \
+                or subtransactions[-1] is not self:
+            raise InvalidOperationException("The sub-transaction is not the innermost open one.")
+        subtransactions.pop()
+        self._status = status
+        return status
+
+    def Commit(self):
+        return self._end(TransactionStatus.Committed)
+
+    def RollBack(self):
+        self._doc._rollback(self._mark)
+        return self._end(TransactionStatus.RolledBack)
+
+    def GetStatus(self):
+        return self._status
+
+    def HasStarted(self):
+        return self._status != TransactionStatus.Uninitialized
+
+    def HasEnded(self):
+        return self._status in (TransactionStatus.Committed, TransactionStatus.RolledBack)
+
+    def Dispose(self):
+        if self._status == TransactionStatus.Started and self._doc._subtransactions:
+            self.RollBack()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Dispose()
+
+
+class TransactionGroup(object):
+    """Groups the transactions committed while it is open (groups nest).
+
+    ``Assimilate`` / ``Commit`` keep them (merged into one undo item in
+    Revit); ``RollBack`` undoes all of them and raises DocumentChanged
+    with ``UndoOperation.TransactionGroupRolledBack``.
+    """
+
+    def __init__(self, doc, name=None):
+        self._doc = doc
+        self._name = name
+        self._status = TransactionStatus.Uninitialized
+        self._undo = []
+        self._changes = (set(), set(), set())   # net effect of the committed transactions
+
+    def GetName(self):
+        return self._name
+
+    def SetName(self, name):
+        self._name = name
+
+    def Start(self, name=None):
+        if name:
+            self._name = name
+        if self._doc._transaction is not None:
+            raise InvalidOperationException(
+                "A transaction group cannot start inside a transaction.")
+        self._doc._groups.append(self)
+        self._status = TransactionStatus.Started
+        return self._status
+
+    def _absorb(self, undo, changes):
+        self._undo.extend(undo)
+        if changes is None:
+            return
+        added, modified, deleted = self._changes
+        new_added, new_modified, new_deleted = changes
+        added |= new_added
+        modified |= new_modified - added
+        for element_id in new_deleted:
+            if element_id in added:
+                added.discard(element_id)
+            else:
+                modified.discard(element_id)
+                deleted.add(element_id)
+
+    def _end(self, status):
+        groups = self._doc._groups
+        if self._status != TransactionStatus.Started or not groups or groups[-1] is not self:
+            raise InvalidOperationException("The group is not the innermost open one.")
+        if self._doc._transaction is not None:
+            raise InvalidOperationException("A transaction inside the group is still open.")
+        groups.pop()
+        self._status = status
+        return status
+
+    def Assimilate(self):
+        status = self._end(TransactionStatus.Committed)
+        if self._doc._groups:
+            self._doc._groups[-1]._absorb(self._undo, self._changes)
+        self._undo = []
+        return status
+
+    def Commit(self):
+        return self.Assimilate()
+
+    def RollBack(self):
+        doc = self._doc
+        status = self._end(TransactionStatus.RolledBack)
+        undo, self._undo = self._undo, []
+        for func, args in reversed(undo):
+            func(*args)
+        added, modified, deleted = self._changes
+        if added or modified or deleted:
+            doc._document_changed((deleted, modified, added), [self._name],
+                                  UndoOperation.TransactionGroupRolledBack)
+        return status
+
+    def GetStatus(self):
+        return self._status
+
+    def HasStarted(self):
+        return self._status != TransactionStatus.Uninitialized
+
+    def HasEnded(self):
+        return self._status in (TransactionStatus.Committed, TransactionStatus.RolledBack)
+
+    def Dispose(self):
+        if self._status == TransactionStatus.Started:
+            self.RollBack()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Dispose()
+
+
+# -------------------------------
+# Worksets
+# -------------------------------
+class Workset(object):
+    def __init__(self, workset_id, name):
+        self.Id = WorksetId(workset_id)
+        self.Name = name
+
+
+class WorksetTable(object):
+    def __init__(self, doc):
+        self._doc = doc
+
+    def GetWorkset(self, workset_id):
+        return self._doc._worksets.get(workset_id.IntegerValue)
+
+
+# -------------------------------
+# Application events
+# -------------------------------
+class _Event(object):
+    """.NET-style event: ``event += handler`` / ``event -= handler``."""
+
+    def __init__(self):
+        self._handlers = []
+
+    def __iadd__(self, handler):
+        self._handlers.append(handler)
+        return self
+
+    def __isub__(self, handler):
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+        return self
+
+    def __len__(self):
+        return len(self._handlers)
+
+    def _raise(self, sender, args):
+        for handler in list(self._handlers):
+            handler(sender, args)
+
+
+class DocumentChangedEventArgs(object):
+    def __init__(self, doc, added, modified, deleted, transaction_names,
+                 operation=UndoOperation.TransactionCommitted):
+        self._doc = doc
+        self._added = added
+        self._modified = modified
+        self._deleted = deleted
+        self._names = transaction_names
+        self.Operation = operation
+
+    def GetDocument(self):
+        return self._doc
+
+    def GetAddedElementIds(self):
+        return _TypedList(ElementId(i) for i in sorted(self._added))
+
+    def GetModifiedElementIds(self):
+        return _TypedList(ElementId(i) for i in sorted(self._modified))
+
+    def GetDeletedElementIds(self):
+        return _TypedList(ElementId(i) for i in sorted(self._deleted))
+
+    def GetTransactionNames(self):
+        return _TypedList(self._names)
+
+
+class DocumentClosingEventArgs(object):
+    def __init__(self, doc):
+        self.Document = doc
+
+
+class Application(object):
+    """The Revit session: one per process, shared by every document."""
+
+    def __init__(self):
+        self.DocumentChanged = _Event()
+        self.DocumentClosing = _Event()
+        self.ShortCurveTolerance = SHORT_CURVE_TOLERANCE
+
+
+_APPLICATION = Application()
+
+
+# -------------------------------
+# Document
+# -------------------------------
+class _CreationDocument(object):
+    """``doc.Create`` (``Autodesk.Revit.Creation.Document``)."""
+
+    def __init__(self, doc):
+        self._doc = doc
+
+    def NewFamilyInstance(self, curve, symbol, level, structural_type):
+        """Curve-based instance (beams, braces) of ``symbol`` on ``level``."""
+        doc = self._doc
+        doc._check_type(symbol._id, FamilySymbol, "symbol")
+        level = doc._check_level(level.Id)
+        return doc._create(FamilyInstance(doc, doc.new_id(), symbol._cat, symbol._id, level._id),
+                           LocationCurve(curve))
+
+    def NewRoom(self, level, point):
+        doc = self._doc
+        level = doc._check_level(level.Id)
+        return doc._create(Room(doc, doc.new_id(), BuiltInCategory.OST_Rooms, level=level._id),
+                           LocationPoint(XYZ(point.U, point.V, level.Elevation)))
+
+    def NewDetailCurve(self, view, curve):
+        doc = self._doc
+        view = doc._check_view(view.Id)
+        return doc._create(DetailCurve(doc, doc.new_id(), BuiltInCategory.OST_Lines,
+                                       owner=view._id), LocationCurve(curve))
+
+
+class Document(object):
+    """In-memory document: elements by id plus the indexes collectors use."""
+
+    def __init__(self, title="StandIn.rvt"):
+        self.Title = title
+        self.PathName = ""
+        self._elements = {}
+        self._order = []              # all ids in creation order (may hold deleted ids)
+        self._by_cat = {}
+        self._by_class = {}
+        self._by_level = {}
+        self._by_owner = {}
+        self._categories = {}
+        self._defs_by_cat = {}        # (category, is_type) -> [Definition]
+        self._defs_index = {}         # (category, is_type) -> {bip / guid / name: Definition}
+        self._bindings = OrderedDict()  # project / shared Definition -> ElementBinding
+        self._family_names = {}
+        self._view_families = {}
+        self._view_names = {}         # name scope -> {name: view id}
+        self._sheet_views = {}
+        self._sheet_viewports = {}
+        self._view_sheet = {}
+        self._dependents = {}
+        self._worksets = {}
+        self._locations = {}          # created element id -> LocationCurve / LocationPoint
+        self._level_param_only = set(int(c[0]) for c in MODEL_CATEGORIES
+                                     if c[4] in NO_LEVEL_ID_MODES)
+        self._next_id = 1000
+        self._transaction = None
+        self._undo = []
+        self._changes = None          # (added, modified, deleted) ids of the open transaction
+        self._subtransactions = []
+        self._groups = []             # open TransactionGroups, innermost last
+        self.ActiveView = None
+        self.Application = _APPLICATION
+        _register_builtin_parameters(self)
+
+    # -------------------------------
+    # Public API
+    # -------------------------------
+    def GetElement(self, key):
+        if isinstance(key, ElementId):
+            return self._elements.get(key.IntegerValue)
+        if isinstance(key, Reference):
+            return self._elements.get(key.ElementId.IntegerValue)
+        return self._elements.get(int(key))
+
+    @property
+    def ParameterBindings(self):
+        return BindingMap(self)
+
+    @property
+    def Create(self):
+        return _CreationDocument(self)
+
+    @property
+    def IsModifiable(self):
+        return self._transaction is not None
+
+    @property
+    def IsWorkshared(self):
+        return bool(self._worksets)
+
+    def GetWorksetTable(self):
+        return WorksetTable(self)
+
+    def Delete(self, element_ids):
+        """Delete one id or a collection of ids; returns the deleted ids."""
+        self._require_transaction()
+        if isinstance(element_ids, ElementId):
+            element_ids = [element_ids]
+        deleted = _TypedList()
+        for element_id in element_ids:
+            element = self._elements.pop(element_id.IntegerValue, None)
+            if element is not None:
+                self._record_undo(self._restore, element)
+                self._on_deleted(element)
+                deleted.Add(element_id)
+        return deleted
+
+    # -------------------------------
+    # Building
+    # -------------------------------
+    def new_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def add_category(self, bic, name, category_type=CategoryType.Model):
+        category = Category(bic, name, category_type)
+        self._categories[int(bic)] = category
+        return category
+
+    def add(self, element):
+        """Index a new element (use inside a transaction for undo support)."""
+        element_id = element._id
+        self._elements[element_id] = element
+        self._order.append(element_id)
+        self._by_cat.setdefault(element._cat, []).append(element_id)
+        self._by_class.setdefault(type(element), []).append(element_id)
+        if element._level != INVALID:
+            self._by_level.setdefault(element._level, []).append(element_id)
+        if element._owner != INVALID:
+            self._by_owner.setdefault(element._owner, []).append(element_id)
+        if isinstance(element, View):
+            self._view_names.setdefault(element._name_scope(), {})[element._name] = element_id
+        elif isinstance(element, Viewport):
+            self._place_viewport(element)
+        if self._transaction is not None:
+            self._record_undo(self._undo_add, element)
+            self._mark_added(element_id)
+        return element
+
+    def _undo_add(self, element):
+        if self._elements.pop(element._id, None) is not None:
+            self._on_deleted(element)
+
+    def _restore(self, element):
+        self._elements[element._id] = element
+        if self._changes is not None and element._id in self._changes[2]:
+            # deleted, then rolled back in a sub-transaction
+            self._changes[2].discard(element._id)
+            self._changes[1].add(element._id)
+        for index, key in ((self._by_cat, element._cat), (self._by_class, type(element)),
+                           (self._by_level, element._level), (self._by_owner, element._owner)):
+            ids = index.setdefault(key, [])
+            if element._id not in ids:
+                ids.append(element._id)
+                ids.sort()
+        if element._id not in self._order:
+            self._order.append(element._id)
+            self._order.sort()
+        if isinstance(element, View):
+            self._view_names.setdefault(element._name_scope(), {})[element._name] = element._id
+        elif isinstance(element, Viewport):
+            self._place_viewport(element)
+
+    def _on_deleted(self, element):
+        # Index lists keep the id; lookups skip ids missing from _elements
+        if isinstance(element, View):
+            names = self._view_names.get(element._name_scope(), {})
+            if names.get(element._name) == element._id:
+                del names[element._name]
+        elif isinstance(element, Viewport):
+            for index, value in ((self._sheet_views, element._view),
+                                 (self._sheet_viewports, element._id)):
+                if value in index.get(element._sheet, ()):
+                    index[element._sheet].remove(value)
+            self._view_sheet.pop(element._view, None)
+        self._mark_deleted(element._id)
+
+    def _place_viewport(self, viewport):
+        self._sheet_views.setdefault(viewport._sheet, []).append(viewport._view)
+        self._sheet_viewports.setdefault(viewport._sheet, []).append(viewport._id)
+        self._view_sheet[viewport._view] = viewport._sheet
+
+    # Change tracking for DocumentChanged (net effect of the open transaction)
+    def _mark_added(self, element_id):
+        if self._changes is not None:
+            self._changes[0].add(element_id)
+
+    def _mark_modified(self, element_id):
+        if self._changes is not None and element_id not in self._changes[0]:
+            self._changes[1].add(element_id)
+
+    def _mark_deleted(self, element_id):
+        if self._changes is None:
+            return
+        added, modified, deleted = self._changes
+        if element_id in added:
+            added.discard(element_id)     # created and deleted in one transaction
+        else:
+            modified.discard(element_id)
+            deleted.add(element_id)
+
+    def _document_changed(self, changes, transaction_names,
+                          operation=UndoOperation.TransactionCommitted):
+        added, modified, deleted = changes
+        self.Application.DocumentChanged._raise(self.Application, DocumentChangedEventArgs(
+            self, added, modified, deleted, transaction_names, operation))
+
+    def simulate_document_changed(self, added=(), modified=(), deleted=(),
+                                  transaction_name="External change"):
+        """Raise DocumentChanged for changes made outside a stand-in transaction.
+
+        Stand-in only: tests use it for what Revit reports after a reload,
+        a sync with central or an undo. Ids may be ElementIds or ints.
+        """
+        def ints(ids):
+            return set(i.IntegerValue if isinstance(i, ElementId) else int(i) for i in ids)
+        self._document_changed((ints(added), ints(modified), ints(deleted)), [transaction_name])
+
+    def Close(self, save_changes=False):
+        self.Application.DocumentClosing._raise(self.Application, DocumentClosingEventArgs(self))
+        return True
+
+    # -------------------------------
+    # Transactions
+    # -------------------------------
+    def _require_transaction(self):
+        if self._transaction is None:
+            raise ModificationOutsideTransactionException(
+                "Attempt to modify the model outside of transaction.")
+
+    def _record_undo(self, func, *args):
+        if self._transaction is not None:
+            self._undo.append((func, args))
+
+    def _rollback(self, mark):
+        while len(self._undo) > mark:
+            func, args = self._undo.pop()
+            func(*args)
+
+    # -------------------------------
+    # Creation
+    # -------------------------------
+    def _create(self, element, location=None):
+        self._require_transaction()
+        self.add(element)
+        if location is not None:
+            self._locations[element._id] = location
+            self._record_undo(self._locations.pop, element._id, None)
+        return element
+
+    def _first_type(self, type_class):
+        ids = [i for i in self._by_class.get(type_class, ()) if i in self._elements]
+        if not ids:
+            raise InvalidOperationException("The document has no {}.".format(
+                type_class.__name__))
+        return ids[0]
+
+    def _check_type(self, type_id, type_class, argument):
+        if not isinstance(self._elements.get(type_id), type_class):
+            raise ArgumentException("{} is not a valid {}.".format(argument, type_class.__name__))
+
+    def _check_level(self, level_id):
+        level = self._elements.get(level_id.IntegerValue)
+        if not isinstance(level, Level):
+            raise ArgumentException("levelId is not a level.")
+        return level
+
+    def _check_view(self, view_id):
+        view = self._elements.get(view_id.IntegerValue)
+        if not isinstance(view, View) or view.IsTemplate:
+            raise ArgumentException("viewId is not a view that can hold annotation.")
+        return view
+
+    # -------------------------------
+    # Views
+    # -------------------------------
+    def _view_name_taken(self, view, name):
+        return name in self._view_names.get(view._name_scope(), {})
+
+    def _rename_view(self, view, old, new):
+        names = self._view_names.setdefault(view._name_scope(), {})
+        if names.get(old) == view._id:
+            del names[old]
+        names[new] = view._id
+
+    def _ids_in_view(self, view_id):
+        view = self._elements.get(view_id)
+        if view is None:
+            raise ArgumentException("viewId is not a view.")
+        owned = list(self._by_owner.get(view_id, ()))
+        if view.ViewType in (ViewType.FloorPlan, ViewType.CeilingPlan, ViewType.EngineeringPlan,
+                             ViewType.AreaPlan):
+            ids = self._by_level.get(view._gen_level, [])
+            ids = [i for i in ids if self._elements.get(i) is not None
+                   and self._elements[i]._owner == INVALID and not self._elements[i]._is_type]
+            return sorted(ids + owned)
+        if view.ViewType in (ViewType.ThreeD, ViewType.Section, ViewType.Elevation):
+            model = [i for i in self._order if i in self._elements
+                     and self._elements[i]._owner == INVALID
+                     and not self._elements[i]._is_type
+                     and self._categories.get(self._elements[i]._cat) is not None
+                     and self._categories[self._elements[i]._cat].CategoryType
+                     == CategoryType.Model]
+            return sorted(model + owned)
+        return owned
+
+    # -------------------------------
+    # Parameters
+    # -------------------------------
+    def _param_defs(self, element):
+        return self._defs_by_cat.get((element._cat, element._is_type), ())
+
+    def _param_index(self, element):
+        return self._defs_index.get((element._cat, element._is_type), {})
+
+    def _bind(self, definition, binding):
+        if definition._id is None:
+            definition._id = self.new_id()      # its ParameterElement
+        self._bindings[definition] = binding
+        self.add_parameter(definition, [int(c.Id.IntegerValue) for c in binding.Categories],
+                           types=isinstance(binding, TypeBinding))
+
+    def _unbind(self, definition):
+        binding = self._bindings.pop(definition)
+        types = isinstance(binding, TypeBinding)
+        for category in binding.Categories:
+            key = (category.Id.IntegerValue, types)
+            definitions = self._defs_by_cat.get(key, [])
+            if definition in definitions:
+                definitions.remove(definition)
+            index = self._defs_index.get(key, {})
+            for index_key in (definition._id, definition.GUID):
+                if index.get(index_key) is definition:
+                    del index[index_key]
+
+    def add_parameter(self, definition, categories, types=False):
+        """Attach ``definition`` to instances (or types) of ``categories``."""
+        for category in categories:
+            key = (int(category), types)
+            self._defs_by_cat.setdefault(key, []).append(definition)
+            index = self._defs_index.setdefault(key, {})
+            if definition.BuiltInParameter != BuiltInParameter.INVALID:
+                index[int(definition.BuiltInParameter)] = definition
+            elif definition._id is not None:
+                index[definition._id] = definition
+            if definition.GUID is not None:
+                index[definition.GUID] = definition
+        return definition
+
+    def __repr__(self):
+        return "<Document {} ({} elements)>".format(self.Title, len(self._elements))
+
+
+# -------------------------------
+# UI
+# -------------------------------
+class Selection(object):
+    def __init__(self, uidoc):
+        self._uidoc = uidoc
+        self._ids = []
+        self._picks = None
+
+    def GetElementIds(self):
+        return _TypedList(ElementId(i) for i in self._ids)
+
+    def SetElementIds(self, element_ids):
+        self._ids = [i.IntegerValue for i in element_ids]
+
+    def queue_picks(self, element_ids):
+        """Ids the next ``PickObject(s)`` call returns (stand-in only)."""
+        self._picks = [i.IntegerValue if isinstance(i, ElementId) else int(i)
+                       for i in element_ids]
+
+    def PickObjects(self, object_type, *args):
+        ids = self._picks if self._picks is not None else self._ids
+        self._picks = None
+        return _TypedList(Reference(ElementId(i)) for i in ids)
+
+    def PickObject(self, object_type, *args):
+        picked = self.PickObjects(object_type)
+        if not picked:
+            raise InvalidOperationException("The user aborted the pick operation.")
+        return picked[0]
+
+
+class UIDocument(object):
+    def __init__(self, doc):
+        self.Document = doc
+        self.Selection = Selection(self)
+
+    @property
+    def ActiveView(self):
+        return self.Document.ActiveView
+
+    def ShowElements(self, element_ids):
+        pass
+
+    def RefreshActiveView(self):
+        pass
+
+
+class UIApplication(object):
+    """Enough of ``__revit__`` for scripts: ``ActiveUIDocument``."""
+
+    def __init__(self, uidoc):
+        self.ActiveUIDocument = uidoc
+
+
+# -------------------------------
+# Built-in parameters
+# -------------------------------
+def _level_of(element):
+    return element._level if element._level != INVALID else None
+
+
+def _curve_length(element):
+    location = element._doc._locations.get(element._id)
+    if isinstance(location, LocationCurve):
+        return location.Curve.Length
+    return 1.0 + (element._id * 7919 % 400) / 8.0
+
+
+def _set_view_name(view, value):
+    if value != view._name and view._doc._view_name_taken(view, value):
+        raise ArgumentException("The name entered is already in use. Enter a unique name.")
+    view._rename(value)
+
+
+def _sheet_attr(name):
+    def get(view):
+        sheet = view._doc._elements.get(view._doc._view_sheet.get(view._id, INVALID))
+        return getattr(sheet, name) if sheet is not None else None
+    return get
+
+
+# category -> (instance class, type class, level mode, display name)
+# level modes: "level" (LevelId + Level param), "base" (walls), "reference" and
+# "schedule" (LevelId invalid, level only in that parameter), None (no level)
+MODEL_CATEGORIES = [
+    (BuiltInCategory.OST_Walls, "Walls", Wall, WallType, "base"),
+    (BuiltInCategory.OST_Floors, "Floors", Floor, FloorType, "level"),
+    (BuiltInCategory.OST_Ceilings, "Ceilings", Ceiling, CeilingType, "level"),
+    (BuiltInCategory.OST_Roofs, "Roofs", RoofBase, RoofType, "level"),
+    (BuiltInCategory.OST_Doors, "Doors", FamilyInstance, FamilySymbol, "family"),
+    (BuiltInCategory.OST_Windows, "Windows", FamilyInstance, FamilySymbol, "family"),
+    (BuiltInCategory.OST_Furniture, "Furniture", FamilyInstance, FamilySymbol, "family"),
+    (BuiltInCategory.OST_Casework, "Casework", FamilyInstance, FamilySymbol, "family"),
+    (BuiltInCategory.OST_GenericModel, "Generic Models", FamilyInstance, FamilySymbol,
+     "family"),
+    (BuiltInCategory.OST_MechanicalEquipment, "Mechanical Equipment", FamilyInstance,
+     FamilySymbol, "family"),
+    (BuiltInCategory.OST_PlumbingFixtures, "Plumbing Fixtures", FamilyInstance, FamilySymbol,
+     "family"),
+    (BuiltInCategory.OST_LightingFixtures, "Lighting Fixtures", FamilyInstance, FamilySymbol,
+     "schedule"),
+    (BuiltInCategory.OST_SpecialityEquipment, "Specialty Equipment", FamilyInstance,
+     FamilySymbol, "schedule"),
+    (BuiltInCategory.OST_StructuralColumns, "Structural Columns", FamilyInstance,
+     FamilySymbol, "family"),
+    (BuiltInCategory.OST_StructuralFraming, "Structural Framing", FamilyInstance,
+     FamilySymbol, "reference"),
+    (BuiltInCategory.OST_PipeCurves, "Pipes", MEPCurve, MEPCurveType, "reference"),
+    (BuiltInCategory.OST_DuctCurves, "Ducts", MEPCurve, MEPCurveType, "reference"),
+    (BuiltInCategory.OST_Rooms, "Rooms", Room, None, "level"),
+    (BuiltInCategory.OST_Stairs, "Stairs", Element, ElementType, "base"),
+]
+ANNOTATION_CATEGORIES = [
+    (BuiltInCategory.OST_Lines, "Lines", DetailCurve, None, None),
+    (BuiltInCategory.OST_TextNotes, "Text Notes", TextNote, TextNoteType, None),
+    (BuiltInCategory.OST_Grids, "Grids", Grid, GridType, None),
+    (BuiltInCategory.OST_DetailComponents, "Detail Items", FilledRegion, FilledRegionType, None),
+]
+OTHER_CATEGORIES = [
+    (BuiltInCategory.OST_Levels, "Levels", CategoryType.Annotation),
+    (BuiltInCategory.OST_Views, "Views", CategoryType.Annotation),
+    (BuiltInCategory.OST_Sheets, "Sheets", CategoryType.Annotation),
+    (BuiltInCategory.OST_Viewports, "Viewports", CategoryType.Annotation),
+    (BuiltInCategory.OST_Phases, "Phases", CategoryType.Annotation),
+]
+
+LEVEL_PARAMS = {
+    "level": (BuiltInParameter.LEVEL_PARAM, "Level"),
+    "family": (BuiltInParameter.FAMILY_LEVEL_PARAM, "Level"),
+    "base": (BuiltInParameter.WALL_BASE_CONSTRAINT, "Base Constraint"),
+    "reference": (BuiltInParameter.INSTANCE_REFERENCE_LEVEL_PARAM, "Reference Level"),
+    "schedule": (BuiltInParameter.SCHEDULE_LEVEL_PARAM, "Schedule Level"),
+}
+NO_LEVEL_ID_MODES = ("reference", "schedule")
+
+
+def _register_builtin_parameters(doc):
+    """Categories and the built-in parameters of every stand-in category."""
+    for spec in MODEL_CATEGORIES:
+        doc.add_category(spec[0], spec[1], CategoryType.Model)
+    for spec in ANNOTATION_CATEGORIES:
+        doc.add_category(spec[0], spec[1], CategoryType.Annotation)
+    for bic, name, category_type in OTHER_CATEGORIES:
+        doc.add_category(bic, name, category_type)
+
+    model = [c[0] for c in MODEL_CATEGORIES]
+    annotation = [c[0] for c in ANNOTATION_CATEGORIES]
+    typed = [c[0] for c in MODEL_CATEGORIES + ANNOTATION_CATEGORIES if c[3] is not None]
+    S, I, D, E = StorageType.String, StorageType.Integer, StorageType.Double, StorageType.ElementId
+    P = BuiltInParameter
+
+    # Instance parameters; order matters for LookupParameter's linear scan
+    doc.add_parameter(Definition("Type", E, P.ELEM_TYPE_PARAM,
+                                 lambda e: e._type if e._type != INVALID else None),
+                      model + annotation)
+    for mode in ("base", "level", "family", "reference", "schedule"):
+        bip, label = LEVEL_PARAMS[mode]
+        cats = [c[0] for c in MODEL_CATEGORIES if c[4] == mode]
+        if cats:
+            doc.add_parameter(Definition(label, E, bip, _level_of), cats)
+    doc.add_parameter(Definition("Workset", I, P.ELEM_PARTITION_PARAM,
+                                 lambda e: e._workset, read_only=True), model + annotation)
+    doc.add_parameter(Definition("Phase Created", E, P.PHASE_CREATED,
+                                 lambda e: e._phase if e._phase != INVALID else None), model)
+    doc.add_parameter(Definition("Comments", S, P.ALL_MODEL_INSTANCE_COMMENTS), model)
+    doc.add_parameter(Definition("Mark", S, P.ALL_MODEL_MARK), model)
+    length_cats = [BuiltInCategory.OST_Walls, BuiltInCategory.OST_StructuralFraming,
+                   BuiltInCategory.OST_PipeCurves, BuiltInCategory.OST_DuctCurves,
+                   BuiltInCategory.OST_Lines]
+    doc.add_parameter(Definition("Length", D, P.CURVE_ELEM_LENGTH, _curve_length,
+                                 read_only=True), length_cats)
+    area_cats = [BuiltInCategory.OST_Floors, BuiltInCategory.OST_Ceilings,
+                 BuiltInCategory.OST_Roofs, BuiltInCategory.OST_Rooms]
+    doc.add_parameter(Definition("Area", D, P.HOST_AREA_COMPUTED,
+                                 lambda e: 50.0 + (e._id * 104729 % 2000) / 4.0, read_only=True),
+                      area_cats)
+    doc.add_parameter(Definition("Name", S, P.ROOM_NAME, lambda e: "Room {}".format(e._id)),
+                      [BuiltInCategory.OST_Rooms])
+    doc.add_parameter(Definition("Number", S, P.ROOM_NUMBER, lambda e: str(e._id)),
+                      [BuiltInCategory.OST_Rooms])
+
+    # Type parameters
+    doc.add_parameter(Definition("Type Name", S, P.ALL_MODEL_TYPE_NAME, lambda e: e._name,
+                                 setter=lambda e, v: e._rename(v)), typed, types=True)
+    doc.add_parameter(Definition("Family Name", S, P.ALL_MODEL_FAMILY_NAME,
+                                 lambda e: e.FamilyName, read_only=True), typed, types=True)
+    doc.add_parameter(Definition("Type Comments", S, P.INVALID, definition_id=-1010103),
+                      typed, types=True)
+
+    # Levels, views, sheets
+    doc.add_parameter(Definition("Elevation", D, P.LEVEL_ELEV, lambda e: e.Elevation),
+                      [BuiltInCategory.OST_Levels])
+    doc.add_parameter(Definition("Name", S, P.DATUM_TEXT, lambda e: e._name,
+                                 setter=lambda e, v: e._rename(v)), [BuiltInCategory.OST_Levels])
+    doc.add_parameter(Definition("View Name", S, P.VIEW_NAME, lambda e: e._name,
+                                 setter=_set_view_name), [BuiltInCategory.OST_Views])
+    doc.add_parameter(Definition("View Scale", I, P.VIEW_SCALE, lambda e: e.Scale),
+                      [BuiltInCategory.OST_Views])
+    doc.add_parameter(Definition("View Template", E, P.VIEW_TEMPLATE,
+                                 lambda e: e._template if e._template != INVALID else None),
+                      [BuiltInCategory.OST_Views])
+    doc.add_parameter(Definition("Sheet Number", S, P.VIEWPORT_SHEET_NUMBER,
+                                 _sheet_attr("SheetNumber"), read_only=True),
+                      [BuiltInCategory.OST_Views])
+    doc.add_parameter(Definition("Sheet Name", S, P.VIEWPORT_SHEET_NAME,
+                                 _sheet_attr("Name"), read_only=True),
+                      [BuiltInCategory.OST_Views])
+    doc.add_parameter(Definition("Sheet Number", S, P.SHEET_NUMBER, lambda e: e.SheetNumber,
+                                 read_only=True), [BuiltInCategory.OST_Sheets])
+    doc.add_parameter(Definition("Sheet Name", S, P.SHEET_NAME, lambda e: e._name,
+                                 setter=lambda e, v: e._rename(v)), [BuiltInCategory.OST_Sheets])
+
+
+# -------------------------------
+# Synthetic models
+# -------------------------------
+# Relative share of instances per category
+CATEGORY_WEIGHTS = {
+    BuiltInCategory.OST_Walls: 12, BuiltInCategory.OST_Floors: 3, BuiltInCategory.OST_Ceilings: 3,
+    BuiltInCategory.OST_Roofs: 1, BuiltInCategory.OST_Doors: 6, BuiltInCategory.OST_Windows: 6,
+    BuiltInCategory.OST_Furniture: 10, BuiltInCategory.OST_Casework: 3,
+    BuiltInCategory.OST_GenericModel: 5, BuiltInCategory.OST_MechanicalEquipment: 4,
+    BuiltInCategory.OST_PlumbingFixtures: 4, BuiltInCategory.OST_LightingFixtures: 6,
+    BuiltInCategory.OST_SpecialityEquipment: 3, BuiltInCategory.OST_StructuralColumns: 4,
+    BuiltInCategory.OST_StructuralFraming: 8, BuiltInCategory.OST_PipeCurves: 6,
+    BuiltInCategory.OST_DuctCurves: 5, BuiltInCategory.OST_Rooms: 2,
+    BuiltInCategory.OST_Stairs: 1, BuiltInCategory.OST_Lines: 5,
+    BuiltInCategory.OST_TextNotes: 3,
+}
+
+PLAN_VIEW_TYPES = ((ViewType.FloorPlan, ViewFamily.FloorPlan, "Floor Plan"),
+                   (ViewType.CeilingPlan, ViewFamily.CeilingPlan, "Ceiling Plan"),
+                   (ViewType.EngineeringPlan, ViewFamily.StructuralPlan, "Structural Plan"))
+
+
+def _scramble(value, modulo):
+    """Cheap deterministic pseudo-random pick (Knuth multiplicative hash)."""
+    return ((value * 2654435761) & 0xFFFFFFFF) % modulo
+
+
+def generate_model(elements=100000, levels=10, types_per_category=12, worksets=4, phases=2,
+                   sheets=None, title=None, project_parameters=24):
+    """Build a ``Document`` with about ``elements`` instances plus support elements.
+
+    Instances are spread over ``MODEL_CATEGORIES`` by ``CATEGORY_WEIGHTS`` and
+    over levels, types, worksets and phases deterministically, so the same
+    arguments always give the same model. Annotation elements (lines, text)
+    are owned by the level's floor plan. Each level gets floor, ceiling and
+    structural plans (some with dependent views), and there are sections,
+    elevations, 3D, drafting and legend views, view templates and sheets
+    holding most plans. ``project_parameters`` project / shared parameters
+    (every third one shared, every fourth a type parameter) are bound to
+    a fifth of the model categories each.
+    """
+    doc = Document(title or "StandIn-{}.rvt".format(elements))
+    add, new_id = doc.add, doc.new_id
+
+    for number in range(1, worksets + 1):
+        doc._worksets[number] = Workset(number, "Workset{}".format(number))
+    phase_ids = [doc.add(Phase(doc, new_id(), BuiltInCategory.OST_Phases,
+                               name=n))._id for n in ("Existing", "New Construction")[:phases]]
+    level_ids = [add(Level(doc, new_id(), "Level {}".format(n + 1), n * 12.0))._id
+                 for n in range(levels)]
+
+    # Types
+    types = {}
+    for bic, name, cls, type_cls, mode in MODEL_CATEGORIES + ANNOTATION_CATEGORIES:
+        if type_cls is None:
+            types[bic] = [INVALID]
+            continue
+        ids = []
+        for number in range(types_per_category):
+            element_type = add(type_cls(doc, new_id(), bic,
+                                        name="{} Type {:02d}".format(name, number + 1)))
+            if type_cls is FamilySymbol:
+                doc._family_names[element_type._id] = "{} Family {}".format(name, number % 3 + 1)
+            ids.append(element_type._id)
+        types[bic] = ids
+
+    # Project and shared parameters
+    for number in range(project_parameters):
+        shared = number % 3 == 0
+        definition = Definition(
+            "HT_{} {:02d}".format("Shared" if shared else "Project", number + 1),
+            StorageType.String, definition_id=new_id(),
+            guid="6f1c2a3e-0000-4000-8000-{:012d}".format(number + 1) if shared else None)
+        categories = CategorySet(doc._categories[int(spec[0])]
+                                 for spec in MODEL_CATEGORIES[number % 5::5])
+        binding = TypeBinding(categories) if number % 4 == 3 else InstanceBinding(categories)
+        doc._bind(definition, binding)
+
+    # Views
+    view_types = {}
+    for view_type, family, label in PLAN_VIEW_TYPES + (
+            (ViewType.ThreeD, ViewFamily.ThreeDimensional, "3D View"),
+            (ViewType.Section, ViewFamily.Section, "Building Section"),
+            (ViewType.Elevation, ViewFamily.Elevation, "Elevation"),
+            (ViewType.DraftingView, ViewFamily.Drafting, "Drafting View"),
+            (ViewType.Legend, ViewFamily.Legend, "Legend"),
+            (ViewType.DrawingSheet, ViewFamily.Sheet, "Sheet")):
+        vft = add(ViewFamilyType(doc, new_id(), INVALID, name=label))
+        doc._view_families[vft._id] = family
+        view_types[view_type] = vft._id
+
+    templates = {}
+    for view_type, family, label in PLAN_VIEW_TYPES:
+        template = add(ViewPlan(doc, new_id(), "{} Template".format(label), view_type,
+                                view_types[view_type], is_template=True))
+        templates[view_type] = template._id
+
+    plans = []
+    floor_plans = {}
+    for level_id in level_ids:
+        level_name = doc._elements[level_id].Name
+        for view_type, family, label in PLAN_VIEW_TYPES:
+            plan = add(ViewPlan(doc, new_id(), level_name, view_type, view_types[view_type],
+                                gen_level=level_id, template=templates[view_type]))
+            plans.append(plan)
+            if view_type == ViewType.FloorPlan:
+                floor_plans[level_id] = plan._id
+                for part in ("A", "B"):
+                    dependent = add(ViewPlan(doc, new_id(), "{} - Dependent {}".format(
+                        level_name, part), view_type, view_types[view_type], gen_level=level_id,
+                        primary=plan._id))
+                    doc._dependents.setdefault(plan._id, []).append(dependent._id)
+    extra = []
+    for view_type, cls, label, count in (
+            (ViewType.ThreeD, View3D, "3D View", 3), (ViewType.Section, ViewSection, "Section", 6),
+            (ViewType.Elevation, ViewSection, "Elevation", 4),
+            (ViewType.DraftingView, ViewDrafting, "Drafting", 4),
+            (ViewType.Legend, View, "Legend", 2)):
+        for number in range(1, count + 1):
+            extra.append(add(cls(doc, new_id(), "{} {}".format(label, number), view_type,
+                                 view_types[view_type], scale=50)))
+    doc.ActiveView = doc._elements[floor_plans[level_ids[0]]]
+
+    # Sheets holding the primary plans and sections
+    placeable = [p for p in plans if p._primary == INVALID] + \
+        [v for v in extra if v.ViewType == ViewType.Section]
+    sheet_count = sheets if sheets is not None else max(1, len(placeable) * 2 // 3)
+    for number in range(sheet_count):
+        sheet = add(ViewSheet(doc, new_id(), "A{:03d}".format(number + 101),
+                              "Sheet {}".format(number + 1), view_types[ViewType.DrawingSheet]))
+        if number < len(placeable):
+            view = placeable[number]
+            add(Viewport(doc, new_id(), sheet._id, view._id))
+
+    # Grids
+    for number in range(max(4, levels)):
+        add(Grid(doc, new_id(), BuiltInCategory.OST_Grids, types[BuiltInCategory.OST_Grids][0],
+                 name=str(number + 1)))
+
+    # Instances
+    total_weight = sum(CATEGORY_WEIGHTS.values())
+    specs = dict((c[0], c) for c in MODEL_CATEGORIES + ANNOTATION_CATEGORIES)
+    order = sorted(CATEGORY_WEIGHTS, key=lambda c: specs[c][1])
+    counts = dict((bic, elements * CATEGORY_WEIGHTS[bic] // total_weight) for bic in order)
+    counts[order[0]] += elements - sum(counts.values())
+    last_phase = phase_ids[-1] if phase_ids else INVALID
+    n_levels, n_phases = len(level_ids), len(phase_ids)
+
+    elements_map, order_list = doc._elements, doc._order
+    by_level = doc._by_level
+    for bic in order:
+        _, _, cls, _, mode = specs[bic]
+        type_ids = types[bic]
+        n_types = len(type_ids)
+        view_specific = mode is None
+        cat_ids = doc._by_cat.setdefault(bic, [])
+        class_ids = doc._by_class.setdefault(cls, [])
+        start = doc._next_id + 1
+        for element_id in range(start, start + counts[bic]):
+            level = level_ids[_scramble(element_id, n_levels)]
+            phase = phase_ids[_scramble(element_id >> 3, n_phases)] if element_id % 5 == 0 \
+                else last_phase
+            if view_specific:
+                element = cls(doc, element_id, bic, type_ids[element_id % n_types], INVALID,
+                              None, 1 + element_id % worksets if worksets else 0, INVALID,
+                              floor_plans[level])
+                doc._by_owner.setdefault(element._owner, []).append(element_id)
+            else:
+                element = cls(doc, element_id, bic, type_ids[_scramble(element_id, n_types * 7)
+                                                              % n_types], level, None,
+                              1 + element_id % worksets if worksets else 0, phase)
+                by_level[level].append(element_id) if level in by_level \
+                    else by_level.setdefault(level, [element_id])
+            elements_map[element_id] = element
+            order_list.append(element_id)
+            cat_ids.append(element_id)
+            class_ids.append(element_id)
+        doc._next_id = start + counts[bic] - 1
+    return doc
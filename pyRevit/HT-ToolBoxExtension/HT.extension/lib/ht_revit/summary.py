@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""One-pass selection profile: counts by category, type, level and workset.
+
+``summarise_selection()`` walks the selected ids once and keeps only
+counters keyed by raw ids. Elements are fetched one at a time and
+dropped, and names are looked up once per distinct key at the end
+(``query.standard_attribute`` supplies the readers). Selections larger
+than ``max_exact`` are sampled instead: only ``sample_size`` randomly
+chosen ids are fetched, and every count comes with a 95% error bound.
+
+>>> summary = summarise_selection(doc, uidoc.Selection.GetElementIds())
+>>> summary.total, summary.sampled, summary.exact
+(200000, 5000, False)
+>>> summary.rows("category")[:1]
+[('Walls', 43680, 1120)]            # value, estimated count, +/- bound
+"""
+
+import math
+import random
+
+from .levels import LevelResolver
+from .query import NONE_LABEL, natural_key, standard_attribute
+
+SUMMARY_ATTRIBUTES = ("category", "type", "level", "workset")
+DEFAULT_MAX_EXACT = 50000
+DEFAULT_SAMPLE_SIZE = 5000
+Z_95 = 1.96
+
+try:
+    _range = xrange     # noqa: F821 - IronPython 2.7: range() would build the list
+except NameError:
+    _range = range
+
+
+class SelectionSummary(object):
+    """Counters per attribute for ``sampled`` of ``total`` elements."""
+
+    def __init__(self, total, sampled, attributes):
+        self.total = total
+        self.sampled = sampled
+        self.attributes = attributes
+        self.counts = dict((name, {}) for name in attributes)   # name -> {label: count}
+        self.missing = 0        # ids that did not resolve to an element
+
+    @property
+    def exact(self):
+        return self.sampled >= self.total
+
+    def error_bound(self, count, z=Z_95):
+        """+/- bound on the scaled-up ``count`` (0 when every element was read).
+
+        Normal approximation of the sampled share, with the finite
+        population correction for sampling without replacement.
+        """
+        if self.exact or not self.sampled:
+            return 0
+        share = float(count) / self.sampled
+        fpc = (self.total - self.sampled) / float(self.total - 1)
+        return int(math.ceil(z * math.sqrt(share * (1 - share) / self.sampled * fpc) * self.total))
+
+    def rows(self, name, z=Z_95):
+        """``[(value, count, error bound)]`` for one attribute, largest count first."""
+        scale = float(self.total) / self.sampled if self.sampled else 0
+        rows = [(value, int(round(count * scale)), self.error_bound(count, z))
+                for value, count in self.counts[name].items()]
+        rows.sort(key=lambda row: (-row[1], natural_key(row[0])))
+        return rows
+
+
+def _sample_positions(total, size, seed):
+    # sorted positions, so one forward pass over the id collection visits them;
+    # sample() of a lazy range only holds the ``size`` positions it picks
+    return sorted(random.Random(seed).sample(_range(total), size))
+
+
+def summarise_selection(doc, element_ids, attributes=SUMMARY_ATTRIBUTES,
+                        max_exact=DEFAULT_MAX_EXACT, sample_size=DEFAULT_SAMPLE_SIZE,
+                        seed=0, resolver=None):
+    """Profile ``element_ids`` in one pass; returns a ``SelectionSummary``.
+
+    ``element_ids`` only needs ``Count`` (or ``len``) and iteration, so
+    ``Selection.GetElementIds()`` is passed straight through, with no
+    element list in between.
+    """
+    total = element_ids.Count if hasattr(element_ids, "Count") else len(element_ids)
+    sampling = total > max_exact and sample_size < total
+    resolver = resolver or LevelResolver(doc)
+    readers = [standard_attribute(doc, name, resolver) for name in attributes]
+    keys = [(reader.key, {}) for reader in readers]
+
+    summary = SelectionSummary(total, 0, list(attributes))
+    targets = iter(_sample_positions(total, sample_size, seed)) if sampling else None
+    target = next(targets, None) if sampling else None
+    get_element = doc.GetElement
+    for position, element_id in enumerate(element_ids):
+        if sampling:
+            if position != target:
+                continue
+            target = next(targets, None)
+        element = get_element(element_id)
+        if element is None:
+            summary.missing += 1
+            continue
+        summary.sampled += 1
+        for key, counter in keys:
+            value = key(element)
+            counter[value] = counter.get(value, 0) + 1
+        if sampling and target is None:
+            break
+
+    if not sampling:
+        summary.total = summary.sampled     # deleted ids do not count
+    for reader, (_, counter) in zip(readers, keys):
+        labelled = summary.counts[reader.name]
+        for value, count in counter.items():
+            label = reader.label(value)
+            if label is None:
+                label = NONE_LABEL
+            labelled[label] = labelled.get(label, 0) + count
+    return summary
+
+
+def summary_table(summary, name, limit=None):
+    """Table rows (lists of strings) for ``output.print_table``."""
+    rows = summary.rows(name)
+    hidden = rows[limit:] if limit else []
+    rows = rows[:limit] if limit else rows
+    table = []
+    for value, count, error in rows:
+        share = 100.0 * count / summary.total if summary.total else 0.0
+        cells = [value, "{:,}".format(count), "{:.1f}%".format(share)]
+        if not summary.exact:
+            cells.append(u"± {:,}".format(error))
+        table.append(cells)
+    if hidden:
+        cells = [u"… {} more".format(len(hidden)),
+                 "{:,}".format(sum(count for _, count, _ in hidden)), ""]
+        if not summary.exact:
+            cells.append("")
+        table.append(cells)
+    return table
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""Session-wide view index, kept current by ``DocumentChanged``.
+
+View tools used to collect every view (and work out names, templates and
+sheet placement) on each run. ``get_view_index(doc)`` builds that once
+per document and Revit session, then applies the added / modified /
+deleted ids of each ``DocumentChanged`` event:
+
+>>> index = get_view_index(doc)          # first call: one collector pass
+>>> index.name_taken(view, "Level 1")
+True
+>>> index.sheet_number(view.Id)
+'A101'
+>>> [r.name for r in index.views(ViewType.Legend)]
+['Legend 1', 'Legend 2']
+>>> index.dependents(floor_plan.Id), len(index.unplaced(ViewType.FloorPlan))
+([2210, 2211], 4)
+>>> [t.Name for t in index.elements(index.view_family_types(ViewFamily.Section))]
+['Building Section']
+
+Views are bucketed by ``ViewType`` and ``ViewFamily`` (and view family
+types by ``ViewFamily``) as they are indexed, so the classification
+the samples did with one list comprehension per view type is a dict
+lookup. Modified ids that are not views or viewports cost one dict lookup, so
+ordinary model edits do not touch the index. The index is a
+``session`` cache: dropped when the document closes.
+"""
+
+from .api import ElementId, FilteredElementCollector, View, ViewFamilyType, Viewport, ViewSheet
+from .levels import INVALID, int_id, raw_id
+from .session import get_cached, release, same_document
+
+_SESSION_KEY = "viewindex"
+
+
+def view_name_scope(view):
+    """Names must be unique within a scope: templates, or views of one ``ViewType``.
+
+    Sheet names need not be unique (sheets are unique by number): None.
+    """
+    if isinstance(view, ViewSheet):
+        return None
+    if view.IsTemplate:
+        return ("template",)
+    return ("view", int(view.ViewType))
+
+
+class ViewRecord(object):
+    """What the index knows about one view."""
+
+    __slots__ = ("id", "name", "view_type", "family", "is_template", "scope", "sheet_number",
+                 "type_id", "template_id", "primary_id")
+
+    def __init__(self, view, family=None):
+        self.id = int_id(view.Id)
+        self.name = view.Name
+        self.view_type = view.ViewType
+        self.family = family            # ViewFamily of its ViewFamilyType, if it has one
+        self.is_template = view.IsTemplate
+        self.scope = view_name_scope(view)
+        self.sheet_number = view.SheetNumber if isinstance(view, ViewSheet) else None
+        self.type_id = int_id(view.GetTypeId())
+        self.template_id = int_id(view.ViewTemplateId)
+        self.primary_id = int_id(view.GetPrimaryViewId())   # -1 unless a dependent view
+
+
+class ViewIndex(object):
+    """Views of one document: names per scope, records, buckets and sheet placement.
+
+    ``names`` has the ``{scope: {name: view id}}`` shape the rename
+    planner takes, and is updated in place, as are the buckets.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.records = {}       # view id -> ViewRecord
+        self.names = {}         # scope -> {name: view id}
+        self.by_type = {}       # (ViewType, is template) -> {view ids}
+        self.by_family = {}     # (ViewFamily, is template) -> {view ids}
+        self.by_template = {}   # template id -> {ids of the views it controls}
+        self.dependent_ids = {}     # primary view id -> {dependent view ids}
+        self.type_family = {}   # ViewFamilyType id -> ViewFamily
+        self.family_types = {}  # ViewFamily -> {ViewFamilyType ids}
+        self.placements = {}    # viewport id -> (sheet id, view id)
+        self.sheet_of = {}      # view id -> sheet id
+        self.builds = 0
+        self.updates = 0        # DocumentChanged events that touched the index
+        self.rebuild()
+
+    # -------------------------------
+    # Building and updating
+    # -------------------------------
+    def rebuild(self):
+        for mapping in (self.records, self.names, self.by_type, self.by_family,
+                        self.by_template, self.dependent_ids, self.type_family,
+                        self.family_types, self.placements, self.sheet_of):
+            mapping.clear()
+        for view_type in FilteredElementCollector(self.doc).OfClass(ViewFamilyType):
+            self._add_view_type(view_type)
+        for view in FilteredElementCollector(self.doc).OfClass(View):
+            self._add_view(view)
+        for viewport in FilteredElementCollector(self.doc).OfClass(Viewport):
+            self._add_viewport(viewport)
+        self.builds += 1
+
+    def _add_view_type(self, view_type):
+        # a ViewFamilyType never changes family, so modifications are ignored
+        type_id, family = int_id(view_type.Id), view_type.ViewFamily
+        self.type_family[type_id] = family
+        self.family_types.setdefault(int(family), set()).add(type_id)
+        return family
+
+    def _drop_view_type(self, type_id):
+        family = self.type_family.pop(type_id)
+        bucket = self.family_types.get(int(family), set())
+        bucket.discard(type_id)
+        if not bucket:
+            self.family_types.pop(int(family), None)
+
+    def _family_of(self, type_id):
+        if type_id == INVALID:
+            return None
+        family = self.type_family.get(type_id)
+        if family is None:      # type added in the same event, after the view
+            view_type = self.doc.GetElement(ElementId(type_id))
+            if isinstance(view_type, ViewFamilyType):
+                family = self._add_view_type(view_type)
+        return family
+
+    def _buckets(self, record):
+        yield self.by_type, (int(record.view_type), record.is_template)
+        if record.family is not None:
+            yield self.by_family, (int(record.family), record.is_template)
+        if record.template_id != INVALID:
+            yield self.by_template, record.template_id
+        if record.primary_id != INVALID:
+            yield self.dependent_ids, record.primary_id
+
+    def _add_view(self, view):
+        record = ViewRecord(view, self._family_of(int_id(view.GetTypeId())))
+        self.records[record.id] = record
+        if record.scope is not None:
+            self.names.setdefault(record.scope, {})[record.name] = record.id
+        for buckets, key in self._buckets(record):
+            buckets.setdefault(key, set()).add(record.id)
+
+    def _drop_view(self, view_id):
+        record = self.records.pop(view_id, None)
+        if record is None:
+            return None
+        if record.scope is not None:
+            names = self.names.get(record.scope, {})
+            if names.get(record.name) == view_id:
+                del names[record.name]
+        for buckets, key in self._buckets(record):
+            bucket = buckets.get(key)
+            if bucket is not None:
+                bucket.discard(view_id)
+                if not bucket:
+                    del buckets[key]
+        return record
+
+    def _add_viewport(self, viewport):
+        sheet_id, view_id = int_id(viewport.SheetId), int_id(viewport.ViewId)
+        self.placements[int_id(viewport.Id)] = (sheet_id, view_id)
+        self.sheet_of[view_id] = sheet_id
+
+    def _drop_viewport(self, viewport_id):
+        sheet_id, view_id = self.placements.pop(viewport_id)
+        if self.sheet_of.get(view_id) == sheet_id:
+            del self.sheet_of[view_id]
+
+    def apply_changes(self, added=(), modified=(), deleted=()):
+        """Apply raw int ids from a change event; returns True if the index changed."""
+        changed = False
+        for element_id in deleted:
+            if element_id in self.records:
+                self._drop_view(element_id)
+                self.sheet_of.pop(element_id, None)
+                changed = True
+            elif element_id in self.placements:
+                self._drop_viewport(element_id)
+                changed = True
+            elif element_id in self.type_family:
+                self._drop_view_type(element_id)
+                changed = True
+        for element_id in modified:
+            if element_id in self.records:
+                self._drop_view(element_id)
+                changed = self._read(element_id) or changed
+        for element_id in added:
+            changed = self._read(element_id) or changed
+        if changed:
+            self.updates += 1
+        return changed
+
+    def _read(self, element_id):
+        element = self.doc.GetElement(ElementId(element_id))
+        if isinstance(element, View):
+            self._add_view(element)
+            return True
+        if isinstance(element, Viewport):
+            self._add_viewport(element)
+            return True
+        if isinstance(element, ViewFamilyType) and element_id not in self.type_family:
+            self._add_view_type(element)
+            return True
+        return False
+
+    def on_document_changed(self, sender, args):
+        """``DocumentChanged`` handler; ignores other documents."""
+        if not same_document(args.GetDocument(), self.doc):
+            return
+        self.apply_changes(map(int_id, args.GetAddedElementIds()),
+                           map(int_id, args.GetModifiedElementIds()),
+                           map(int_id, args.GetDeletedElementIds()))
+
+    # -------------------------------
+    # Queries
+    # -------------------------------
+    def get(self, view_id):
+        return self.records.get(raw_id(view_id))
+
+    def name_taken(self, view, name):
+        """True if another view in ``view``'s name scope is called ``name``."""
+        scope = view_name_scope(view)
+        holder = self.names.get(scope, {}).get(name) if scope is not None else None
+        return holder is not None and holder != int_id(view.Id)
+
+    def _records(self, ids):
+        records = self.records
+        return [records[i] for i in sorted(ids)]
+
+    def views(self, view_type=None, templates=False):
+        """Records of non-template views (or only templates), optionally of one type."""
+        if view_type is None:
+            return [r for r in self.records.values() if r.is_template == templates]
+        return self._records(self.by_type.get((int(view_type), templates), ()))
+
+    def views_of_family(self, family, templates=False):
+        """Records of the views whose ``ViewFamilyType`` is of ``family``."""
+        return self._records(self.by_family.get((int(family), templates), ()))
+
+    def count(self, view_type, templates=False):
+        return len(self.by_type.get((int(view_type), templates), ()))
+
+    def templates(self, view_type=None):
+        return self.views(view_type, templates=True)
+
+    def using_template(self, template_id):
+        """Records of the views ``template_id`` is applied to."""
+        return self._records(self.by_template.get(raw_id(template_id), ()))
+
+    def dependents(self, view_id):
+        """Ids of the dependent views of ``view_id``, in id order."""
+        return sorted(self.dependent_ids.get(raw_id(view_id), ()))
+
+    def placed(self, view_type=None):
+        """Records of the (non-template) views placed on a sheet."""
+        return [r for r in self.views(view_type) if r.id in self.sheet_of]
+
+    def unplaced(self, view_type=None):
+        """Records of the (non-template, non-sheet) views on no sheet."""
+        return [r for r in self.views(view_type)
+                if r.id not in self.sheet_of and r.sheet_number is None]
+
+    def view_family_types(self, family):
+        """Ids of the ``ViewFamilyType`` elements of ``family``."""
+        return sorted(self.family_types.get(int(family), ()))
+
+    def elements(self, records):
+        """Elements of records (or of raw ids, e.g. from ``view_family_types()``)."""
+        get_element = self.doc.GetElement
+        return [get_element(ElementId(r.id if isinstance(r, ViewRecord) else raw_id(r)))
+                for r in records]
+
+    def sheet_id(self, view_id):
+        """Integer id of the sheet the view is placed on, or -1."""
+        return self.sheet_of.get(raw_id(view_id), INVALID)
+
+    def sheet_number(self, view_id):
+        record = self.records.get(self.sheet_id(view_id))
+        return record.sheet_number if record is not None else None
+
+
+def get_view_index(doc):
+    """The session's ``ViewIndex`` for ``doc``, built and subscribed on first use."""
+    return get_cached(doc, _SESSION_KEY, ViewIndex)
+
+
+def release_view_index(doc):
+    """Unsubscribe and forget the index of ``doc`` (on close, or to force a rebuild)."""
+    release(doc, _SESSION_KEY)